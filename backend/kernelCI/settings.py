@@ -16,6 +16,8 @@ import sys
 import threading
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 from utils.development_metrics import start_development_metrics_server
 from utils.validation import is_boolean_or_string_true
 
@@ -32,6 +34,20 @@ def get_json_env_var(name, default):
         raise
 
 
+def set_database_pools(databases, pools):
+    """Enables the connection pool of each database alias in `pools`"""
+    for alias, pool_options in pools.items():
+        database = databases[alias]
+        if "postgresql" not in database["ENGINE"]:
+            raise ValueError(
+                f"Connection pools are only supported by PostgreSQL, not by {alias!r}"
+            )
+        database.setdefault("OPTIONS", {})["pool"] = pool_options
+        # Django gives pooled connections back to the pool at the end of each
+        # request instead of keeping them open
+        database["CONN_MAX_AGE"] = 0
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -89,6 +105,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "kernelCI_app.middleware.logServerErrorMiddleware.LogServerErrorMiddleware",
+    "kernelCI_app.middleware.replicaRoutingMiddleware.ReplicaRoutingMiddleware",
+    "kernelCI_app.middleware.queryProfilingMiddleware.QueryProfilingMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",
 ]
 
@@ -115,6 +133,10 @@ WSGI_APPLICATION = "kernelCI.wsgi.application"
 REST_FRAMEWORK = {
     # YOUR SETTINGS
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": [
+        "kernelCI_app.renderers.jsonRenderer.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 SPECTACULAR_SETTINGS = {
@@ -271,6 +293,28 @@ BACKEND_VOLUME_DIR = os.environ.get("BACKEND_VOLUME_DIR", "/volume_data")
 
 DATABASE_ROUTERS = ["kernelCI_app.routers.databaseRouter.DatabaseRouter"]
 
+# Set when the database is reached through PgBouncer (or another pooler) in
+# transaction mode, which doesn't keep server-side cursors and prepared statements
+DB_PGBOUNCER = is_boolean_or_string_true(os.environ.get("DB_PGBOUNCER", False))
+
+# Runs the registered hot queries as server-side prepared statements.
+PREPARED_QUERIES_ENABLED = is_boolean_or_string_true(
+    os.environ.get("DB_PREPARED_QUERIES_ENABLED", not DB_PGBOUNCER)
+)
+# Pins the plan_cache_mode of registered queries, e.g. {"tree_details": "force_custom_plan"}
+PREPARED_QUERIES_PLAN_CACHE_MODES = get_json_env_var(
+    "DB_PREPARED_QUERIES_PLAN_CACHE_MODES", {}
+)
+
+# Captures the EXPLAIN (ANALYZE, BUFFERS) of a sample of the slow queries, which
+# are run again to be explained. Each process keeps its last plans, which are
+# listed by the admin-only /api/admin/query-plans/ endpoint. Off by default.
+QUERY_PLANS_SAMPLE_RATE = float(os.environ.get("DB_QUERY_PLANS_SAMPLE_RATE", "0"))
+QUERY_PLANS_SLOW_QUERY_SECONDS = float(
+    os.environ.get("DB_QUERY_PLANS_SLOW_QUERY_SECONDS", "1")
+)
+QUERY_PLANS_BUFFER_SIZE = int(os.environ.get("DB_QUERY_PLANS_BUFFER_SIZE", "50"))
+
 # Database definition configurations
 kcidb_config = {
     "NAME": os.getenv("DB_NAME", "dashboard"),
@@ -285,7 +329,11 @@ kcidb_config = {
     ),
     "OPTIONS": {
         "connect_timeout": int(os.getenv("DB_OPTIONS_CONNECT_TIMEOUT", "16")),
+        # Django turns psycopg's prepared statements off unless a threshold is set.
+        # Its cursors bind parameters on the client and are never prepared anyway.
+        "prepare_threshold": 5 if PREPARED_QUERIES_ENABLED else None,
     },
+    "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
 }
 
 cache_db_config = {
@@ -304,6 +352,31 @@ DATABASES = {
     "notifications": notifications_db_config,
 }
 
+# Read replicas of the default database, e.g. [{"HOST": "replica-1"}]. Each entry
+# overrides the settings of the default database and gets its own alias:
+# "replica", then "replica_2", "replica_3"...
+DATABASE_REPLICAS = []
+for index, replica_overrides in enumerate(get_json_env_var("DB_REPLICAS", [])):
+    replica_alias = "replica" if index == 0 else f"replica_{index + 1}"
+    DATABASES[replica_alias] = {
+        **kcidb_config,
+        "OPTIONS": {**kcidb_config["OPTIONS"]},
+        **replica_overrides,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(replica_alias)
+# URL names of the views whose reads go to the replicas, or ["*"] for all of them.
+# Only GET and HEAD requests are routed.
+REPLICA_VIEWS = get_json_env_var("DB_REPLICA_VIEWS", [])
+# Replicas further behind the primary are skipped until they catch up
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("DB_REPLICA_MAX_LAG_SECONDS", "30"))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_LAG_CHECK_INTERVAL", "5"))
+
+# psycopg connection pools per database alias, e.g. {"default": {"max_size": 8}}.
+# The options are the ones of psycopg_pool.ConnectionPool, `true` uses its defaults.
+DATABASE_POOLS = get_json_env_var("DB_POOLS", {})
+set_database_pools(DATABASES, DATABASE_POOLS)
+
 if DEBUG_DB_VARS:
     print("DEBUG: DATABASES:", DATABASES)
 
@@ -373,6 +446,19 @@ CORS_ALLOW_ALL_ORIGINS = is_boolean_or_string_true(
 
 CACHE_TIMEOUT = int(os.environ.get("CACHE_TIMEOUT", "180"))
 
+# Validation of the details responses against their models: "full" validates
+# all of them, "sampled" a RESPONSE_VALIDATION_SAMPLE_RATE fraction of them and
+# "off" none, sending the rows as the views built them.
+RESPONSE_VALIDATION = os.environ.get("RESPONSE_VALIDATION", "full")
+if RESPONSE_VALIDATION not in ("full", "sampled", "off"):
+    raise ImproperlyConfigured(
+        f"Invalid RESPONSE_VALIDATION {RESPONSE_VALIDATION!r},"
+        " expected 'full', 'sampled' or 'off'"
+    )
+RESPONSE_VALIDATION_SAMPLE_RATE = float(
+    os.environ.get("RESPONSE_VALIDATION_SAMPLE_RATE", "0.01")
+)
+
 if DEBUG:
     CORS_ALLOWED_ORIGIN_REGEXES = [
         r"^http://localhost",  # dashboard dev server
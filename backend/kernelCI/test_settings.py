@@ -17,15 +17,18 @@ DATABASES = {
         "PORT": os.environ.get("DB_PORT", "5432"),
         "OPTIONS": {
             "connect_timeout": 5,
+            "prepare_threshold": 5,
         },
     },
     "cache": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
+        "TEST": {"DEPENDENCIES": []},
     },
     "notifications": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": ":memory:",
+        "TEST": {"DEPENDENCIES": []},
     },
 }
 
@@ -59,6 +62,9 @@ CORS_ALLOW_ALL_ORIGINS = True
 # Shorter cache timeout for tests
 CACHE_TIMEOUT = 60
 
+# Always validate the responses against their models in tests
+RESPONSE_VALIDATION = "full"
+
 # Disable security features for tests
 SESSION_COOKIE_SECURE = False
 CSRF_COOKIE_SECURE = False
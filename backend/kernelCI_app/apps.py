@@ -11,6 +11,13 @@ class KernelciAppConfig(AppConfig):
 
     def ready(self) -> None:
         super().ready()
+
+        from django.db.backends.signals import connection_created
+
+        from kernelCI_app.helpers.databasePool import record_pool_stats
+
+        connection_created.connect(record_pool_stats)
+
         is_server = (
             os.path.basename(sys.argv[0]) == "gunicorn" or "runserver" in sys.argv
         )
@@ -1,5 +1,5 @@
 import json
-from typing import Optional
+from typing import Any, Optional, Sequence
 
 from django.conf import settings
 from django.core.cache import cache
@@ -21,6 +21,13 @@ def _create_cache_params_hash(params: dict) -> str:
     return stable_hash(params_string)
 
 
+def _create_cache_key(key, params: Optional[dict] = None) -> str:
+    if params is not None:
+        params_hash = _create_cache_params_hash(params)
+        return "%s-%s" % (key, params_hash)
+    return "%s" % key
+
+
 def set_query_cache(
     *,
     key,
@@ -31,11 +38,7 @@ def set_query_cache(
     test_id=None,
     timeout=timeout,
 ):
-    if params is not None:
-        params_hash = _create_cache_params_hash(params)
-        hash_key = "%s-%s" % (key, params_hash)
-    else:
-        hash_key = "%s" % key
+    hash_key = _create_cache_key(key, params)
 
     _add_to_lookup(hash_key, commit_hash, _commit_lookup)
     _add_to_lookup(hash_key, build_id, _build_lookup)
@@ -45,10 +48,26 @@ def set_query_cache(
 
 
 def get_query_cache(key, params: Optional[dict] = None):
-    if params is not None:
-        params_hash = _create_cache_params_hash(params)
-        return cache.get("%s-%s" % (key, params_hash))
-    return cache.get("%s" % key)
+    return cache.get(_create_cache_key(key, params))
+
+
+def get_query_cache_many(entries: Sequence[tuple[str, Optional[dict]]]) -> list:
+    """Reads several `(key, params)` entries with a single cache lookup.
+
+    Returns the cached rows in the same order as `entries`, None for the misses."""
+    hash_keys = [_create_cache_key(key, params) for key, params in entries]
+    cached = cache.get_many(hash_keys)
+    return [cached.get(hash_key) for hash_key in hash_keys]
+
+
+def set_query_cache_many(
+    entries: Sequence[tuple[str, Optional[dict], Any]], timeout=timeout
+) -> None:
+    """Writes several `(key, params, rows)` entries with a single cache call."""
+    cache.set_many(
+        {_create_cache_key(key, params): rows for key, params, rows in entries},
+        timeout,
+    )
 
 
 def set_notification_cache(*, notification: str) -> None:
@@ -6,6 +6,9 @@ UNCATEGORIZED_STRING = "Uncategorized"
 
 MAESTRO_DUMMY_BUILD_PREFIX = "maestro:dummy_"
 
+# Maximum number of builds or tests of a single batch lookup request
+BATCH_LOOKUP_MAX_IDS = 500
+
 SCHEMA_VERSION_ENV_NAME = "schema-version"
 SCHEMA_VERSION_ENV_FILE = "kernelCI/envconfig/schema-version.yaml"
 
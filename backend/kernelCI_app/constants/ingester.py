@@ -28,7 +28,15 @@ STORAGE_BASE_URL = os.environ.get(
 UPLOAD_URL = f"{STORAGE_BASE_URL}/upload"
 
 CACHE_LOGS_SIZE_LIMIT = int(os.environ.get("CACHE_LOGS_SIZE_LIMIT", 100000))
-"""Arbitrary limit for cache_logs size, adjust as needed. Default: 100000"""
+"""Max entries of the uploaded log excerpts index, the least recently used
+ones are pruned above it. Default: 100000"""
+
+try:
+    LOGEXCERPT_UPLOAD_WORKERS = int(os.environ.get("LOGEXCERPT_UPLOAD_WORKERS", "4"))
+except (ValueError, TypeError):
+    logger.warning("Invalid LOGEXCERPT_UPLOAD_WORKERS, using default 4")
+    LOGEXCERPT_UPLOAD_WORKERS = 4
+"""Concurrent log excerpt uploads of each ingester worker. Default: 4"""
 
 INGESTER_TREES_FILEPATH = f"/app/{TREE_NAMES_FILENAME}"
 
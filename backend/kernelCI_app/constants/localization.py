@@ -110,6 +110,15 @@ class DocStrings:
     ISSUE_DETAILS_VERSION_DESCRIPTION = "Issue version"
 
     ISSUE_EXTRA_ID_LIST_DESCRIPTION = "List of issue ids"
+    ISSUE_LISTING_LIMIT_DESCRIPTION = (
+        "Maximum number of issues to return, all issues are returned if not set"
+    )
+    ISSUE_LISTING_OFFSET_DESCRIPTION = "Number of issues to skip before the page"
+    BATCH_BUILD_IDS_DESCRIPTION = "List of build ids to look up"
+    BATCH_TEST_IDS_DESCRIPTION = "List of test ids to look up"
+    BATCH_INCLUDE_DESCRIPTION = (
+        "Payloads to return for each id, all of them are returned if not set"
+    )
 
     LOG_DOWNLOADER_URL_DESCRIPTION = "URL of the log to be downloaded"
 
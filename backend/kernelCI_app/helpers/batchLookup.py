@@ -0,0 +1,68 @@
+from collections import defaultdict
+from typing import Callable, NamedTuple
+
+from kernelCI_app.cache import get_query_cache_many, set_query_cache_many
+
+
+class BatchQuery(NamedTuple):
+    """A set-based query of a batch lookup.
+
+    `query` receives the list of ids and returns the rows of all of them,
+    `id_field` is the column of the rows that holds the id they belong to."""
+
+    query: Callable[[list[str]], list[dict]]
+    id_field: str
+
+
+def _batch_cache_key(name: str) -> str:
+    return f"batchLookup-{name}"
+
+
+def lookup_batch(
+    *, ids: list[str], queries: dict[str, BatchQuery]
+) -> dict[str, dict[str, list[dict]]]:
+    """Runs each query of `queries` for the list of ids.
+
+    The rows of each `(query name, id)` are cached on their own, so that batches
+    with different ids can reuse them. The cache entries of all queries are read
+    with a single multi-get and only the missing ids are queried.
+
+    Returns, for each query name, the rows of every id. Ids without rows
+    have an empty list."""
+    cache_entries = [
+        (_batch_cache_key(name), {"id": entity_id})
+        for name in queries
+        for entity_id in ids
+    ]
+    cached_rows = iter(get_query_cache_many(cache_entries))
+
+    result: dict[str, dict[str, list[dict]]] = {}
+    new_cache_entries = []
+    for name, batch_query in queries.items():
+        rows_by_id = {}
+        for entity_id in ids:
+            rows = next(cached_rows)
+            if rows is not None:
+                rows_by_id[entity_id] = rows
+
+        missing_ids = [entity_id for entity_id in ids if entity_id not in rows_by_id]
+        if missing_ids:
+            queried_rows: dict[str, list[dict]] = defaultdict(list)
+            for row in batch_query.query(missing_ids):
+                queried_rows[row[batch_query.id_field]].append(row)
+            for entity_id in missing_ids:
+                rows_by_id[entity_id] = queried_rows[entity_id]
+                new_cache_entries.append(
+                    (
+                        _batch_cache_key(name),
+                        {"id": entity_id},
+                        rows_by_id[entity_id],
+                    )
+                )
+
+        result[name] = rows_by_id
+
+    if new_cache_entries:
+        set_query_cache_many(new_cache_entries)
+
+    return result
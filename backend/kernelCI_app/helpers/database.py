@@ -8,11 +8,12 @@ def dict_fetchall(cursor) -> list[dict]:
     return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
 
 
-def debug_query(cursor, query, params) -> tuple[str, str]:
+def debug_query(cursor, query, params, *, analyze: bool = True) -> tuple[str, str]:
+    """Returns the query with its params and its plan. With `analyze` the query
+    is executed to get the actual timings, so only use it on read-only queries."""
     sql = cursor.mogrify(query, params)
-    profile = "\n".join(
-        row for row, *_ in cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {query}", params)
-    )
+    explain = "EXPLAIN (ANALYZE, BUFFERS)" if analyze else "EXPLAIN"
+    profile = "\n".join(row for row, *_ in cursor.execute(f"{explain} {query}", params))
     return (sql, profile)
 
 
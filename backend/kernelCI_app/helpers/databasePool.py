@@ -0,0 +1,56 @@
+from prometheus_client import Counter, Gauge
+
+POOL_REQUESTS_COUNTER = Counter(
+    "kernelci_db_pool_requests",
+    "Number of connections requested from the pool",
+    ["alias"],
+)
+POOL_WAIT_SECONDS_COUNTER = Counter(
+    "kernelci_db_pool_wait_seconds",
+    "Time spent waiting for a connection of the pool",
+    ["alias"],
+)
+POOL_ERRORS_COUNTER = Counter(
+    "kernelci_db_pool_request_errors",
+    "Number of connection requests that timed out or failed",
+    ["alias"],
+)
+POOL_CONNECTIONS_GAUGE = Gauge(
+    "kernelci_db_pool_connections",
+    "Connections of the pool, by state. The saturation is in_use / max",
+    ["alias", "state"],
+    multiprocess_mode="livesum",
+)
+POOL_WAITING_GAUGE = Gauge(
+    "kernelci_db_pool_requests_waiting",
+    "Number of requests waiting for a connection of the pool",
+    ["alias"],
+    multiprocess_mode="livesum",
+)
+
+
+def record_pool_stats(sender, connection, **kwargs) -> None:
+    """Exports the stats of a connection pool each time a connection is taken from it.
+
+    Connected to the `connection_created` signal, which is sent whenever Django
+    gets a connection, so the counters are collected as the pool is used."""
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return
+
+    alias = connection.alias
+    stats = pool.pop_stats()
+
+    POOL_REQUESTS_COUNTER.labels(alias=alias).inc(stats.get("requests_num", 0))
+    POOL_WAIT_SECONDS_COUNTER.labels(alias=alias).inc(
+        stats.get("requests_wait_ms", 0) / 1000
+    )
+    POOL_ERRORS_COUNTER.labels(alias=alias).inc(stats.get("requests_errors", 0))
+
+    in_use = stats["pool_size"] - stats["pool_available"]
+    POOL_CONNECTIONS_GAUGE.labels(alias=alias, state="in_use").set(in_use)
+    POOL_CONNECTIONS_GAUGE.labels(alias=alias, state="idle").set(
+        stats["pool_available"]
+    )
+    POOL_CONNECTIONS_GAUGE.labels(alias=alias, state="max").set(stats["pool_max"])
+    POOL_WAITING_GAUGE.labels(alias=alias).set(stats.get("requests_waiting", 0))
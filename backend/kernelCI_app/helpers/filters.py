@@ -1,5 +1,6 @@
 import re
 from collections.abc import Callable
+from functools import cached_property
 from typing import Any, Dict, List, Literal, Optional, Tuple, TypedDict, Union
 
 from django.http import HttpRequest, HttpResponseBadRequest
@@ -269,6 +270,17 @@ def to_int_or_default(value, default):
     return default
 
 
+def is_duration_filtered_out(
+    duration: Optional[int], duration_min: Optional[int], duration_max: Optional[int]
+) -> bool:
+    if duration is None:
+        return True
+    duration = to_int_or_default(duration, 0)
+    return (duration_max is not None and duration > duration_max) or (
+        duration_min is not None and duration < duration_min
+    )
+
+
 type FilterFields = Literal[
     "boot.status",
     "boot.duration",
@@ -293,6 +305,11 @@ type FilterFields = Literal[
     "issue.options",
 ]
 type FilterHandlers = dict[FilterFields, Callable]
+type FilterPredicate = Callable[..., bool]
+
+
+def _never_filtered_out(**_kwargs) -> bool:
+    return False
 
 
 class InvalidComparisonOPError(
@@ -619,6 +636,184 @@ class FilterParams:
 
         return grouped_filters
 
+    def compile_build_predicate(self) -> FilterPredicate:
+        """Returns a predicate telling if a build is filtered out, with the
+        signature of `is_build_filtered_out`, that only checks the filters
+        that are currently set."""
+        statuses = self.filterBuildStatus
+        duration_min = self.filterBuildDurationMin
+        duration_max = self.filterBuildDurationMax
+        origins = self.filter_build_origin
+        issue_filters = self.filterIssues["build"]
+
+        has_duration_filter = duration_min is not None or duration_max is not None
+        if not (statuses or has_duration_filter or origins or issue_filters):
+            return _never_filtered_out
+
+        def is_build_filtered_out(
+            *,
+            duration: Optional[int],
+            build_status: StatusValues,
+            issue_id: Optional[str],
+            issue_version: Optional[int],
+            incident_test_id: Optional[str],
+            build_origin: Optional[str] = None,
+        ) -> bool:
+            if statuses and build_status.upper() not in statuses:
+                return True
+            if has_duration_filter and is_duration_filtered_out(
+                duration, duration_min, duration_max
+            ):
+                return True
+            if origins and build_origin not in origins:
+                return True
+            return bool(issue_filters) and should_filter_build_issue(
+                issue_filters=issue_filters,
+                issue_id=issue_id,
+                issue_version=issue_version,
+                incident_test_id=incident_test_id,
+                build_status=build_status,
+            )
+
+        return is_build_filtered_out
+
+    def compile_record_predicate(self) -> FilterPredicate:
+        """Returns a predicate telling if a record is filtered out by its build
+        or environment, with the signature of `is_record_filtered_out`, that
+        only checks the filters that are currently set."""
+        hardwares_filter = self.filterHardware
+        architectures = self.filterArchitecture
+        compilers = self.filterCompiler
+        configs = self.filterConfigs
+        labs = self.filter_labs
+
+        if not (hardwares_filter or architectures or compilers or configs or labs):
+            return _never_filtered_out
+
+        def is_record_filtered_out(
+            *,
+            hardwares: Optional[List[str]] = None,
+            architecture: Optional[str],
+            compiler: Optional[str],
+            config_name: Optional[str],
+            lab: Optional[str] = UNKNOWN_STRING,
+        ) -> bool:
+            if hardwares_filter and hardwares_filter.isdisjoint(
+                [UNKNOWN_STRING] if hardwares is None else hardwares
+            ):
+                return True
+            if (
+                architectures
+                and (UNKNOWN_STRING if architecture is None else architecture)
+                not in architectures
+            ):
+                return True
+            if (
+                compilers
+                and (UNKNOWN_STRING if compiler is None else compiler) not in compilers
+            ):
+                return True
+            if (
+                configs
+                and (UNKNOWN_STRING if config_name is None else config_name)
+                not in configs
+            ):
+                return True
+            return bool(labs) and (UNKNOWN_STRING if lab is None else lab) not in labs
+
+        return is_record_filtered_out
+
+    def _compile_test_predicate(self, tab: Literal["boot", "test"]) -> FilterPredicate:
+        if tab == "boot":
+            path_filter = self.filterBootPath
+            statuses = self.filterBootStatus
+            duration_min = self.filterBootDurationMin
+            duration_max = self.filterBootDurationMax
+            origins = self.filter_boot_origin
+        else:
+            path_filter = self.filterTestPath
+            statuses = self.filterTestStatus
+            duration_min = self.filterTestDurationMin
+            duration_max = self.filterTestDurationMax
+            origins = self.filter_test_origin
+        issue_filters = self.filterIssues[tab]
+        platforms = self.filterPlatforms[tab]
+
+        has_duration_filter = duration_min is not None or duration_max is not None
+        if not (
+            path_filter
+            or statuses
+            or has_duration_filter
+            or issue_filters
+            or platforms
+            or origins
+        ):
+            return _never_filtered_out
+
+        def is_test_filtered_out(
+            *,
+            path: Optional[str],
+            status: Optional[str],
+            duration: Optional[int],
+            issue_id: Optional[str] = None,
+            issue_version: Optional[int] = None,
+            incident_test_id: Optional[str] = "incident_test_id",
+            platform: Optional[str] = None,
+            origin: Optional[str] = None,
+        ) -> bool:
+            if path_filter and path_filter not in path:
+                return True
+            if statuses and status not in statuses:
+                return True
+            if has_duration_filter and is_duration_filtered_out(
+                duration, duration_min, duration_max
+            ):
+                return True
+            if issue_filters and should_filter_test_issue(
+                issue_filters=issue_filters,
+                issue_id=issue_id,
+                issue_version=issue_version,
+                incident_test_id=incident_test_id,
+            ):
+                return True
+            if platforms and platform not in platforms:
+                return True
+            return bool(origins) and origin not in origins
+
+        return is_test_filtered_out
+
+    def compile_boot_predicate(self) -> FilterPredicate:
+        """Returns a predicate telling if a boot is filtered out, with the
+        signature of `is_boot_filtered_out`, that only checks the filters
+        that are currently set."""
+        return self._compile_test_predicate("boot")
+
+    def compile_test_predicate(self) -> FilterPredicate:
+        """Returns a predicate telling if a test is filtered out, with the
+        signature of `is_test_filtered_out`, that only checks the filters
+        that are currently set."""
+        return self._compile_test_predicate("test")
+
+    # The filters of a request are set when it is parsed, so the views
+    # compile each predicate once and call it for every row.
+    # Changes to the filter attributes after the first call aren't seen.
+
+    @cached_property
+    def build_predicate(self) -> FilterPredicate:
+        return self.compile_build_predicate()
+
+    @cached_property
+    def record_predicate(self) -> FilterPredicate:
+        return self.compile_record_predicate()
+
+    @cached_property
+    def boot_predicate(self) -> FilterPredicate:
+        return self.compile_boot_predicate()
+
+    @cached_property
+    def test_predicate(self) -> FilterPredicate:
+        return self.compile_test_predicate()
+
     def is_build_filtered_out(
         self,
         *,
@@ -629,39 +824,13 @@ class FilterParams:
         incident_test_id: Optional[str],
         build_origin: Optional[str] = None,
     ) -> bool:
-        return (
-            (
-                len(self.filterBuildStatus) > 0
-                and (build_status.upper() not in self.filterBuildStatus)
-            )
-            or (
-                (
-                    self.filterBuildDurationMax is not None
-                    or self.filterBuildDurationMin is not None
-                )
-                and duration is None
-            )
-            or (
-                self.filterBuildDurationMax is not None
-                and (to_int_or_default(duration, 0) > self.filterBuildDurationMax)
-            )
-            or (
-                self.filterBuildDurationMin is not None
-                and (to_int_or_default(duration, 0) < self.filterBuildDurationMin)
-            )
-            or (
-                len(self.filter_build_origin) > 0
-                and (build_origin not in self.filter_build_origin)
-            )
-            or (
-                should_filter_build_issue(
-                    issue_filters=self.filterIssues["build"],
-                    issue_id=issue_id,
-                    issue_version=issue_version,
-                    incident_test_id=incident_test_id,
-                    build_status=build_status,
-                )
-            )
+        return self.compile_build_predicate()(
+            duration=duration,
+            build_status=build_status,
+            issue_id=issue_id,
+            issue_version=issue_version,
+            incident_test_id=incident_test_id,
+            build_origin=build_origin,
         )
 
     def is_record_filtered_out(
@@ -673,43 +842,13 @@ class FilterParams:
         config_name: Optional[str],
         lab: Optional[str] = UNKNOWN_STRING,
     ) -> bool:
-        hardware_compatibles = [UNKNOWN_STRING]
-        record_architecture = UNKNOWN_STRING
-        record_compiler = UNKNOWN_STRING
-        record_config_name = UNKNOWN_STRING
-        record_lab = UNKNOWN_STRING if lab is None else lab
-
-        if hardwares is not None:
-            hardware_compatibles = hardwares
-        if architecture is not None:
-            record_architecture = architecture
-        if compiler is not None:
-            record_compiler = compiler
-        if config_name is not None:
-            record_config_name = config_name
-
-        if (
-            (
-                len(self.filterHardware) > 0
-                and (not self.filterHardware.intersection(hardware_compatibles))
-            )
-            or (
-                len(self.filterArchitecture) > 0
-                and (record_architecture not in self.filterArchitecture)
-            )
-            or (
-                len(self.filterCompiler) > 0
-                and (record_compiler not in self.filterCompiler)
-            )
-            or (
-                len(self.filterConfigs) > 0
-                and (record_config_name not in self.filterConfigs)
-            )
-            or (len(self.filter_labs) > 0 and (record_lab not in self.filter_labs))
-        ):
-            return True
-
-        return False
+        return self.compile_record_predicate()(
+            hardwares=hardwares,
+            architecture=architecture,
+            compiler=compiler,
+            config_name=config_name,
+            lab=lab,
+        )
 
     def is_boot_filtered_out(
         self,
@@ -723,44 +862,16 @@ class FilterParams:
         platform: Optional[str] = None,
         origin: Optional[str] = None,
     ) -> bool:
-        if (
-            (self.filterBootPath != "" and (self.filterBootPath not in path))
-            or (
-                len(self.filterBootStatus) > 0 and (status not in self.filterBootStatus)
-            )
-            or (
-                (
-                    self.filterBootDurationMax is not None
-                    or self.filterBootDurationMin is not None
-                )
-                and duration is None
-            )
-            or (
-                self.filterBootDurationMax is not None
-                and (to_int_or_default(duration, 0) > self.filterBootDurationMax)
-            )
-            or (
-                self.filterBootDurationMin is not None
-                and (to_int_or_default(duration, 0) < self.filterBootDurationMin)
-            )
-            or should_filter_test_issue(
-                issue_filters=self.filterIssues["boot"],
-                issue_id=issue_id,
-                issue_version=issue_version,
-                incident_test_id=incident_test_id,
-            )
-            or (
-                len(self.filterPlatforms["boot"]) > 0
-                and (platform not in self.filterPlatforms["boot"])
-            )
-            or (
-                len(self.filter_boot_origin) > 0
-                and (origin not in self.filter_boot_origin)
-            )
-        ):
-            return True
-
-        return False
+        return self.compile_boot_predicate()(
+            path=path,
+            status=status,
+            duration=duration,
+            issue_id=issue_id,
+            issue_version=issue_version,
+            incident_test_id=incident_test_id,
+            platform=platform,
+            origin=origin,
+        )
 
     def is_test_filtered_out(
         self,
@@ -774,41 +885,13 @@ class FilterParams:
         platform: Optional[str] = None,
         origin: Optional[str] = None,
     ) -> bool:
-        if (
-            (self.filterTestPath != "" and (self.filterTestPath not in path))
-            or (
-                len(self.filterTestStatus) > 0 and (status not in self.filterTestStatus)
-            )
-            or (
-                (
-                    self.filterTestDurationMax is not None
-                    or self.filterTestDurationMin is not None
-                )
-                and duration is None
-            )
-            or (
-                self.filterTestDurationMax is not None
-                and (to_int_or_default(duration, 0) > self.filterTestDurationMax)
-            )
-            or (
-                self.filterTestDurationMin is not None
-                and (to_int_or_default(duration, 0) < self.filterTestDurationMin)
-            )
-            or should_filter_test_issue(
-                issue_filters=self.filterIssues["test"],
-                issue_id=issue_id,
-                issue_version=issue_version,
-                incident_test_id=incident_test_id,
-            )
-            or (
-                len(self.filterPlatforms["test"]) > 0
-                and (platform not in self.filterPlatforms["test"])
-            )
-            or (
-                len(self.filter_test_origin) > 0
-                and (origin not in self.filter_test_origin)
-            )
-        ):
-            return True
-
-        return False
+        return self.compile_test_predicate()(
+            path=path,
+            status=status,
+            duration=duration,
+            issue_id=issue_id,
+            issue_version=issue_version,
+            incident_test_id=incident_test_id,
+            platform=platform,
+            origin=origin,
+        )
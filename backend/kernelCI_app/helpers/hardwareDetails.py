@@ -582,7 +582,7 @@ def decide_if_is_full_record_filtered_out(
     misc = sanitize_dict(record.get("misc")) or {}
     lab = misc.get("runtime", UNKNOWN_STRING)
 
-    is_record_filtered_out_result = instance.filters.is_record_filtered_out(
+    is_record_filtered_out_result = instance.filters.record_predicate(
         hardwares=record["environment_compatible"],
         architecture=record["build__architecture"],
         compiler=record["build__compiler"],
@@ -602,7 +602,7 @@ def decide_if_is_build_in_filter(
 ) -> bool:
     is_build_not_processed = build.id not in processed_builds
     is_build_dummy = build.id.startswith(MAESTRO_DUMMY_BUILD_PREFIX)
-    is_build_filtered_out_result = instance.filters.is_build_filtered_out(
+    is_build_filtered_out_result = instance.filters.build_predicate(
         build_status=build.status,
         duration=build.duration,
         issue_id=build.issue_id,
@@ -656,7 +656,7 @@ def decide_if_is_test_in_filter(
     )
 
     if test_type == "boot":
-        test_filter_pass = not instance.filters.is_boot_filtered_out(
+        test_filter_pass = not instance.filters.boot_predicate(
             status=status,
             duration=duration,
             path=path,
@@ -667,7 +667,7 @@ def decide_if_is_test_in_filter(
             origin=origin,
         )
     else:
-        test_filter_pass = not instance.filters.is_test_filtered_out(
+        test_filter_pass = not instance.filters.test_predicate(
             status=status,
             duration=duration,
             path=path,
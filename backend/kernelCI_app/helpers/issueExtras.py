@@ -1,11 +1,13 @@
 from collections import defaultdict
 from typing import List, Optional, Tuple
 
+from kernelCI_app.cache import get_query_cache_many, set_query_cache_many
 from kernelCI_app.constants.general import UNCATEGORIZED_STRING
 from kernelCI_app.helpers.logger import log_message
 from kernelCI_app.queries.issues import (
     get_issue_first_seen_data,
     get_issue_last_seen_data,
+    get_issue_seen_summary_data,
     get_issue_trees_data,
 )
 from kernelCI_app.typeModels.issues import (
@@ -16,6 +18,8 @@ from kernelCI_app.typeModels.issues import (
     TreeSetItem,
 )
 
+ISSUE_EXTRAS_CACHE_KEY = "issueExtras"
+
 
 class TagUrls:
     MAINLINE_URL = "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git"
@@ -46,24 +50,211 @@ def _incident_from_record(record: dict) -> Incident:
     )
 
 
+def _incident_from_summary_record(record: dict, prefix: str) -> Incident:
+    return Incident(
+        first_seen=record[f"{prefix}_seen"],
+        git_commit_hash=record[f"{prefix}_git_commit_hash"],
+        git_repository_url=record[f"{prefix}_git_repository_url"],
+        git_repository_branch=record[f"{prefix}_git_repository_branch"],
+        git_commit_name=record[f"{prefix}_git_commit_name"],
+        tree_name=record[f"{prefix}_tree_name"],
+        issue_version=record["issue_version"],
+        checkout_id=record[f"{prefix}_checkout_id"],
+    )
+
+
+def _add_issue_tree(
+    *,
+    detailed_issue: IssueWithExtraInfo,
+    tree_name: Optional[str],
+    git_repository_url: Optional[str],
+    git_repository_branch: Optional[str],
+) -> None:
+    if tree_name is not None and git_repository_branch is not None:
+        detailed_issue.trees.append(
+            TreeSetItem(
+                tree_name=tree_name,
+                git_repository_branch=git_repository_branch,
+            )
+        )
+
+    match (git_repository_url, git_repository_branch):
+        case (TagUrls.MAINLINE_URL, "master"):
+            detailed_issue.tags.add("mainline")
+        case (TagUrls.STABLE_URL, branch) if branch is not None:
+            detailed_issue.tags.add("stable")
+        case (TagUrls.LINUX_NEXT_URL, "master" | "pending-fixes"):
+            detailed_issue.tags.add("linux-next")
+
+
 def process_issues_extra_details(
     *,
     issue_key_list: List[Tuple[str, int]],
     processed_issues_table: ProcessedExtraDetailedIssues,
 ) -> None:
+    """
+    Assigns the first/last incidents and the trees of a list of issues
+    to the processed_issues_table.
+
+    Each `(issue_id, issue_version)` is cached on its own, so that different
+    issue listings can reuse it, and only the missing ones are queried.
+    """
     if len(issue_key_list) == 0:
         return
 
-    # TODO: combine both queries into one
-    assign_issue_incidents(
-        issue_key_list=issue_key_list,
-        processed_issues_table=processed_issues_table,
+    cached_extras_list = get_query_cache_many(
+        [
+            (
+                ISSUE_EXTRAS_CACHE_KEY,
+                {"issue_id": issue_id, "issue_version": issue_version},
+            )
+            for issue_id, issue_version in issue_key_list
+        ]
     )
-    assign_issue_trees(
-        issue_key_list=issue_key_list,
-        processed_issues_table=processed_issues_table,
+
+    uncached_keys: list[tuple[str, int]] = []
+    for (issue_id, issue_version), cached_extras in zip(
+        issue_key_list, cached_extras_list, strict=True
+    ):
+        if cached_extras is None:
+            uncached_keys.append((issue_id, issue_version))
+            continue
+        _assign_cached_issue_extras(
+            issue_id=issue_id,
+            issue_version=issue_version,
+            cached_extras=cached_extras,
+            processed_issues_table=processed_issues_table,
+        )
+
+    if not uncached_keys:
+        return
+
+    queried_issues_table: ProcessedExtraDetailedIssues = {}
+    assign_issue_seen_summary(
+        issue_key_list=uncached_keys,
+        processed_issues_table=queried_issues_table,
     )
 
+    cache_entries = []
+    for issue_id, issue_version in uncached_keys:
+        issue_extras = queried_issues_table.get(issue_id)
+        # An empty dict marks an issue without incidents, since None is a cache miss
+        cached_extras = (
+            {
+                "first_incident": issue_extras.first_incident,
+                "last_incident": issue_extras.last_incident,
+                "version": issue_extras.versions.get(issue_version),
+            }
+            if issue_extras is not None
+            else {}
+        )
+        cache_entries.append(
+            (
+                ISSUE_EXTRAS_CACHE_KEY,
+                {"issue_id": issue_id, "issue_version": issue_version},
+                cached_extras,
+            )
+        )
+        _assign_cached_issue_extras(
+            issue_id=issue_id,
+            issue_version=issue_version,
+            cached_extras=cached_extras,
+            processed_issues_table=processed_issues_table,
+        )
+    set_query_cache_many(cache_entries)
+
+
+def _assign_cached_issue_extras(
+    *,
+    issue_id: str,
+    issue_version: int,
+    cached_extras: dict,
+    processed_issues_table: ProcessedExtraDetailedIssues,
+) -> None:
+    if not cached_extras:
+        return
+
+    processed_issue_from_id = processed_issues_table.setdefault(
+        issue_id,
+        ExtraIssuesData(
+            first_incident=cached_extras["first_incident"],
+            last_incident=cached_extras["last_incident"],
+            versions={},
+        ),
+    )
+    processed_issue_from_id.versions[issue_version] = cached_extras["version"]
+
+
+def assign_issue_seen_summary(
+    *,
+    issue_key_list: List[Tuple[str, int]],
+    processed_issues_table: ProcessedExtraDetailedIssues,
+) -> None:
+    """
+    Assigns first/last seen data and trees to the processed_issues_table
+    with a single query on the issue_seen_summary tables.
+
+    Follows the same rules as `assign_issue_incidents` and `assign_issue_trees`:
+    issues without incidents are left out, requested versions that don't exist
+    are set to None and existing versions without incidents have no trees.
+    """
+    versions_per_issue: dict[str, set[int]] = defaultdict(set)
+    for issue_id, issue_version in issue_key_list:
+        versions_per_issue[issue_id].add(issue_version)
+
+    records = get_issue_seen_summary_data(issue_id_list=list(versions_per_issue))
+
+    # Records are ordered by version, so the first incident comes from the
+    # lowest version with incidents and the last one from the highest
+    first_incident_records: dict[str, dict] = {}
+    last_incident_records: dict[str, dict] = {}
+    for record in records:
+        if record["first_incident_id"] is None:
+            continue
+        first_incident_records.setdefault(record["issue_id"], record)
+        last_incident_records[record["issue_id"]] = record
+
+    for issue_id, first_record in first_incident_records.items():
+        processed_issue_from_id = processed_issues_table.setdefault(
+            issue_id,
+            ExtraIssuesData(
+                first_incident=_incident_from_summary_record(first_record, "first"),
+                last_incident=_incident_from_summary_record(
+                    last_incident_records[issue_id], "last"
+                ),
+                versions={},
+            ),
+        )
+        for version in versions_per_issue[issue_id]:
+            processed_issue_from_id.versions.setdefault(version, None)
+
+    for record in records:
+        issue_id = record["issue_id"]
+        issue_version = record["issue_version"]
+
+        processed_issue_from_id = processed_issues_table.get(issue_id)
+        if (
+            processed_issue_from_id is None
+            or not record["issue_exists"]
+            or issue_version not in versions_per_issue[issue_id]
+        ):
+            continue
+
+        issue_versions_map = processed_issue_from_id.versions
+        current_detailed_issue = issue_versions_map.get(issue_version)
+        if current_detailed_issue is None:
+            current_detailed_issue = IssueWithExtraInfo(
+                id=issue_id, version=issue_version
+            )
+            issue_versions_map[issue_version] = current_detailed_issue
+
+        _add_issue_tree(
+            detailed_issue=current_detailed_issue,
+            tree_name=record["tree_name"],
+            git_repository_url=record["git_repository_url"],
+            git_repository_branch=record["git_repository_branch"],
+        )
+
 
 def assign_issue_incidents(
     *,
@@ -139,18 +330,9 @@ def assign_issue_trees(
             )
             current_detailed_issue = issue_versions_map[issue_version]
 
-        if tree_name is not None and git_repository_branch is not None:
-            current_detailed_issue.trees.append(
-                TreeSetItem(
-                    tree_name=record["tree_name"],
-                    git_repository_branch=git_repository_branch,
-                )
-            )
-
-        match (git_repository_url, git_repository_branch):
-            case (TagUrls.MAINLINE_URL, "master"):
-                current_detailed_issue.tags.add("mainline")
-            case (TagUrls.STABLE_URL, branch) if branch is not None:
-                current_detailed_issue.tags.add("stable")
-            case (TagUrls.LINUX_NEXT_URL, "master" | "pending-fixes"):
-                current_detailed_issue.tags.add("linux-next")
+        _add_issue_tree(
+            detailed_issue=current_detailed_issue,
+            tree_name=tree_name,
+            git_repository_url=git_repository_url,
+            git_repository_branch=git_repository_branch,
+        )
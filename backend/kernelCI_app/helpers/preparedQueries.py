@@ -0,0 +1,201 @@
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator, Literal, Optional, get_args
+from weakref import WeakKeyDictionary
+
+import psycopg
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, transaction
+from prometheus_client import Histogram
+
+from kernelCI_app.helpers.queryProfiling import (
+    ROWS_BUCKETS,
+    profiled_query,
+    record_query,
+)
+from kernelCI_app.routers.replicas import get_read_database
+
+type PlanCacheMode = Literal["auto", "force_generic_plan", "force_custom_plan"]
+
+PLAN_CACHE_MODES: tuple[str, ...] = get_args(PlanCacheMode.__value__)
+DEFAULT_PLAN_CACHE_MODE: PlanCacheMode = "auto"
+
+REGISTERED_QUERY_DURATION = Histogram(
+    "kernelci_registered_query_duration_seconds",
+    "Duration of the registered queries. The 'prepare' phase also parses and plans"
+    " the statement, 'prepared' reuses a statement prepared on that connection"
+    " and 'unprepared' is used when prepared statements are disabled. 'fetch' is"
+    " the time spent fetching the rows of the query",
+    ["query", "phase"],
+)
+REGISTERED_QUERY_ROWS = Histogram(
+    "kernelci_registered_query_rows",
+    "Number of rows returned by the registered queries",
+    ["query"],
+    buckets=ROWS_BUCKETS,
+)
+
+REGISTERED_QUERIES: dict[str, str] = {}
+"""Name and description of every hot query that goes through `registered_cursor`"""
+
+# Query texts prepared on each psycopg connection, least recently used first
+_prepared_texts: WeakKeyDictionary[psycopg.Connection, OrderedDict[str, None]] = (
+    WeakKeyDictionary()
+)
+
+
+def _add_prepared_text(pg_connection: psycopg.Connection, query: str) -> None:
+    """Marks `query` as the most recently prepared text of the connection.
+
+    psycopg deallocates the least recently used statements beyond the
+    `prepared_max` of the connection, so the oldest texts are dropped as well."""
+    prepared_texts = _prepared_texts.setdefault(pg_connection, OrderedDict())
+    prepared_texts[query] = None
+    prepared_texts.move_to_end(query)
+
+    prepared_max = pg_connection.prepared_max
+    if prepared_max is not None:
+        while len(prepared_texts) > prepared_max:
+            prepared_texts.popitem(last=False)
+
+
+def register_query(name: str, description: str) -> str:
+    """Adds a query to the registry and returns its name.
+
+    The name is what identifies the query in the metrics and in the
+    `DB_PREPARED_QUERIES_PLAN_CACHE_MODES` setting."""
+    if name in REGISTERED_QUERIES:
+        raise ValueError(f"Query {name!r} is already registered")
+
+    REGISTERED_QUERIES[name] = description
+    return name
+
+
+def get_plan_cache_mode(name: str) -> PlanCacheMode:
+    """Returns the plan_cache_mode pinned for a query in the settings"""
+    mode = settings.PREPARED_QUERIES_PLAN_CACHE_MODES.get(name, DEFAULT_PLAN_CACHE_MODE)
+    if mode not in PLAN_CACHE_MODES:
+        raise ImproperlyConfigured(
+            f"Invalid plan_cache_mode {mode!r} for query {name!r},"
+            f" expected one of {', '.join(PLAN_CACHE_MODES)}"
+        )
+    return mode
+
+
+class RegisteredQueryCursor:
+    """Cursor of a registered query, everything but `execute` is delegated to
+    the underlying database cursor."""
+
+    def __init__(self, *, name: str, cursor: Any, using: str, prepare: bool) -> None:
+        self.name = name
+        self._cursor = cursor
+        self._using = using
+        self._prepare = prepare
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._cursor, attr)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def fetchall(self) -> list[Any]:
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._observe(phase="fetch", start=start)
+        return rows
+
+    def execute(self, query: str, params: Optional[Any] = None) -> None:
+        if not self._prepare:
+            start = time.perf_counter()
+            # Profiled by the execute wrappers of the Django cursor
+            with profiled_query(self.name):
+                self._cursor.execute(query, params)
+            self._observe(phase="unprepared", start=start)
+            self._observe_rows()
+            return
+
+        prepared_texts = _prepared_texts.get(self._cursor.connection, {})
+        phase = "prepared" if query in prepared_texts else "prepare"
+        plan_cache_mode = get_plan_cache_mode(self.name)
+
+        start = time.perf_counter()
+        with connections[self._using].wrap_database_errors:
+            if plan_cache_mode == DEFAULT_PLAN_CACHE_MODE:
+                self._cursor.execute(query, params, prepare=True)
+            else:
+                # A transaction-local setting can't leak to other queries of the
+                # connection, and it is restored for the rest of an outer transaction
+                pg_connection = self._cursor.connection
+                with transaction.atomic(using=self._using, savepoint=False):
+                    (previous_mode,) = pg_connection.execute(
+                        "SELECT current_setting('plan_cache_mode')"
+                    ).fetchone()
+                    pg_connection.execute(
+                        "SELECT set_config('plan_cache_mode', %s, true)",
+                        [plan_cache_mode],
+                    )
+                    self._cursor.execute(query, params, prepare=True)
+                    pg_connection.execute(
+                        "SELECT set_config('plan_cache_mode', %s, true)",
+                        [previous_mode],
+                    )
+        duration = self._observe(phase=phase, start=start)
+        self._observe_rows()
+        _add_prepared_text(self._cursor.connection, query)
+
+        # Prepared statements skip the execute wrappers of Django's cursors
+        with profiled_query(self.name):
+            record_query(
+                sql=query,
+                params=params,
+                using=self._using,
+                duration=duration,
+                rows=self._cursor.rowcount,
+            )
+
+    def _observe(self, *, phase: str, start: float) -> float:
+        duration = time.perf_counter() - start
+        REGISTERED_QUERY_DURATION.labels(query=self.name, phase=phase).observe(duration)
+        return duration
+
+    def _observe_rows(self) -> None:
+        if self._cursor.rowcount >= 0:
+            REGISTERED_QUERY_ROWS.labels(query=self.name).observe(self._cursor.rowcount)
+
+
+@contextmanager
+def registered_cursor(
+    name: str, *, using: Optional[str] = None
+) -> Iterator[RegisteredQueryCursor]:
+    """Opens a cursor to run the registered query `name`.
+
+    When `PREPARED_QUERIES_ENABLED` is set the query is executed as a psycopg
+    server-side prepared statement, which Postgres parses and plans once per
+    connection instead of on every call. Queries built with f-strings prepare
+    one statement for each distinct text. Since the parameters are bound on
+    the server, `IN %s` tuple expansion can't be used, use `= ANY(%s)` instead.
+
+    Prepared statements live in the database session, so they don't work
+    behind a pooler in transaction mode; disable them in that case."""
+    if name not in REGISTERED_QUERIES:
+        raise ValueError(f"Query {name!r} is not registered")
+
+    using = using or get_read_database()
+    db_connection = connections[using]
+    prepare = settings.PREPARED_QUERIES_ENABLED and db_connection.vendor == "postgresql"
+
+    with db_connection.cursor() as cursor:
+        # psycopg never prepares on connections without a prepare_threshold
+        if not prepare or cursor.cursor.connection.prepare_threshold is None:
+            yield RegisteredQueryCursor(
+                name=name, cursor=cursor, using=using, prepare=False
+            )
+            return
+
+        # Django's cursors bind the parameters on the client, which can't be prepared
+        with psycopg.Cursor(cursor.cursor.connection) as server_cursor:
+            yield RegisteredQueryCursor(
+                name=name, cursor=server_cursor, using=using, prepare=True
+            )
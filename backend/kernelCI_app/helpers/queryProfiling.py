@@ -0,0 +1,196 @@
+import random
+import re
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+import psycopg
+from django.conf import settings
+from django.db import connections
+from prometheus_client import Histogram
+
+from kernelCI_app.helpers.database import debug_query
+from kernelCI_app.helpers.logger import log_message
+from kernelCI_app.typeModels.queryPlans import QueryPlan
+
+ROWS_BUCKETS = (0, 10, 100, 1_000, 10_000, 100_000, 1_000_000, float("inf"))
+
+VIEW_DURATION = Histogram(
+    "kernelci_view_duration_seconds",
+    "Duration of the requests of each view by phase: 'database' runs the queries,"
+    " 'processing' is the rest of the view and 'rendering' serializes the response",
+    ["view", "phase"],
+)
+VIEW_ROWS = Histogram(
+    "kernelci_view_rows",
+    "Number of rows returned by the queries of each request of a view",
+    ["view"],
+    buckets=ROWS_BUCKETS,
+)
+
+_READ_ONLY_QUERY = re.compile(
+    r"^(?:\s+|--[^\n]*|/\*.*?\*/)*(?:select|with)\b", re.I | re.S
+)
+_WRITE_KEYWORD = re.compile(r"\b(?:insert|update|delete|merge|into)\b", re.I)
+
+QUERY_PLANS: deque[QueryPlan] = deque(maxlen=settings.QUERY_PLANS_BUFFER_SIZE)
+"""Last plans captured by this process, see `capture_query_plan`"""
+
+
+@dataclass
+class RequestProfile:
+    """Time spent by a request in each phase of its view"""
+
+    view_start: Optional[float] = None
+    view_end: Optional[float] = None
+    render_end: Optional[float] = None
+    database_seconds: float = 0.0
+    rows: int = 0
+
+
+_request_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+_query_name: ContextVar[Optional[str]] = ContextVar("query_name", default=None)
+
+
+def get_request_profile() -> Optional[RequestProfile]:
+    return _request_profile.get()
+
+
+def _should_capture_query_plan(duration: float) -> bool:
+    sample_rate = settings.QUERY_PLANS_SAMPLE_RATE
+    return (
+        sample_rate > 0
+        and duration >= settings.QUERY_PLANS_SLOW_QUERY_SECONDS
+        and random.random() < sample_rate  # noqa: S311
+    )
+
+
+def is_read_only_query(sql: str) -> bool:
+    """Whether `sql` is a SELECT, or a WITH ... SELECT, that doesn't write any
+    row. Queries that mention a write, even in a string, aren't read-only."""
+    return bool(_READ_ONLY_QUERY.match(sql)) and not _WRITE_KEYWORD.search(sql)
+
+
+def capture_query_plan(
+    *, sql: str, params: Any, using: str, duration: float, name: Optional[str]
+) -> None:
+    """Runs the query again with EXPLAIN (ANALYZE, BUFFERS) and keeps its plan
+    in QUERY_PLANS. Queries that aren't read-only only get a plain EXPLAIN, which
+    doesn't execute them.
+
+    The plan is only captured on PostgreSQL and out of transactions, so that
+    an error of the EXPLAIN can't abort the transaction of the request."""
+    db_connection = connections[using]
+    if db_connection.vendor != "postgresql" or db_connection.in_atomic_block:
+        return
+
+    try:
+        # The raw cursor skips the execute wrappers, which would profile the EXPLAIN
+        with db_connection.connection.cursor() as cursor:
+            mogrified_sql, plan = debug_query(
+                cursor, sql, params, analyze=is_read_only_query(sql)
+            )
+    except psycopg.Error as e:
+        log_message(f"Error capturing the plan of a slow query: {e}")
+        return
+
+    QUERY_PLANS.append(
+        QueryPlan(
+            captured_at=datetime.now(timezone.utc),
+            query=name,
+            database=using,
+            duration=duration,
+            sql=mogrified_sql,
+            plan=plan,
+        )
+    )
+
+
+def record_query(
+    *, sql: str, params: Any, using: str, duration: float, rows: int
+) -> None:
+    """Adds a query to the profile of the current request and captures its plan
+    when it is slow and sampled.
+
+    Registered queries are identified by their name, see `profiled_query`."""
+    profile = _request_profile.get()
+    if profile is not None:
+        profile.database_seconds += duration
+        profile.rows += max(rows, 0)
+
+    if _should_capture_query_plan(duration):
+        capture_query_plan(
+            sql=sql,
+            params=params,
+            using=using,
+            duration=duration,
+            name=_query_name.get(),
+        )
+
+
+@contextmanager
+def profiled_query(name: str) -> Iterator[None]:
+    """Identifies the queries executed in the context as the registered query `name`"""
+    token = _query_name.set(name)
+    try:
+        yield
+    finally:
+        _query_name.reset(token)
+
+
+def _profile_execute(execute, sql, params, many, context):
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    record_query(
+        sql=sql,
+        params=params,
+        using=context["connection"].alias,
+        duration=time.perf_counter() - start,
+        rows=0 if many else context["cursor"].rowcount,
+    )
+    return result
+
+
+@contextmanager
+def profile_request() -> Iterator[RequestProfile]:
+    """Profiles the queries that the request runs through any of the databases"""
+    profile = RequestProfile()
+    token = _request_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(_profile_execute)
+                )
+            yield profile
+    finally:
+        _request_profile.reset(token)
+
+
+def observe_request_profile(*, view: str, profile: RequestProfile, end: float) -> None:
+    """Exports the phases of a profiled request of `view`"""
+    if profile.view_start is None:
+        return
+
+    view_end = profile.view_end or end
+    processing_seconds = view_end - profile.view_start - profile.database_seconds
+    VIEW_DURATION.labels(view=view, phase="database").observe(profile.database_seconds)
+    VIEW_DURATION.labels(view=view, phase="processing").observe(
+        max(processing_seconds, 0.0)
+    )
+    if profile.view_end is not None and profile.render_end is not None:
+        VIEW_DURATION.labels(view=view, phase="rendering").observe(
+            profile.render_end - profile.view_end
+        )
+    VIEW_ROWS.labels(view=view).observe(profile.rows)
+
+
+def get_query_plans() -> list[QueryPlan]:
+    """Returns the captured query plans, the most recent first"""
+    return list(reversed(QUERY_PLANS))
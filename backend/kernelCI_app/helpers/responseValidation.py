@@ -0,0 +1,51 @@
+import random
+from typing import Any, Literal
+
+from django.conf import settings
+from pydantic import BaseModel
+
+type ResponseValidationPolicy = Literal["full", "sampled", "off"]
+
+
+def should_validate_response() -> bool:
+    """Tells if the response being built is validated, following the
+    RESPONSE_VALIDATION policy"""
+    policy: ResponseValidationPolicy = settings.RESPONSE_VALIDATION
+    if policy == "off":
+        return False
+    if policy == "sampled":
+        return random.random() < settings.RESPONSE_VALIDATION_SAMPLE_RATE  # noqa: S311
+    return True
+
+
+def _to_response_data(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, list) and value and isinstance(value[0], BaseModel):
+        return [item.model_dump() for item in value]
+    return value
+
+
+def build_response(
+    response_model: type[BaseModel], **fields
+) -> BaseModel | dict[str, Any]:
+    """Returns the response with the given fields.
+
+    When the response is validated, the fields go through `response_model`,
+    raising a ValidationError if they don't match it, and the model itself is
+    returned, which FastJSONRenderer dumps straight to JSON. Otherwise, only
+    the models in the fields are dumped: the rows that the views already build
+    as dicts, with the shape of the response, are sent as they are.
+    """
+    if should_validate_response():
+        return response_model(**fields)
+    return {name: _to_response_data(value) for name, value in fields.items()}
+
+
+def build_response_data(response_model: type[BaseModel], **fields) -> dict[str, Any]:
+    """Same as `build_response`, but always returns the data of the response
+    as a dict"""
+    response = build_response(response_model, **fields)
+    if isinstance(response, BaseModel):
+        return response.model_dump()
+    return response
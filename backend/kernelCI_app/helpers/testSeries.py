@@ -0,0 +1,27 @@
+def get_test_series_id_clause(
+    *,
+    path: str,
+    origin: str,
+    git_repository_url: str,
+    git_repository_branch: str,
+    config_name: str,
+    platform: str,
+) -> str:
+    """Returns the SQL expression of the series of a test, from SQL expressions
+    of its path, checkout origin, tree, build config and platform.
+
+    A series holds the runs of the same test in the same tree and environment,
+    which are the ones compared in the test status history. The identity is hashed
+    as a JSON array so that NULL values don't collide with strings."""
+    fields = ", ".join(
+        f"({field})::text"
+        for field in (
+            path,
+            origin,
+            git_repository_url,
+            git_repository_branch,
+            config_name,
+            platform,
+        )
+    )
+    return f"md5(json_build_array({fields})::text)"
@@ -302,7 +302,7 @@ def decide_if_is_build_filtered_out(instance, row_data):
     incident_test_id = row_data["incident_test_id"]
     build_origin = row_data["build_origin"]
 
-    is_build_filtered_out = instance.filters.is_build_filtered_out(
+    is_build_filtered_out = instance.filters.build_predicate(
         build_status=build_status,
         duration=build_duration,
         issue_id=issue_id,
@@ -322,7 +322,7 @@ def decide_if_is_boot_filtered_out(instance, row_data):
     incident_test_id = row_data["incident_test_id"]
     origin = row_data["test_origin"]
 
-    return instance.filters.is_boot_filtered_out(
+    return instance.filters.boot_predicate(
         duration=test_duration,
         issue_id=issue_id,
         issue_version=issue_version,
@@ -336,7 +336,7 @@ def decide_if_is_boot_filtered_out(instance, row_data):
 def decide_if_is_full_row_filtered_out(instance, row_data):
     hardware_filter = get_hardware_filter(row_data)
 
-    return instance.filters.is_record_filtered_out(
+    return instance.filters.record_predicate(
         hardwares=[hardware_filter],
         architecture=row_data["build_architecture"],
         compiler=row_data["build_compiler"],
@@ -354,7 +354,7 @@ def decide_if_is_test_filtered_out(instance, row_data):
     incident_test_id = row_data["incident_test_id"]
     origin = row_data["test_origin"]
 
-    return instance.filters.is_test_filtered_out(
+    return instance.filters.test_predicate(
         duration=test_duration,
         issue_id=issue_id,
         issue_version=issue_version,
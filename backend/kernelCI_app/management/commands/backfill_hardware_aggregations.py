@@ -1,9 +1,11 @@
+import json
 import time
-from datetime import timedelta
-from typing import Any, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, Sequence
 
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
 from django.db.models.query import QuerySet
 from django.utils import timezone
 
@@ -19,6 +21,94 @@ from kernelCI_app.models import (
     Tests,
 )
 
+# Set-based equivalents of aggregate_checkouts and aggregate_tests, used by --sql.
+# Both are parametrized by a [start, end) window on start_time; the end bound is
+# appended by _chunk_condition so the last chunk can stay open-ended.
+LATEST_CHECKOUT_SELECT = """
+    SELECT DISTINCT ON (origin, tree_name, git_repository_url, git_repository_branch)
+        id, origin, tree_name, git_repository_url, git_repository_branch, start_time
+    FROM checkouts
+    WHERE start_time >= %(start)s {end_condition}
+    ORDER BY
+        origin, tree_name, git_repository_url, git_repository_branch,
+        start_time DESC
+"""
+
+LATEST_CHECKOUT_INSERT = """
+    INSERT INTO latest_checkout (
+        checkout_id, origin, tree_name,
+        git_repository_url, git_repository_branch, start_time
+    )
+    {select}
+    ON CONFLICT (origin, tree_name, git_repository_url, git_repository_branch)
+    DO UPDATE SET
+        start_time = EXCLUDED.start_time,
+        checkout_id = EXCLUDED.checkout_id
+    WHERE latest_checkout.start_time < EXCLUDED.start_time
+"""
+
+PENDING_TEST_SELECT = """
+    SELECT
+        t.id,
+        t.origin,
+        t.environment_misc ->> 'platform',
+        t.environment_compatible,
+        t.build_id,
+        CASE
+            WHEN t.status IS NULL THEN NULL
+            WHEN t.status = 'PASS' THEN 'P'
+            WHEN t.status = 'FAIL' THEN 'F'
+            ELSE 'I'
+        END,
+        COALESCE(t.path = 'boot' OR t.path LIKE 'boot.%%', FALSE),
+        t.path,
+        t.start_time,
+        t.misc ->> 'runtime',
+        t.status
+    FROM tests t
+    INNER JOIN builds b ON b.id = t.build_id
+    WHERE
+        t.start_time >= %(start)s {end_condition}
+        AND t.environment_misc ->> 'platform' IS NOT NULL
+        AND b.checkout_id IN (SELECT checkout_id FROM latest_checkout)
+"""
+
+PENDING_TEST_INSERT = """
+    INSERT INTO pending_test (
+        test_id, origin, platform, compatible,
+        build_id, status, is_boot,
+        path, start_time, lab, full_status
+    )
+    {select}
+    ON CONFLICT (test_id)
+    DO UPDATE SET
+        platform = COALESCE(pending_test.platform, EXCLUDED.platform),
+        compatible = COALESCE(pending_test.compatible, EXCLUDED.compatible),
+        status = COALESCE(pending_test.status, EXCLUDED.status),
+        path = COALESCE(pending_test.path, EXCLUDED.path),
+        start_time = COALESCE(pending_test.start_time, EXCLUDED.start_time),
+        lab = COALESCE(pending_test.lab, EXCLUDED.lab),
+        full_status = COALESCE(pending_test.full_status, EXCLUDED.full_status)
+"""
+
+
+def date_range_chunks(
+    start: datetime, end: datetime, step: timedelta
+) -> Iterator[tuple[datetime, datetime | None]]:
+    """
+    Split [start, end) into consecutive windows of size `step`.
+    The last window has no upper bound, so rows newer than `end` are still included.
+    """
+    chunk_start = start
+    while chunk_start + step < end:
+        yield chunk_start, chunk_start + step
+        chunk_start += step
+    yield chunk_start, None
+
+
+def _chunk_condition(column: str, end: datetime | None) -> str:
+    return f"AND {column} < %(end)s" if end is not None else ""
+
 
 class Command(BaseCommand):
     help = """
@@ -45,13 +135,40 @@ class Command(BaseCommand):
             default=2000,
             help="Batch size for processing (default: 2000)",
         )
+        parser.add_argument(
+            "--sql",
+            action="store_true",
+            help="""Run the backfill with set-based INSERT ... SELECT statements
+                executed directly in the database, instead of loading rows through the ORM.""",
+        )
+        parser.add_argument(
+            "--chunk-hours",
+            type=int,
+            default=24,
+            help="Size of each start_time window when using --sql (default: 24)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of chunks processed in parallel when using --sql (default: 1)",
+        )
 
     def handle(self, *args: Any, **options: Any) -> None:
         days = options["days"]
         truncate = options["truncate"]
         batch_size = options["batch_size"]
+        use_sql = options["sql"]
+        chunk_hours = options["chunk_hours"]
+        workers = options["workers"]
+
+        if chunk_hours < 1:
+            raise CommandError(f"--chunk-hours must be at least 1 (got {chunk_hours})")
+        if workers < 1:
+            raise CommandError(f"--workers must be at least 1 (got {workers})")
 
-        cutoff_date = timezone.now() - timedelta(days=days)
+        now = timezone.now()
+        cutoff_date = now - timedelta(days=days)
         out(f"Backfilling hardware aggregations since {cutoff_date}...")
 
         if truncate:
@@ -60,6 +177,38 @@ class Command(BaseCommand):
             PendingTest.objects.all().delete()
             out("Truncation complete.")
 
+        if use_sql:
+            chunks = list(
+                date_range_chunks(cutoff_date, now, timedelta(hours=chunk_hours))
+            )
+
+            # latest_checkout must be complete before pending_test is filled,
+            # since tests are only backfilled for checkouts present there.
+            out("Backfilling LatestCheckout (set-based)...")
+            failed_chunks = self.process_sql_chunks(
+                chunks=chunks,
+                select_query=LATEST_CHECKOUT_SELECT,
+                insert_query=LATEST_CHECKOUT_INSERT,
+                end_column="start_time",
+                workers=workers,
+                label="Checkouts",
+            )
+            self.raise_for_failed_chunks(failed_chunks, label="Checkouts")
+
+            out("Backfilling PendingTest (set-based)...")
+            failed_chunks = self.process_sql_chunks(
+                chunks=chunks,
+                select_query=PENDING_TEST_SELECT,
+                insert_query=PENDING_TEST_INSERT,
+                end_column="t.start_time",
+                workers=workers,
+                label="Tests",
+            )
+            self.raise_for_failed_chunks(failed_chunks, label="Tests")
+
+            out("Backfill complete.")
+            return
+
         out("Backfilling LatestCheckout...")
         checkouts_qs = Checkouts.objects.filter(start_time__gte=cutoff_date).order_by(
             "-start_time"
@@ -131,3 +280,142 @@ class Command(BaseCommand):
             out(
                 f"Processed {total_processed} {label} (elapsed time: {time.time() - t0:.2f}s)"
             )
+
+    def estimate_rows(self, select_query: str, params: dict[str, Any]) -> int:
+        """
+        Returns the planner estimate of rows returned by a select query.
+        Used instead of COUNT(*) so that the estimate doesn't cost a full scan.
+        """
+        with connections["default"].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {select_query}", params)
+            plan = cursor.fetchone()[0]
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def run_sql_chunk(
+        self,
+        *,
+        select_query: str,
+        insert_query: str,
+        end_column: str,
+        start: datetime,
+        end: datetime | None,
+        in_worker: bool,
+    ) -> int:
+        """Runs a single INSERT ... SELECT for the [start, end) window, returns affected rows."""
+        select = select_query.format(end_condition=_chunk_condition(end_column, end))
+        try:
+            with transaction.atomic():
+                with connections["default"].cursor() as cursor:
+                    cursor.execute(
+                        insert_query.format(select=select),
+                        {"start": start, "end": end},
+                    )
+                    return cursor.rowcount
+        finally:
+            # Each worker thread gets its own connection, which is not
+            # closed automatically when the thread finishes
+            if in_worker:
+                connections["default"].close()
+
+    def raise_for_failed_chunks(
+        self, failed_chunks: list[tuple[datetime, datetime | None]], *, label: str
+    ) -> None:
+        """Lists the chunks that failed so that they can be backfilled again"""
+        if not failed_chunks:
+            return
+
+        out(f"{len(failed_chunks)} {label} chunks failed:")
+        for start, end in sorted(failed_chunks):
+            out(f"  from {start.isoformat()} to {end.isoformat() if end else 'now'}")
+        raise CommandError(f"Failed to backfill {len(failed_chunks)} {label} chunks")
+
+    def process_sql_chunks(
+        self,
+        *,
+        chunks: list[tuple[datetime, datetime | None]],
+        select_query: str,
+        insert_query: str,
+        end_column: str,
+        workers: int,
+        label: str,
+    ) -> list[tuple[datetime, datetime | None]]:
+        """
+        Executes the set-based backfill for every date-range chunk,
+        optionally in parallel, reporting progress after each chunk
+        against the planner estimate of the total rows.
+
+        Returns the chunks that failed.
+        """
+        failed_chunks: list[tuple[datetime, datetime | None]] = []
+        if not chunks:
+            return failed_chunks
+
+        estimate = self.estimate_rows(
+            select_query.format(end_condition=""), {"start": chunks[0][0]}
+        )
+        out(f"Estimated {estimate} {label} to backfill in {len(chunks)} chunks")
+
+        total_processed = 0
+        done_chunks = 0
+        t0 = time.time()
+
+        def report(start: datetime, rows: int) -> None:
+            elapsed = time.time() - t0
+            remaining = max(estimate - total_processed, 0)
+            rate = total_processed / elapsed if elapsed > 0 else 0
+            eta = f"{remaining / rate:.0f}s" if rate > 0 else "unknown"
+            out(
+                f"Processed {label} chunk {done_chunks}/{len(chunks)} "
+                f"(from {start.isoformat()}): {rows} rows, total {total_processed}, "
+                f"~{remaining} remaining, elapsed time: {elapsed:.2f}s, eta: {eta}"
+            )
+
+        if workers == 1:
+            for start, end in chunks:
+                try:
+                    rows = self.run_sql_chunk(
+                        select_query=select_query,
+                        insert_query=insert_query,
+                        end_column=end_column,
+                        start=start,
+                        end=end,
+                        in_worker=False,
+                    )
+                except Exception as e:
+                    out(f"Error processing {label} chunk from {start.isoformat()}: {e}")
+                    failed_chunks.append((start, end))
+                    rows = 0
+                total_processed += rows
+                done_chunks += 1
+                report(start, rows)
+            return failed_chunks
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.run_sql_chunk,
+                    select_query=select_query,
+                    insert_query=insert_query,
+                    end_column=end_column,
+                    start=start,
+                    end=end,
+                    in_worker=True,
+                ): (start, end)
+                for start, end in chunks
+            }
+            for future in as_completed(futures):
+                start, end = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    out(f"Error processing {label} chunk from {start.isoformat()}: {e}")
+                    failed_chunks.append((start, end))
+                    rows = 0
+                total_processed += rows
+                done_chunks += 1
+                report(start, rows)
+
+        return failed_chunks
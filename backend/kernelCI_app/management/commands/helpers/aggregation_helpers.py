@@ -1,9 +1,11 @@
 import time
-from typing import Optional, Sequence
+from datetime import datetime
+from typing import Iterable, Optional, Sequence
 
 from django.db import connections
 
 from kernelCI_app.helpers.logger import out
+from kernelCI_app.helpers.testSeries import get_test_series_id_clause
 from kernelCI_app.management.commands.helpers.tree_listing import (
     CheckoutRow,
     tree_listing_sort_key,
@@ -11,6 +13,8 @@ from kernelCI_app.management.commands.helpers.tree_listing import (
 from kernelCI_app.models import (
     Builds,
     Checkouts,
+    Incidents,
+    Issues,
     PendingBuilds,
     PendingTest,
     SimplifiedStatusChoices,
@@ -231,6 +235,574 @@ def aggregate_builds(
         out(f"bulk_create pending_builds in {time.time() - t0:.3f}s")
 
 
+def update_issue_seen_summary(
+    incident_ids: Optional[list[str]] = None, issue_ids: Optional[list[str]] = None
+) -> None:
+    """
+    Merges incidents into the issue_seen_summary and issue_seen_trees tables.
+    The first and last incidents of each issue version are only replaced
+    by older or newer ones, so incidents can be merged in any order.
+    Merging an incident again fills its checkout if it was unknown before.
+
+    If `issue_ids` is given, all incidents of those issues are merged.
+    Otherwise, if `incident_ids` is None, all incidents are merged.
+    """
+    if issue_ids is not None:
+        incident_condition = "WHERE IC.issue_id = ANY(%s)"
+        params = [issue_ids]
+    elif incident_ids is not None:
+        incident_condition = "WHERE IC.id = ANY(%s)"
+        params = [incident_ids]
+    else:
+        incident_condition = ""
+        params = []
+
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH seen_incidents AS (
+                SELECT
+                    IC.id,
+                    IC.issue_id,
+                    IC.issue_version,
+                    IC._timestamp,
+                    B.checkout_id
+                FROM incidents IC
+                LEFT JOIN tests T ON IC.test_id = T.id
+                LEFT JOIN builds B ON B.id = COALESCE(IC.build_id, T.build_id)
+                {incident_condition}
+            ),
+            first_incidents AS (
+                SELECT DISTINCT ON (issue_id, issue_version) *
+                FROM seen_incidents
+                ORDER BY issue_id, issue_version, _timestamp ASC NULLS LAST, id
+            ),
+            last_incidents AS (
+                SELECT DISTINCT ON (issue_id, issue_version) *
+                FROM seen_incidents
+                ORDER BY issue_id, issue_version, _timestamp DESC NULLS LAST, id
+            )
+            INSERT INTO issue_seen_summary (
+                issue_id, issue_version,
+                first_incident_id, first_seen, first_checkout_id,
+                last_incident_id, last_seen, last_checkout_id
+            )
+            SELECT
+                F.issue_id, F.issue_version,
+                F.id, F._timestamp, F.checkout_id,
+                L.id, L._timestamp, L.checkout_id
+            FROM first_incidents F
+            JOIN last_incidents L USING (issue_id, issue_version)
+            ORDER BY F.issue_id, F.issue_version
+            ON CONFLICT (issue_id, issue_version)
+            DO UPDATE SET
+                first_incident_id = CASE
+                    WHEN EXCLUDED.first_seen < issue_seen_summary.first_seen
+                    THEN EXCLUDED.first_incident_id
+                    ELSE issue_seen_summary.first_incident_id END,
+                first_checkout_id = CASE
+                    WHEN EXCLUDED.first_seen < issue_seen_summary.first_seen
+                    THEN EXCLUDED.first_checkout_id
+                    WHEN EXCLUDED.first_incident_id = issue_seen_summary.first_incident_id
+                    THEN COALESCE(
+                        EXCLUDED.first_checkout_id, issue_seen_summary.first_checkout_id
+                    )
+                    ELSE issue_seen_summary.first_checkout_id END,
+                first_seen = LEAST(issue_seen_summary.first_seen, EXCLUDED.first_seen),
+                last_incident_id = CASE
+                    WHEN EXCLUDED.last_seen > issue_seen_summary.last_seen
+                    THEN EXCLUDED.last_incident_id
+                    ELSE issue_seen_summary.last_incident_id END,
+                last_checkout_id = CASE
+                    WHEN EXCLUDED.last_seen > issue_seen_summary.last_seen
+                    THEN EXCLUDED.last_checkout_id
+                    WHEN EXCLUDED.last_incident_id = issue_seen_summary.last_incident_id
+                    THEN COALESCE(
+                        EXCLUDED.last_checkout_id, issue_seen_summary.last_checkout_id
+                    )
+                    ELSE issue_seen_summary.last_checkout_id END,
+                last_seen = GREATEST(issue_seen_summary.last_seen, EXCLUDED.last_seen)
+            """,
+            params,
+        )
+        summary_count = cursor.rowcount
+
+        cursor.execute(
+            f"""
+            INSERT INTO issue_seen_trees (
+                issue_id, issue_version,
+                tree_name, git_repository_url, git_repository_branch
+            )
+            SELECT DISTINCT
+                IC.issue_id,
+                IC.issue_version,
+                C.tree_name,
+                C.git_repository_url,
+                C.git_repository_branch
+            FROM incidents IC
+            LEFT JOIN tests T ON IC.test_id = T.id
+            JOIN builds B ON B.id = COALESCE(IC.build_id, T.build_id)
+            JOIN checkouts C ON B.checkout_id = C.id
+            {incident_condition}
+            ON CONFLICT ON CONSTRAINT issue_seen_trees_unique DO NOTHING
+            """,
+            params,
+        )
+        trees_count = cursor.rowcount
+
+    out(
+        f"upserted {summary_count} issue_seen_summary rows"
+        f" and {trees_count} issue_seen_trees rows"
+    )
+
+
+def get_linked_incidents(
+    *, checkout_ids: list[str], build_ids: list[str], test_ids: list[str]
+) -> dict[str, str]:
+    """
+    Returns the issue ids of the incidents of the given tests and builds,
+    and of the tests and builds of the given builds and checkouts, by incident id.
+    """
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT IC.id, IC.issue_id
+            FROM incidents IC
+            WHERE IC.test_id = ANY(%(test_ids)s)
+            UNION
+            SELECT IC.id, IC.issue_id
+            FROM incidents IC
+            WHERE IC.build_id = ANY(%(build_ids)s)
+            UNION
+            SELECT IC.id, IC.issue_id
+            FROM tests T
+            JOIN incidents IC ON IC.test_id = T.id
+            WHERE T.build_id = ANY(%(build_ids)s)
+            UNION
+            SELECT IC.id, IC.issue_id
+            FROM builds B
+            JOIN incidents IC ON IC.build_id = B.id
+            WHERE B.checkout_id = ANY(%(checkout_ids)s)
+            UNION
+            SELECT IC.id, IC.issue_id
+            FROM builds B
+            JOIN tests T ON T.build_id = B.id
+            JOIN incidents IC ON IC.test_id = T.id
+            WHERE B.checkout_id = ANY(%(checkout_ids)s)
+            """,
+            {
+                "checkout_ids": checkout_ids,
+                "build_ids": build_ids,
+                "test_ids": test_ids,
+            },
+        )
+        return dict(cursor.fetchall())
+
+
+def aggregate_incidents(
+    incidents_instances: Sequence[Incidents],
+    *,
+    checkouts_instances: Sequence[Checkouts] = (),
+    builds_instances: Sequence[Builds] = (),
+    tests_instances: Sequence[Tests] = (),
+) -> set[str]:
+    """
+    Merges the first/last seen data and trees of the incidents into the issue summaries.
+
+    Incidents can be ingested before their test, build or checkout, so the incidents
+    linked to the given checkouts, builds and tests are merged again to fill their
+    checkouts and trees. Returns the issue ids of those linked incidents.
+    """
+    incident_ids = {incident.id for incident in incidents_instances}
+    linked_incidents = {}
+    if checkouts_instances or builds_instances or tests_instances:
+        linked_incidents = get_linked_incidents(
+            checkout_ids=[checkout.id for checkout in checkouts_instances],
+            build_ids=[build.id for build in builds_instances],
+            test_ids=[test.id for test in tests_instances],
+        )
+        incident_ids.update(linked_incidents)
+    if not incident_ids:
+        return set()
+
+    t0 = time.time()
+    update_issue_seen_summary(incident_ids=sorted(incident_ids))
+    out(f"aggregated {len(incident_ids)} incidents in {time.time() - t0:.3f}s")
+    return set(linked_incidents.values())
+
+
+def update_issue_listing(
+    issue_ids: Optional[list[str]] = None,
+    new_incident_ids: Optional[list[str]] = None,
+) -> None:
+    """
+    Recomputes the issue_listing rows of every version of the given issues
+    from the issues, incidents and issue_seen_* tables. Rows are rebuilt
+    from those tables, so issues and incidents can be merged in any order.
+
+    If `new_incident_ids` is None, the incidents of every row are counted again.
+    Otherwise they are only counted for new rows, and the existing rows add the
+    incidents of `new_incident_ids`, which must be the incidents inserted by the
+    current transaction.
+
+    Expects issue_seen_summary and issue_seen_trees to be up to date.
+    If `issue_ids` is None, all issues are recomputed.
+    """
+    issue_condition = "" if issue_ids is None else "WHERE I.id = ANY(%s)"
+    params = [] if issue_ids is None else [issue_ids]
+
+    incremental = new_incident_ids is not None
+    if incremental:
+        # Only new rows count their incidents, the existing ones add the new incidents
+        # after the upsert. A row that another flush creates meanwhile keeps its own
+        # count, and the new incidents of this flush are added to it.
+        count_join = """
+            LEFT JOIN issue_listing EL
+                ON EL.issue_id = I.id AND EL.issue_version = I.version
+            LEFT JOIN LATERAL (
+                SELECT COUNT(*) AS incident_count
+                FROM incidents INC
+                WHERE EL.issue_id IS NULL
+                    AND INC.issue_id = I.id
+                    AND INC.issue_version = I.version
+            ) IC ON TRUE"""
+        count_update = ""
+        returning = "RETURNING issue_id, issue_version, xmax = 0"
+    else:
+        count_join = """
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS incident_count
+                FROM incidents INC
+                WHERE INC.issue_id = I.id
+                    AND INC.issue_version = I.version
+            ) IC"""
+        count_update = "incident_count = EXCLUDED.incident_count,"
+        returning = ""
+
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO issue_listing (
+                issue_id, issue_version, origin, _timestamp, comment,
+                culprit_code, culprit_tool, culprit_harness, categories,
+                incident_count, has_trees, first_seen, last_seen
+            )
+            SELECT
+                I.id,
+                I.version,
+                I.origin,
+                I._timestamp,
+                I.comment,
+                I.culprit_code,
+                I.culprit_tool,
+                I.culprit_harness,
+                I.categories,
+                IC.incident_count,
+                EXISTS (
+                    SELECT 1
+                    FROM issue_seen_trees ST
+                    WHERE ST.issue_id = I.id
+                        AND ST.issue_version = I.version
+                        AND ST.tree_name IS NOT NULL
+                        AND ST.git_repository_branch IS NOT NULL
+                ),
+                S.first_seen,
+                S.last_seen
+            FROM issues I{count_join}
+            LEFT JOIN issue_seen_summary S
+                ON S.issue_id = I.id AND S.issue_version = I.version
+            {issue_condition}
+            ORDER BY I.id, I.version
+            ON CONFLICT (issue_id, issue_version)
+            DO UPDATE SET
+                origin = EXCLUDED.origin,
+                _timestamp = EXCLUDED._timestamp,
+                comment = EXCLUDED.comment,
+                culprit_code = EXCLUDED.culprit_code,
+                culprit_tool = EXCLUDED.culprit_tool,
+                culprit_harness = EXCLUDED.culprit_harness,
+                categories = EXCLUDED.categories,
+                {count_update}
+                has_trees = EXCLUDED.has_trees,
+                first_seen = EXCLUDED.first_seen,
+                last_seen = EXCLUDED.last_seen
+            {returning}
+            """,
+            params,
+        )
+        listing_count = cursor.rowcount
+
+        if incremental and new_incident_ids:
+            updated_keys = [
+                (issue_id, issue_version)
+                for issue_id, issue_version, inserted in cursor.fetchall()
+                if not inserted
+            ]
+            if updated_keys:
+                updated_issue_ids, updated_versions = zip(*updated_keys, strict=True)
+                cursor.execute(
+                    """
+                    UPDATE issue_listing L
+                    SET incident_count = L.incident_count + N.incident_count
+                    FROM (
+                        SELECT INC.issue_id, INC.issue_version, COUNT(*) AS incident_count
+                        FROM incidents INC
+                        JOIN UNNEST(%s::text[], %s::integer[]) AS U(issue_id, issue_version)
+                            ON U.issue_id = INC.issue_id
+                            AND U.issue_version = INC.issue_version
+                        WHERE INC.id = ANY(%s)
+                        GROUP BY INC.issue_id, INC.issue_version
+                    ) N
+                    WHERE L.issue_id = N.issue_id AND L.issue_version = N.issue_version
+                    """,
+                    [list(updated_issue_ids), list(updated_versions), new_incident_ids],
+                )
+
+    out(f"upserted {listing_count} issue_listing rows")
+
+
+def aggregate_issue_listing(
+    issues_instances: Sequence[Issues],
+    incidents_instances: Sequence[Incidents],
+    linked_issue_ids: Iterable[str] = (),
+    *,
+    new_incident_ids: Optional[list[str]] = None,
+) -> None:
+    """
+    Refreshes the issue listing rows of the ingested issues, of the issues of the
+    ingested incidents and of the `linked_issue_ids` returned by aggregate_incidents.
+    The incident counts are updated from `new_incident_ids` when given.
+    """
+    issue_ids = {issue.id for issue in issues_instances}
+    issue_ids.update(incident.issue_id for incident in incidents_instances)
+    issue_ids.update(linked_issue_ids)
+    if not issue_ids:
+        return
+
+    t0 = time.time()
+    update_issue_listing(issue_ids=sorted(issue_ids), new_incident_ids=new_incident_ids)
+    out(f"aggregated {len(issue_ids)} issue listing entries in {time.time() - t0:.3f}s")
+
+
+def update_hardware_tree_selectors(checkout_ids: Optional[list[str]] = None) -> None:
+    """
+    Merges the tree heads of the given checkouts into the hardware_tree_selectors table,
+    keeping the latest checkout and build start times of each commit.
+    Builds can arrive before or after their checkout, so both ingestions update it.
+
+    If `checkout_ids` is None, all checkouts are merged.
+    """
+    checkout_condition = "" if checkout_ids is None else "AND c.id = ANY(%s)"
+    params = [] if checkout_ids is None else [checkout_ids]
+
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO hardware_tree_selectors (
+                origin, tree_name, git_repository_url, git_repository_branch,
+                git_commit_hash, git_commit_name, start_time, last_build_start_time
+            )
+            SELECT
+                b.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                c.git_commit_name,
+                MAX(c.start_time),
+                MAX(b.start_time)
+            FROM checkouts c
+            INNER JOIN builds b ON b.checkout_id = c.id
+            WHERE
+                b.start_time IS NOT NULL
+                AND c.tree_name IS NOT NULL
+                AND c.git_repository_url IS NOT NULL
+                AND c.git_repository_branch IS NOT NULL
+                AND c.git_commit_hash IS NOT NULL
+                {checkout_condition}
+            GROUP BY
+                b.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                c.git_commit_name
+            ORDER BY
+                b.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                c.git_commit_name
+            ON CONFLICT ON CONSTRAINT hardware_tree_selectors_unique
+            DO UPDATE SET
+                start_time = GREATEST(
+                    hardware_tree_selectors.start_time, EXCLUDED.start_time
+                ),
+                last_build_start_time = GREATEST(
+                    hardware_tree_selectors.last_build_start_time,
+                    EXCLUDED.last_build_start_time
+                )
+            """,
+            params,
+        )
+        selectors_count = cursor.rowcount
+
+    out(f"upserted {selectors_count} hardware_tree_selectors rows")
+
+
+def update_tree_commit_timeline(checkout_ids: Optional[list[str]] = None) -> None:
+    """
+    Merges the commits of the given checkouts into the tree_commit_timeline table.
+    The name and tags of a commit are only replaced by the ones of an older checkout,
+    so checkouts can be merged in any order.
+
+    If `checkout_ids` is None, all checkouts are merged.
+    """
+    checkout_condition = "" if checkout_ids is None else "AND c.id = ANY(%s)"
+    params = [] if checkout_ids is None else [checkout_ids]
+
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO tree_commit_timeline (
+                origin, tree_name, git_repository_url, git_repository_branch,
+                git_commit_hash, git_commit_name, git_commit_tags,
+                first_start_time, last_start_time
+            )
+            SELECT DISTINCT ON (
+                c.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash
+            )
+                c.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                c.git_commit_name,
+                c.git_commit_tags,
+                c.start_time,
+                MAX(c.start_time) OVER (
+                    PARTITION BY
+                        c.origin,
+                        c.tree_name,
+                        c.git_repository_url,
+                        c.git_repository_branch,
+                        c.git_commit_hash
+                )
+            FROM checkouts c
+            WHERE
+                c.start_time IS NOT NULL
+                AND c.tree_name IS NOT NULL
+                AND c.git_repository_url IS NOT NULL
+                AND c.git_repository_branch IS NOT NULL
+                AND c.git_commit_hash IS NOT NULL
+                {checkout_condition}
+            ORDER BY
+                c.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                c.start_time
+            ON CONFLICT ON CONSTRAINT tree_commit_timeline_unique
+            DO UPDATE SET
+                git_commit_name = CASE
+                    WHEN EXCLUDED.first_start_time < tree_commit_timeline.first_start_time
+                    THEN EXCLUDED.git_commit_name
+                    ELSE tree_commit_timeline.git_commit_name END,
+                git_commit_tags = CASE
+                    WHEN EXCLUDED.first_start_time < tree_commit_timeline.first_start_time
+                    THEN EXCLUDED.git_commit_tags
+                    ELSE tree_commit_timeline.git_commit_tags END,
+                first_start_time = LEAST(
+                    tree_commit_timeline.first_start_time, EXCLUDED.first_start_time
+                ),
+                last_start_time = GREATEST(
+                    tree_commit_timeline.last_start_time, EXCLUDED.last_start_time
+                )
+            """,
+            params,
+        )
+        timeline_count = cursor.rowcount
+
+    out(f"upserted {timeline_count} tree_commit_timeline rows")
+
+
+def update_test_series(
+    test_ids: Optional[list[str]] = None, since: Optional[datetime] = None
+) -> int:
+    """
+    Copies the given tests into the test_series table, with the series of each one.
+    Tests without path, tree or build config can't be in a status history, so they
+    are skipped. Returns the number of upserted rows.
+
+    If `test_ids` is None, all tests are copied, or the ones since the
+    `since` timestamp if it is set.
+    """
+    conditions = []
+    params = []
+    if test_ids is not None:
+        conditions.append("AND T.id = ANY(%s)")
+        params.append(test_ids)
+    if since is not None:
+        conditions.append("AND T._timestamp >= %s")
+        params.append(since)
+
+    series_id_clause = get_test_series_id_clause(
+        path="T.path",
+        origin="C.origin",
+        git_repository_url="C.git_repository_url",
+        git_repository_branch="C.git_repository_branch",
+        config_name="B.config_name",
+        platform="T.environment_misc ->> 'platform'",
+    )
+
+    with connections["default"].cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO test_series (
+                test_id, series_id, checkout_id,
+                start_time, _timestamp, status, git_commit_hash
+            )
+            SELECT
+                T.id,
+                {series_id_clause},
+                C.id,
+                T.start_time,
+                T._timestamp,
+                T.status,
+                C.git_commit_hash
+            FROM tests T
+            INNER JOIN builds B ON T.build_id = B.id
+            INNER JOIN checkouts C ON B.checkout_id = C.id
+            WHERE
+                T.path IS NOT NULL
+                AND C.git_repository_url IS NOT NULL
+                AND C.git_repository_branch IS NOT NULL
+                AND B.config_name IS NOT NULL
+                {" ".join(conditions)}
+            ORDER BY T.id
+            ON CONFLICT (test_id)
+            DO UPDATE SET
+                series_id = EXCLUDED.series_id,
+                checkout_id = EXCLUDED.checkout_id,
+                start_time = EXCLUDED.start_time,
+                _timestamp = EXCLUDED._timestamp,
+                status = EXCLUDED.status,
+                git_commit_hash = EXCLUDED.git_commit_hash
+            """,
+            params,
+        )
+        series_count = cursor.rowcount
+
+    out(f"upserted {series_count} test_series rows")
+    return series_count
+
+
 def aggregate_checkouts_and_pendings(
     checkouts_instances: Sequence[Checkouts],
     tests_instances: Sequence[Tests],
@@ -238,5 +810,14 @@ def aggregate_checkouts_and_pendings(
 ) -> None:
     aggregate_checkouts(checkouts_instances)
     update_tree_listing(checkouts_instances)
+    if checkouts_instances:
+        update_tree_commit_timeline(
+            checkout_ids=sorted({checkout.id for checkout in checkouts_instances})
+        )
     aggregate_tests(tests_instances)
     aggregate_builds(build_instances)
+
+    selector_checkout_ids = {checkout.id for checkout in checkouts_instances}
+    selector_checkout_ids.update(build.checkout_id for build in build_instances)
+    if selector_checkout_ids:
+        update_hardware_tree_selectors(checkout_ids=sorted(selector_checkout_ids))
@@ -0,0 +1,222 @@
+"""Lightweight rows for the tables written by the ingester.
+
+The ingester doesn't build Django model instances: each submission item is
+turned into a record, a named tuple with one slot per column of the table's
+insert query, in the same order. Records can be sorted and read like the
+model instances (`record.id`, `record.checkout_id`...) and are almost the
+parameters of the insert query already, only the JSON columns are dumped.
+
+The columns, defaults and JSON columns of each table are resolved once, from
+the model and the generated insert queries, into a `ColumnPlan`.
+"""
+
+import json
+import re
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+
+from kernelCI_app.management.commands.generated.insert_queries import INSERT_QUERIES
+from kernelCI_app.typeModels.modelTypes import (
+    MODEL_MAP,
+    TableModelsClass,
+    TableNames,
+    TableRecord,
+)
+
+TIMESTAMP_COLUMN = "field_timestamp"
+
+# Nested objects of the submission that are stored as prefixed columns,
+# e.g. test["environment"]["misc"] goes to the environment_misc column
+FLATTENED_FIELDS: dict[TableNames, tuple[str, ...]] = {
+    "issues": ("culprit",),
+    "tests": ("environment", "number"),
+}
+
+
+def flatten_dict_specific(target: dict[str, Any], target_fields: Sequence[str]):
+    """
+    Flatten specific fields of a dict on a one-level-deep only.
+    Done in order to avoid flattening fields that should be kept as JSONs
+     (which happens with other libraries such as flatdict).
+
+    Example of `flatten_dict_specific(test_data, ["environment"])`:
+    `test_data` will go from
+    ```
+    {
+        environment: {
+            comment: "foo"
+            misc: {
+                platform: "bar"
+            }
+        }
+    }
+    ```
+    to
+    ```
+    {
+        environment_comment: "foo"
+        environment_misc: {
+            platform: "bar"
+        }
+    }
+    """
+
+    separator = "_"
+
+    flattened_dict = target.copy()
+    for first_key, value in target.items():
+        if first_key in target_fields:
+            if isinstance(value, dict):
+                for (
+                    inner_key,
+                    real_value,
+                ) in value.items():
+                    merged_key = separator.join([first_key, inner_key])
+                    flattened_dict[merged_key] = real_value
+                del flattened_dict[first_key]
+            else:
+                print(f"Target key {first_key} is not a dict")
+                continue
+
+    return flattened_dict
+
+
+class ColumnPlan(NamedTuple):
+    table_name: TableNames
+    record_class: type[TableRecord]
+    columns: tuple[str, ...]
+    """Model attribute of each column, in the order of the insert query"""
+    column_defaults: tuple[tuple[str, Any], ...]
+    """Each column with the value that the model sets when an item misses it"""
+    json_indexes: tuple[int, ...]
+    timestamp_index: int
+    flattened_fields: tuple[str, ...]
+    coalesce_indexes: tuple[int, ...]
+    """Columns that the upsert only sets when they are NULL"""
+    greatest_indexes: tuple[int, ...]
+    """Columns that the upsert sets to the greatest value"""
+
+
+# Matches the `column = OPERATION(table.column, EXCLUDED.column)` clauses of the upserts
+CONFLICT_CLAUSE_PATTERN = re.compile(r"(\w+) = (COALESCE|GREATEST)\(")
+
+
+def get_conflict_operations(query: str) -> dict[str, str]:
+    """Maps the database columns that an upsert query updates on conflict to
+    the operation that merges their values"""
+    _, update_clauses = query.split("DO UPDATE SET")
+    return dict(CONFLICT_CLAUSE_PATTERN.findall(update_clauses))
+
+
+def build_column_plan(table_name: TableNames, model: TableModelsClass) -> ColumnPlan:
+    columns = tuple(INSERT_QUERIES[table_name]["updateable_model_fields"])
+    model_fields = [model._meta.get_field(column) for column in columns]
+    conflict_operations = get_conflict_operations(INSERT_QUERIES[table_name]["query"])
+    column_operations = [
+        conflict_operations.get(field.column) for field in model_fields
+    ]
+
+    if any(field.has_default() and callable(field.default) for field in model_fields):
+        raise ValueError(
+            f"Can't build the column plan of {table_name}, its defaults must be constant"
+        )
+
+    return ColumnPlan(
+        table_name=table_name,
+        record_class=NamedTuple(
+            f"{model.__name__}Record", [(column, Any) for column in columns]
+        ),
+        columns=columns,
+        column_defaults=tuple(
+            (column, field.get_default())
+            for column, field in zip(columns, model_fields, strict=True)
+        ),
+        json_indexes=tuple(
+            index
+            for index, field in enumerate(model_fields)
+            if field.get_internal_type() == "JSONField"
+        ),
+        timestamp_index=columns.index(TIMESTAMP_COLUMN),
+        flattened_fields=FLATTENED_FIELDS.get(table_name, ()),
+        coalesce_indexes=tuple(
+            index
+            for index, operation in enumerate(column_operations)
+            if operation == "COALESCE"
+        ),
+        greatest_indexes=tuple(
+            index
+            for index, operation in enumerate(column_operations)
+            if operation == "GREATEST"
+        ),
+    )
+
+
+COLUMN_PLANS: dict[TableNames, ColumnPlan] = {
+    table_name: build_column_plan(table_name, model)
+    for table_name, model in MODEL_MAP.items()
+}
+
+
+def make_record(
+    table_name: TableNames, item: dict[str, Any], *, timestamp: datetime
+) -> TableRecord:
+    """Converts a submission item into a record of `table_name`.
+    Keys that aren't columns of the table are ignored."""
+    plan = COLUMN_PLANS[table_name]
+    if plan.flattened_fields:
+        item = flatten_dict_specific(item, plan.flattened_fields)
+
+    get = item.get
+    values = [get(column, default) for column, default in plan.column_defaults]
+    values[plan.timestamp_index] = timestamp
+    return plan.record_class._make(values)
+
+
+def record_to_params(plan: ColumnPlan, record: TableRecord) -> tuple[Any, ...]:
+    """Returns the parameters of the insert query for a record"""
+    if not plan.json_indexes:
+        return record
+
+    values = list(record)
+    for index in plan.json_indexes:
+        if values[index] is not None:
+            values[index] = json.dumps(values[index])
+    return tuple(values)
+
+
+def merge_records(
+    plan: ColumnPlan, kept: TableRecord, duplicate: TableRecord
+) -> TableRecord:
+    """Merges a record into a previous one with the same id, the way that the
+    upsert of the duplicate would update the row of the kept record.
+
+    Columns merged with COALESCE keep their first non-NULL value, the ones
+    merged with GREATEST keep the greatest non-NULL value, and the columns
+    that the upsert doesn't update keep the value of the kept record."""
+    values = list(kept)
+    for index in plan.coalesce_indexes:
+        if values[index] is None:
+            values[index] = duplicate[index]
+    for index in plan.greatest_indexes:
+        value = duplicate[index]
+        if value is not None and (values[index] is None or value > values[index]):
+            values[index] = value
+    return plan.record_class._make(values)
+
+
+def merge_duplicate_records(
+    table_name: TableNames, records: list[TableRecord]
+) -> tuple[list[TableRecord], int]:
+    """Merges the records that share an id, in their ingestion order, so that
+    upserting the result gives the same rows as upserting every record.
+
+    Returns the merged records, in the order of the first record of each id,
+    and the number of duplicates that were merged."""
+    plan = COLUMN_PLANS[table_name]
+    merged: dict[Any, TableRecord] = {}
+    for record in records:
+        kept = merged.get(record.id)
+        merged[record.id] = (
+            record if kept is None else merge_records(plan, kept, record)
+        )
+    return list(merged.values()), len(records) - len(merged)
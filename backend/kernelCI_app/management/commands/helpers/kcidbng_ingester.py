@@ -11,7 +11,7 @@ from typing import Any, Optional, TypedDict
 
 import kcidb_io
 from django.db import connections, transaction
-from prometheus_client import Counter
+from prometheus_client import Counter, Histogram
 from typing_extensions import Literal
 
 from kernelCI_app.constants.ingester import (
@@ -28,17 +28,22 @@ from kernelCI_app.helpers.logger import out
 from kernelCI_app.management.commands.generated.insert_queries import INSERT_QUERIES
 from kernelCI_app.management.commands.helpers.aggregation_helpers import (
     aggregate_checkouts_and_pendings,
+    aggregate_incidents,
+    aggregate_issue_listing,
 )
 from kernelCI_app.management.commands.helpers.file_utils import move_file_to_failed_dir
+from kernelCI_app.management.commands.helpers.ingest_records import (
+    COLUMN_PLANS,
+    merge_duplicate_records,
+    record_to_params,
+)
 from kernelCI_app.management.commands.helpers.log_excerpt_utils import (
     extract_log_excerpt,
 )
 from kernelCI_app.management.commands.helpers.process_submissions import (
-    TableNames,
-    build_instances_from_submission,
+    build_records_from_submission,
 )
-from kernelCI_app.models import Builds, Checkouts, Incidents, Issues, Tests
-from kernelCI_app.typeModels.modelTypes import TableModels
+from kernelCI_app.typeModels.modelTypes import TableNames, TableRecord
 
 type INGESTER_DIRS = Literal["archive", "failed", "pending_retry"]
 
@@ -71,12 +76,74 @@ TESTS_COUNTER = Counter(
 INCIDENTS_COUNTER = Counter(
     "kcidb_incidents", "Number of incidents ingested", ["ingester", "origin"]
 )
+DUPLICATES_MERGED_COUNTER = Counter(
+    "kcidb_ingester_merged_duplicates",
+    "Number of ingested items merged into another item with the same id before a flush",
+    ["ingester", "table"],
+)
 WORKER_FAILURES_COUNTER = Counter(
     "kcidb_ingester_worker_failures",
     "Number of ingester worker processes that exited abnormally",
     ["ingester", "reason"],
 )
 
+INGEST_STAGE_DURATION = Histogram(
+    "kcidb_ingester_stage_duration_seconds",
+    "Duration of each stage of the ingestion: 'read', 'decode', 'log_excerpts' and"
+    " 'validation' run once per file, 'records' builds the records of a file,"
+    " 'aggregation' runs the upserts of the aggregated tables and 'archive' moves"
+    " the files of a flush once it is committed",
+    ["ingester", "stage"],
+)
+FLUSH_TABLE_DURATION = Histogram(
+    "kcidb_ingester_flush_duration_seconds",
+    "Duration of the insertion of the records of each table in a flush",
+    ["ingester", "table"],
+)
+INGEST_LATENCY = Histogram(
+    "kcidb_ingester_latency_seconds",
+    "Time from the last modification of a submission file to the commit of its records",
+    ["ingester"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, float("inf")),
+)
+
+
+INGEST_STAGES = (
+    "read",
+    "decode",
+    "log_excerpts",
+    "validation",
+    "records",
+    "aggregation",
+    "archive",
+)
+
+# Exports every series from the start, so that a stage that is never reached shows up
+for stage in INGEST_STAGES:
+    INGEST_STAGE_DURATION.labels(ingester=INGESTER_GRAFANA_LABEL, stage=stage)
+for table_name in INSERT_QUERIES:
+    FLUSH_TABLE_DURATION.labels(ingester=INGESTER_GRAFANA_LABEL, table=table_name)
+INGEST_LATENCY.labels(ingester=INGESTER_GRAFANA_LABEL)
+
+
+def stage_timer(stage: str):
+    """Times a stage of the ingestion into INGEST_STAGE_DURATION"""
+    return INGEST_STAGE_DURATION.labels(
+        ingester=INGESTER_GRAFANA_LABEL, stage=stage
+    ).time()
+
+
+def observe_ingest_latency(filepath: str) -> None:
+    """Observes the time since the submission file was written, which is when
+    the submitter finished sending it"""
+    try:
+        modified_at = os.path.getmtime(filepath)
+    except OSError:
+        return
+    INGEST_LATENCY.labels(ingester=INGESTER_GRAFANA_LABEL).observe(
+        max(time.time() - modified_at, 0.0)
+    )
+
 
 def standardize_tree_names(
     input_data: dict[str, Any], tree_names: dict[str, str]
@@ -168,15 +235,19 @@ def prepare_file_data(
 
     data: Optional[dict[str, Any]] = None
     try:
-        with open(file["path"], "r") as f:
-            data = json.loads(f.read())
+        with stage_timer("read"), open(file["path"], "r") as f:
+            content = f.read()
+        with stage_timer("decode"):
+            data = json.loads(content)
 
         # These operations can be done in parallel (especially extract_log_excerpt)
         if CONVERT_LOG_EXCERPT:
-            extract_log_excerpt(data)
+            with stage_timer("log_excerpts"):
+                extract_log_excerpt(data)
         standardize_tree_names(data, tree_names)
-        kcidb_io.schema.V5_3.validate(data)
-        kcidb_io.schema.V5_3.upgrade(data)
+        with stage_timer("validation"):
+            kcidb_io.schema.V5_3.validate(data)
+            kcidb_io.schema.V5_3.upgrade(data)
         standardize_labs(data)
 
         processing_time = time.time() - start_time
@@ -193,43 +264,64 @@ def prepare_file_data(
         }
 
 
-def consume_buffer(buffer: list[TableModels], table_name: TableNames) -> None:
+def consume_buffer(
+    buffer: list[TableRecord],
+    table_name: TableNames,
+    *,
+    return_inserted_ids: bool = False,
+) -> list[str]:
     """
-    Consume a buffer of items and insert them into the database.
+    Consume a buffer of records and insert them into the database.
     This function is called by the db_worker thread.
+
+    If `return_inserted_ids` is set, returns the ids of the records that were
+    inserted, leaving out the ones merged into an existing row.
     """
     if not buffer:
-        return
+        return []
 
-    insert_props = INSERT_QUERIES[table_name]
-    updateable_model_fields = insert_props["updateable_model_fields"]
-    query = insert_props["query"]
-
-    params = []
-    for obj in buffer:
-        obj_values = []
-        for field in updateable_model_fields:
-            value = getattr(obj, field)
-            model_field = obj._meta.get_field(field)
-            if model_field.get_internal_type() == "JSONField" and value is not None:
-                value = json.dumps(value)
-            obj_values.append(value)
-        params.append(tuple(obj_values))
+    plan = COLUMN_PLANS[table_name]
+    query = INSERT_QUERIES[table_name]["query"]
+    params = [record_to_params(plan, record) for record in buffer]
 
+    inserted_ids = []
     t0 = time.time()
     with connections["default"].cursor() as cursor:
-        cursor.executemany(query, params)
+        if return_inserted_ids:
+            # The rows updated by the upsert are locked by it, so only
+            # the inserted ones have no xmax
+            pg_cursor = cursor.cursor
+            pg_cursor.executemany(
+                query.rstrip().removesuffix(";") + " RETURNING id, xmax = 0",
+                params,
+                returning=True,
+            )
+            while True:
+                inserted_ids.extend(
+                    record_id
+                    for record_id, inserted in pg_cursor.fetchall()
+                    if inserted
+                )
+                if not pg_cursor.nextset():
+                    break
+        else:
+            cursor.executemany(query, params)
 
-    out("bulk_create %s: n=%d in %.3fs" % (table_name, len(buffer), time.time() - t0))
+    duration = time.time() - t0
+    FLUSH_TABLE_DURATION.labels(
+        ingester=INGESTER_GRAFANA_LABEL, table=table_name
+    ).observe(duration)
+    out("bulk_create %s: n=%d in %.3fs" % (table_name, len(buffer), duration))
+    return inserted_ids
 
 
 def flush_buffers(
     *,
-    issues_buf: list[Issues],
-    checkouts_buf: list[Checkouts],
-    builds_buf: list[Builds],
-    tests_buf: list[Tests],
-    incidents_buf: list[Incidents],
+    issues_buf: list[TableRecord],
+    checkouts_buf: list[TableRecord],
+    builds_buf: list[TableRecord],
+    tests_buf: list[TableRecord],
+    incidents_buf: list[TableRecord],
     buffer_files: set[tuple[str, str]],
     dirs: dict[INGESTER_DIRS, str],
     stat_ok: Synchronized,
@@ -259,14 +351,31 @@ def flush_buffers(
             consume_buffer(checkouts_buf, "checkouts")
             consume_buffer(builds_buf, "builds")
             consume_buffer(tests_buf, "tests")
-            consume_buffer(incidents_buf, "incidents")
-            aggregate_checkouts_and_pendings(
-                checkouts_instances=checkouts_buf,
-                tests_instances=tests_buf,
-                build_instances=builds_buf,
+            new_incident_ids = consume_buffer(
+                incidents_buf, "incidents", return_inserted_ids=True
             )
-        for filename, filepath in buffer_files:
-            os.rename(filepath, os.path.join(dirs["archive"], filename))
+            with stage_timer("aggregation"):
+                aggregate_checkouts_and_pendings(
+                    checkouts_instances=checkouts_buf,
+                    tests_instances=tests_buf,
+                    build_instances=builds_buf,
+                )
+                linked_issue_ids = aggregate_incidents(
+                    incidents_buf,
+                    checkouts_instances=checkouts_buf,
+                    builds_instances=builds_buf,
+                    tests_instances=tests_buf,
+                )
+                aggregate_issue_listing(
+                    issues_buf,
+                    incidents_buf,
+                    linked_issue_ids,
+                    new_incident_ids=new_incident_ids,
+                )
+        with stage_timer("archive"):
+            for filename, filepath in buffer_files:
+                observe_ingest_latency(filepath)
+                os.rename(filepath, os.path.join(dirs["archive"], filename))
 
         with counter_lock:
             stat_ok.value += len(buffer_files)
@@ -315,12 +424,26 @@ MAP_TABLENAMES_TO_COUNTER: dict[TableNames, Counter] = {
 }
 
 
-class SubmissionsInstances(TypedDict):
-    issues: list[Issues]
-    checkouts: list[Checkouts]
-    builds: list[Builds]
-    tests: list[Tests]
-    incidents: list[Incidents]
+class SubmissionsRecords(TypedDict):
+    issues: list[TableRecord]
+    checkouts: list[TableRecord]
+    builds: list[TableRecord]
+    tests: list[TableRecord]
+    incidents: list[TableRecord]
+
+
+def merge_buffered_duplicates(records_dict: SubmissionsRecords) -> None:
+    """
+    Merges the buffered records that share an id, such as status updates and
+    retries of a test, so that a flush upserts each row only once.
+    """
+    for table_name, records in records_dict.items():
+        merged_records, duplicates = merge_duplicate_records(table_name, records)
+        if duplicates:
+            records_dict[table_name] = merged_records
+            DUPLICATES_MERGED_COUNTER.labels(
+                ingester=INGESTER_GRAFANA_LABEL, table=table_name
+            ).inc(duplicates)
 
 
 def process_batch(
@@ -335,7 +458,7 @@ def process_batch(
     # Ensure that the new process has a unique connection to the database
     connections.close_all()
 
-    instances_dict: SubmissionsInstances = {
+    records_dict: SubmissionsRecords = {
         "issues": [],
         "checkouts": [],
         "builds": [],
@@ -373,47 +496,50 @@ def process_batch(
                 processed.value += 1
             FILES_INGESTER_COUNTER.labels(ingester=INGESTER_GRAFANA_LABEL).inc()
 
-            instances = build_instances_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
+            with stage_timer("records"):
+                records = build_records_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
 
-            instances_dict["issues"].extend(instances["issues"])
-            instances_dict["checkouts"].extend(instances["checkouts"])
-            instances_dict["builds"].extend(instances["builds"])
-            instances_dict["tests"].extend(instances["tests"])
-            instances_dict["incidents"].extend(instances["incidents"])
+            records_dict["issues"].extend(records["issues"])
+            records_dict["checkouts"].extend(records["checkouts"])
+            records_dict["builds"].extend(records["builds"])
+            records_dict["tests"].extend(records["tests"])
+            records_dict["incidents"].extend(records["incidents"])
 
             buffer_files.add((file["name"], file["path"]))
 
-        # Sort instances to prevent deadlocks when multiple transactions update the same rows
-        instances_dict["issues"].sort(key=lambda x: x.id)
-        instances_dict["checkouts"].sort(key=lambda x: x.id)
-        instances_dict["builds"].sort(key=lambda x: x.id)
-        instances_dict["tests"].sort(key=lambda x: x.id)
-        instances_dict["incidents"].sort(key=lambda x: x.id)
+        merge_buffered_duplicates(records_dict)
+
+        # Sort records to prevent deadlocks when multiple transactions update the same rows
+        records_dict["issues"].sort(key=lambda x: x.id)
+        records_dict["checkouts"].sort(key=lambda x: x.id)
+        records_dict["builds"].sort(key=lambda x: x.id)
+        records_dict["tests"].sort(key=lambda x: x.id)
+        records_dict["incidents"].sort(key=lambda x: x.id)
 
         flush_buffers(
             issues_buf=(
-                instances_dict["issues"]
-                if len(instances_dict["issues"]) >= INGEST_BATCH_SIZE
+                records_dict["issues"]
+                if len(records_dict["issues"]) >= INGEST_BATCH_SIZE
                 else []
             ),
             checkouts_buf=(
-                instances_dict["checkouts"]
-                if len(instances_dict["checkouts"]) >= INGEST_BATCH_SIZE
+                records_dict["checkouts"]
+                if len(records_dict["checkouts"]) >= INGEST_BATCH_SIZE
                 else []
             ),
             builds_buf=(
-                instances_dict["builds"]
-                if len(instances_dict["builds"]) >= INGEST_BATCH_SIZE
+                records_dict["builds"]
+                if len(records_dict["builds"]) >= INGEST_BATCH_SIZE
                 else []
             ),
             tests_buf=(
-                instances_dict["tests"]
-                if len(instances_dict["tests"]) >= INGEST_BATCH_SIZE
+                records_dict["tests"]
+                if len(records_dict["tests"]) >= INGEST_BATCH_SIZE
                 else []
             ),
             incidents_buf=(
-                instances_dict["incidents"]
-                if len(instances_dict["incidents"]) >= INGEST_BATCH_SIZE
+                records_dict["incidents"]
+                if len(records_dict["incidents"]) >= INGEST_BATCH_SIZE
                 else []
             ),
             buffer_files=buffer_files,
@@ -423,14 +549,14 @@ def process_batch(
             counter_lock=counter_lock,
         )
 
-    if any(len(instances_dict[table]) for table in instances_dict):
+    if any(len(records_dict[table]) for table in records_dict):
         out("Process finished, flushing remaining buffers")
         flush_buffers(
-            issues_buf=instances_dict["issues"],
-            checkouts_buf=instances_dict["checkouts"],
-            builds_buf=instances_dict["builds"],
-            tests_buf=instances_dict["tests"],
-            incidents_buf=instances_dict["incidents"],
+            issues_buf=records_dict["issues"],
+            checkouts_buf=records_dict["checkouts"],
+            builds_buf=records_dict["builds"],
+            tests_buf=records_dict["tests"],
+            incidents_buf=records_dict["incidents"],
             buffer_files=buffer_files,
             dirs=dirs,
             stat_ok=stat_ok,
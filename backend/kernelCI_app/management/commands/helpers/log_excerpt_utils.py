@@ -2,93 +2,154 @@ import gzip
 import hashlib
 import logging
 import os
-import tempfile
-import threading
-from typing import Any, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from django.db import DatabaseError
+from django.utils import timezone
+from prometheus_client import Counter
+from requests.adapters import HTTPAdapter
 
 import requests
 from kernelCI_app.constants.general import REQUESTS_TIMEOUT_UPLOAD_IN_SECONDS
 from kernelCI_app.constants.ingester import (
     CACHE_LOGS_SIZE_LIMIT,
+    INGESTER_GRAFANA_LABEL,
     LOGEXCERPT_THRESHOLD,
+    LOGEXCERPT_UPLOAD_WORKERS,
     STORAGE_BASE_URL,
     STORAGE_TOKEN,
     UPLOAD_URL,
     VERBOSE,
 )
+from kernelCI_cache.models import LogExcerptUpload
 
-CACHE_LOGS = {}
-cache_logs_lock = threading.Lock()
 logger = logging.getLogger("ingester")
 
+LOG_EXCERPTS_COUNTER = Counter(
+    "kcidb_log_excerpts",
+    "Number of large log excerpts by result: 'uploaded', 'deduplicated' when the"
+    " same content was already uploaded, or 'failed' when it was kept inline",
+    ["ingester", "result"],
+)
+
+# The session and the executor are created by each ingester worker process,
+# connections and threads can't be shared with forked processes
+_upload_session: Optional[requests.Session] = None
+_upload_executor: Optional[ThreadPoolExecutor] = None
+_upload_pid: Optional[int] = None
+
+
+def _ensure_uploader() -> tuple[requests.Session, ThreadPoolExecutor]:
+    global _upload_session, _upload_executor, _upload_pid
+
+    if _upload_pid != os.getpid():
+        session = requests.Session()
+        # Keeps one keep-alive connection to the storage per upload thread
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=LOGEXCERPT_UPLOAD_WORKERS
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        _upload_session = session
+        _upload_executor = ThreadPoolExecutor(
+            max_workers=LOGEXCERPT_UPLOAD_WORKERS,
+            thread_name_prefix="logexcerpt-upload",
+        )
+        _upload_pid = os.getpid()
+
+    return _upload_session, _upload_executor
 
-def upload_logexcerpt(logexcerpt: str, id: str) -> str:
+
+def get_log_excerpt_url(log_hash: str) -> str:
+    return f"{STORAGE_BASE_URL}/logexcerpt/{log_hash}/logexcerpt.txt.gz"
+
+
+def upload_logexcerpt(logexcerpt: str, id: str) -> Optional[str]:
     """
     Upload logexcerpt to storage and return a reference (URL string) if successful.
-    If fails, returns the original logexcerpt.
 
     Args:
         logexcerpt: the unchanged logexcerpt
         id: the hash of the logexcerpt
 
     Returns:
-        str: On success upload: the reference url. On failed upload: the original logexcerpt
+        str|None: The reference url, or None if the upload failed
     """
     if VERBOSE:
         logger.info("Uploading logexcerpt for %s to %s", id, UPLOAD_URL)
-    # make temporary file with logexcerpt data
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".logexcerpt") as temp_file:
-        logexcerpt_filename = temp_file.name
-        logexcerpt_compressed = gzip.compress(logexcerpt.encode("utf-8"))
-        temp_file.write(logexcerpt_compressed)
-        temp_file.flush()
-    with open(logexcerpt_filename, "rb") as f:
-        hdr = {
-            "Authorization": f"Bearer {STORAGE_TOKEN}",
-        }
-        files = {"file0": ("logexcerpt.txt.gz", f), "path": f"logexcerpt/{id}"}
-        try:
-            r = requests.post(
-                UPLOAD_URL,
-                headers=hdr,
-                files=files,
-                timeout=REQUESTS_TIMEOUT_UPLOAD_IN_SECONDS,
-            )
-        except Exception as e:
-            logger.error("Error uploading logexcerpt for %s: %s", id, e)
-            os.remove(logexcerpt_filename)
-            return logexcerpt  # Return original logexcerpt if upload fails
-    os.remove(logexcerpt_filename)
+
+    session, _ = _ensure_uploader()
+    logexcerpt_compressed = gzip.compress(logexcerpt.encode("utf-8"))
+    hdr = {
+        "Authorization": f"Bearer {STORAGE_TOKEN}",
+    }
+    files = {
+        "file0": ("logexcerpt.txt.gz", logexcerpt_compressed),
+        "path": f"logexcerpt/{id}",
+    }
+    try:
+        r = session.post(
+            UPLOAD_URL,
+            headers=hdr,
+            files=files,
+            timeout=REQUESTS_TIMEOUT_UPLOAD_IN_SECONDS,
+        )
+    except Exception as e:
+        logger.error("Error uploading logexcerpt for %s: %s", id, e)
+        return None
+
     if r.status_code != 200:
         logger.error(
             "Failed to upload logexcerpt for %s: %d : %s", id, r.status_code, r.text
         )
-        return logexcerpt  # Return original logexcerpt if upload fails
+        return None
 
-    return f"{STORAGE_BASE_URL}/logexcerpt/{id}/logexcerpt.txt.gz"
+    return get_log_excerpt_url(id)
 
 
-def get_from_cache(log_hash: str) -> Optional[str]:
+def get_uploaded_urls(log_hashes: list[str]) -> dict[str, str]:
     """
-    Check if log_hash is in the cache
+    Looks up log excerpts in the uploads index, shared by the ingester workers
+    and kept across restarts, and marks the ones found as recently used.
 
     Returns:
-        str|None: The log_excerpt if it exists in cache, None otherwise
+        dict: The reference url of each hash that was already uploaded
     """
-    with cache_logs_lock:
-        return CACHE_LOGS.get(log_hash)
+    uploads = LogExcerptUpload.objects.using("cache")
+    try:
+        uploaded_urls = dict(
+            uploads.filter(log_hash__in=log_hashes).values_list("log_hash", "url")
+        )
+        if uploaded_urls:
+            uploads.filter(log_hash__in=list(uploaded_urls)).update(
+                last_used=timezone.now()
+            )
+    except DatabaseError as e:
+        logger.error("Error reading the log excerpt uploads index: %s", e)
+        return {}
+    return uploaded_urls
 
 
-def set_in_cache(log_hash: str, log_excerpt: str) -> None:
-    """
-    Set log_hash in the cache with the given log_excerpt.
-    Ideally, the log_excerpt will arrive as a reference URL to where it was stored.
-    It can arrive as the entire log_excerpt though.
-    """
-    with cache_logs_lock:
-        CACHE_LOGS[log_hash] = log_excerpt
-        if VERBOSE:
-            logger.info("Cached log excerpt with hash %s as %s", log_hash, log_excerpt)
+def save_uploaded_urls(uploaded_urls: dict[str, str]) -> None:
+    """Adds uploaded log excerpts to the uploads index"""
+    now = timezone.now()
+    try:
+        LogExcerptUpload.objects.using("cache").bulk_create(
+            [
+                LogExcerptUpload(log_hash=log_hash, url=url, last_used=now)
+                for log_hash, url in uploaded_urls.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["log_hash"],
+            update_fields=["url", "last_used"],
+        )
+    except DatabaseError as e:
+        logger.error("Error writing the log excerpt uploads index: %s", e)
+        return
+    if VERBOSE:
+        logger.info("Indexed %d uploaded log excerpts", len(uploaded_urls))
 
 
 def set_log_excerpt_ofile(item: dict[str, Any], url: str) -> dict[str, Any]:
@@ -110,74 +171,93 @@ def set_log_excerpt_ofile(item: dict[str, Any], url: str) -> dict[str, Any]:
     return item
 
 
-def process_log_excerpt_from_item(
-    item: dict[str, Any], item_type: Literal["build", "test"]
-) -> None:
-    """
-    Process log_excerpt from a single build or test (item).
-    If log_excerpt is large, upload it to storage and replace with a reference.
-    """
-    id = item.get("id", "unknown")
-    log_excerpt = item["log_excerpt"]
-
-    if isinstance(log_excerpt, str) and len(log_excerpt) > LOGEXCERPT_THRESHOLD:
-        log_hash = hashlib.sha256(log_excerpt.encode("utf-8")).hexdigest()
-        if VERBOSE:
-            logger.info(
-                "Uploading log_excerpt for %s id %s hash %s with size %d bytes",
-                item_type,
-                id,
-                log_hash,
-                len(log_excerpt),
-            )
-        # check if log_excerpt already uploaded (by hash as key)
-        cached_url = get_from_cache(log_hash)
-        if cached_url:
-            if VERBOSE:
-                logger.info(
-                    "Log excerpt for %s %s already uploaded, using cached URL",
-                    item_type,
-                    id,
-                )
-            set_log_excerpt_ofile(item, cached_url)
-        else:
-            cached_url = upload_logexcerpt(log_excerpt, log_hash)
-            # TODO: if upload_logexcerpt fails, should we be caching the entire logexcerpt?
-            set_in_cache(log_hash, cached_url)
-            set_log_excerpt_ofile(item, cached_url)
+def get_large_log_excerpts(
+    input_data: dict[str, Any],
+) -> dict[str, list[dict[str, Any]]]:
+    """Groups the builds and tests with a log_excerpt larger than the
+    threshold by the SHA-256 hash of their log_excerpt"""
+    items_by_hash: dict[str, list[dict[str, Any]]] = {}
+    for item_type in ("builds", "tests"):
+        for item in input_data.get(item_type, []):
+            log_excerpt = item.get("log_excerpt")
+            if isinstance(log_excerpt, str) and len(log_excerpt) > LOGEXCERPT_THRESHOLD:
+                log_hash = hashlib.sha256(log_excerpt.encode("utf-8")).hexdigest()
+                items_by_hash.setdefault(log_hash, []).append(item)
+    return items_by_hash
 
 
 def extract_log_excerpt(input_data: dict[str, Any]) -> None:
     """
     Extract log_excerpt from builds and tests, if it is large,
     upload to storage and replace with a reference.
+
+    Each distinct log_excerpt is uploaded once: the ones found in the uploads
+    index reuse their url, and the others are uploaded concurrently. When an
+    upload fails, the log_excerpt of its items is kept as it is.
     """
     if not STORAGE_TOKEN:
         logger.warning("STORAGE_TOKEN is not set, log_excerpts will not be uploaded")
         return
 
-    builds: list[dict[str, Any]] = input_data.get("builds", [])
-    tests: list[dict[str, Any]] = input_data.get("tests", [])
+    items_by_hash = get_large_log_excerpts(input_data)
+    if not items_by_hash:
+        return
+
+    urls = get_uploaded_urls(list(items_by_hash))
+    missing_hashes = [log_hash for log_hash in items_by_hash if log_hash not in urls]
+
+    uploaded_urls: dict[str, str] = {}
+    if missing_hashes:
+        _, executor = _ensure_uploader()
+        upload_futures = {
+            log_hash: executor.submit(
+                upload_logexcerpt, items_by_hash[log_hash][0]["log_excerpt"], log_hash
+            )
+            for log_hash in missing_hashes
+        }
+        for log_hash, future in upload_futures.items():
+            url = future.result()
+            if url is not None:
+                uploaded_urls[log_hash] = url
+        if uploaded_urls:
+            save_uploaded_urls(uploaded_urls)
 
-    for build in builds:
-        if build.get("log_excerpt"):
-            process_log_excerpt_from_item(item=build, item_type="build")
+    for result, count in (
+        ("deduplicated", len(urls)),
+        ("uploaded", len(uploaded_urls)),
+        ("failed", len(missing_hashes) - len(uploaded_urls)),
+    ):
+        if count:
+            LOG_EXCERPTS_COUNTER.labels(
+                ingester=INGESTER_GRAFANA_LABEL, result=result
+            ).inc(count)
 
-    for test in tests:
-        if test.get("log_excerpt"):
-            process_log_excerpt_from_item(item=test, item_type="test")
+    urls.update(uploaded_urls)
+    for log_hash, items in items_by_hash.items():
+        url = urls.get(log_hash)
+        if url is None:
+            continue
+        for item in items:
+            set_log_excerpt_ofile(item, url)
 
 
 def cache_logs_maintenance() -> None:
     """
-    Periodically clean up the cache logs to prevent memory leak and slow down.
-    If CACHE_LOGS grow over 100k entries, clear it.
+    Keeps the uploads index within CACHE_LOGS_SIZE_LIMIT entries,
+    pruning the least recently used ones.
     """
-
-    # Limit the size of the cache to prevent memory leaks
-    # (we don't really need lock, as workers idle, but just in case)
-    with cache_logs_lock:
-        if len(CACHE_LOGS) > CACHE_LOGS_SIZE_LIMIT:
-            CACHE_LOGS.clear()
-            if VERBOSE:
-                logger.info("Cache logs cleared")
+    uploads = LogExcerptUpload.objects.using("cache")
+    try:
+        cutoff = (
+            uploads.order_by("-last_used")
+            .values_list("last_used", flat=True)[CACHE_LOGS_SIZE_LIMIT:]
+            .first()
+        )
+        if cutoff is None:
+            return
+        deleted, _ = uploads.filter(last_used__lte=cutoff).delete()
+    except DatabaseError as e:
+        logger.error("Error pruning the log excerpt uploads index: %s", e)
+        return
+    if VERBOSE:
+        logger.info("Pruned %d entries of the log excerpt uploads index", deleted)
@@ -1,7 +1,7 @@
 import hashlib
 from typing import NamedTuple, Optional, Sequence, TypedDict
 
-from kernelCI_app.constants.general import UNKNOWN_STRING
+from kernelCI_app.constants.general import MAESTRO_DUMMY_BUILD_PREFIX, UNKNOWN_STRING
 from kernelCI_app.constants.process_pending import ROLLUP_STATUS_FIELDS
 from kernelCI_app.helpers.logger import logger
 from kernelCI_app.models import Builds, Checkouts, Incidents, PendingTest, StatusChoices
@@ -12,6 +12,17 @@ def get_rollup_key(test_id: str) -> bytes:
     return hashlib.sha256(f"rollup|{test_id}".encode("utf-8")).digest()
 
 
+def get_hardware_rollup_key(entity_id: str, hardware_id: Optional[str] = None) -> bytes:
+    """
+    Generate a hash (hardware rollup key) with 'hardware_rollup|' prefix for namespacing.
+
+    Tests are keyed by their id alone since all of their rows are written at once,
+    while builds are keyed per hardware since they are counted once for each.
+    """
+    key = entity_id if hardware_id is None else f"{hardware_id}|{entity_id}"
+    return hashlib.sha256(f"hardware_rollup|{key}".encode("utf-8")).digest()
+
+
 EMPTY_PATH_GROUP = "-"
 
 
@@ -35,6 +46,24 @@ class RollupKey(NamedTuple):
     is_boot: bool
 
 
+class HardwareRollupKey(NamedTuple):
+    hardware_id: str
+    checkout_id: str
+    origin: str
+    platform: Optional[str]
+    compatibles: Optional[tuple[str, ...]]
+    path_group: str
+    config: str
+    arch: str
+    compiler: str
+    lab: Optional[str]
+    issue_id: Optional[str]
+    issue_version: Optional[int]
+    issue_uncategorized: bool
+    is_boot: bool
+    is_build: bool
+
+
 class RollupEntryData(TypedDict):
     checkout: Checkouts
     path_group: str
@@ -85,21 +114,27 @@ def accumulate_rollup_entry(
         is_boot=entry["is_boot"],
     )
 
-    record = rollup_data.setdefault(
-        rollup_key,
-        {
-            "pass_tests": 0,
-            "fail_tests": 0,
-            "skip_tests": 0,
-            "error_tests": 0,
-            "miss_tests": 0,
-            "done_tests": 0,
-            "null_tests": 0,
-            "total_tests": 0,
-        },
-    )
+    record = rollup_data.setdefault(rollup_key, _init_rollup_record())
+    _increment_rollup_record(record, entry["status"], is_correction=is_correction)
+
 
-    counter = ROLLUP_STATUS_FIELDS.get(entry["status"], "null_tests")
+def _init_rollup_record() -> dict:
+    return {
+        "pass_tests": 0,
+        "fail_tests": 0,
+        "skip_tests": 0,
+        "error_tests": 0,
+        "miss_tests": 0,
+        "done_tests": 0,
+        "null_tests": 0,
+        "total_tests": 0,
+    }
+
+
+def _increment_rollup_record(
+    record: dict, status: Optional[StatusChoices], *, is_correction: bool
+) -> None:
+    counter = ROLLUP_STATUS_FIELDS.get(status, "null_tests")
 
     if is_correction:
         record["null_tests"] -= 1
@@ -179,24 +214,155 @@ def aggregate_tests_rollup(
     return rollup_data
 
 
-def fetch_test_issues(test_ids: list[str]) -> dict[str, dict]:
+def get_hardware_ids(
+    platform: Optional[str], compatibles: Optional[Sequence[str]]
+) -> list[str]:
     """
-    Bulk-fetch the first (earliest) incident per test_id.
+    Returns every hardware a test ran on, which are its compatibles and its platform,
+    matching the `environment_compatible @> ARRAY[...] OR platform = ...` lookups.
+    """
+    hardware_ids = list(dict.fromkeys(compatibles or []))
+    if platform is not None and platform not in hardware_ids:
+        hardware_ids.append(platform)
+    return hardware_ids
 
-    Returns a mapping {test_id: {"issue_id": ..., "issue_version": ...}}.
-    "First" is defined as the earliest incident ordered by test_id,
-    field_timestamp, and id to ensure deterministic results.
+
+def is_hardware_countable_build(build: Builds) -> bool:
+    """Dummy builds and builds without config are not counted in hardware details"""
+    return build.config_name is not None and not build.id.startswith(
+        MAESTRO_DUMMY_BUILD_PREFIX
+    )
+
+
+def _accumulate_hardware_rollup_entry(
+    rollup_data: dict[HardwareRollupKey, dict],
+    *,
+    hardware_id: str,
+    test: PendingTest,
+    build: Builds,
+    origin: str,
+    path_group: str,
+    lab: Optional[str],
+    issue_info: dict,
+    status: Optional[StatusChoices],
+    is_boot: bool,
+    is_build: bool,
+    is_correction: bool,
+) -> None:
+    """Accumulate a single test or build entry into rollup_data in-place."""
+    issue_id = issue_info.get("issue_id")
+    rollup_key = HardwareRollupKey(
+        hardware_id=hardware_id,
+        checkout_id=build.checkout.id,
+        origin=origin,
+        platform=test.platform,
+        compatibles=tuple(test.compatible) if test.compatible else None,
+        path_group=path_group,
+        config=build.config_name or UNKNOWN_STRING,
+        arch=build.architecture or UNKNOWN_STRING,
+        compiler=build.compiler or UNKNOWN_STRING,
+        lab=lab,
+        issue_id=issue_id,
+        issue_version=issue_info.get("issue_version"),
+        issue_uncategorized=issue_id is None and status == StatusChoices.FAIL,
+        is_boot=is_boot,
+        is_build=is_build,
+    )
+    record = rollup_data.get(rollup_key)
+    if record is None:
+        record = _init_rollup_record()
+        record["start_time"] = build.checkout.start_time
+        rollup_data[rollup_key] = record
+    _increment_rollup_record(record, status, is_correction=is_correction)
+
+
+def aggregate_hardware_tests_rollup(
+    tests_to_process: Sequence[PendingTest],
+    builds_to_process: Sequence[tuple[str, PendingTest]],
+    test_builds_by_id: dict[str, Builds],
+    test_issues_map: dict[str, dict],
+    build_issues_map: dict[str, dict],
+    *,
+    reprocess_test_ids: set[str] | None = None,
+    reprocess_build_keys: set[tuple[str, str]] | None = None,
+) -> dict[HardwareRollupKey, dict]:
+    """
+    Build hardware rollup data from pending tests and the builds they belong to.
+
+    `builds_to_process` holds `(hardware_id, test)` pairs, where the test is the one
+    that brought the build to that hardware, and `reprocess_build_keys` holds the
+    `(hardware_id, build_id)` pairs that were counted before with a null status.
+
+    Returns rollup data without touching the database.
     """
+    rollup_data: dict[HardwareRollupKey, dict] = {}
+
+    if reprocess_test_ids is None:
+        reprocess_test_ids = set()
+    if reprocess_build_keys is None:
+        reprocess_build_keys = set()
+
+    for test in tests_to_process:
+        try:
+            build = test_builds_by_id[test.build_id]
+        except KeyError:
+            logger.warning(
+                f"Found test {test.test_id} with no build {test.build_id} "
+                "on aggregate_hardware_tests_rollup"
+            )
+            continue
+
+        for hardware_id in get_hardware_ids(test.platform, test.compatible):
+            _accumulate_hardware_rollup_entry(
+                rollup_data,
+                hardware_id=hardware_id,
+                test=test,
+                build=build,
+                origin=test.origin,
+                path_group=extract_path_group(test.path or ""),
+                lab=test.lab,
+                issue_info=test_issues_map.get(test.test_id, {}),
+                status=test.full_status,
+                is_boot=test.is_boot,
+                is_build=False,
+                is_correction=test.test_id in reprocess_test_ids,
+            )
+
+    for hardware_id, test in builds_to_process:
+        build = test_builds_by_id.get(test.build_id)
+        if build is None:
+            continue
+
+        build_misc = build.misc or {}
+        _accumulate_hardware_rollup_entry(
+            rollup_data,
+            hardware_id=hardware_id,
+            test=test,
+            build=build,
+            origin=build.origin,
+            path_group=EMPTY_PATH_GROUP,
+            lab=build_misc.get("lab"),
+            issue_info=build_issues_map.get(build.id, {}),
+            status=build.status,
+            is_boot=False,
+            is_build=True,
+            is_correction=(hardware_id, build.id) in reprocess_build_keys,
+        )
+
+    return rollup_data
+
+
+def _fetch_first_issues(field: str, ids: list[str]) -> dict[str, dict]:
     issues_map: dict[str, dict] = {}
     incidents = (
-        Incidents.objects.filter(test_id__in=test_ids)
-        .order_by("test_id", "field_timestamp", "id")
-        .values("test_id", "issue_id", "issue_version")
+        Incidents.objects.filter(**{f"{field}__in": ids})
+        .order_by(field, "field_timestamp", "id")
+        .values(field, "issue_id", "issue_version")
     )
 
     for inc in incidents:
         issues_map.setdefault(
-            inc["test_id"],
+            inc[field],
             {
                 "issue_id": inc["issue_id"],
                 "issue_version": inc["issue_version"],
@@ -204,3 +370,22 @@ def fetch_test_issues(test_ids: list[str]) -> dict[str, dict]:
         )
 
     return issues_map
+
+
+def fetch_test_issues(test_ids: list[str]) -> dict[str, dict]:
+    """
+    Bulk-fetch the first (earliest) incident per test_id.
+
+    Returns a mapping {test_id: {"issue_id": ..., "issue_version": ...}}.
+    "First" is defined as the earliest incident ordered by test_id,
+    field_timestamp, and id to ensure deterministic results.
+    """
+    return _fetch_first_issues("test_id", test_ids)
+
+
+def fetch_build_issues(build_ids: list[str]) -> dict[str, dict]:
+    """
+    Bulk-fetch the first (earliest) incident per build_id,
+    with the same mapping and ordering as `fetch_test_issues`.
+    """
+    return _fetch_first_issues("build_id", build_ids)
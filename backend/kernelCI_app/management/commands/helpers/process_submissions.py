@@ -7,144 +7,62 @@ from prometheus_client import Counter
 from pydantic import ValidationError
 
 from kernelCI_app.constants.ingester import INGESTER_GRAFANA_LABEL
+from kernelCI_app.management.commands.helpers.ingest_records import make_record
 from kernelCI_app.models import Builds, Checkouts, Incidents, Issues, Tests
-from kernelCI_app.typeModels.modelTypes import TableNames
+from kernelCI_app.typeModels.modelTypes import (
+    MODEL_MAP,
+    TableModels,
+    TableNames,
+    TableRecord,
+)
 
 
 class ProcessedSubmission(TypedDict):
-    """Stores the list of items in a single submission.
+    """Stores the records of a single submission, grouped by table.
     Lists can't be None but can be empty."""
 
-    issues: list[Issues]
-    checkouts: list[Checkouts]
-    builds: list[Builds]
-    tests: list[Tests]
-    incidents: list[Incidents]
+    issues: list[TableRecord]
+    checkouts: list[TableRecord]
+    builds: list[TableRecord]
+    tests: list[TableRecord]
+    incidents: list[TableRecord]
 
 
 logger = logging.getLogger(__name__)
 
 
-def get_model_fields(model_fields) -> set[str]:
-    """
-    Gathers a set of the field_names of a model in order to validate them.
-    This is done such that django doesn't complain about extra fields in a model.
-    """
-    valid_fields = set()
-    for field in model_fields:
-        if field.__class__.__name__ == "ForeignKey":
-            valid_fields.add(f"{field.name}_id")
-        else:
-            valid_fields.add(field.name)
-    return valid_fields
-
-
-ISSUE_FIELDS = get_model_fields(Issues._meta.get_fields())
-CHECKOUT_FIELDS = get_model_fields(Checkouts._meta.get_fields())
-BUILD_FIELDS = get_model_fields(Builds._meta.get_fields())
-TEST_FIELDS = get_model_fields(Tests._meta.get_fields())
-INCIDENT_FIELDS = get_model_fields(Incidents._meta.get_fields())
-
-
-def flatten_dict_specific(target: dict[str, Any], target_fields: list[str]):
-    """
-    Flatten specific fields of a dict on a one-level-deep only.
-    Done in order to avoid flattening fields that should be kept as JSONs
-     (which happens with other libraries such as flatdict).
-
-    Example of `flatten_dict_specific(test_data, ["environment"])`:
-    `test_data` will go from
-    ```
-    {
-        environment: {
-            comment: "foo"
-            misc: {
-                platform: "bar"
-            }
-        }
-    }
-    ```
-    to
-    ```
-    {
-        environment_comment: "foo"
-        environment_misc: {
-            platform: "bar"
-        }
-    }
-    """
-
-    separator = "_"
-
-    flattened_dict = target.copy()
-    for first_key, value in target.items():
-        if first_key in target_fields:
-            if isinstance(value, dict):
-                for (
-                    inner_key,
-                    real_value,
-                ) in value.items():
-                    merged_key = separator.join([first_key, inner_key])
-                    flattened_dict[merged_key] = real_value
-                del flattened_dict[first_key]
-            else:
-                print(f"Target key {first_key} is not a dict")
-                continue
-
-    return flattened_dict
+def make_instance(table_name: TableNames, item: dict[str, Any]) -> TableModels:
+    """Builds an unsaved model instance from a submission item, through its record"""
+    record = make_record(table_name, item, timestamp=timezone.now())
+    return MODEL_MAP[table_name](**record._asdict())
 
 
 def make_issue_instance(issue: dict[str, Any]) -> Issues:
-    flattened_issue = flatten_dict_specific(issue, ["culprit"])
-    filtered_issue = {
-        key: value for key, value in flattened_issue.items() if key in ISSUE_FIELDS
-    }
-    obj = Issues(**filtered_issue)
-    obj.field_timestamp = timezone.now()
-    return obj
+    return make_instance("issues", issue)
 
 
 def make_checkout_instance(checkout: dict[str, Any]) -> Checkouts:
-    filtered_checkout = {
-        key: value for key, value in checkout.items() if key in CHECKOUT_FIELDS
-    }
-    obj = Checkouts(**filtered_checkout)
-    obj.field_timestamp = timezone.now()
-    return obj
+    return make_instance("checkouts", checkout)
 
 
 def make_build_instance(build: dict[str, Any]) -> Builds:
-    filtered_build = {key: value for key, value in build.items() if key in BUILD_FIELDS}
-    obj = Builds(**filtered_build)
-    obj.field_timestamp = timezone.now()
-    return obj
+    return make_instance("builds", build)
 
 
 def make_test_instance(test: dict[str, Any]) -> Tests:
-    flattened_test = flatten_dict_specific(test, ["environment", "number"])
-    filtered_test = {
-        key: value for key, value in flattened_test.items() if key in TEST_FIELDS
-    }
-    obj = Tests(**filtered_test)
-    obj.field_timestamp = timezone.now()
-    return obj
+    return make_instance("tests", test)
 
 
 def make_incident_instance(incident: dict[str, Any]) -> Incidents:
-    filtered_incident = {
-        key: value for key, value in incident.items() if key in INCIDENT_FIELDS
-    }
-    obj = Incidents(**filtered_incident)
-    obj.field_timestamp = timezone.now()
-    return obj
+    return make_instance("incidents", incident)
 
 
-def build_instances_from_submission(
+def build_records_from_submission(
     data: dict[str, Any], counters: dict[TableNames, Counter]
 ) -> ProcessedSubmission:
     """
-    Convert raw submission dicts into unsaved Django model instances, grouped by type.
-    Per-item errors are logged and the item is skipped, matching the previous behavior.
+    Convert raw submission dicts into records, grouped by type.
+    Per-item errors are logged and the item is skipped.
 
     Params:
         data: the submission data in dict format
@@ -157,6 +75,8 @@ def build_instances_from_submission(
         "tests": [],
         "incidents": [],
     }
+    # Every record of a submission gets the same ingestion timestamp
+    timestamp = timezone.now()
 
     def _process(items, item_type: TableNames):
         if not items:
@@ -168,67 +88,42 @@ def build_instances_from_submission(
                 )
                 continue
             try:
+                record = make_record(item_type, item, timestamp=timestamp)
+                out[item_type].append(record)
                 match item_type:
-                    case "issues":
-                        issue = make_issue_instance(item)
-                        out["issues"].append(issue)
-                        counters["issues"].labels(
-                            ingester=INGESTER_GRAFANA_LABEL, origin=issue.origin
-                        ).inc()
-                    case "checkouts":
-                        checkout = make_checkout_instance(item)
-                        out["checkouts"].append(checkout)
-                        counters["checkouts"].labels(
-                            ingester=INGESTER_GRAFANA_LABEL, origin=checkout.origin
-                        ).inc()
                     case "builds":
-                        build = make_build_instance(item)
-                        out["builds"].append(build)
-
                         try:
-                            misc = build.misc
-                            lab = misc.get("lab")
+                            lab = record.misc.get("lab")
                         except AttributeError:
                             lab = None
 
                         counters["builds"].labels(
                             ingester=INGESTER_GRAFANA_LABEL,
-                            origin=build.origin,
+                            origin=record.origin,
                             lab=lab,
                         ).inc()
                     case "tests":
-                        test = make_test_instance(item)
-                        out["tests"].append(test)
-
                         try:
-                            misc = test.misc
+                            misc = record.misc
                             lab = misc.get("lab", misc.get("runtime"))
                         except AttributeError:
                             lab = None
 
                         try:
-                            environment_misc = test.environment_misc
-                            platform = environment_misc.get("platform")
+                            platform = record.environment_misc.get("platform")
                         except AttributeError:
                             platform = None
 
                         counters["tests"].labels(
                             ingester=INGESTER_GRAFANA_LABEL,
-                            origin=test.origin,
+                            origin=record.origin,
                             lab=lab,
                             platform=platform,
                         ).inc()
-                    case "incidents":
-                        incident = make_incident_instance(item)
-                        out["incidents"].append(incident)
-                        counters["incidents"].labels(
-                            ingester=INGESTER_GRAFANA_LABEL, origin=incident.origin
-                        ).inc()
                     case _:
-                        raise ValueError(f"Unknown item type: {item_type}")
-            except ValidationError as ve:
-                logger.error(f"Validation error for {item_type} item: {ve}")
-                continue
+                        counters[item_type].labels(
+                            ingester=INGESTER_GRAFANA_LABEL, origin=record.origin
+                        ).inc()
             except Exception as e:
                 logger.error(f"{e.__class__.__name__} error for {item_type} item: {e}")
                 continue
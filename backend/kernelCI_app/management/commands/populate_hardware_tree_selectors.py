@@ -0,0 +1,39 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from kernelCI_app.helpers.logger import out
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_hardware_tree_selectors,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute hardware_tree_selectors from the checkouts and builds tables. "
+        "Needed for data ingested before this table existed."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the checkouts that would be processed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM checkouts")
+                (checkout_count,) = cursor.fetchone()
+            out(f"DRY-RUN would merge {checkout_count} checkouts")
+            return
+
+        t0 = time.time()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM hardware_tree_selectors")
+            update_hardware_tree_selectors(checkout_ids=None)
+        out(f"Recomputed hardware tree selectors in {time.time() - t0:.3f}s")
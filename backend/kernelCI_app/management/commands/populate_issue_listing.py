@@ -0,0 +1,40 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from kernelCI_app.helpers.logger import out
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_issue_listing,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute issue_listing from the issues, incidents and issue_seen_* tables. "
+        "Needed for data ingested before this table existed and after running "
+        "populate_issue_seen_summary."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the issues that would be processed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM issues")
+                (issue_count,) = cursor.fetchone()
+            out(f"DRY-RUN would merge {issue_count} issues")
+            return
+
+        t0 = time.time()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM issue_listing")
+            update_issue_listing(issue_ids=None)
+        out(f"Recomputed issue listing in {time.time() - t0:.3f}s")
@@ -0,0 +1,41 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from kernelCI_app.helpers.logger import out
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_issue_seen_summary,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute issue_seen_summary and issue_seen_trees from the incidents table. "
+        "Needed for data ingested before these tables existed and for incidents "
+        "that were ingested before their builds or tests."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the incidents that would be processed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM incidents")
+                (incident_count,) = cursor.fetchone()
+            out(f"DRY-RUN would merge {incident_count} incidents")
+            return
+
+        t0 = time.time()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM issue_seen_summary")
+                cursor.execute("DELETE FROM issue_seen_trees")
+            update_issue_seen_summary(incident_ids=None)
+        out(f"Recomputed issue seen summaries in {time.time() - t0:.3f}s")
@@ -0,0 +1,57 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from kernelCI_app.helpers.logger import out
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_test_series,
+)
+from kernelCI_app.management.commands.helpers.intervals import parse_interval
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy tests into the test_series table used by the test status history. "
+        "Needed for data ingested before this table existed."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--start-interval",
+            type=str,
+            help="Only copy tests ingested within this interval "
+            "('x days' or 'x hours' format, e.g. '30 days'). "
+            "If not provided, all tests are copied.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the tests that would be processed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        since = None
+        if options["start_interval"] is not None:
+            try:
+                since = parse_interval(options["start_interval"])
+            except ValueError as e:
+                raise CommandError(str(e)) from e
+
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                if since is None:
+                    cursor.execute("SELECT COUNT(*) FROM tests")
+                else:
+                    cursor.execute(
+                        "SELECT COUNT(*) FROM tests WHERE _timestamp >= %s", [since]
+                    )
+                (test_count,) = cursor.fetchone()
+            out(f"DRY-RUN would copy {test_count} tests")
+            return
+
+        t0 = time.time()
+        with transaction.atomic():
+            update_test_series(test_ids=None, since=since)
+        out(f"Populated test series in {time.time() - t0:.3f}s")
@@ -0,0 +1,39 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from kernelCI_app.helpers.logger import out
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_tree_commit_timeline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute tree_commit_timeline from the checkouts table. "
+        "Needed for data ingested before this table existed."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the checkouts that would be processed",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["dry_run"]:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COUNT(*) FROM checkouts")
+                (checkout_count,) = cursor.fetchone()
+            out(f"DRY-RUN would merge {checkout_count} checkouts")
+            return
+
+        t0 = time.time()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM tree_commit_timeline")
+            update_tree_commit_timeline(checkout_ids=None)
+        out(f"Recomputed tree commit timeline in {time.time() - t0:.3f}s")
@@ -10,17 +10,27 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import connection, transaction
 from django.db.utils import OperationalError
-from prometheus_client import Counter, start_http_server
+from django.utils import timezone
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
 from psycopg.errors import DeadlockDetected
 
 from kernelCI_app.constants.general import MAESTRO_DUMMY_BUILD_PREFIX
 from kernelCI_app.constants.ingester import PROMETHEUS_MULTIPROC_DIR
 from kernelCI_app.helpers.logger import out
-from kernelCI_app.management.commands.helpers.aggregation_helpers import simplify_status
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    simplify_status,
+    update_test_series,
+)
 from kernelCI_app.management.commands.helpers.process_pending_helpers import (
+    HardwareRollupKey,
+    aggregate_hardware_tests_rollup,
     aggregate_tests_rollup,
+    fetch_build_issues,
     fetch_test_issues,
+    get_hardware_ids,
+    get_hardware_rollup_key,
     get_rollup_key,
+    is_hardware_countable_build,
 )
 from kernelCI_app.management.commands.helpers.tree_listing import (
     TreeListingRow,
@@ -38,7 +48,9 @@ from kernelCI_app.models import (
 AGGREGATION_RECORDS_WRITTEN = Counter(
     "aggregation_records_written_total",
     "Total number of records written to destination tables",
-    ["table"],  # values: "tree_listing", "hardware_status", "processed_items"
+    # values: "tree_listing", "hardware_status", "tree_tests_rollup",
+    # "hardware_tests_rollup", "test_series", "processed_items"
+    ["table"],
 )
 
 DEADLOCK_RETRIES_TOTAL = Counter(
@@ -47,6 +59,63 @@ DEADLOCK_RETRIES_TOTAL = Counter(
     ["table"],  # values: "tree_listing", "hardware_status"
 )
 
+AGGREGATION_PENDING_ROWS = Gauge(
+    "aggregation_pending_rows",
+    "Number of rows waiting to be aggregated in the pending tables",
+    ["table"],  # values: "pending_test", "pending_builds"
+    multiprocess_mode="livemax",
+)
+
+AGGREGATION_OLDEST_PENDING_AGE = Gauge(
+    "aggregation_oldest_pending_age_seconds",
+    "Time since the oldest row of the pending tables was ingested",
+    ["table"],  # values: "pending_test", "pending_builds"
+    multiprocess_mode="livemax",
+)
+
+AGGREGATION_BATCH_DURATION = Histogram(
+    "aggregation_batch_duration_seconds",
+    "Duration of each phase of a batch: 'claim' locks the pending rows and reads"
+    " their builds and checkouts, 'aggregate' updates the hardware status, rollups"
+    " and test series, 'write' updates the tree listing and 'delete' removes the"
+    " aggregated pending rows",
+    ["phase"],
+)
+
+AGGREGATION_SKIPPED_ROWS = Counter(
+    "aggregation_skipped_rows_total",
+    "Number of pending rows skipped because their build or checkout wasn't found."
+    " They are retried by the next batches, which count them again",
+    ["table"],  # values: "pending_test", "pending_builds"
+)
+
+# The pending rows have no timestamp, so their age is the one of their test or build
+PENDING_BACKLOG_QUERIES = {
+    "pending_test": """
+        SELECT COUNT(*), MIN(t._timestamp)
+        FROM pending_test p
+        LEFT JOIN tests t ON t.id = p.test_id
+    """,
+    "pending_builds": """
+        SELECT COUNT(*), MIN(b._timestamp)
+        FROM pending_builds p
+        LEFT JOIN builds b ON b.id = p.build_id
+    """,
+}
+
+
+def update_pending_backlog() -> None:
+    """Exports the size of the pending tables and the age of their oldest row"""
+    now = timezone.now()
+    with connection.cursor() as cursor:
+        for table, query in PENDING_BACKLOG_QUERIES.items():
+            cursor.execute(query)
+            count, oldest_timestamp = cursor.fetchone()
+            AGGREGATION_PENDING_ROWS.labels(table=table).set(count)
+            AGGREGATION_OLDEST_PENDING_AGE.labels(table=table).set(
+                (now - oldest_timestamp).total_seconds() if oldest_timestamp else 0
+            )
+
 
 class ListingItemCount(TypedDict):
     build_pass: int
@@ -521,6 +590,20 @@ class Command(BaseCommand):
         Pending tests are generated through the monitor_submissions command.
         """
     running = True
+    backlog_interval = int(os.getenv("PROCESS_PENDING_BACKLOG_INTERVAL", "30"))
+    backlog_updated_at: Optional[float] = None
+
+    def _update_pending_backlog(self) -> None:
+        """Refreshes the backlog metrics at most once every `backlog_interval`
+        seconds, since counting a large backlog is expensive"""
+        now = time.monotonic()
+        if (
+            self.backlog_updated_at is not None
+            and now - self.backlog_updated_at < self.backlog_interval
+        ):
+            return
+        update_pending_backlog()
+        self.backlog_updated_at = now
 
     def signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
@@ -803,6 +886,7 @@ class Command(BaseCommand):
 
         if not found_checkouts:
             out("No checkouts found for pending builds, skipping batch")
+            skipped_no_checkout = pending_build_count
             return (
                 ready_builds,
                 build_checkouts_by_id,
@@ -879,6 +963,7 @@ class Command(BaseCommand):
             Builds.objects.select_related("checkout")
             .only(
                 "id",
+                "origin",
                 "status",
                 "architecture",
                 "compiler",
@@ -897,6 +982,7 @@ class Command(BaseCommand):
 
         if not found_test_builds:
             out("No builds found for pending tests, skipping batch")
+            skipped_no_build = pending_test_count
             return (
                 ready_tests,
                 test_builds_by_id,
@@ -1048,6 +1134,185 @@ class Command(BaseCommand):
         self._process_tests_rollup(rollup_data)
         self._process_new_processed_entries(new_processed_entries)
 
+    def _process_hardware_tests_rollup(
+        self, rollup_data: dict[HardwareRollupKey, dict]
+    ) -> None:
+        if not rollup_data:
+            return
+
+        values = [
+            (
+                key.hardware_id,
+                key.checkout_id,
+                data["start_time"],
+                key.origin,
+                key.platform,
+                list(key.compatibles) if key.compatibles is not None else None,
+                key.path_group,
+                key.config,
+                key.arch,
+                key.compiler,
+                key.lab,
+                key.issue_id,
+                key.issue_version,
+                key.issue_uncategorized,
+                key.is_boot,
+                key.is_build,
+                data["pass_tests"],
+                data["fail_tests"],
+                data["skip_tests"],
+                data["error_tests"],
+                data["miss_tests"],
+                data["done_tests"],
+                data["null_tests"],
+                data["total_tests"],
+            )
+            for key, data in rollup_data.items()
+        ]
+
+        t0 = time.time()
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO hardware_tests_rollup (
+                    hardware_id, checkout_id, start_time,
+                    origin, test_platform, test_compatibles,
+                    path_group, build_config_name, build_architecture, build_compiler,
+                    lab, issue_id, issue_version, issue_uncategorized,
+                    is_boot, is_build,
+                    pass_tests, fail_tests, skip_tests,
+                    error_tests, miss_tests, done_tests,
+                    null_tests, total_tests
+                )
+                VALUES (
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
+                )
+                ON CONFLICT ON CONSTRAINT hardware_tests_rollup_unique DO UPDATE SET
+                    pass_tests = hardware_tests_rollup.pass_tests + EXCLUDED.pass_tests,
+                    fail_tests = hardware_tests_rollup.fail_tests + EXCLUDED.fail_tests,
+                    skip_tests = hardware_tests_rollup.skip_tests + EXCLUDED.skip_tests,
+                    error_tests = hardware_tests_rollup.error_tests + EXCLUDED.error_tests,
+                    miss_tests = hardware_tests_rollup.miss_tests + EXCLUDED.miss_tests,
+                    done_tests = hardware_tests_rollup.done_tests + EXCLUDED.done_tests,
+                    null_tests = hardware_tests_rollup.null_tests + EXCLUDED.null_tests,
+                    total_tests = hardware_tests_rollup.total_tests + EXCLUDED.total_tests
+                """,
+                values,
+            )
+        out(
+            f"Upserted {len(values)} hardware_tests_rollup records "
+            f"in {time.time() - t0:.3f}s"
+        )
+        AGGREGATION_RECORDS_WRITTEN.labels(table="hardware_tests_rollup").inc(
+            len(values)
+        )
+
+    def _process_hardware_tests_rollup_batch(
+        self,
+        ready_tests: Sequence[PendingTest],
+        test_builds_by_id: dict[str, Builds],
+    ) -> None:
+        """
+        Counts each test once and each build once per hardware in hardware_tests_rollup,
+        following the same processed/reprocess rules as `_process_tests_rollup_batch`.
+        """
+        if not ready_tests:
+            return
+
+        test_keys: dict[str, tuple[bytes, PendingTest]] = {}
+        build_keys: dict[tuple[str, str], tuple[bytes, PendingTest]] = {}
+        for test in ready_tests:
+            build = test_builds_by_id.get(test.build_id)
+            hardware_ids = get_hardware_ids(test.platform, test.compatible)
+            if build is None or not hardware_ids:
+                continue
+
+            test_keys[test.test_id] = (get_hardware_rollup_key(test.test_id), test)
+            if not is_hardware_countable_build(build):
+                continue
+            for hardware_id in hardware_ids:
+                build_keys.setdefault(
+                    (hardware_id, build.id),
+                    (get_hardware_rollup_key(build.id, hardware_id=hardware_id), test),
+                )
+
+        existing_processed = _get_existing_processed(
+            {key for key, _ in test_keys.values()}
+            | {key for key, _ in build_keys.values()}
+        )
+        existing_by_key = {
+            (e.listing_item_key, e.checkout_id): e for e in existing_processed
+        }
+        new_processed_entries: set[ProcessedListingItems] = set()
+
+        def should_process(
+            key: bytes, checkout_id: str, status: Optional[SimplifiedStatusChoices]
+        ) -> tuple[bool, bool]:
+            """Returns whether the item must be counted and if it is a correction"""
+            found_existing = existing_by_key.get((key, checkout_id))
+            if found_existing is not None and (
+                found_existing.status is not None or status is None
+            ):
+                return False, False
+            new_processed_entries.add(
+                ProcessedListingItems(
+                    listing_item_key=key, checkout_id=checkout_id, status=status
+                )
+            )
+            # null -> non-null: This is a correction (reprocess)
+            return True, found_existing is not None
+
+        tests_to_process: list[PendingTest] = []
+        reprocess_test_ids: set[str] = set()
+        for test_id, (key, test) in test_keys.items():
+            checkout_id = test_builds_by_id[test.build_id].checkout.id
+            process, is_correction = should_process(key, checkout_id, test.status)
+            if not process:
+                continue
+            tests_to_process.append(test)
+            if is_correction:
+                reprocess_test_ids.add(test_id)
+
+        builds_to_process: list[tuple[str, PendingTest]] = []
+        reprocess_build_keys: set[tuple[str, str]] = set()
+        for (hardware_id, build_id), (key, test) in build_keys.items():
+            build = test_builds_by_id[build_id]
+            process, is_correction = should_process(
+                key, build.checkout.id, simplify_status(build.status)
+            )
+            if not process:
+                continue
+            builds_to_process.append((hardware_id, test))
+            if is_correction:
+                reprocess_build_keys.add((hardware_id, build_id))
+
+        if not tests_to_process and not builds_to_process:
+            return
+
+        rollup_data = aggregate_hardware_tests_rollup(
+            tests_to_process,
+            builds_to_process,
+            test_builds_by_id,
+            fetch_test_issues([test.test_id for test in tests_to_process]),
+            fetch_build_issues(list({test.build_id for _, test in builds_to_process})),
+            reprocess_test_ids=reprocess_test_ids,
+            reprocess_build_keys=reprocess_build_keys,
+        )
+
+        self._process_hardware_tests_rollup(rollup_data)
+        self._process_new_processed_entries(new_processed_entries)
+
+    def _process_test_series_batch(self, ready_tests: Sequence[PendingTest]) -> None:
+        """Copies the tests into test_series. Re-processed tests overwrite their row."""
+        if not ready_tests:
+            return
+
+        series_count = update_test_series(
+            test_ids=[test.test_id for test in ready_tests]
+        )
+        AGGREGATION_RECORDS_WRITTEN.labels(table="test_series").inc(series_count)
+
     def _process_hardware_batch(
         self,
         ready_tests: Sequence[PendingTest],
@@ -1107,9 +1372,11 @@ class Command(BaseCommand):
                 f"last_processed_build_id={str(last_processed_build_id)[:20]}, "
                 f"batch_size={batch_size})..."
             )
+            self._update_pending_backlog()
             t0 = time.time()
 
             with transaction.atomic():
+                claim_start = time.perf_counter()
                 (
                     ready_tests,
                     test_builds_by_id,
@@ -1120,11 +1387,18 @@ class Command(BaseCommand):
                     last_processed_test_id=last_processed_test_id,
                     batch_size=batch_size,
                 )
+                claim_duration = time.perf_counter() - claim_start
 
                 if ready_tests:
-                    self._process_hardware_batch(ready_tests, test_builds_by_id)
-                    self._process_tests_rollup_batch(ready_tests, test_builds_by_id)
-
+                    with AGGREGATION_BATCH_DURATION.labels(phase="aggregate").time():
+                        self._process_hardware_batch(ready_tests, test_builds_by_id)
+                        self._process_tests_rollup_batch(ready_tests, test_builds_by_id)
+                        self._process_hardware_tests_rollup_batch(
+                            ready_tests, test_builds_by_id
+                        )
+                        self._process_test_series_batch(ready_tests)
+
+                claim_start = time.perf_counter()
                 (
                     ready_builds,
                     build_checkouts_by_id,
@@ -1135,16 +1409,27 @@ class Command(BaseCommand):
                     last_processed_build_id=last_processed_build_id,
                     batch_size=batch_size,
                 )
+                claim_duration += time.perf_counter() - claim_start
+
+            AGGREGATION_BATCH_DURATION.labels(phase="claim").observe(claim_duration)
+            AGGREGATION_SKIPPED_ROWS.labels(table="pending_test").inc(skipped_no_build)
+            AGGREGATION_SKIPPED_ROWS.labels(table="pending_builds").inc(
+                skipped_no_checkout
+            )
 
             if ready_tests or ready_builds:
-                self._process_tree_listing_batch(
-                    ready_tests,
-                    test_builds_by_id,
-                    ready_builds,
-                    build_checkouts_by_id,
-                )
+                with AGGREGATION_BATCH_DURATION.labels(phase="write").time():
+                    self._process_tree_listing_batch(
+                        ready_tests,
+                        test_builds_by_id,
+                        ready_builds,
+                        build_checkouts_by_id,
+                    )
 
-            with transaction.atomic():
+            with (
+                AGGREGATION_BATCH_DURATION.labels(phase="delete").time(),
+                transaction.atomic(),
+            ):
                 tests_count += self._delete_ready_tests(ready_tests=ready_tests)
                 builds_count += self._delete_ready_builds(ready_builds=ready_builds)
 
@@ -9,19 +9,73 @@ children are newer than the cutoff.
 Rows linked to an incident (an issue) are kept by default, together with their
 ancestors so nothing is orphaned; pass --skip-issue-protection to prune them too.
 
-Only checkouts, builds and tests are touched. Aggregate and derived tables (e.g.
-tree_tests_rollup, hardware_status, latest_checkout) are left untouched and must
-be cleaned up separately.
+When a table is range-partitioned by _timestamp or start_time, partitions that
+lie entirely before the cutoff and whose rows are all doomed are detached and
+dropped instead of deleted row by row. The partial boundary partition, and any
+partition holding protected rows, falls back to the batched delete.
+
+By default only checkouts, builds and tests are touched. With --derived, rows of
+the aggregate and derived tables (tree_tests_rollup, tree_commit_timeline,
+hardware_tree_selectors, hardware_status, hardware_tests_rollup, test_series,
+latest_checkout, tree_listing, processed_listing_items) that belong to a pruned
+checkout are removed as well, before the raw rows they were computed from. With
+--skip-issue-protection too, the issue_seen_summary, issue_seen_trees and
+issue_listing rows of the issues whose incidents were linked to pruned rows are
+recomputed after the raw rows are gone.
 """
 
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connections
+from django.db import connections, transaction
 
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    update_issue_listing,
+    update_issue_seen_summary,
+)
 from kernelCI_app.management.commands.helpers.intervals import parse_interval
 
 # Strict parent-before-child order: a checkout owns builds, a build owns tests.
 PRUNABLE_TABLES = ("checkouts", "builds", "tests")
 
+# Partition keys for which the upper bound of a range partition is meaningful
+# as an age. Other partitioning schemes are ignored and pruned row by row.
+PARTITION_KEY_COLUMNS = ("_timestamp", "start_time")
+
+# Tables computed from checkouts/builds/tests, cleaned up by --derived.
+# The tables of IDENTITY_KEYED_TABLES are keyed by the checkout identity
+# (tree + commit), the others reference the checkout id directly.
+DERIVED_TABLES = (
+    "tree_tests_rollup",
+    "tree_commit_timeline",
+    "hardware_tree_selectors",
+    "hardware_status",
+    "hardware_tests_rollup",
+    "test_series",
+    "latest_checkout",
+    "tree_listing",
+    "processed_listing_items",
+)
+
+# Condition matching a checkout c to a row r of the tables keyed by the checkout
+# identity. Hardware tree selectors are per build origin, so a checkout only
+# matches through its builds of the selector origin.
+COMMIT_IDENTITY = (
+    "c.tree_name IS NOT DISTINCT FROM r.tree_name "
+    "AND c.git_repository_branch IS NOT DISTINCT FROM r.git_repository_branch "
+    "AND c.git_repository_url IS NOT DISTINCT FROM r.git_repository_url "
+    "AND c.git_commit_hash IS NOT DISTINCT FROM r.git_commit_hash"
+)
+IDENTITY_KEYED_TABLES = {
+    "tree_tests_rollup": f"c.origin = r.origin AND {COMMIT_IDENTITY}",
+    "tree_commit_timeline": f"c.origin = r.origin AND {COMMIT_IDENTITY}",
+    "hardware_tree_selectors": (
+        f"{COMMIT_IDENTITY} "
+        "AND c.git_commit_name IS NOT DISTINCT FROM r.git_commit_name "
+        "AND EXISTS (SELECT 1 FROM builds b "
+        "WHERE b.checkout_id = c.id AND b.origin = r.origin)"
+    ),
+}
+ISSUES_TEMP_TABLE = "prune_issues"
+
 
 class Command(BaseCommand):
     help = "Prune checkouts, builds and tests older than a given age"
@@ -73,6 +127,21 @@ class Command(BaseCommand):
             help="Prune builds and tests linked to issues (default: keep rows with "
             "an associated incident)",
         )
+        parser.add_argument(
+            "--skip-partition-drop",
+            action="store_true",
+            help="Always delete in batches, even when whole partitions of a "
+            "partitioned table could be detached and dropped",
+        )
+        parser.add_argument(
+            "--derived",
+            action="store_true",
+            help="Also remove rows of the derived tables "
+            f"({', '.join(DERIVED_TABLES)}) that belong to pruned checkouts. "
+            "With --skip-issue-protection, also recompute the issue summaries and "
+            "listing rows of the issues linked to pruned rows. "
+            "Requires 'checkouts' to be pruned.",
+        )
 
     def handle(self, *args, **options):
         try:
@@ -95,6 +164,13 @@ class Command(BaseCommand):
             )
         selected_tables = [t for t in PRUNABLE_TABLES if t in options["tables"]]
         protect_incidents = not options["skip_issue_protection"]
+        use_partitions = not options["skip_partition_drop"]
+        prune_derived = options["derived"]
+        if prune_derived and "checkouts" not in selected_tables:
+            raise CommandError(
+                "--derived cleans up derived tables by checkout, so 'checkouts' "
+                "must be one of the pruned --tables."
+            )
 
         dry_run = options["dry_run"]
         origins = options["origins"]
@@ -124,6 +200,33 @@ class Command(BaseCommand):
                 }
                 total = sum(counts.values())
 
+                derived_counts = {}
+                recompute_issues = prune_derived and not protect_incidents
+                if prune_derived:
+                    # Some tables have no checkout id, so their rows are resolved
+                    # now, while the pruned checkouts can still be joined.
+                    for table in IDENTITY_KEYED_TABLES:
+                        self._materialize_by_identity(
+                            cursor, table, temp_tables["checkouts"]
+                        )
+                    derived_counts = {
+                        t: self._count_derived(cursor, t, temp_tables["checkouts"])
+                        for t in DERIVED_TABLES
+                    }
+                if recompute_issues:
+                    self._materialize_issues(cursor, temp_tables)
+
+                droppable = {
+                    t: (
+                        self._find_droppable_partitions(
+                            cursor, t, temp_tables[t], cutoff
+                        )
+                        if use_partitions
+                        else []
+                    )
+                    for t in selected_tables
+                }
+
                 lines = [f"Rows older than {cutoff.isoformat()}:"]
                 lines += [f"* {t}:\t{counts[t]:>8}" for t in selected_tables]
                 lines += ["----------------------", f"* total:\t{total:>8}"]
@@ -132,6 +235,20 @@ class Command(BaseCommand):
                 )
                 if protect_incidents:
                     lines.append("Note: rows linked to an incident are kept.")
+                if prune_derived:
+                    lines.append("Derived rows of pruned checkouts:")
+                    lines += [f"* {t}:\t{derived_counts[t]:>8}" for t in DERIVED_TABLES]
+                if recompute_issues:
+                    lines.append(
+                        "Issues linked to pruned rows to recompute: "
+                        f"{self._count(cursor, ISSUES_TEMP_TABLE)}"
+                    )
+                for table in selected_tables:
+                    if droppable[table]:
+                        lines.append(
+                            f"Partitions of {table} to drop: "
+                            f"{', '.join(droppable[table])}"
+                        )
                 self.stdout.write("\n".join(lines))
 
                 if total == 0:
@@ -161,16 +278,43 @@ class Command(BaseCommand):
                 # before their parents, never the reverse. Reordering this would risk
                 # orphans.
                 deleted = 0
+                # Derived rows go first, while the checkout snapshot is still full.
+                # A crash afterwards leaves raw rows without aggregates, which can be
+                # rebuilt, rather than aggregates that can no longer be matched.
+                if prune_derived:
+                    deleted_derived = 0
+                    for table in DERIVED_TABLES:
+                        deleted_derived += self._batch_delete_derived(
+                            cursor,
+                            table,
+                            temp_tables["checkouts"],
+                            options["batch_size"],
+                        )
+                    self.stdout.write(f"Deleted {deleted_derived} derived rows.")
+
                 for table in reversed(selected_tables):
+                    for partition in droppable[table]:
+                        deleted += self._drop_partition(
+                            cursor, table, partition, temp_tables[table]
+                        )
                     deleted += self._batch_delete(
                         cursor, table, temp_tables[table], options["batch_size"]
                     )
 
+                # The issue rows are recomputed from the incidents once the raw rows
+                # are gone, so the incidents of pruned rows no longer resolve a tree.
+                if recompute_issues:
+                    self._recompute_issues(cursor)
+
                 self.stdout.write(
                     self.style.SUCCESS(f"Successfully pruned {deleted} rows.")
                 )
             finally:
-                for temp_table in temp_tables.values():
+                for temp_table in [
+                    *temp_tables.values(),
+                    *(f"prune_{table}" for table in IDENTITY_KEYED_TABLES),
+                    ISSUES_TEMP_TABLE,
+                ]:
                     cursor.execute(f'DROP TABLE IF EXISTS "{temp_table}"')
 
     def _build_where_clauses(
@@ -254,3 +398,160 @@ class Command(BaseCommand):
             deleted_total += deleted
             self.stdout.write(f"Deleted {table}(n={deleted}) total={deleted_total}")
         return deleted_total
+
+    def _materialize_by_identity(self, cursor, table, checkouts_temp_table):
+        """Snapshot the rows of pruned checkouts of a table keyed by the checkout
+        identity. A row covers every checkout of the same tree and commit, so it is
+        only doomed when none of those checkouts survives the prune."""
+        same_identity = IDENTITY_KEYED_TABLES[table]
+        temp_table = f"prune_{table}"
+        cursor.execute(f'DROP TABLE IF EXISTS "{temp_table}"')
+        cursor.execute(
+            f'CREATE TEMP TABLE "{temp_table}" AS '
+            f'SELECT r.id FROM "{table}" r '
+            "WHERE EXISTS (SELECT 1 FROM checkouts c "
+            f'WHERE {same_identity} AND c.id IN (SELECT id FROM "{checkouts_temp_table}")) '
+            "AND NOT EXISTS (SELECT 1 FROM checkouts c "
+            f'WHERE {same_identity} AND c.id NOT IN (SELECT id FROM "{checkouts_temp_table}"))'
+        )
+
+    def _materialize_issues(self, cursor, temp_tables):
+        """Snapshot the issues with incidents linked to a pruned test or build, or to
+        a build or test of a pruned checkout or build, directly or not."""
+        pruned_builds = [
+            f'SELECT id FROM builds WHERE checkout_id IN (SELECT id FROM "{temp_tables["checkouts"]}")'
+        ]
+        if "builds" in temp_tables:
+            pruned_builds.append(f'SELECT id FROM "{temp_tables["builds"]}"')
+        builds = " UNION ".join(pruned_builds)
+        tests = f"SELECT id FROM tests WHERE build_id IN ({builds})"
+        if "tests" in temp_tables:
+            tests += f' UNION SELECT id FROM "{temp_tables["tests"]}"'
+
+        cursor.execute(f'DROP TABLE IF EXISTS "{ISSUES_TEMP_TABLE}"')
+        cursor.execute(
+            f'CREATE TEMP TABLE "{ISSUES_TEMP_TABLE}" AS '
+            "SELECT DISTINCT issue_id FROM incidents "
+            f"WHERE issue_id IS NOT NULL AND (build_id IN ({builds}) OR test_id IN ({tests}))"
+        )
+
+    def _recompute_issues(self, cursor):
+        """Rebuild the issue_seen_* and issue_listing rows of the snapshotted issues,
+        in a single transaction so the listing never shows them half rebuilt."""
+        cursor.execute(f'SELECT issue_id FROM "{ISSUES_TEMP_TABLE}" ORDER BY issue_id')
+        issue_ids = [row[0] for row in cursor.fetchall()]
+        if not issue_ids:
+            return
+
+        with transaction.atomic(using="default"):
+            cursor.execute(
+                "DELETE FROM issue_seen_trees WHERE issue_id = ANY(%s)", [issue_ids]
+            )
+            cursor.execute(
+                "DELETE FROM issue_seen_summary WHERE issue_id = ANY(%s)", [issue_ids]
+            )
+            update_issue_seen_summary(issue_ids=issue_ids)
+            update_issue_listing(issue_ids=issue_ids)
+        self.stdout.write(f"Recomputed the summaries of {len(issue_ids)} issues.")
+
+    def _count_derived(self, cursor, table, checkouts_temp_table):
+        if table in IDENTITY_KEYED_TABLES:
+            return self._count(cursor, f"prune_{table}")
+
+        cursor.execute(
+            f'SELECT COUNT(*) FROM "{table}" '
+            f'WHERE checkout_id IN (SELECT id FROM "{checkouts_temp_table}")'
+        )
+        return cursor.fetchone()[0]
+
+    def _batch_delete_derived(self, cursor, table, checkouts_temp_table, batch_size):
+        if table in IDENTITY_KEYED_TABLES:
+            return self._batch_delete(cursor, table, f"prune_{table}", batch_size)
+
+        # Derived tables don't share a single-column key (hardware_status has a
+        # composite one), so batches are bounded through the physical row id.
+        sql = (
+            f'DELETE FROM "{table}" WHERE ctid IN ('
+            f'SELECT ctid FROM "{table}" '
+            f'WHERE checkout_id IN (SELECT id FROM "{checkouts_temp_table}") '
+            "LIMIT %(batch_size)s)"
+        )
+        deleted_total = 0
+        while True:
+            cursor.execute(sql, {"batch_size": batch_size})
+            deleted = cursor.rowcount
+            if deleted == 0:
+                break
+            deleted_total += deleted
+            self.stdout.write(f"Deleted {table}(n={deleted}) total={deleted_total}")
+        return deleted_total
+
+    def _find_partitions_before(self, cursor, table, cutoff):
+        """List the range partitions of a table whose upper bound is not after the
+        cutoff. Returns an empty list when the table is not partitioned."""
+        cursor.execute(
+            r"""
+            SELECT child.relname
+            FROM pg_inherits inh
+            JOIN pg_class child ON child.oid = inh.inhrelid
+            JOIN pg_partitioned_table pt ON pt.partrelid = inh.inhparent
+            JOIN pg_attribute att
+                ON att.attrelid = pt.partrelid AND att.attnum = pt.partattrs[0]
+            WHERE
+                inh.inhparent = to_regclass(%(table)s)
+                AND pt.partstrat = 'r'
+                AND pt.partnatts = 1
+                AND att.attname = ANY(%(key_columns)s)
+                AND substring(
+                    pg_get_expr(child.relpartbound, child.oid)
+                    FROM 'TO \(''([^'']+)''\)'
+                )::timestamptz <= %(cutoff)s
+            ORDER BY child.relname
+            """,
+            {
+                "table": table,
+                "key_columns": list(PARTITION_KEY_COLUMNS),
+                "cutoff": cutoff,
+            },
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _is_fully_doomed(self, cursor, partition, temp_table):
+        """A partition can be dropped only when every one of its rows was
+        snapshotted for deletion, which already accounts for --origins and
+        incident protection."""
+        cursor.execute(
+            f'SELECT NOT EXISTS (SELECT 1 FROM "{partition}" p '
+            f'WHERE NOT EXISTS (SELECT 1 FROM "{temp_table}" t WHERE t.id = p.id))'
+        )
+        return cursor.fetchone()[0]
+
+    def _find_droppable_partitions(self, cursor, table, temp_table, cutoff):
+        return [
+            partition
+            for partition in self._find_partitions_before(cursor, table, cutoff)
+            if self._is_fully_doomed(cursor, partition, temp_table)
+        ]
+
+    def _drop_partition(self, cursor, table, partition, temp_table):
+        """Detach and drop a whole partition, removing its ids from the snapshot so
+        the batched delete only handles the remaining rows. The partition is checked
+        again under lock, since rows could have been written since the dry check."""
+        with transaction.atomic(using="default"):
+            cursor.execute(f'LOCK TABLE "{partition}" IN ACCESS EXCLUSIVE MODE')
+            if not self._is_fully_doomed(cursor, partition, temp_table):
+                self.stdout.write(
+                    f"Partition {partition} changed since the snapshot, "
+                    "falling back to batched delete"
+                )
+                return 0
+
+            cursor.execute(
+                f'DELETE FROM "{temp_table}" WHERE id IN (SELECT id FROM "{partition}")'
+            )
+            dropped = cursor.rowcount
+            cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"')
+            cursor.execute(f'DROP TABLE "{partition}"')
+
+        self.stdout.write(f"Dropped partition {partition} of {table}(n={dropped})")
+        return dropped
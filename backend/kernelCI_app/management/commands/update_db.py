@@ -2,16 +2,20 @@ import ast
 import csv
 import json
 import logging
+import shutil
 import tarfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from io import IOBase, StringIO, TextIOWrapper
+from io import IOBase, TextIOWrapper
 from itertools import islice
 from pathlib import Path
 from tempfile import SpooledTemporaryFile
-from typing import Generator, Optional
+from typing import Callable, Iterable, Optional
 
+import zstandard
 from django.core.management.base import BaseCommand, CommandError
-from django.db import connections, models
+from django.db import connections, models, transaction
 from django.utils.dateparse import parse_datetime
 
 from kernelCI_app.management.commands.helpers.intervals import parse_interval
@@ -33,12 +37,186 @@ DEFAULT_BATCH_SIZE = 1000
 BUILD_BATCH_SIZE = 10000
 TEST_BATCH_SIZE = 100000
 
-SELECT_BATCH_SIZE = 25000
-
 MAX_MEMORY_BUFFER_BYTES = 64 * 1024**2  # 64 MiB
+COPY_CHUNK_SIZE = 1024**2  # 1 MiB
+
+DEFAULT_WORKERS = 4
+ZSTD_LEVEL = 3
+
+SNAPSHOT_SUFFIX = ".tar.zst"
+# Snapshots taken before the COPY-based format, restored with the ORM
+LEGACY_SNAPSHOT_SUFFIX = ".tar.gz"
 
 csv.field_size_limit(1 * 1024**2)  # 1MiB row limit
 
+# Columns stored in the snapshot for each table. The order matches the legacy
+# CSV layout, which has no header and is read by position.
+SNAPSHOT_COLUMNS: dict[str, tuple[str, ...]] = {
+    "issues": (
+        "_timestamp",
+        "id",
+        "version",
+        "origin",
+        "report_url",
+        "report_subject",
+        "culprit_code",
+        "culprit_tool",
+        "culprit_harness",
+        "comment",
+        "misc",
+        "categories",
+    ),
+    "checkouts": (
+        "_timestamp",
+        "id",
+        "origin",
+        "tree_name",
+        "git_repository_url",
+        "git_commit_hash",
+        "git_commit_name",
+        "git_repository_branch",
+        "patchset_files",
+        "patchset_hash",
+        "message_id",
+        "comment",
+        "start_time",
+        "log_url",
+        "log_excerpt",
+        "valid",
+        "misc",
+        "git_commit_message",
+        "git_repository_branch_tip",
+        "git_commit_tags",
+        "origin_builds_finish_time",
+        "origin_tests_finish_time",
+    ),
+    "builds": (
+        "_timestamp",
+        "checkout_id",
+        "id",
+        "origin",
+        "comment",
+        "start_time",
+        "duration",
+        "architecture",
+        "command",
+        "compiler",
+        "input_files",
+        "output_files",
+        "config_name",
+        "config_url",
+        "log_url",
+        "log_excerpt",
+        "misc",
+        "status",
+    ),
+    "tests": (
+        "_timestamp",
+        "build_id",
+        "id",
+        "origin",
+        "environment_comment",
+        "environment_misc",
+        "path",
+        "comment",
+        "log_url",
+        "log_excerpt",
+        "status",
+        "start_time",
+        "duration",
+        "output_files",
+        "misc",
+        "number_value",
+        "environment_compatible",
+        "number_prefix",
+        "number_unit",
+        "input_files",
+    ),
+    "incidents": (
+        "_timestamp",
+        "id",
+        "origin",
+        "issue_id",
+        "issue_version",
+        "build_id",
+        "test_id",
+        "present",
+        "comment",
+        "misc",
+    ),
+    "latest_checkout": (
+        "checkout_id",
+        "origin",
+        "tree_name",
+        "git_repository_url",
+        "git_repository_branch",
+        "start_time",
+    ),
+    "hardware_status": (
+        "checkout_id",
+        "test_origin",
+        "platform",
+        "compatibles",
+        "start_time",
+        "build_pass",
+        "build_failed",
+        "build_inc",
+        "boot_pass",
+        "boot_failed",
+        "boot_inc",
+        "test_pass",
+        "test_failed",
+        "test_inc",
+    ),
+    "tree_listing": (
+        "checkout_id",
+        "origin",
+        "tree_name",
+        "git_repository_url",
+        "git_repository_branch",
+        "git_commit_hash",
+        "git_commit_name",
+        "git_commit_tags",
+        "start_time",
+        "build_pass",
+        "build_failed",
+        "build_inc",
+        "boot_pass",
+        "boot_failed",
+        "boot_inc",
+        "test_pass",
+        "test_failed",
+        "test_inc",
+    ),
+    "tree_tests_rollup": (
+        "origin",
+        "tree_name",
+        "git_repository_branch",
+        "git_repository_url",
+        "git_commit_hash",
+        "path_group",
+        "build_config_name",
+        "build_architecture",
+        "build_compiler",
+        "hardware_key",
+        "test_platform",
+        "test_lab",
+        "test_origin",
+        "issue_id",
+        "issue_version",
+        "issue_uncategorized",
+        "is_boot",
+        "pass_tests",
+        "fail_tests",
+        "skip_tests",
+        "error_tests",
+        "miss_tests",
+        "done_tests",
+        "null_tests",
+        "total_tests",
+    ),
+}
+
 
 def parse_array(array_str) -> Optional[list[str]]:
     try:
@@ -59,13 +237,17 @@ def to_human_readable(num_bytes: int) -> str:
 
 
 def ensure_suffix(filepath: str, suffix: str) -> Path:
-    """Ensure path ends with .tar.gz without doubling when suffix already present."""
+    """Ensure path ends with the suffix without doubling when it is already present."""
     p = Path(filepath)
     if p.name.lower().endswith(suffix):
         return p
     return p.with_suffix(suffix)
 
 
+def select_columns(table: str) -> str:
+    return ", ".join(SNAPSHOT_COLUMNS[table])
+
+
 class Command(BaseCommand):
     help = "Migrate data dashboard_db to/from file"
 
@@ -79,6 +261,7 @@ class Command(BaseCommand):
         self.origins: list[str]
         self.origin_condition: str
         self.snapshot_archive: tarfile.TarFile
+        self.archive_lock = threading.Lock()
 
     def add_arguments(self, parser):
 
@@ -125,7 +308,14 @@ class Command(BaseCommand):
             "--filepath",
             type=str,
             required=True,
-            help="Path to store/load the snapshot (.tar.gz) file.",
+            help="Path to store/load the snapshot (.tar.zst) file.",
+        )
+        snapshot_parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="Number of tables streamed in parallel, each on its own"
+            f" database connection (default: {DEFAULT_WORKERS})",
         )
 
         restore_parser = command_parser.add_parser(
@@ -136,7 +326,15 @@ class Command(BaseCommand):
             "--filepath",
             type=str,
             required=True,
-            help="Path to store/load the snapshot (.tar.gz) file.",
+            help="Path to store/load the snapshot (.tar.zst) file."
+            " Legacy .tar.gz snapshots are also accepted.",
+        )
+        restore_parser.add_argument(
+            "--workers",
+            type=int,
+            default=DEFAULT_WORKERS,
+            help="Number of tables loaded in parallel, each on its own"
+            f" database connection (default: {DEFAULT_WORKERS})",
         )
 
     def _invalid_table_error(self, table: str) -> str:
@@ -147,6 +345,11 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, command, **options):
+        if options["workers"] < 1:
+            raise CommandError(
+                f"--workers must be at least 1 (got {options['workers']})"
+            )
+
         if command == "snapshot":
             self.handle_snapshot(**options)
         elif command == "restore":
@@ -154,11 +357,15 @@ class Command(BaseCommand):
         else:
             raise ValueError(f"Invalid command: {command}")
 
-    def handle_restore(self, *args, filepath, **options):
+    def handle_restore(self, *args, filepath, workers: int, **options):
 
         self.related_data_only = False
-        filepath = ensure_suffix(filepath, ".tar.gz")
-        self.restore(filepath)
+        if filepath.lower().endswith(LEGACY_SNAPSHOT_SUFFIX):
+            self.restore_legacy(Path(filepath))
+            return
+
+        filepath = ensure_suffix(filepath, SNAPSHOT_SUFFIX)
+        self.restore(filepath, workers=workers)
 
     def handle_snapshot(
         self,
@@ -169,6 +376,7 @@ class Command(BaseCommand):
         origins: list[str],
         related_data_only: bool,
         filepath: str,
+        workers: int,
         **options,
     ):
         end_interval_unsafe_tables = (
@@ -210,46 +418,62 @@ class Command(BaseCommand):
             f"\nFiltering data between {self.start_interval} and {self.end_interval}"
         )
 
-        filepath = ensure_suffix(filepath, ".tar.gz")
+        filepath = ensure_suffix(filepath, SNAPSHOT_SUFFIX)
 
-        self.snapshot(table, filepath)
+        self.snapshot(table, filepath, workers=workers)
 
-    def snapshot(self, table, snapshot_filepath: Path):
+    def snapshot(self, table: Optional[str], snapshot_filepath: Path, *, workers: int):
+        if table is None:
+            tables = list(SNAPSHOT_COLUMNS)
+        elif table in SNAPSHOT_COLUMNS:
+            tables = [table]
+        else:
+            self.stdout.write(self._invalid_table_error(table))
+            return
 
-        self.snapshot_archive = tarfile.open(snapshot_filepath, "w:gz")
+        compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, threads=-1)
+        try:
+            with (
+                open(snapshot_filepath, "wb") as raw_file,
+                compressor.stream_writer(raw_file) as compressed_file,
+                tarfile.open(fileobj=compressed_file, mode="w|") as archive,
+            ):
+                self.snapshot_archive = archive
+                self.run_table_jobs(self.snapshot_table, tables, workers=workers)
+            self.stdout.write(
+                self.style.SUCCESS("Successfully migrated all data to dashboard_db")
+            )
+        except Exception as e:
+            logger.error(f"Error updating database: {str(e)}")
+            raise CommandError("Command failed") from e
 
+    def restore(self, snapshot_filepath: Path, *, workers: int):
+        # The archive is a compressed stream, so the members are read in order
+        # and spooled before the tables are loaded in parallel
+        table_files: dict[str, IOBase] = {}
         try:
-            match table:
-                case None:
-                    self.snapshot_issues()
-                    self.snapshot_checkouts()
-                    self.snapshot_builds()
-                    self.snapshot_tests()
-                    self.snapshot_incidents()
-                    self.snapshot_latest_checkout()
-                    self.snapshot_hardware_status()
-                    self.snapshot_tree_listing()
-                    self.snapshot_tree_tests_rollup()
-                case "issues":
-                    self.snapshot_issues()
-                case "checkouts":
-                    self.snapshot_checkouts()
-                case "builds":
-                    self.snapshot_builds()
-                case "tests":
-                    self.snapshot_tests()
-                case "incidents":
-                    self.snapshot_incidents()
-                case "latest_checkout":
-                    self.snapshot_latest_checkout()
-                case "hardware_status":
-                    self.snapshot_hardware_status()
-                case "tree_listing":
-                    self.snapshot_tree_listing()
-                case "tree_tests_rollup":
-                    self.snapshot_tree_tests_rollup()
-                case _:
-                    self.stdout.write(self._invalid_table_error(table))
+            with (
+                open(snapshot_filepath, "rb") as raw_file,
+                zstandard.ZstdDecompressor().stream_reader(raw_file) as stream,
+                tarfile.open(fileobj=stream, mode="r|") as archive,
+            ):
+                for member in archive:
+                    table = member.name.removesuffix(".csv")
+                    if table not in SNAPSHOT_COLUMNS:
+                        raise ValueError(f"Unexpected file in snapshot: {member.name}")
+                    table_file = SpooledTemporaryFile(
+                        mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES
+                    )
+                    table_files[table] = table_file
+                    shutil.copyfileobj(archive.extractfile(member), table_file)
+
+            self.run_table_jobs(
+                lambda table, in_worker: self.restore_table(
+                    table, table_files[table], in_worker=in_worker
+                ),
+                [table for table in SNAPSHOT_COLUMNS if table in table_files],
+                workers=workers,
+            )
             self.stdout.write(
                 self.style.SUCCESS("Successfully migrated all data to dashboard_db")
             )
@@ -257,9 +481,11 @@ class Command(BaseCommand):
             logger.error(f"Error updating database: {str(e)}")
             raise CommandError("Command failed") from e
         finally:
-            self.snapshot_archive.close()
+            for table_file in table_files.values():
+                table_file.close()
 
-    def restore(self, snapshot_filepath: Path):
+    def restore_legacy(self, snapshot_filepath: Path):
+        """Restores a gzip snapshot of header-less CSVs through the ORM"""
         self.snapshot_archive = tarfile.open(snapshot_filepath, "r:*")
         try:
             self.restore_checkouts()
@@ -280,6 +506,124 @@ class Command(BaseCommand):
         finally:
             self.snapshot_archive.close()
 
+    def run_table_jobs(
+        self,
+        job: Callable[[str, bool], None],
+        tables: Iterable[str],
+        *,
+        workers: int,
+    ) -> None:
+        """Runs the job for every table, in a thread pool when there are multiple workers.
+        A failing table doesn't stop the others, but the run fails at the end."""
+        if workers == 1:
+            for table in tables:
+                job(table, False)
+            return
+
+        failed_tables: list[str] = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(job, table, True): table for table in tables}
+            for future in as_completed(futures):
+                table = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error migrating {table}: {str(e)}")
+                    failed_tables.append(table)
+
+        if failed_tables:
+            raise RuntimeError(f"Failed to migrate {', '.join(sorted(failed_tables))}")
+
+    def add_file_to_snapshot(self, file: IOBase, table: str) -> int:
+        tar_info = tarfile.TarInfo(name=f"{table}.csv")
+        file.seek(0, 2)
+        tar_info.size = file.tell()
+        file.seek(0, 0)
+        # The archive is a single stream shared by all workers
+        with self.archive_lock:
+            self.snapshot_archive.addfile(tar_info, file)
+        return tar_info.size
+
+    def snapshot_table(self, table: str, in_worker: bool) -> None:
+        """Streams the selected rows of a table into the snapshot
+        as a CSV with header, using COPY TO STDOUT"""
+        try:
+            self.stdout.write(f"\nMigrating {table}...")
+            selection = getattr(self, f"select_{table}_query")()
+            with SpooledTemporaryFile(
+                mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES
+            ) as file:
+                if selection is None:
+                    file.write(f"{','.join(SNAPSHOT_COLUMNS[table])}\n".encode())
+                    total_records = 0
+                else:
+                    query, query_params = selection
+                    with connections["default"].cursor() as kcidb_cursor:
+                        with kcidb_cursor.cursor.copy(
+                            f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true)",
+                            query_params,
+                        ) as copy:
+                            for data in copy:
+                                file.write(data)
+                        total_records = kcidb_cursor.cursor.rowcount
+                size = self.add_file_to_snapshot(file, table)
+            self.stdout.write(
+                f"Processed {total_records} {table} records: {to_human_readable(size)}"
+            )
+        finally:
+            # Each worker thread gets its own connection, which is not
+            # closed automatically when the thread finishes
+            if in_worker:
+                connections["default"].close()
+
+    def restore_table(self, table: str, file: IOBase, *, in_worker: bool) -> None:
+        """Loads a snapshot CSV into a temporary staging table with COPY FROM STDIN,
+        then inserts the staged rows, ignoring the ones that already exist"""
+        staging_table = f"restore_{table}"
+        try:
+            self.stdout.write(f"\nMigrating {table}...")
+            file.seek(0)
+            header = file.readline().decode("utf-8")
+            columns = next(csv.reader([header]), [])
+            # The header is interpolated into the queries, so only known columns
+            # are accepted
+            if not columns or not set(columns) <= set(SNAPSHOT_COLUMNS[table]):
+                raise ValueError(f"Invalid {table} header: {header.strip()}")
+            column_list = ", ".join(columns)
+
+            with transaction.atomic():
+                with connections["default"].cursor() as cursor:
+                    cursor.execute(
+                        f"""
+                        CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS
+                        SELECT {column_list} FROM {table} WITH NO DATA
+                        """
+                    )
+                    with cursor.cursor.copy(
+                        f"COPY {staging_table} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+                    ) as copy:
+                        while data := file.read(COPY_CHUNK_SIZE):
+                            copy.write(data)
+                    total_records = cursor.cursor.rowcount
+                    cursor.execute(
+                        f"""
+                        INSERT INTO {table} ({column_list})
+                        SELECT {column_list} FROM {staging_table}
+                        ON CONFLICT DO NOTHING
+                        """
+                    )
+                    total_inserted = cursor.rowcount
+                    # ON COMMIT DROP is not enough when running inside an outer
+                    # transaction, where this block is only a savepoint
+                    cursor.execute(f"DROP TABLE {staging_table}")
+
+            self.stdout.write(
+                f"Processed {total_records} {table} records (inserted {total_inserted})"
+            )
+        finally:
+            if in_worker:
+                connections["default"].close()
+
     def get_related_data(
         self, *, model: models.Model, field_name: str, filter_timestamp: bool = True
     ) -> tuple[set[str], str]:
@@ -305,25 +649,20 @@ class Command(BaseCommand):
         return related_ids, related_condition
 
     # ISSUES ########################################
-    def select_issues_data(self) -> list[tuple]:
+    def select_issues_query(self) -> Optional[tuple[str, list]]:
         query = f"""
-            SELECT _timestamp, id, version, origin, report_url, report_subject,
-                   culprit_code, culprit_tool, culprit_harness, comment, misc,
-                   categories
+            SELECT {select_columns("issues")}
             FROM issues
                 WHERE _timestamp >= NOW() - INTERVAL %s
                 AND _timestamp <= NOW() - INTERVAL %s
                 {self.origin_condition}
-            ORDER BY _timestamp
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
+        return query, query_params
 
     def insert_issues_data(self, records: list[tuple]) -> int:
         total_inserted = 0
@@ -357,15 +696,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} Issues records")
         return total_inserted
 
-    def snapshot_issues(self) -> None:
-        """Migrate Issues data from dashboard_db to file"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating Issues...")
-            records = self.select_issues_data()
-            self.insert_records(file, "issues", records)
-            self.add_file_to_snapshot(file, "issues")
-            self.stdout.write("Issues migration completed")
-
     def restore_issues(self) -> None:
         """Migrate Issues data from file to dashboard_db"""
         with TextIOWrapper(self.snapshot_archive.extractfile("issues.csv")) as file:
@@ -376,28 +706,20 @@ class Command(BaseCommand):
             self.stdout.write("Issues migration completed")
 
     # CHECKOUTS ########################################
-    def select_checkouts_data(self) -> list[tuple]:
+    def select_checkouts_query(self) -> Optional[tuple[str, list]]:
         query = f"""
-            SELECT _timestamp, id, origin, tree_name, git_repository_url,
-                   git_commit_hash, git_commit_name, git_repository_branch,
-                   patchset_files, patchset_hash, message_id, comment, start_time,
-                   log_url, log_excerpt, valid, misc, git_commit_message,
-                   git_repository_branch_tip, git_commit_tags,
-                   origin_builds_finish_time, origin_tests_finish_time
+            SELECT {select_columns("checkouts")}
             FROM checkouts
                 WHERE _timestamp >= NOW() - INTERVAL %s
                 AND _timestamp <= NOW() - INTERVAL %s
                 {self.origin_condition}
-            ORDER BY _timestamp
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
+        return query, query_params
 
     def insert_checkouts_data(self, records: list[tuple]) -> int:
         original_checkouts = []
@@ -441,16 +763,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} Checkouts records")
         return total_inserted
 
-    def snapshot_checkouts(self) -> None:
-        """Migrate Checkouts data from dashboard_db to file"""
-
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating Checkouts...")
-            records = self.select_checkouts_data()
-            self.insert_records(file, "checkouts", records)
-            self.add_file_to_snapshot(file, "checkouts")
-            self.stdout.write("Checkouts migration completed")
-
     def restore_checkouts(self) -> None:
         """Migrate Checkouts data from file to dashboard_db"""
 
@@ -462,24 +774,20 @@ class Command(BaseCommand):
             self.stdout.write("Checkouts migration completed")
 
     # BUILDS ########################################
-    def select_builds_data(self) -> list[tuple]:
+    def select_builds_query(self) -> Optional[tuple[str, list]]:
         related_checkout_ids, related_condition = self.get_related_data(
             model=Checkouts, field_name="checkout_id"
         )
         if self.related_data_only and len(related_checkout_ids) == 0:
-            return []
+            return None
 
         query = f"""
-            SELECT _timestamp, checkout_id, id, origin, comment, start_time,
-                   duration, architecture, command, compiler, input_files,
-                   output_files, config_name, config_url, log_url, log_excerpt,
-                   misc, status
+            SELECT {select_columns("builds")}
             FROM builds
             WHERE _timestamp >= NOW() - INTERVAL %s
             AND _timestamp <= NOW() - INTERVAL %s
             {related_condition}
             {self.origin_condition}
-            ORDER BY _timestamp, id
         """
         query_params = (
             [
@@ -490,15 +798,7 @@ class Command(BaseCommand):
             + self.origins
         )
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
-
-    def write_to_csv_stream(self, records: list[tuple]) -> StringIO:
-        stream = StringIO()
-        writer = csv.writer(stream)
-        writer.writerows(records)
-        return stream
+        return query, query_params
 
     def read_records(
         self, reader: csv.reader, max_rows: Optional[int] = None
@@ -506,25 +806,6 @@ class Command(BaseCommand):
         records = [tuple(record) for record in islice(reader, max_rows)]
         return records
 
-    def insert_records(self, tmp_file: IOBase, table: str, records: list[tuple]):
-        stream = self.write_to_csv_stream(records)
-        csv_bytes = stream.getvalue().encode("utf-8")
-        tmp_file.write(csv_bytes)
-        self.stdout.write(
-            f"\nProcessed {len(records)} {table} records: {to_human_readable(len(csv_bytes))}"
-        )
-
-    def snapshot_builds(self) -> None:
-        """Migrate Builds data from dashboard_db to file,
-        only inserts builds that have the related checkout in the dashboard_db
-        in order to preserve the foreign key constraint"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating Builds...")
-            records = self.select_builds_data()
-            self.insert_records(file, "builds", records)
-            self.add_file_to_snapshot(file, "builds")
-            self.stdout.write("Builds migration completed")
-
     def restore_builds(self) -> None:
         """Migrate Builds data from file to dashboard_db,
         only inserts builds that have the related checkout in the dashboard_db
@@ -572,25 +853,20 @@ class Command(BaseCommand):
         return total_inserted
 
     # TESTS ########################################
-    def select_tests_data(self) -> Generator[list[tuple], None, list[tuple]]:
+    def select_tests_query(self) -> Optional[tuple[str, list]]:
         related_build_ids, related_condition = self.get_related_data(
             model=Builds, field_name="build_id"
         )
         if self.related_data_only and len(related_build_ids) == 0:
-            return []
+            return None
 
         tests_query = f"""
-            SELECT _timestamp, build_id, id, origin, environment_comment,
-                    environment_misc, path, comment, log_url, log_excerpt,
-                    status, start_time, duration, output_files, misc,
-                    number_value, environment_compatible, number_prefix,
-                    number_unit, input_files
+            SELECT {select_columns("tests")}
             FROM tests
             WHERE _timestamp >= NOW() - INTERVAL %s
             AND _timestamp <= NOW() - INTERVAL %s
             {related_condition}
             {self.origin_condition}
-            ORDER BY _timestamp, id
         """
         query_params = (
             [
@@ -601,11 +877,7 @@ class Command(BaseCommand):
             + self.origins
         )
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(tests_query, query_params)
-            self.stdout.write("Finished fetching tests")
-            while batch := kcidb_cursor.fetchmany(SELECT_BATCH_SIZE):
-                yield batch
+        return tests_query, query_params
 
     def insert_tests_data(self, records: list[tuple]) -> int:
         print(f"Processing {len(records)} tests")
@@ -645,25 +917,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} Tests records")
         return total_inserted
 
-    def add_file_to_snapshot(self, file: IOBase, table: str):
-        tar_info = tarfile.TarInfo(name=f"{table}.csv")
-        file.seek(0, 2)
-        tar_info.size = file.tell()
-        file.seek(0, 0)
-        self.snapshot_archive.addfile(tar_info, file)
-
-    def snapshot_tests(self) -> None:
-        """Migrate Tests data from dashboard_db to file,
-        only inserts tests that have the related build in the dashboard_db
-        in order to preserve the foreign key constraint"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating Tests...")
-            records = self.select_tests_data()
-            for record_batch in records:
-                self.insert_records(file, "tests", record_batch)
-            self.add_file_to_snapshot(file, "tests")
-            self.stdout.write("Tests migration completed")
-
     def restore_tests(self) -> None:
         """Migrate Tests data from file to dashboard_db,
         only inserts tests that have the related build in the dashboard_db
@@ -676,25 +929,23 @@ class Command(BaseCommand):
             self.stdout.write("Tests migration completed")
 
     # INCIDENTS ########################################
-    def select_incidents_data(self) -> list[tuple]:
+    def select_incidents_query(self) -> Optional[tuple[str, list]]:
         related_issue_ids, related_condition = self.get_related_data(
             model=Issues, field_name="issue_id", filter_timestamp=False
         )
         if self.related_data_only and len(related_issue_ids) == 0:
-            return []
+            return None
 
         # Though we can filter with the build and test ID, filtering by
         # issue ID is more consistent since incidents can be triggered for
         # an old build/test and filtering with all build/test ids is also costly
         query = f"""
-            SELECT _timestamp, id, origin, issue_id, issue_version,
-                   build_id, test_id, present, comment, misc
+            SELECT {select_columns("incidents")}
             FROM incidents
             WHERE _timestamp >= NOW() - INTERVAL %s
             AND _timestamp <= NOW() - INTERVAL %s
             {related_condition}
             {self.origin_condition}
-            ORDER BY _timestamp
         """
 
         query_params = (
@@ -706,11 +957,7 @@ class Command(BaseCommand):
             + self.origins
         )
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            records = kcidb_cursor.fetchall()
-            print(f"Retrieved {len(records)} Incidents")
-            return records
+        return query, query_params
 
     def insert_incidents_data(self, records: list[tuple]) -> int:
         original_incidents: list[Incidents] = []
@@ -798,19 +1045,6 @@ class Command(BaseCommand):
         )
         return total_inserted
 
-    def snapshot_incidents(self) -> None:
-        """Migrate Incidents data from dashboard_db to file,
-        incidents are related to issues, builds and tests.
-        So if any of them are not null, an incident will only be inserted
-        if the related issue, build or test exists in the dashboard_db"""
-
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating Incidents...")
-            records = self.select_incidents_data()
-            self.insert_records(file, "incidents", records)
-            self.add_file_to_snapshot(file, "incidents")
-            self.stdout.write("Incidents migration completed")
-
     def restore_incidents(self) -> None:
         """Migrate Incidents data from file to dashboard_db,
         incidents are related to issues, builds and tests.
@@ -825,24 +1059,20 @@ class Command(BaseCommand):
             self.stdout.write("Incidents migration completed")
 
     # LATEST CHECKOUT ########################################
-    def select_latest_checkout_data(self) -> list[tuple]:
+    def select_latest_checkout_query(self) -> Optional[tuple[str, list]]:
         query = f"""
-            SELECT checkout_id, origin, tree_name, git_repository_url,
-                   git_repository_branch, start_time
+            SELECT {select_columns("latest_checkout")}
             FROM latest_checkout
             WHERE start_time >= NOW() - INTERVAL %s
             AND start_time <= NOW() - INTERVAL %s
             {self.origin_condition}
-            ORDER BY start_time, checkout_id
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
+        return query, query_params
 
     def insert_latest_checkout_data(self, records: list[tuple]) -> int:
         original_latest_checkout: list[LatestCheckout] = [
@@ -867,15 +1097,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} LatestCheckout records")
         return total_inserted
 
-    def snapshot_latest_checkout(self) -> None:
-        """Migrate LatestCheckout data from dashboard_db to file"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating LatestCheckout...")
-            records = self.select_latest_checkout_data()
-            self.insert_records(file, "latest_checkout", records)
-            self.add_file_to_snapshot(file, "latest_checkout")
-            self.stdout.write("LatestCheckout migration completed")
-
     def restore_latest_checkout(self) -> None:
         """Migrate LatestCheckout data from file to dashboard_db"""
         with TextIOWrapper(
@@ -888,31 +1109,25 @@ class Command(BaseCommand):
             self.stdout.write("LatestCheckout migration completed")
 
     # HARDWARE STATUS ########################################
-    def select_hardware_status_data(self) -> list[tuple]:
+    def select_hardware_status_query(self) -> Optional[tuple[str, list]]:
         origin_condition = (
             f"AND test_origin IN ({','.join(['%s'] * len(self.origins))})"
             if self.origins
             else ""
         )
         query = f"""
-            SELECT checkout_id, test_origin, platform, compatibles, start_time,
-                   build_pass, build_failed, build_inc,
-                   boot_pass, boot_failed, boot_inc,
-                   test_pass, test_failed, test_inc
+            SELECT {select_columns("hardware_status")}
             FROM hardware_status
             WHERE start_time >= NOW() - INTERVAL %s
             AND start_time <= NOW() - INTERVAL %s
             {origin_condition}
-            ORDER BY start_time, test_origin, platform, checkout_id
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
+        return query, query_params
 
     def insert_hardware_status_data(self, records: list[tuple]) -> int:
         original_hardware_status: list[HardwareStatus] = [
@@ -945,15 +1160,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} HardwareStatus records")
         return total_inserted
 
-    def snapshot_hardware_status(self) -> None:
-        """Migrate HardwareStatus data from dashboard_db to file"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating HardwareStatus...")
-            records = self.select_hardware_status_data()
-            self.insert_records(file, "hardware_status", records)
-            self.add_file_to_snapshot(file, "hardware_status")
-            self.stdout.write("HardwareStatus migration completed")
-
     def restore_hardware_status(self) -> None:
         """Migrate HardwareStatus data from file to dashboard_db"""
         with TextIOWrapper(
@@ -966,26 +1172,20 @@ class Command(BaseCommand):
             self.stdout.write("HardwareStatus migration completed")
 
     # TREE LISTING ########################################
-    def select_tree_listing_data(self) -> list[tuple]:
+    def select_tree_listing_query(self) -> Optional[tuple[str, list]]:
         query = f"""
-            SELECT checkout_id, origin, tree_name, git_repository_url,
-                   git_repository_branch, git_commit_hash, git_commit_name,
-                   git_commit_tags, start_time, build_pass, build_failed, build_inc,
-                   boot_pass, boot_failed, boot_inc, test_pass, test_failed, test_inc
+            SELECT {select_columns("tree_listing")}
             FROM tree_listing
             WHERE start_time >= NOW() - INTERVAL %s
             AND start_time <= NOW() - INTERVAL %s
             {self.origin_condition}
-            ORDER BY start_time, checkout_id
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            return kcidb_cursor.fetchall()
+        return query, query_params
 
     def insert_tree_listing_data(self, records: list[tuple]) -> int:
         original_tree_listing: list[TreeListing] = [
@@ -1022,15 +1222,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} TreeListing records")
         return total_inserted
 
-    def snapshot_tree_listing(self) -> None:
-        """Migrate TreeListing data from dashboard_db to file"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating TreeListing...")
-            records = self.select_tree_listing_data()
-            self.insert_records(file, "tree_listing", records)
-            self.add_file_to_snapshot(file, "tree_listing")
-            self.stdout.write("TreeListing migration completed")
-
     def restore_tree_listing(self) -> None:
         """Migrate TreeListing data from file to dashboard_db"""
         with TextIOWrapper(
@@ -1043,21 +1234,14 @@ class Command(BaseCommand):
             self.stdout.write("TreeListing migration completed")
 
     # TREE TESTS ROLLUP ########################################
-    def select_tree_tests_rollup_data(
-        self,
-    ) -> Generator[list[tuple], None, list[tuple]]:
+    def select_tree_tests_rollup_query(self) -> Optional[tuple[str, list]]:
         origin_condition = (
             f"AND tree_tests_rollup.origin IN ({','.join(['%s'] * len(self.origins))})"
             if self.origins
             else ""
         )
         query = f"""
-            SELECT origin, tree_name, git_repository_branch, git_repository_url,
-                   git_commit_hash, path_group, build_config_name,
-                   build_architecture, build_compiler, hardware_key, test_platform,
-                   test_lab, test_origin, issue_id, issue_version,
-                   issue_uncategorized, is_boot, pass_tests, fail_tests, skip_tests,
-                   error_tests, miss_tests, done_tests, null_tests, total_tests
+            SELECT {select_columns("tree_tests_rollup")}
             FROM tree_tests_rollup
             WHERE EXISTS (
                 SELECT 1
@@ -1074,19 +1258,13 @@ class Command(BaseCommand):
                     tree_tests_rollup.git_commit_hash
             )
             {origin_condition}
-            ORDER BY origin, tree_name, git_repository_branch, git_repository_url,
-                     git_commit_hash, path_group
         """
         query_params = [
             self.start_interval,
             self.end_interval,
         ] + self.origins
 
-        with connections["default"].cursor() as kcidb_cursor:
-            kcidb_cursor.execute(query, query_params)
-            self.stdout.write("Finished fetching tree_tests_rollup")
-            while batch := kcidb_cursor.fetchmany(SELECT_BATCH_SIZE):
-                yield batch
+        return query, query_params
 
     def insert_tree_tests_rollup_data(self, records: list[tuple]) -> int:
         original_tree_tests_rollup: list[TreeTestsRollup] = [
@@ -1130,16 +1308,6 @@ class Command(BaseCommand):
         self.stdout.write(f"Processed {total_inserted} TreeTestsRollup records")
         return total_inserted
 
-    def snapshot_tree_tests_rollup(self) -> None:
-        """Migrate TreeTestsRollup data from dashboard_db to file"""
-        with SpooledTemporaryFile(mode="w+b", max_size=MAX_MEMORY_BUFFER_BYTES) as file:
-            self.stdout.write("\nMigrating TreeTestsRollup...")
-            records = self.select_tree_tests_rollup_data()
-            for record_batch in records:
-                self.insert_records(file, "tree_tests_rollup", record_batch)
-            self.add_file_to_snapshot(file, "tree_tests_rollup")
-            self.stdout.write("TreeTestsRollup migration completed")
-
     def restore_tree_tests_rollup(self) -> None:
         """Migrate TreeTestsRollup data from file to dashboard_db"""
         with TextIOWrapper(
@@ -0,0 +1,109 @@
+import zstandard
+from django.http import HttpResponse
+from django.middleware.cache import CacheMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import decorator_from_middleware_with_args
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_string
+
+# Responses shorter than this are not compressed, as in GZipMiddleware
+MIN_COMPRESSED_LENGTH = 200
+ZSTD_LEVEL = 3
+
+# In order of preference when the client accepts more than one of them
+ACCEPTED_ENCODINGS = {
+    "zstd": _lazy_re_compile(r"\bzstd\b"),
+    "gzip": _lazy_re_compile(r"\bgzip\b"),
+}
+
+
+def precompress_content(content: bytes) -> dict[str, bytes]:
+    """Compresses the content with each of the ACCEPTED_ENCODINGS, keeping only
+    the ones that are shorter than the content"""
+    compressed_contents = {
+        "zstd": zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content),
+        "gzip": compress_string(content),
+    }
+    return {
+        encoding: compressed_content
+        for encoding, compressed_content in compressed_contents.items()
+        if len(compressed_content) < len(content)
+    }
+
+
+def encode_response(request, response):
+    """Replaces the content of the response with its precompressed representation
+    in the best encoding accepted by the request, if it has any."""
+    precompressed_content: dict[str, bytes] = getattr(
+        response, "precompressed_content", {}
+    )
+    if not precompressed_content:
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+
+    accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    for encoding, accepts_encoding in ACCEPTED_ENCODINGS.items():
+        if encoding in precompressed_content and accepts_encoding.search(
+            accept_encoding
+        ):
+            response.content = precompressed_content[encoding]
+            response.headers["Content-Length"] = str(len(response.content))
+            response.headers["Content-Encoding"] = encoding
+            break
+    return response
+
+
+def to_plain_response(response: HttpResponse) -> HttpResponse:
+    """Copies a rendered response to a plain HttpResponse, without the data and
+    renderer context that DRF responses keep, so that only bytes are cached"""
+    plain_response = HttpResponse(
+        response.content,
+        status=response.status_code,
+        reason=response.reason_phrase,
+        headers=response.headers,
+    )
+    plain_response.cookies = response.cookies
+    return plain_response
+
+
+class PrecompressedCacheMiddleware(CacheMiddleware):
+    """
+    CacheMiddleware that also caches the compressed representations of the
+    responses, so that GZipMiddleware doesn't compress the same content again
+    on every cache hit.
+
+    The responses are cached as plain HttpResponses, compressed once with each
+    of the ACCEPTED_ENCODINGS. Both the cache hits and the response that fills
+    the cache are then served in the best encoding accepted by the client, or
+    uncompressed. They keep a single cache entry for every Accept-Encoding.
+    """
+
+    def process_request(self, request):
+        response = super().process_request(request)
+        if response is None:
+            return None
+        return encode_response(request, response)
+
+    def process_response(self, request, response):
+        if (
+            self._should_update_cache(request, response)
+            and not response.streaming
+            and response.status_code == 200
+        ):
+            response = to_plain_response(response)
+            if (
+                not response.has_header("Content-Encoding")
+                and len(response.content) >= MIN_COMPRESSED_LENGTH
+            ):
+                response.precompressed_content = precompress_content(response.content)
+
+        response = super().process_response(request, response)
+        return encode_response(request, response)
+
+
+def precompressed_cache_page(timeout: int):
+    """Same as django's cache_page, caching the compressed responses as well"""
+    return decorator_from_middleware_with_args(PrecompressedCacheMiddleware)(
+        page_timeout=timeout
+    )
@@ -0,0 +1,51 @@
+import time
+
+from kernelCI_app.helpers.queryProfiling import (
+    get_request_profile,
+    observe_request_profile,
+    profile_request,
+)
+
+
+class QueryProfilingMiddleware:
+    """Exports the time that the requests of each view spend running queries,
+    processing the rows and rendering the response, and the number of rows that
+    their queries return.
+
+    The rendering is measured from the end of the view to the end of the
+    post-render callbacks of its response, which include the ones that cache
+    and compress it. Cache hits have no rendering phase."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_request() as profile:
+            response = self.get_response(request)
+            end = time.perf_counter()
+
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is not None and resolver_match.url_name is not None:
+            observe_request_profile(
+                view=resolver_match.url_name, profile=profile, end=end
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = get_request_profile()
+        if profile is not None:
+            profile.view_start = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        profile = get_request_profile()
+        if profile is None:
+            return response
+
+        profile.view_end = time.perf_counter()
+
+        def end_rendering(rendered_response):
+            profile.render_end = time.perf_counter()
+
+        response.add_post_render_callback(end_rendering)
+        return response
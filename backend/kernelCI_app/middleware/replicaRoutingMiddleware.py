@@ -0,0 +1,35 @@
+from django.urls import Resolver404, resolve
+
+from kernelCI_app.routers.replicas import (
+    REPLICA_ROUTING_COUNTER,
+    choose_read_database,
+    is_replica_view,
+    use_read_database,
+)
+
+READ_ONLY_METHODS = ("GET", "HEAD")
+
+
+class ReplicaRoutingMiddleware:
+    """Routes the reads of the views in `REPLICA_VIEWS` to a read replica.
+
+    Only GET and HEAD requests are routed, everything else stays on the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if request.method not in READ_ONLY_METHODS:
+            return self.get_response(request)
+
+        try:
+            url_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return self.get_response(request)
+        if not is_replica_view(url_name):
+            return self.get_response(request)
+
+        database = choose_read_database()
+        REPLICA_ROUTING_COUNTER.labels(database=database).inc()
+        with use_read_database(database):
+            return self.get_response(request)
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0018_hardwareregistryplatformvendor_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueSeenSummary",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "issue_id",
+                        "issue_version",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("issue_id", models.TextField()),
+                ("issue_version", models.IntegerField()),
+                ("first_incident_id", models.TextField()),
+                ("first_seen", models.DateTimeField(blank=True, null=True)),
+                ("first_checkout_id", models.TextField(blank=True, null=True)),
+                ("last_incident_id", models.TextField()),
+                ("last_seen", models.DateTimeField(blank=True, null=True)),
+                ("last_checkout_id", models.TextField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "issue_seen_summary",
+            },
+        ),
+        migrations.CreateModel(
+            name="IssueSeenTree",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("issue_id", models.TextField()),
+                ("issue_version", models.IntegerField()),
+                ("tree_name", models.TextField(blank=True, null=True)),
+                ("git_repository_url", models.TextField(blank=True, null=True)),
+                ("git_repository_branch", models.TextField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "issue_seen_trees",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "issue_id",
+                            "issue_version",
+                            "tree_name",
+                            "git_repository_url",
+                            "git_repository_branch",
+                        ),
+                        name="issue_seen_trees_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:29
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0019_issue_seen_summary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HardwareTestsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hardware_id", models.TextField()),
+                ("checkout_id", models.TextField()),
+                ("start_time", models.DateTimeField()),
+                ("origin", models.TextField()),
+                ("test_platform", models.TextField(blank=True, null=True)),
+                (
+                    "test_compatibles",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), blank=True, null=True, size=None
+                    ),
+                ),
+                ("path_group", models.TextField()),
+                ("build_config_name", models.TextField()),
+                ("build_architecture", models.TextField()),
+                ("build_compiler", models.TextField()),
+                ("lab", models.TextField(blank=True, null=True)),
+                ("issue_id", models.TextField(blank=True, null=True)),
+                ("issue_version", models.IntegerField(blank=True, null=True)),
+                ("issue_uncategorized", models.BooleanField(default=False)),
+                ("is_boot", models.BooleanField(default=False)),
+                ("is_build", models.BooleanField(default=False)),
+                ("pass_tests", models.IntegerField(default=0)),
+                ("fail_tests", models.IntegerField(default=0)),
+                ("skip_tests", models.IntegerField(default=0)),
+                ("error_tests", models.IntegerField(default=0)),
+                ("miss_tests", models.IntegerField(default=0)),
+                ("done_tests", models.IntegerField(default=0)),
+                ("null_tests", models.IntegerField(default=0)),
+                ("total_tests", models.IntegerField(default=0)),
+            ],
+            options={
+                "db_table": "hardware_tests_rollup",
+                "indexes": [
+                    models.Index(
+                        fields=["hardware_id", "origin", "start_time"],
+                        name="hw_tests_rollup_scope",
+                    ),
+                    models.Index(
+                        fields=["checkout_id"], name="hw_tests_rollup_checkout_id"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "hardware_id",
+                            "checkout_id",
+                            "origin",
+                            "test_platform",
+                            "test_compatibles",
+                            "path_group",
+                            "build_config_name",
+                            "build_architecture",
+                            "build_compiler",
+                            "lab",
+                            "issue_id",
+                            "issue_version",
+                            "issue_uncategorized",
+                            "is_boot",
+                            "is_build",
+                        ),
+                        name="hardware_tests_rollup_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0020_hardware_tests_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HardwareTreeSelector",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("origin", models.TextField()),
+                ("tree_name", models.TextField()),
+                ("git_repository_url", models.TextField()),
+                ("git_repository_branch", models.TextField()),
+                ("git_commit_hash", models.TextField()),
+                ("git_commit_name", models.TextField(blank=True, null=True)),
+                ("start_time", models.DateTimeField(blank=True, null=True)),
+                ("last_build_start_time", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "hardware_tree_selectors",
+                "indexes": [
+                    models.Index(
+                        fields=["origin", "last_build_start_time"],
+                        name="hw_tree_selectors_recent",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "origin",
+                            "tree_name",
+                            "git_repository_url",
+                            "git_repository_branch",
+                            "git_commit_hash",
+                            "git_commit_name",
+                        ),
+                        name="hardware_tree_selectors_unique",
+                        nulls_distinct=False,
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0021_hardware_tree_selectors"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TestSeries",
+            fields=[
+                ("test_id", models.TextField(primary_key=True, serialize=False)),
+                ("series_id", models.TextField()),
+                ("checkout_id", models.TextField()),
+                ("start_time", models.DateTimeField(blank=True, null=True)),
+                (
+                    "field_timestamp",
+                    models.DateTimeField(blank=True, db_column="_timestamp", null=True),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("PASS", "Pass"),
+                            ("FAIL", "Fail"),
+                            ("SKIP", "Skip"),
+                            ("ERROR", "Error"),
+                            ("MISS", "Miss"),
+                            ("DONE", "Done"),
+                        ],
+                        max_length=10,
+                        null=True,
+                    ),
+                ),
+                ("git_commit_hash", models.TextField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "test_series",
+                "indexes": [
+                    models.Index(
+                        fields=["series_id", "-start_time"],
+                        name="test_series_start_time",
+                    ),
+                    models.Index(
+                        fields=["series_id", "-field_timestamp"],
+                        name="test_series_timestamp",
+                    ),
+                    models.Index(
+                        fields=["checkout_id"], name="test_series_checkout_id"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:45
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0022_test_series"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TreeCommitTimeline",
+            fields=[
+                ("id", models.AutoField(primary_key=True, serialize=False)),
+                ("origin", models.TextField()),
+                ("tree_name", models.TextField()),
+                ("git_repository_url", models.TextField()),
+                ("git_repository_branch", models.TextField()),
+                ("git_commit_hash", models.TextField()),
+                ("git_commit_name", models.TextField(blank=True, null=True)),
+                (
+                    "git_commit_tags",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), blank=True, null=True, size=None
+                    ),
+                ),
+                ("first_start_time", models.DateTimeField()),
+                ("last_start_time", models.DateTimeField()),
+            ],
+            options={
+                "db_table": "tree_commit_timeline",
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "tree_name",
+                            "git_repository_url",
+                            "git_repository_branch",
+                            "first_start_time",
+                        ],
+                        name="tree_commit_timeline_scope",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=(
+                            "origin",
+                            "tree_name",
+                            "git_repository_url",
+                            "git_repository_branch",
+                            "git_commit_hash",
+                        ),
+                        name="tree_commit_timeline_unique",
+                    )
+                ],
+            },
+        ),
+    ]
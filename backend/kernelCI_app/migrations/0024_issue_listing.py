@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:47
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_app", "0023_tree_commit_timeline"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueListingEntry",
+            fields=[
+                (
+                    "pk",
+                    models.CompositePrimaryKey(
+                        "issue_id",
+                        "issue_version",
+                        blank=True,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("issue_id", models.TextField()),
+                ("issue_version", models.IntegerField()),
+                ("origin", models.TextField()),
+                (
+                    "field_timestamp",
+                    models.DateTimeField(blank=True, db_column="_timestamp", null=True),
+                ),
+                ("comment", models.TextField(blank=True, null=True)),
+                ("culprit_code", models.BooleanField(blank=True, null=True)),
+                ("culprit_tool", models.BooleanField(blank=True, null=True)),
+                ("culprit_harness", models.BooleanField(blank=True, null=True)),
+                (
+                    "categories",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.TextField(), blank=True, null=True, size=None
+                    ),
+                ),
+                ("incident_count", models.IntegerField(default=0)),
+                ("has_trees", models.BooleanField(default=False)),
+                ("first_seen", models.DateTimeField(blank=True, null=True)),
+                ("last_seen", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "issue_listing",
+                "indexes": [
+                    models.Index(
+                        fields=["-field_timestamp", "issue_id", "issue_version"],
+                        name="issue_listing__timestamp",
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["categories"], name="issue_listing_categories"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -501,6 +501,299 @@ class TreeTestsRollup(models.Model):
         ]
 
 
+class HardwareTestsRollup(models.Model):
+    """Rollup of per-status build and test counts for a hardware in a checkout.
+
+    Tests are counted once for each hardware they ran on, that is, their
+    platform and each of their compatibles, so a single `hardware_id` filter
+    finds every test of a hardware. Builds are counted once per hardware
+    that ran tests of them, in rows with `is_build` set.
+
+    `start_time` is the checkout start time, like in `hardware_status`.
+    """
+
+    hardware_id = models.TextField()
+    checkout_id = models.TextField()
+    start_time = models.DateTimeField()
+
+    origin = models.TextField()
+    test_platform = models.TextField(blank=True, null=True)
+    test_compatibles = ArrayField(models.TextField(), blank=True, null=True)
+
+    path_group = models.TextField()
+    build_config_name = models.TextField()
+    build_architecture = models.TextField()
+    build_compiler = models.TextField()
+    lab = models.TextField(blank=True, null=True)
+
+    issue_id = models.TextField(blank=True, null=True)
+    issue_version = models.IntegerField(blank=True, null=True)
+    issue_uncategorized = models.BooleanField(default=False)
+
+    is_boot = models.BooleanField(default=False)
+    is_build = models.BooleanField(default=False)
+
+    pass_tests = models.IntegerField(default=0)
+    fail_tests = models.IntegerField(default=0)
+    skip_tests = models.IntegerField(default=0)
+    error_tests = models.IntegerField(default=0)
+    miss_tests = models.IntegerField(default=0)
+    done_tests = models.IntegerField(default=0)
+    null_tests = models.IntegerField(default=0)
+    total_tests = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "hardware_tests_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "hardware_id",
+                    "checkout_id",
+                    "origin",
+                    "test_platform",
+                    "test_compatibles",
+                    "path_group",
+                    "build_config_name",
+                    "build_architecture",
+                    "build_compiler",
+                    "lab",
+                    "issue_id",
+                    "issue_version",
+                    "issue_uncategorized",
+                    "is_boot",
+                    "is_build",
+                ],
+                name="hardware_tests_rollup_unique",
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["hardware_id", "origin", "start_time"],
+                name="hw_tests_rollup_scope",
+            ),
+            models.Index(fields=["checkout_id"], name="hw_tests_rollup_checkout_id"),
+        ]
+
+
+class IssueSeenSummary(models.Model):
+    """First and last incident of each issue version.
+
+    Maintained by the ingester as incidents arrive, so that the issue extras
+    don't need to scan all incidents of an issue. The checkout is resolved
+    through the incident's build or test when the incident is ingested.
+    """
+
+    pk = models.CompositePrimaryKey("issue_id", "issue_version")
+    issue_id = models.TextField()
+    issue_version = models.IntegerField()
+
+    first_incident_id = models.TextField()
+    first_seen = models.DateTimeField(blank=True, null=True)
+    first_checkout_id = models.TextField(blank=True, null=True)
+
+    last_incident_id = models.TextField()
+    last_seen = models.DateTimeField(blank=True, null=True)
+    last_checkout_id = models.TextField(blank=True, null=True)
+
+    class Meta:
+        db_table = "issue_seen_summary"
+
+
+class IssueSeenTree(models.Model):
+    """Trees in which each issue version had an incident."""
+
+    id = models.AutoField(primary_key=True)
+    issue_id = models.TextField()
+    issue_version = models.IntegerField()
+
+    tree_name = models.TextField(blank=True, null=True)
+    git_repository_url = models.TextField(blank=True, null=True)
+    git_repository_branch = models.TextField(blank=True, null=True)
+
+    class Meta:
+        db_table = "issue_seen_trees"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "issue_id",
+                    "issue_version",
+                    "tree_name",
+                    "git_repository_url",
+                    "git_repository_branch",
+                ],
+                name="issue_seen_trees_unique",
+                nulls_distinct=False,
+            ),
+        ]
+
+
+class IssueListingEntry(models.Model):
+    """Issue versions with their incident data, for the issue listing.
+
+    Maintained by the ingester as issues and incidents arrive, so that the
+    listing can be filtered and paginated without scanning the incidents.
+    `has_trees` tells whether any incident is linked to a tree.
+    """
+
+    pk = models.CompositePrimaryKey("issue_id", "issue_version")
+    issue_id = models.TextField()
+    issue_version = models.IntegerField()
+    origin = models.TextField()
+    field_timestamp = models.DateTimeField(
+        db_column="_timestamp", blank=True, null=True
+    )
+    comment = models.TextField(blank=True, null=True)
+    culprit_code = models.BooleanField(blank=True, null=True)
+    culprit_tool = models.BooleanField(blank=True, null=True)
+    culprit_harness = models.BooleanField(blank=True, null=True)
+    categories = ArrayField(models.TextField(), blank=True, null=True)
+
+    incident_count = models.IntegerField(default=0)
+    has_trees = models.BooleanField(default=False)
+    first_seen = models.DateTimeField(blank=True, null=True)
+    last_seen = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "issue_listing"
+        indexes = [
+            models.Index(
+                fields=["-field_timestamp", "issue_id", "issue_version"],
+                name="issue_listing__timestamp",
+            ),
+            GinIndex(fields=["categories"], name="issue_listing_categories"),
+        ]
+
+
+class HardwareTreeSelector(models.Model):
+    """Tree heads that had builds of an origin, for the hardware selectors.
+
+    Maintained by the ingester as checkouts and builds arrive. `start_time`
+    is the latest start time of the checkouts of the commit and
+    `last_build_start_time` the latest start time of their builds.
+    """
+
+    id = models.AutoField(primary_key=True)
+    origin = models.TextField()
+    tree_name = models.TextField()
+    git_repository_url = models.TextField()
+    git_repository_branch = models.TextField()
+    git_commit_hash = models.TextField()
+    git_commit_name = models.TextField(blank=True, null=True)
+
+    start_time = models.DateTimeField(blank=True, null=True)
+    last_build_start_time = models.DateTimeField()
+
+    class Meta:
+        db_table = "hardware_tree_selectors"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "origin",
+                    "tree_name",
+                    "git_repository_url",
+                    "git_repository_branch",
+                    "git_commit_hash",
+                    "git_commit_name",
+                ],
+                name="hardware_tree_selectors_unique",
+                nulls_distinct=False,
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["origin", "last_build_start_time"],
+                name="hw_tree_selectors_recent",
+            ),
+        ]
+
+
+class TreeCommitTimeline(models.Model):
+    """Commits seen in each tree, for the hardware commit history.
+
+    Maintained by the ingester as checkouts arrive. `first_start_time` is the
+    start time of the first checkout of the commit, and the commit name and tags
+    are the ones of that checkout. `last_start_time` is the start time of
+    the latest checkout of the commit.
+    """
+
+    id = models.AutoField(primary_key=True)
+    origin = models.TextField()
+    tree_name = models.TextField()
+    git_repository_url = models.TextField()
+    git_repository_branch = models.TextField()
+    git_commit_hash = models.TextField()
+    git_commit_name = models.TextField(blank=True, null=True)
+    git_commit_tags = ArrayField(models.TextField(), blank=True, null=True)
+
+    first_start_time = models.DateTimeField()
+    last_start_time = models.DateTimeField()
+
+    class Meta:
+        db_table = "tree_commit_timeline"
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "origin",
+                    "tree_name",
+                    "git_repository_url",
+                    "git_repository_branch",
+                    "git_commit_hash",
+                ],
+                name="tree_commit_timeline_unique",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=[
+                    "tree_name",
+                    "git_repository_url",
+                    "git_repository_branch",
+                    "first_start_time",
+                ],
+                name="tree_commit_timeline_scope",
+            ),
+        ]
+
+
+class TestSeries(models.Model):
+    """Runs of each test series, for the test status history.
+
+    A series is the same test path in the same tree, origin, build config and
+    platform, hashed into `series_id` (see `get_test_series_id_clause`). The
+    rows copy what the history shows, so it is read without joining
+    the builds and checkouts tables.
+    """
+
+    # Disables automatic pytest test discovery for this class
+    __test__ = False
+
+    test_id = models.TextField(primary_key=True)
+    series_id = models.TextField()
+    checkout_id = models.TextField()
+
+    start_time = models.DateTimeField(blank=True, null=True)
+    field_timestamp = models.DateTimeField(
+        db_column="_timestamp", blank=True, null=True
+    )
+    status = models.CharField(
+        max_length=10, choices=StatusChoices.choices, blank=True, null=True
+    )
+    git_commit_hash = models.TextField(blank=True, null=True)
+
+    class Meta:
+        db_table = "test_series"
+        indexes = [
+            models.Index(
+                fields=["series_id", "-start_time"], name="test_series_start_time"
+            ),
+            models.Index(
+                fields=["series_id", "-field_timestamp"], name="test_series_timestamp"
+            ),
+            models.Index(fields=["checkout_id"], name="test_series_checkout_id"),
+        ]
+
+
 class HardwareRegistrySiliconVendor(models.Model):
     id = models.TextField(primary_key=True)
     type = models.CharField(max_length=64, blank=True)
@@ -3,7 +3,10 @@ from typing import Optional
 from django.db.models.expressions import F
 from querybuilder.query import Query
 
+from kernelCI_app.helpers.database import dict_fetchall
 from kernelCI_app.models import Builds, Tests
+from kernelCI_app.routers.replicas import connection
+from kernelCI_app.utils import validate_str_to_dict
 
 
 def get_build_details(build_id: str) -> Optional[list[dict]]:
@@ -65,3 +68,80 @@ def get_build_tests(build_id: str) -> Optional[list[dict]]:
         )
     )
     return list(result)
+
+
+def get_builds_details(build_ids: list[str]) -> list[dict]:
+    """Batch version of `get_build_details`, returns the rows of all the given builds."""
+    query = """
+        SELECT
+            B.id,
+            B._timestamp,
+            B.checkout_id,
+            B.origin AS build_origin,
+            B.comment,
+            B.start_time,
+            B.log_excerpt,
+            B.duration,
+            B.architecture,
+            B.command,
+            B.compiler,
+            B.config_name,
+            B.config_url,
+            B.log_url,
+            B.status,
+            B.misc,
+            B.input_files,
+            B.output_files,
+            C.tree_name,
+            C.git_repository_branch,
+            C.git_commit_name,
+            C.git_repository_url,
+            C.git_commit_hash,
+            C.git_commit_tags,
+            C.origin
+        FROM
+            builds B
+            LEFT JOIN checkouts C ON C.id = B.checkout_id
+        WHERE
+            B.id = ANY(%s)
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, [build_ids])
+        rows = dict_fetchall(cursor)
+
+    # The raw cursor returns json columns as strings
+    for row in rows:
+        for field in ("misc", "input_files", "output_files"):
+            row[field] = validate_str_to_dict(row[field])
+    return rows
+
+
+def get_builds_tests(build_ids: list[str]) -> list[dict]:
+    """Batch version of `get_build_tests`, the rows also have the `build_id`."""
+    query = """
+        SELECT
+            T.id,
+            T.build_id,
+            T.duration,
+            T.status,
+            T.path,
+            T.start_time,
+            T.environment_compatible,
+            T.environment_misc,
+            B.status AS build__status,
+            T.misc->>'runtime' AS lab
+        FROM
+            tests T
+            JOIN builds B ON B.id = T.build_id
+        WHERE
+            T.build_id = ANY(%s)
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, [build_ids])
+        rows = dict_fetchall(cursor)
+
+    for row in rows:
+        row["environment_misc"] = validate_str_to_dict(row["environment_misc"])
+    return rows
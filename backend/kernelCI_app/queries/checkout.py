@@ -1,7 +1,6 @@
-from django.db import connection
-
 from kernelCI_app.cache import get_query_cache, set_query_cache
 from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.routers.replicas import connection
 
 ORIGINS_CACHE_TIMEOUT = 12 * 60 * 60  # 12 hours
 
@@ -1,16 +1,20 @@
 from datetime import datetime
 from typing import Optional, TypedDict
 
-from django.db import connection
-
 from kernelCI_app.cache import get_query_cache, set_query_cache
 from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.helpers.preparedQueries import register_query, registered_cursor
 from kernelCI_app.queries.duration import (
     get_boot_test_duration_clause,
     get_build_duration_clause,
 )
+from kernelCI_app.routers.replicas import connection
 from kernelCI_app.typeModels.hardwareDetails import CommitHead, Tree
 
+HARDWARE_LISTING_QUERY = register_query(
+    "hardware_listing", "Status counts of each hardware from the hardware_status table"
+)
+
 
 def _get_hardware_tree_heads_clause(*, id_only: bool) -> str:
     """Returns the tree_heads for the hardware queries,
@@ -120,35 +124,23 @@ def get_hardware_selectors(origin: str) -> list[dict]:
     params = {"origin": origin}
 
     query = """
-        SELECT DISTINCT ON (
-            c.tree_name,
-            c.git_repository_url,
-            c.git_repository_branch,
-            c.git_commit_hash,
-            c.git_commit_name
-        )
-            c.tree_name,
-            c.git_repository_url,
-            c.git_repository_branch,
-            c.git_commit_hash,
-            c.git_commit_name,
-            c.start_time
-        FROM checkouts c
-        INNER JOIN builds b ON b.checkout_id = c.id
+        SELECT
+            tree_name,
+            git_repository_url,
+            git_repository_branch,
+            git_commit_hash,
+            git_commit_name,
+            start_time
+        FROM hardware_tree_selectors
         WHERE
-            b.origin = %(origin)s
-            AND b.start_time > (NOW() - INTERVAL '30 days')
-            AND c.git_repository_url IS NOT NULL
-            AND c.git_repository_branch IS NOT NULL
-            AND c.git_commit_hash IS NOT NULL
-            AND c.tree_name IS NOT NULL
+            origin = %(origin)s
+            AND last_build_start_time > (NOW() - INTERVAL '30 days')
         ORDER BY
-            c.tree_name,
-            c.git_repository_url,
-            c.git_repository_branch,
-            c.git_commit_hash,
-            c.git_commit_name,
-            c.start_time DESC;
+            tree_name,
+            git_repository_url,
+            git_repository_branch,
+            git_commit_hash,
+            git_commit_name
     """
 
     with connection.cursor() as cursor:
@@ -388,7 +380,7 @@ def get_hardware_listing_data_from_status_table(
             compatibles
     """
 
-    with connection.cursor() as cursor:
+    with registered_cursor(HARDWARE_LISTING_QUERY) as cursor:
         cursor.execute(query, params)
         return cursor.fetchall()
 
@@ -584,6 +576,99 @@ def get_hardware_details_summary(
         return query_rows
 
 
+def get_hardware_details_summary_from_rollup(
+    *,
+    hardware_id: str,
+    origin: str,
+    commit_hashes: list[str],
+    start_datetime: datetime,
+    end_datetime: datetime,
+) -> list[dict]:
+    """
+    Returns the same rows as `get_hardware_details_summary`, read from the
+    pre-aggregated hardware_tests_rollup table instead of the builds and tests.
+
+    Differences from the raw query:
+        - the time interval is applied to the checkout start_time;
+        - each build or test is counted with its first incident only;
+        - duration filters are not supported.
+    """
+    cache_key = "hardwareDetailsSummaryRollup"
+    cache_params = {
+        "hardware_id": hardware_id,
+        "origin": origin,
+        "commit_hashes": commit_hashes,
+        "start_date": start_datetime.timestamp(),
+        "end_date": end_datetime.timestamp(),
+    }
+
+    query_rows = get_query_cache(cache_key, cache_params)
+    if query_rows is not None:
+        return query_rows
+
+    query = """
+        SELECT
+            S.count,
+            checkouts.origin,
+            S.status,
+            CASE WHEN R.issue_id IS NULL THEN 0 ELSE S.count END AS incidents_count,
+            ARRAY[
+                CASE WHEN R.issue_id IS NOT NULL
+                THEN R.issue_id || ',' || COALESCE(R.issue_version::text, 'NULL')
+                END
+            ] AS known_issues,
+            ARRAY[R.build_compiler, R.build_architecture] AS compiler_arch,
+            R.build_config_name AS config_name,
+            R.lab,
+            R.test_platform AS platform,
+            R.test_compatibles AS environment_compatible,
+            checkouts.tree_name,
+            checkouts.git_repository_url,
+            checkouts.git_commit_tags,
+            checkouts.git_commit_name,
+            checkouts.git_repository_branch,
+            checkouts.git_commit_hash,
+            R.is_build,
+            NOT R.is_build AS is_test,
+            R.is_boot
+        FROM
+            hardware_tests_rollup R
+        INNER JOIN checkouts ON
+            R.checkout_id = checkouts.id
+        CROSS JOIN LATERAL (
+            VALUES
+                ('PASS', R.pass_tests),
+                ('FAIL', R.fail_tests),
+                ('SKIP', R.skip_tests),
+                ('ERROR', R.error_tests),
+                ('MISS', R.miss_tests),
+                ('DONE', R.done_tests),
+                (NULL, R.null_tests)
+        ) AS S(status, count)
+        WHERE
+            R.hardware_id = %(hardware_id)s
+            AND R.origin = %(origin)s
+            AND R.start_time >= %(start_date)s
+            AND R.start_time <= %(end_date)s
+            AND checkouts.git_commit_hash = ANY(%(commits)s)
+            AND S.count > 0
+    """
+
+    params = {
+        "hardware_id": hardware_id,
+        "origin": origin,
+        "start_date": start_datetime,
+        "end_date": end_datetime,
+        "commits": commit_hashes,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        query_rows = dict_fetchall(cursor)
+        set_query_cache(key=cache_key, params=cache_params, rows=query_rows)
+        return query_rows
+
+
 def query_records(
     *, hardware_id: str, origin: str, trees: list[Tree], start_date: int, end_date: int
 ) -> list[dict] | None:
@@ -985,65 +1070,63 @@ def get_hardware_commit_history(
     }
 
     raw_query = f"""
-        -- Selects the start_time of the latest checkout for the selected trees (+identifier fields)
-        WITH filtered_checkouts AS (
+        -- Selects the first start_time of the selected heads for each tree
+        WITH filtered_heads AS (
             SELECT DISTINCT
                 ON (
                     tree_name,
                     git_repository_url,
-                    git_repository_branch,
-                    origin
+                    git_repository_branch
                 )
                 tree_name,
                 git_repository_url,
                 git_repository_branch,
-                start_time
+                first_start_time AS start_time
             FROM
-                checkouts c
+                tree_commit_timeline tct
             WHERE
                 (
-                    c.tree_name,
-                    c.git_repository_url,
-                    c.git_repository_branch,
-                    c.git_commit_hash
+                    tct.tree_name,
+                    tct.git_repository_url,
+                    tct.git_repository_branch,
+                    tct.git_commit_hash
                 ) IN {commit_heads_params["tuple_str"]}
-                AND c.origin = %(origin)s
+                AND tct.origin = %(origin)s
             ORDER BY
                 tree_name,
                 git_repository_url,
                 git_repository_branch,
-                origin,
-                c.start_time
+                first_start_time
         )
-        -- Selects the data from all checkouts prior to the "head checkout" of
-        -- the selected trees (while also limiting by the queried timestamps)
+        -- Selects the commits of the selected trees prior to their head
+        -- (while also limiting by the queried timestamps)
         SELECT
-            fc.tree_name AS tree_name,
-            fc.git_repository_url AS git_repository_url,
-            fc.git_repository_branch AS git_repository_branch,
+            fh.tree_name AS tree_name,
+            fh.git_repository_url AS git_repository_url,
+            fh.git_repository_branch AS git_repository_branch,
             lateralus.git_commit_tags AS git_commit_tags,
             lateralus.git_commit_name AS git_commit_name,
             lateralus.git_commit_hash AS git_commit_hash,
-            lateralus.start_time AS start_time
+            lateralus.first_start_time AS start_time
         FROM
-            filtered_checkouts fc,
+            filtered_heads fh,
             LATERAL (
                 SELECT
-                    DISTINCT ON (c.git_commit_hash)
-                    c.git_commit_tags,
-                    c.git_commit_name,
-                    c.git_commit_hash,
-                    c.start_time
+                    DISTINCT ON (tct.git_commit_hash)
+                    tct.git_commit_tags,
+                    tct.git_commit_name,
+                    tct.git_commit_hash,
+                    tct.first_start_time
                 FROM
-                    checkouts c
+                    tree_commit_timeline tct
                 WHERE
-                    c.tree_name = fc.tree_name
-                    AND c.git_repository_branch = fc.git_repository_branch
-                    AND c.git_repository_url = fc.git_repository_url
-                    AND c.start_time <= fc.start_time
-                    AND c.start_time >= %(start_date)s
-                    AND c.start_time <= %(end_date)s
-                ORDER BY c.git_commit_hash, c.start_time
+                    tct.tree_name = fh.tree_name
+                    AND tct.git_repository_url = fh.git_repository_url
+                    AND tct.git_repository_branch = fh.git_repository_branch
+                    AND tct.first_start_time <= fh.start_time
+                    AND tct.first_start_time >= %(start_date)s
+                    AND tct.first_start_time <= %(end_date)s
+                ORDER BY tct.git_commit_hash, tct.first_start_time
             ) AS lateralus;
         """
 
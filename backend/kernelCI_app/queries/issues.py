@@ -1,11 +1,19 @@
 from datetime import datetime
 from typing import Any, Literal, Optional
 
-from django.db import connection, connections
-
 from kernelCI_app.cache import get_query_cache, set_query_cache
 from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.helpers.preparedQueries import register_query, registered_cursor
 from kernelCI_app.models import Issues
+from kernelCI_app.routers.replicas import connection
+from kernelCI_app.typeModels.issues import POSSIBLE_CULPRITS
+
+ISSUE_LISTING_PAGE_QUERY = register_query(
+    "issue_listing_page", "Page of the issue_listing table"
+)
+ISSUE_LISTING_COUNT_QUERY = register_query(
+    "issue_listing_count", "Number of issue_listing rows that match a filter"
+)
 
 
 def _get_issue_version_clause(*, version: Optional[int]) -> str:
@@ -153,6 +161,172 @@ def get_issue_listing_data(
         return rows
 
 
+def get_issue_listing_facets(*, start_date: datetime, end_date: datetime) -> dict:
+    """Queries the origins, culprits and categories of the issues whose timestamp
+    falls within [start_date, end_date] from the issue_listing table.
+
+    Returns a dict with `issue_count`, `origins`, `categories` and one flag per culprit."""
+
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    cache_params = {
+        "start_date": int(start_date.timestamp()),
+        "end_date": int(end_date.timestamp()),
+    }
+    cache_key = "issueListingFacets"
+
+    rows = get_query_cache(key=cache_key, params=cache_params)
+    if rows is not None:
+        return rows
+
+    query = """
+    WITH window_issues AS (
+        SELECT
+            origin,
+            culprit_code,
+            culprit_harness,
+            culprit_tool,
+            categories
+        FROM
+            issue_listing
+        WHERE
+            _timestamp >= %(start_date)s
+            AND _timestamp <= %(end_date)s
+    )
+    SELECT
+        COUNT(*) AS issue_count,
+        COALESCE(ARRAY_AGG(DISTINCT origin), '{}') AS origins,
+        COALESCE(BOOL_OR(culprit_code), FALSE) AS culprit_code,
+        COALESCE(BOOL_OR(culprit_harness), FALSE) AS culprit_harness,
+        COALESCE(BOOL_OR(culprit_tool), FALSE) AS culprit_tool,
+        COALESCE(
+            (
+                SELECT ARRAY_AGG(DISTINCT category)
+                FROM window_issues, UNNEST(categories) AS category
+            ),
+            '{}'
+        ) AS categories
+    FROM
+        window_issues
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        facets = dict_fetchall(cursor)[0]
+        set_query_cache(key=cache_key, params=cache_params, rows=facets)
+        return facets
+
+
+def get_issue_listing_page(
+    *,
+    start_date: datetime,
+    end_date: datetime,
+    origins: list[str],
+    culprits: list[str],
+    categories: list[str],
+    has_incident: bool,
+    limit: Optional[int],
+    offset: int,
+) -> tuple[list[dict], int]:
+    """Queries a page of the issues whose timestamp falls within [start_date, end_date]
+    from the issue_listing table, newest first.
+
+    An issue is kept if it matches any of the `origins`, any of the `culprits` and any
+    of the `categories`, and if it has incidents when `has_incident` is set. Empty lists
+    don't filter. Issues whose incidents aren't linked to any tree are left out.
+
+    Returns the issue records of the page and the number of issues in all pages."""
+
+    culprit_clauses = [
+        f"culprit_{culprit} IS TRUE"
+        for culprit in sorted(culprits)
+        if culprit in POSSIBLE_CULPRITS
+    ]
+    filter_clauses = []
+    if origins:
+        filter_clauses.append("origin = ANY(%(origins)s)")
+    if culprit_clauses:
+        filter_clauses.append(f"({' OR '.join(culprit_clauses)})")
+    if categories:
+        filter_clauses.append("categories && %(categories)s::text[]")
+    if has_incident:
+        filter_clauses.append("incident_count > 0")
+    filter_clause = "".join(f"\n            AND {clause}" for clause in filter_clauses)
+
+    params = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "origins": sorted(origins),
+        "categories": sorted(categories),
+        "limit": limit,
+        "offset": offset,
+    }
+    cache_params = {
+        **params,
+        "start_date": int(start_date.timestamp()),
+        "end_date": int(end_date.timestamp()),
+        "culprits": sorted(culprits),
+        "has_incident": has_incident,
+    }
+    cache_key = "issueListingPage"
+
+    cached_page = get_query_cache(key=cache_key, params=cache_params)
+    if cached_page is not None:
+        return cached_page["rows"], cached_page["total"]
+
+    where_clause = f"""
+        WHERE
+            _timestamp >= %(start_date)s
+            AND _timestamp <= %(end_date)s
+            AND (incident_count = 0 OR has_trees){filter_clause}
+    """
+
+    page_query = f"""
+        SELECT
+            issue_id AS id,
+            _timestamp AS field_timestamp,
+            comment,
+            issue_version AS version,
+            origin,
+            culprit_code,
+            culprit_harness,
+            culprit_tool,
+            categories,
+            incident_count > 0 AS has_incident
+        FROM
+            issue_listing
+        {where_clause}
+        ORDER BY
+            _timestamp DESC,
+            issue_id,
+            issue_version
+        LIMIT %(limit)s
+        OFFSET %(offset)s
+    """
+
+    count_query = f"""
+        SELECT
+            COUNT(*)
+        FROM
+            issue_listing
+        {where_clause}
+    """
+
+    with registered_cursor(ISSUE_LISTING_PAGE_QUERY) as cursor:
+        cursor.execute(page_query, params)
+        rows = dict_fetchall(cursor)
+    with registered_cursor(ISSUE_LISTING_COUNT_QUERY) as cursor:
+        cursor.execute(count_query, params)
+        (total,) = cursor.fetchone()
+
+    set_query_cache(
+        key=cache_key, params=cache_params, rows={"rows": rows, "total": total}
+    )
+    return rows, total
+
+
 # TODO: combine this query with the other queries for issues
 def get_latest_issue_version(*, issue_id: str) -> Optional[dict]:
     version_row = (
@@ -239,6 +413,58 @@ def get_test_issues(*, test_id: str) -> list[dict]:
     return rows
 
 
+def get_builds_issues(*, build_ids: list[str]) -> list[dict]:
+    """Batch version of `get_build_issues`, the rows also have the `build_id`."""
+
+    query = """
+        SELECT
+            incidents.build_id,
+            issues.id,
+            issues.version,
+            issues.comment,
+            issues.report_url,
+            builds.status AS status
+        FROM incidents
+        JOIN issues
+            ON incidents.issue_id = issues.id
+            AND incidents.issue_version = issues.version
+        JOIN builds
+            ON incidents.build_id = builds.id
+        WHERE incidents.build_id = ANY(%s)
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(query, [build_ids])
+        rows = dict_fetchall(cursor=cursor)
+
+    return rows
+
+
+def get_tests_issues(*, test_ids: list[str]) -> list[dict]:
+    """Batch version of `get_test_issues`, the rows also have the `test_id`."""
+
+    query = """
+        SELECT
+            incidents.test_id,
+            issues.id,
+            issues.version,
+            issues.comment,
+            issues.report_url,
+            tests.status AS status
+        FROM incidents
+        JOIN issues
+            ON incidents.issue_id = issues.id
+            AND incidents.issue_version = issues.version
+        JOIN tests
+            ON incidents.test_id = tests.id
+        WHERE incidents.test_id = ANY(%s)
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(query, [test_ids])
+        rows = dict_fetchall(cursor=cursor)
+
+    return rows
+
+
 def get_issue_seen_data(
     *, issue_id_list: list[str], mode: Literal["first", "last"] = "first"
 ) -> list[dict]:
@@ -391,8 +617,82 @@ def get_issue_trees_data(
             (I.ID, I.VERSION) {comparison} ({tuple_str})
         """
 
-    with connections["default"].cursor() as cursor:
+    with connection.cursor() as cursor:
         cursor.execute(query, params)
         records = dict_fetchall(cursor)
 
     return records
+
+
+def get_issue_seen_summary_data(*, issue_id_list: list[str]) -> list[dict[str, Any]]:
+    """
+    Retrieves the first and last incidents and the trees of every version
+    of a list of issues from the precomputed issue_seen_summary and
+    issue_seen_trees tables.
+
+    Returns one row per issue version and tree, ordered by issue id and version.
+    `issue_exists` tells whether the version exists in the issues table,
+    and the incident columns are null when the version had no incidents.
+    """
+
+    if not issue_id_list:
+        return []
+
+    query = """
+        WITH
+            summary AS (
+                SELECT
+                    *
+                FROM
+                    issue_seen_summary
+                WHERE
+                    issue_id = ANY (%(issue_id_list)s)
+            ),
+            issue_versions AS (
+                SELECT
+                    id AS issue_id,
+                    version AS issue_version
+                FROM
+                    issues
+                WHERE
+                    id = ANY (%(issue_id_list)s)
+            )
+        SELECT
+            issue_id,
+            issue_version,
+            IV.issue_id IS NOT NULL AS issue_exists,
+            S.first_incident_id,
+            S.first_seen,
+            S.first_checkout_id,
+            FC.git_commit_hash AS first_git_commit_hash,
+            FC.git_repository_url AS first_git_repository_url,
+            FC.git_repository_branch AS first_git_repository_branch,
+            FC.git_commit_name AS first_git_commit_name,
+            FC.tree_name AS first_tree_name,
+            S.last_incident_id,
+            S.last_seen,
+            S.last_checkout_id,
+            LC.git_commit_hash AS last_git_commit_hash,
+            LC.git_repository_url AS last_git_repository_url,
+            LC.git_repository_branch AS last_git_repository_branch,
+            LC.git_commit_name AS last_git_commit_name,
+            LC.tree_name AS last_tree_name,
+            T.tree_name,
+            T.git_repository_url,
+            T.git_repository_branch
+        FROM
+            summary S
+            FULL JOIN issue_versions IV USING (issue_id, issue_version)
+            LEFT JOIN checkouts FC ON FC.id = S.first_checkout_id
+            LEFT JOIN checkouts LC ON LC.id = S.last_checkout_id
+            LEFT JOIN issue_seen_trees T USING (issue_id, issue_version)
+        ORDER BY
+            issue_id,
+            issue_version
+        """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, {"issue_id_list": issue_id_list})
+        records = dict_fetchall(cursor)
+
+    return records
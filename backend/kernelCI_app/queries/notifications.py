@@ -717,6 +717,8 @@ def query_fetchone_work(
             cursor.execute(query, params)
             rows = cursor.fetchone()
     finally:
+        # Runs in worker threads, outside of the request cycle that would close
+        # their connection. With DB_POOLS set, closing gives it back to the pool.
         connections["default"].close()
     set_query_cache(
         key=cache_key,
@@ -744,6 +746,8 @@ def query_fetchall_work(
             cursor.execute(query, params)
             rows = cursor.fetchall()
     finally:
+        # Runs in worker threads, outside of the request cycle that would close
+        # their connection. With DB_POOLS set, closing gives it back to the pool.
         connections["default"].close()
     set_query_cache(
         key=cache_key,
@@ -1,9 +1,11 @@
 from typing import Optional
 
-from django.db import connection, transaction
+from django.db import transaction
 
 from kernelCI_app.cache import get_query_cache, set_query_cache
 from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.helpers.testSeries import get_test_series_id_clause
+from kernelCI_app.routers.replicas import connection
 from kernelCI_app.typeModels.databases import (
     Origin,
     Test__StartTime,
@@ -52,6 +54,66 @@ def get_test_details_data(*, test_id: str) -> list[dict]:
         return dict_fetchall(cursor)
 
 
+def get_tests_details_data(*, test_ids: list[str]) -> list[dict]:
+    """Batch version of `get_test_details_data`, returns the rows of all the given tests."""
+    query = """
+    SELECT
+        T._TIMESTAMP,
+        T.ID,
+        T.BUILD_ID,
+        T.STATUS,
+        T.PATH,
+        T.LOG_EXCERPT,
+        T.LOG_URL,
+        T.MISC,
+        T.ENVIRONMENT_MISC,
+        T.START_TIME,
+        T.ENVIRONMENT_COMPATIBLE,
+        T.OUTPUT_FILES,
+        T.INPUT_FILES,
+        T.ORIGIN AS TEST_ORIGIN,
+        B.COMPILER,
+        B.ARCHITECTURE,
+        B.CONFIG_NAME,
+        C.GIT_COMMIT_HASH,
+        C.GIT_REPOSITORY_BRANCH,
+        C.GIT_REPOSITORY_URL,
+        C.GIT_COMMIT_TAGS,
+        C.TREE_NAME,
+        C.ORIGIN
+    FROM
+        TESTS T
+        LEFT JOIN BUILDS B ON T.BUILD_ID = B.ID
+        LEFT JOIN CHECKOUTS C ON B.CHECKOUT_ID = C.ID
+    WHERE
+        T.ID = ANY(%(test_ids)s)
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, {"test_ids": test_ids})
+        return dict_fetchall(cursor)
+
+
+def _get_status_history_time_clauses(
+    *, table_alias: str, test_start_time: Test__StartTime, field_timestamp: Timestamp
+) -> tuple[str, str]:
+    if test_start_time is None:
+        if field_timestamp is None:
+            time_clause = (
+                f"AND {table_alias}.START_TIME IS NULL "
+                f"AND {table_alias}._TIMESTAMP IS NULL"
+            )
+            order_clause = f"ORDER BY {table_alias}._TIMESTAMP DESC"
+        else:
+            time_clause = f"AND {table_alias}._TIMESTAMP <= %(field_timestamp)s"
+            order_clause = f"ORDER BY {table_alias}._TIMESTAMP DESC"
+    else:
+        time_clause = f"AND {table_alias}.START_TIME <= %(test_start_time)s"
+        order_clause = f"ORDER BY {table_alias}.START_TIME DESC"
+
+    return time_clause, order_clause
+
+
 def get_test_status_history(
     *,
     path: str,
@@ -80,21 +142,128 @@ def get_test_status_history(
     if rows := get_query_cache(key=cache_key, params=params):
         return rows
 
+    series_time_clause, series_order_clause = _get_status_history_time_clauses(
+        table_alias="TS",
+        test_start_time=test_start_time,
+        field_timestamp=field_timestamp,
+    )
+    pending_time_clause, _ = _get_status_history_time_clauses(
+        table_alias="T",
+        test_start_time=test_start_time,
+        field_timestamp=field_timestamp,
+    )
+    _, order_clause = _get_status_history_time_clauses(
+        table_alias="H",
+        test_start_time=test_start_time,
+        field_timestamp=field_timestamp,
+    )
+
+    series_id_clause = get_test_series_id_clause(
+        path="%(path)s",
+        origin="%(origin)s",
+        git_repository_url="%(git_repository_url)s",
+        git_repository_branch="%(git_repository_branch)s",
+        config_name="%(config_name)s",
+        platform="%(platform)s",
+    )
+
+    # Tests are added to their series by process_pending_aggregations, so the
+    # tests that are still pending, such as the one of the history, are read from
+    # the tests table. They are deleted from pending_test after being added.
+    query = f"""
+        SELECT
+            H.START_TIME,
+            H.ID,
+            H.status,
+            H.build__checkout__git_commit_hash
+        FROM (
+            (
+                SELECT
+                    TS.START_TIME,
+                    TS._TIMESTAMP,
+                    TS.TEST_ID AS ID,
+                    COALESCE(TS.STATUS, 'NULL') AS status,
+                    TS.GIT_COMMIT_HASH AS build__checkout__git_commit_hash
+                FROM
+                    TEST_SERIES TS
+                WHERE
+                    TS.SERIES_ID = {series_id_clause}
+                    {series_time_clause}
+                {series_order_clause}
+                LIMIT %(group_size)s
+            )
+            UNION ALL
+            (
+                SELECT
+                    T.START_TIME,
+                    T._TIMESTAMP,
+                    T.ID,
+                    COALESCE(T.STATUS, 'NULL') AS status,
+                    C.GIT_COMMIT_HASH AS build__checkout__git_commit_hash
+                FROM
+                    PENDING_TEST PT
+                INNER JOIN TESTS T ON PT.TEST_ID = T.ID
+                INNER JOIN BUILDS B ON T.BUILD_ID = B.ID
+                INNER JOIN CHECKOUTS C ON B.CHECKOUT_ID = C.ID
+                WHERE
+                    {_get_status_history_filter_clause(platform=platform)}
+                    {pending_time_clause}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM TEST_SERIES TS WHERE TS.TEST_ID = T.ID
+                    )
+            )
+        ) H
+        {order_clause}
+        LIMIT %(group_size)s;
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = dict_fetchall(cursor)
+
+    # Tests ingested before the series were populated aren't in any of them
+    if not rows:
+        rows = _get_test_status_history_from_tests(
+            params=params,
+            platform=platform,
+            test_start_time=test_start_time,
+            field_timestamp=field_timestamp,
+        )
+
+    set_query_cache(key=cache_key, params=params, rows=rows)
+    return rows
+
+
+def _get_status_history_filter_clause(*, platform: Optional[str]) -> str:
+    """Filters the tests of a status history, with the tests table as T, the
+    builds table as B and the checkouts table as C"""
     if platform is None:
         platform_clause = "AND T.ENVIRONMENT_MISC ->> 'platform' IS NULL"
     else:
         platform_clause = "AND T.ENVIRONMENT_MISC ->> 'platform' = %(platform)s"
 
-    if test_start_time is None:
-        if field_timestamp is None:
-            time_clause = "AND T.START_TIME IS NULL AND T._TIMESTAMP IS NULL"
-            order_clause = "ORDER BY T._TIMESTAMP DESC"
-        else:
-            time_clause = "AND T._TIMESTAMP <= %(field_timestamp)s"
-            order_clause = "ORDER BY T._TIMESTAMP DESC"
-    else:
-        time_clause = "AND T.START_TIME <= %(test_start_time)s"
-        order_clause = "ORDER BY T.START_TIME DESC"
+    return f"""
+        T.PATH = %(path)s
+        AND C.ORIGIN = %(origin)s
+        AND C.GIT_REPOSITORY_URL = %(git_repository_url)s
+        AND C.GIT_REPOSITORY_BRANCH = %(git_repository_branch)s
+        AND B.CONFIG_NAME = %(config_name)s
+        {platform_clause}
+    """
+
+
+def _get_test_status_history_from_tests(
+    *,
+    params: dict,
+    platform: Optional[str],
+    test_start_time: Test__StartTime,
+    field_timestamp: Timestamp,
+) -> list[dict]:
+    time_clause, order_clause = _get_status_history_time_clauses(
+        table_alias="T",
+        test_start_time=test_start_time,
+        field_timestamp=field_timestamp,
+    )
 
     query = f"""
         SELECT
@@ -107,23 +276,16 @@ def get_test_status_history(
         INNER JOIN BUILDS B ON T.BUILD_ID = B.ID
         INNER JOIN CHECKOUTS C ON B.CHECKOUT_ID = C.ID
         WHERE
-            T.PATH = %(path)s
-            AND C.ORIGIN = %(origin)s
-            AND C.GIT_REPOSITORY_URL = %(git_repository_url)s
-            AND C.GIT_REPOSITORY_BRANCH = %(git_repository_branch)s
-            AND B.CONFIG_NAME = %(config_name)s
-            {platform_clause}
+            {_get_status_history_filter_clause(platform=platform)}
             {time_clause}
         {order_clause}
         LIMIT %(group_size)s;
     """
 
-    with transaction.atomic():
+    with transaction.atomic(using=connection.alias):
         with connection.cursor() as cursor:
             # do not let postgres planner use a slow nested loop in the query
             # a hashed approach should always be faster here
             cursor.execute("SET LOCAL enable_nestloop = off")
             cursor.execute(query, params)
-            rows = dict_fetchall(cursor)
-            set_query_cache(key=cache_key, params=params, rows=rows)
-            return rows
+            return dict_fetchall(cursor)
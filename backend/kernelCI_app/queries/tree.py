@@ -1,16 +1,25 @@
 from typing import Literal, Optional
 
-from django.db import connection
 from django.db.models import Q
 
 from kernelCI_app.cache import get_query_cache, set_query_cache
+from kernelCI_app.constants.general import UNKNOWN_STRING
 from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.helpers.preparedQueries import register_query, registered_cursor
 from kernelCI_app.helpers.treeDetails import create_checkouts_where_clauses
 from kernelCI_app.models import Checkouts
 from kernelCI_app.queries.duration import (
     get_boot_test_duration_clause,
     get_build_duration_clause,
 )
+from kernelCI_app.routers.replicas import connection
+
+TREE_LISTING_QUERY = register_query(
+    "tree_listing", "Latest checkouts of an origin from the tree_listing table"
+)
+TREE_DETAILS_QUERY = register_query(
+    "tree_details", "Builds, tests and issues of a tree checkout"
+)
 
 
 def _get_tree_listing_count_clause() -> str:
@@ -128,7 +137,7 @@ def get_tree_listing_data_denormalized(
         "interval_param": interval_param,
     }
 
-    with connection.cursor() as cursor:
+    with registered_cursor(TREE_LISTING_QUERY) as cursor:
         cursor.execute(
             """
             WITH latest AS (
@@ -137,7 +146,7 @@ def get_tree_listing_data_denormalized(
                 FROM
                     latest_checkout
                 WHERE
-                    start_time >= NOW() - INTERVAL %(interval_param)s
+                    start_time >= NOW() - %(interval_param)s::interval
                     AND origin = %(origin_param)s
             )
             SELECT
@@ -286,7 +295,7 @@ def get_tree_details_data(
             issues."_timestamp" DESC
         """
 
-        with connection.cursor() as cursor:
+        with registered_cursor(TREE_DETAILS_QUERY) as cursor:
             cursor.execute(query, params)
             rows = cursor.fetchall()
             set_query_cache(key=cache_key, params=params, rows=rows)
@@ -977,6 +986,211 @@ def get_tree_commit_history_hashes_aggregated(
         return rows
 
 
+def get_tree_commit_history_from_rollup(
+    *,
+    commit_hashes: list[str],
+    origin: str,
+    git_url: Optional[str],
+    git_branch: Optional[str],
+    tree_name: Optional[str],
+    include_types: Optional[list[str]] = None,
+) -> list[dict]:
+    """
+    Returns the same rows as `get_tree_commit_history_hashes_aggregated`,
+    but reads boots and tests from tree_tests_rollup instead of the tests table.
+
+    The rollup has no durations and no compatibles, so it doesn't support
+    the duration and hardware filters. Builds still come from the builds table,
+    which is small and indexed by checkout.
+    """
+    if not commit_hashes:
+        return []
+
+    if not include_types:
+        include_types = ["builds", "boots", "tests"]
+
+    include_types = [t.lower() for t in include_types]
+
+    params = {
+        "commit_hashes": commit_hashes,
+        "origin_param": origin,
+        "git_url_param": git_url,
+        "git_branch_param": git_branch,
+        "tree_name": tree_name,
+    }
+
+    cache_key = "treeCommitHistoryRollup"
+    cache_params = {
+        **params,
+        "include_types": tuple(sorted(include_types)),
+    }
+    rows = get_query_cache(cache_key, cache_params)
+    if rows is not None:
+        return rows
+
+    include_builds = "builds" in include_types
+    include_tests = "tests" in include_types
+    include_boots = "boots" in include_types
+
+    if not (include_builds or include_boots or include_tests):
+        set_query_cache(key=cache_key, params=cache_params, rows=[])
+        return []
+
+    checkout_clauses = create_checkouts_where_clauses(
+        git_url=git_url, git_branch=git_branch, tree_name=tree_name
+    )
+
+    git_branch_clause = checkout_clauses.get("git_branch_clause")
+    tree_name_clause = checkout_clauses.get("tree_name_clause")
+    git_url_clause = checkout_clauses.get("git_url_clause")
+    tree_name_full_clause = "\nAND " + tree_name_clause if tree_name_clause else ""
+    git_url_full_clause = "\nAND " + git_url_clause if git_url_clause else ""
+    git_branch_full_clause = "\nAND " + git_branch_clause if git_branch_clause else ""
+
+    builds_query = """
+        SELECT
+            COUNT(DISTINCT builds.id) AS count,
+            c.git_commit_hash,
+            c.git_commit_name,
+            c.git_commit_tags,
+            c.start_time,
+            c.origin,
+            builds.status AS status,
+            array[builds.compiler, builds.architecture] AS compiler_arch,
+            builds.config_name AS config_name,
+            builds.misc->>'lab' AS lab,
+            ARRAY_AGG(DISTINCT ic.issue_id || ',' || ic.issue_version::text) AS known_issues,
+            true AS is_build,
+            false AS is_boot,
+            false AS is_test
+        FROM relevant_checkouts c
+        INNER JOIN builds ON c.id = builds.checkout_id
+        LEFT JOIN incidents ic ON builds.id = ic.build_id
+        WHERE
+            builds.config_name IS NOT NULL
+            AND builds.id NOT LIKE 'maestro:dummy_%%'
+        GROUP BY
+            c.id,
+            c.git_commit_hash,
+            c.git_commit_name,
+            c.git_commit_tags,
+            c.start_time,
+            c.origin,
+            builds.status,
+            builds.compiler,
+            builds.architecture,
+            builds.config_name,
+            lab
+    """
+
+    boot_filter = ""
+    if include_boots and not include_tests:
+        boot_filter = "\nWHERE tr.is_boot"
+    elif include_tests and not include_boots:
+        boot_filter = "\nWHERE NOT tr.is_boot"
+
+    # A tree_tests_rollup row sums every checkout of the same tree and commit,
+    # so the checkouts are grouped by that identity before joining
+    tests_query = f"""
+        SELECT
+            status_counts.count,
+            rc.git_commit_hash,
+            rc.git_commit_name,
+            rc.git_commit_tags,
+            rc.start_time,
+            rc.origin,
+            status_counts.status,
+            array[tr.build_compiler, tr.build_architecture] AS compiler_arch,
+            NULLIF(tr.build_config_name, '{UNKNOWN_STRING}') AS config_name,
+            tr.test_lab AS lab,
+            ARRAY[tr.issue_id || ',' || tr.issue_version::text] AS known_issues,
+            false AS is_build,
+            true AS is_test,
+            tr.is_boot
+        FROM (
+            SELECT
+                c.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash,
+                MAX(c.git_commit_name) AS git_commit_name,
+                ARRAY(
+                    SELECT DISTINCT tag
+                    FROM relevant_checkouts tc, UNNEST(tc.git_commit_tags) AS tag
+                    WHERE tc.origin = c.origin
+                        AND tc.tree_name IS NOT DISTINCT FROM c.tree_name
+                        AND tc.git_repository_url IS NOT DISTINCT FROM c.git_repository_url
+                        AND tc.git_repository_branch IS NOT DISTINCT FROM c.git_repository_branch
+                        AND tc.git_commit_hash = c.git_commit_hash
+                ) AS git_commit_tags,
+                MIN(c.start_time) AS start_time
+            FROM relevant_checkouts c
+            GROUP BY
+                c.origin,
+                c.tree_name,
+                c.git_repository_url,
+                c.git_repository_branch,
+                c.git_commit_hash
+        ) rc
+        INNER JOIN tree_tests_rollup tr ON (
+            tr.origin = rc.origin
+            AND tr.tree_name IS NOT DISTINCT FROM rc.tree_name
+            AND tr.git_repository_branch IS NOT DISTINCT FROM rc.git_repository_branch
+            AND tr.git_repository_url IS NOT DISTINCT FROM rc.git_repository_url
+            AND tr.git_commit_hash = rc.git_commit_hash
+        )
+        CROSS JOIN LATERAL (
+            VALUES
+                ('PASS', tr.pass_tests),
+                ('FAIL', tr.fail_tests),
+                ('SKIP', tr.skip_tests),
+                ('ERROR', tr.error_tests),
+                ('MISS', tr.miss_tests),
+                ('DONE', tr.done_tests),
+                (NULL, tr.null_tests)
+        ) AS status_counts (status, count)
+        {boot_filter}
+    """
+
+    queries = []
+    if include_builds:
+        queries.append(builds_query)
+    if include_boots or include_tests:
+        queries.append(tests_query)
+
+    query = f"""
+        WITH relevant_checkouts AS (
+            SELECT
+                id,
+                origin,
+                tree_name,
+                git_repository_url,
+                git_repository_branch,
+                git_commit_hash,
+                git_commit_name,
+                git_commit_tags,
+                start_time
+            FROM checkouts
+            WHERE
+                git_commit_hash = ANY(%(commit_hashes)s)
+                AND origin = %(origin_param)s
+                {git_branch_full_clause}
+                {git_url_full_clause}
+                {tree_name_full_clause}
+        )
+        SELECT *
+        FROM ({union_all(queries)}) commit_history
+        WHERE commit_history.count > 0
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        rows = dict_fetchall(cursor)
+        set_query_cache(key=cache_key, params=cache_params, rows=rows)
+        return rows
+
+
 def get_tree_commit_history(
     *,
     commit_hash: str,
@@ -0,0 +1,45 @@
+from typing import Any, Optional
+
+from pydantic_core import to_json
+from rest_framework.renderers import JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes the responses with the serializer of pydantic-core.
+
+    Datetimes, UUIDs and nested dicts and lists are encoded natively instead of
+    going through the stdlib encoder, and Pydantic models given as the response
+    data are dumped straight to JSON bytes, as `model_dump` would dump them,
+    without building their dict first. Other types fall back to the encoder of
+    JSONRenderer.
+
+    The output is the compact JSON of JSONRenderer, except that Decimals are
+    rendered as strings, timedeltas as ISO 8601 durations and NaN or infinite
+    floats as null. The response models don't have any of them.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[dict[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+
+        ret = to_json(
+            data,
+            indent=indent,
+            by_alias=False,
+            inf_nan_mode="null",
+            fallback=self.encoder_class().default,
+        )
+
+        # Escaped as JSONRenderer does, so that the output is valid JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
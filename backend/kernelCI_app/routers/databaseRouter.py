@@ -1,15 +1,39 @@
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from kernelCI_app.routers.replicas import get_read_database
+
+
 class DatabaseRouter:
     """
     A router to control all database operations on models in the
     kernelCI_app application.
     """
 
+    def db_for_read(self, model, **hints):
+        # The cache and notifications models always set the database they use
+        if model._meta.app_label != "kernelCI_app":
+            return None
+        return get_read_database()
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold the same data as the primary
+        kcidb_databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in kcidb_databases and obj2._state.db in kcidb_databases:
+            return True
+        return None
+
     def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
         if db == "default":
             return app_label != "kernelCI_cache"
         if model_name in ["notificationscheckout", "notificationsissue"]:
             return db == "notifications"
-        if model_name in ["checkoutscache"]:
+        if model_name in ["checkoutscache", "logexcerptupload"]:
             return db == "cache"
         if hints.get("run_always", False):
             return app_label == "kernelCI_cache"
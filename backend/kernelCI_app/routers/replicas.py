@@ -0,0 +1,117 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+REPLICA_ROUTING_COUNTER = Counter(
+    "kernelci_db_read_routing",
+    "Number of requests whose reads were routed to each database",
+    ["database"],
+)
+
+REPLICA_LAG_QUERY = """
+    SELECT
+        CASE
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        END
+"""
+"""Replication lag in seconds. It is 0 when the replica replayed everything it
+received and NULL when the database isn't a replica."""
+
+_read_database: ContextVar[Optional[str]] = ContextVar("read_database", default=None)
+
+# Replica alias -> (monotonic time of the check, whether its lag was acceptable)
+_replica_health: dict[str, tuple[float, bool]] = {}
+
+
+def get_read_database() -> str:
+    """Returns the alias of the database that the reads of the current context use"""
+    return _read_database.get() or DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def use_read_database(alias: str) -> Iterator[None]:
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+@contextmanager
+def use_primary_database() -> Iterator[None]:
+    """Pins the reads of the context to the primary, for reads that must see
+    writes made just before them."""
+    with use_read_database(DEFAULT_DB_ALIAS):
+        yield
+
+
+def _get_replica_lag(alias: str) -> Optional[float]:
+    with connections[alias].cursor() as cursor:
+        cursor.execute(REPLICA_LAG_QUERY)
+        (lag,) = cursor.fetchone()
+    return None if lag is None else float(lag)
+
+
+def is_replica_healthy(alias: str) -> bool:
+    """Checks if the lag of a replica is within `REPLICA_MAX_LAG_SECONDS`.
+
+    The result is kept for `REPLICA_LAG_CHECK_INTERVAL` seconds, so the lag is
+    queried at most once per interval in each process."""
+    now = time.monotonic()
+    checked_at, healthy = _replica_health.get(alias, (None, False))
+    if (
+        checked_at is not None
+        and now - checked_at < settings.REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return healthy
+
+    try:
+        lag = _get_replica_lag(alias)
+        healthy = lag is None or lag <= settings.REPLICA_MAX_LAG_SECONDS
+        if not healthy:
+            logger.warning("Replica %s is %.1fs behind the primary", alias, lag)
+    except DatabaseError as e:
+        logger.warning("Replica %s is unavailable: %s", alias, e)
+        healthy = False
+
+    _replica_health[alias] = (now, healthy)
+    return healthy
+
+
+def choose_read_database() -> str:
+    """Returns a random replica among the ones with an acceptable lag, or the
+    primary if there are none"""
+    healthy_replicas = [
+        alias for alias in settings.DATABASE_REPLICAS if is_replica_healthy(alias)
+    ]
+    if not healthy_replicas:
+        return DEFAULT_DB_ALIAS
+    return random.choice(healthy_replicas)  # noqa: S311
+
+
+def is_replica_view(url_name: Optional[str]) -> bool:
+    replica_views = settings.REPLICA_VIEWS
+    return bool(settings.DATABASE_REPLICAS) and (
+        "*" in replica_views or url_name in replica_views
+    )
+
+
+class ReadConnectionProxy:
+    """Proxy to the connection of the current read database, used by the raw
+    SQL queries in place of `django.db.connection`"""
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(connections[get_read_database()], item)
+
+
+connection = ReadConnectionProxy()
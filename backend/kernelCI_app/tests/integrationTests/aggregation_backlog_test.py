@@ -0,0 +1,111 @@
+"""Tests of the backlog and batch metrics of process_pending_aggregations."""
+
+import pytest
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_builds,
+    aggregate_tests,
+)
+from kernelCI_app.management.commands.process_pending_aggregations import (
+    Command as ProcessPendingCommand,
+)
+from kernelCI_app.management.commands.process_pending_aggregations import (
+    update_pending_backlog,
+)
+from kernelCI_app.models import Builds, PendingTest, StatusChoices, Tests
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory, TestFactory
+
+ORIGIN = "aggregation-backlog-origin"
+INGESTED_AT = timezone.now() - timezone.timedelta(hours=1)
+
+
+def _get_sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _create_pending_rows() -> None:
+    checkout = CheckoutFactory(
+        id="aggregation_backlog_checkout",
+        origin=ORIGIN,
+        field_timestamp=INGESTED_AT,
+    )
+    build = BuildFactory(
+        id="aggregation_backlog_build",
+        checkout=checkout,
+        origin=ORIGIN,
+        status=StatusChoices.PASS,
+        field_timestamp=INGESTED_AT,
+    )
+    for index in range(3):
+        TestFactory(
+            id=f"aggregation_backlog_test_{index}",
+            build=build,
+            origin=ORIGIN,
+            status=StatusChoices.PASS,
+            environment_misc={"platform": "aggregation-backlog-board"},
+            field_timestamp=INGESTED_AT + timezone.timedelta(minutes=index),
+        )
+
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    aggregate_builds(Builds.objects.filter(origin=ORIGIN))
+    # A test whose build hasn't been ingested yet
+    PendingTest.objects.create(
+        test_id="aggregation_backlog_orphan",
+        origin=ORIGIN,
+        build_id="aggregation_backlog_missing_build",
+        is_boot=False,
+    )
+
+
+@pytest.mark.django_db
+def test_update_pending_backlog():
+    _create_pending_rows()
+
+    update_pending_backlog()
+
+    assert (
+        _get_sample("aggregation_pending_rows", table="pending_test")
+        == PendingTest.objects.count()
+    )
+    assert _get_sample("aggregation_pending_rows", table="pending_builds") >= 1
+    assert (
+        _get_sample("aggregation_oldest_pending_age_seconds", table="pending_test")
+        >= 3600
+    )
+    assert (
+        _get_sample("aggregation_oldest_pending_age_seconds", table="pending_builds")
+        >= 3600
+    )
+
+
+@pytest.mark.django_db
+def test_process_pending_batch_metrics():
+    _create_pending_rows()
+    skipped_before = _get_sample("aggregation_skipped_rows_total", table="pending_test")
+    phase_counts_before = {
+        phase: _get_sample("aggregation_batch_duration_seconds_count", phase=phase)
+        for phase in ["claim", "aggregate", "write", "delete"]
+    }
+
+    command = ProcessPendingCommand()
+    command.backlog_interval = 0
+    command.process_pending_batch(batch_size=1000)
+    update_pending_backlog()
+
+    assert (
+        _get_sample("aggregation_skipped_rows_total", table="pending_test")
+        > skipped_before
+    )
+    for phase, count in phase_counts_before.items():
+        assert (
+            _get_sample("aggregation_batch_duration_seconds_count", phase=phase) > count
+        )
+    # Only the test without build is left
+    assert _get_sample("aggregation_pending_rows", table="pending_test") == 1
+    assert _get_sample("aggregation_pending_rows", table="pending_builds") == 0
+    # It has no row in tests, so it has no ingestion time
+    assert (
+        _get_sample("aggregation_oldest_pending_age_seconds", table="pending_test") == 0
+    )
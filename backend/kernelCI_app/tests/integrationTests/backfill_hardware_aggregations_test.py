@@ -0,0 +1,114 @@
+"""Integration tests for the backfill_hardware_aggregations management command."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from kernelCI_app.models import LatestCheckout, PendingTest, StatusChoices
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory, TestFactory
+
+ORIGIN = "backfill-origin"
+
+
+def _hours_ago(hours: int):
+    return timezone.now() - timezone.timedelta(hours=hours)
+
+
+def _backfill(**kwargs) -> None:
+    call_command("backfill_hardware_aggregations", days=2, stdout=StringIO(), **kwargs)
+
+
+def _create_tree():
+    old_checkout = CheckoutFactory(
+        id="backfill_checkout_old",
+        origin=ORIGIN,
+        tree_name="backfill-tree",
+        start_time=_hours_ago(30),
+    )
+    new_checkout = CheckoutFactory(
+        id="backfill_checkout_new",
+        origin=ORIGIN,
+        tree_name="backfill-tree",
+        git_repository_url=old_checkout.git_repository_url,
+        git_repository_branch=old_checkout.git_repository_branch,
+        start_time=_hours_ago(2),
+    )
+    build = BuildFactory(id="backfill_build", checkout=new_checkout)
+    boot = TestFactory(
+        id="backfill_boot",
+        build=build,
+        path="boot",
+        status=StatusChoices.PASS,
+        start_time=_hours_ago(1),
+        environment_misc={"platform": "backfill-board"},
+        misc={"runtime": "backfill-lab"},
+    )
+    test = TestFactory(
+        id="backfill_test",
+        build=build,
+        path="kselftest.example",
+        status=StatusChoices.SKIP,
+        start_time=_hours_ago(1),
+        environment_misc={"platform": "backfill-board"},
+    )
+    no_platform_test = TestFactory(
+        id="backfill_test_no_platform",
+        build=build,
+        start_time=_hours_ago(1),
+        environment_misc={},
+        environment_compatible=None,
+    )
+    return new_checkout, boot, test, no_platform_test
+
+
+def _snapshot():
+    latest = list(
+        LatestCheckout.objects.filter(origin=ORIGIN).values_list(
+            "checkout_id", "tree_name", "start_time"
+        )
+    )
+    pending = list(
+        PendingTest.objects.filter(origin=ORIGIN)
+        .order_by("test_id")
+        .values_list(
+            "test_id", "platform", "status", "is_boot", "path", "lab", "full_status"
+        )
+    )
+    return latest, pending
+
+
+@pytest.mark.django_db
+def test_sql_backfill_keeps_latest_checkout_and_platform_tests():
+    new_checkout, boot, test, no_platform_test = _create_tree()
+
+    _backfill(sql=True, chunk_hours=6)
+
+    latest = LatestCheckout.objects.get(origin=ORIGIN)
+    assert latest.checkout_id == new_checkout.id
+
+    pending = PendingTest.objects.in_bulk([boot.id, test.id, no_platform_test.id])
+    assert set(pending) == {boot.id, test.id}
+    assert pending[boot.id].is_boot is True
+    assert pending[boot.id].status == "P"
+    assert pending[boot.id].lab == "backfill-lab"
+    assert pending[test.id].is_boot is False
+    assert pending[test.id].status == "I"
+    assert pending[test.id].full_status == StatusChoices.SKIP
+
+
+@pytest.mark.django_db
+def test_sql_backfill_matches_orm_backfill():
+    _create_tree()
+
+    _backfill()
+    orm_result = _snapshot()
+
+    LatestCheckout.objects.filter(origin=ORIGIN).delete()
+    PendingTest.objects.filter(origin=ORIGIN).delete()
+
+    _backfill(sql=True, chunk_hours=6)
+    sql_result = _snapshot()
+
+    assert sql_result == orm_result
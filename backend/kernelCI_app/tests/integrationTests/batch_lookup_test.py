@@ -0,0 +1,127 @@
+"""Parity tests between the batch lookup endpoints and the single build/test endpoints."""
+
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+
+from kernelCI_app.tests.factories import (
+    BuildFactory,
+    CheckoutFactory,
+    IncidentFactory,
+    IssueFactory,
+    TestFactory,
+)
+from kernelCI_app.views.buildBatchView import BuildBatchView
+from kernelCI_app.views.buildDetailsView import BuildDetails
+from kernelCI_app.views.buildIssuesView import BuildIssuesView
+from kernelCI_app.views.buildTestsView import BuildTests
+from kernelCI_app.views.testBatchView import TestBatchView
+from kernelCI_app.views.testDetailsView import TestDetails
+from kernelCI_app.views.testIssuesView import TestIssuesView
+
+request_factory = APIRequestFactory()
+
+
+def _create_data(prefix: str) -> dict:
+    checkout = CheckoutFactory(id=f"{prefix}_checkout")
+    builds = [
+        BuildFactory(id=f"{prefix}_build_{index}", checkout=checkout, status="PASS")
+        for index in range(2)
+    ]
+    tests = [
+        TestFactory(id=f"{prefix}_test_{index}", build=builds[0], status="FAIL")
+        for index in range(2)
+    ]
+    issue = IssueFactory(id=f"{prefix}_issue", version=1)
+    IncidentFactory(issue=issue, build=builds[0], test=None)
+    IncidentFactory(issue=issue, build=None, test=tests[0])
+    return {
+        "build_ids": [build.id for build in builds],
+        "test_ids": [test.id for test in tests],
+    }
+
+
+def _post(view_class, body: dict):
+    request = request_factory.post(
+        "/api/batch/", json.dumps(body), content_type="application/json"
+    )
+    return view_class().post(request)
+
+
+def _sorted(payload):
+    # Neither endpoint orders the rows of lists
+    if isinstance(payload, list):
+        return sorted(payload, key=repr)
+    return payload
+
+
+def _single(view_class, **kwargs):
+    response = view_class().get(request_factory.get("/api/single/"), **kwargs)
+    if "error" in response.data:
+        return None
+    return _sorted(response.data)
+
+
+@pytest.mark.django_db
+def test_build_batch_matches_single_build_endpoints():
+    ids = _create_data("build_batch")
+    build_ids = ids["build_ids"] + ["build_batch_missing"]
+
+    response = _post(BuildBatchView, {"build_ids": build_ids})
+
+    assert response.status_code == 200
+    for build_id in build_ids:
+        assert response.data["details"].get(build_id) == _single(
+            BuildDetails, build_id=build_id
+        )
+        assert _sorted(response.data["tests"].get(build_id)) == _single(
+            BuildTests, build_id=build_id
+        )
+        assert response.data["issues"].get(build_id) == _single(
+            BuildIssuesView, build_id=build_id
+        )
+
+
+@pytest.mark.django_db
+def test_test_batch_matches_single_test_endpoints():
+    ids = _create_data("test_batch")
+    test_ids = ids["test_ids"] + ["test_batch_missing"]
+
+    response = _post(TestBatchView, {"test_ids": test_ids, "include": ["details"]})
+    assert response.status_code == 200
+    assert response.data["issues"] == {}
+
+    response = _post(TestBatchView, {"test_ids": test_ids})
+    assert response.status_code == 200
+    for test_id in test_ids:
+        assert response.data["details"].get(test_id) == _single(
+            TestDetails, test_id=test_id
+        )
+        assert response.data["issues"].get(test_id) == _single(
+            TestIssuesView, test_id=test_id
+        )
+
+
+@pytest.mark.django_db
+def test_batch_lookups_are_cached_per_id():
+    ids = _create_data("cached_batch")
+    _post(BuildBatchView, {"build_ids": ids["build_ids"][:1]})
+
+    with CaptureQueriesContext(connection) as queries:
+        response = _post(BuildBatchView, {"build_ids": ids["build_ids"]})
+
+    # Only the build that wasn't looked up before is queried, once per payload
+    assert len(queries) == 3
+    assert all("cached_batch_build_1" in str(query) for query in queries)
+    assert sorted(response.data["details"]) == ids["build_ids"]
+
+
+@pytest.mark.parametrize(
+    "body",
+    [{"build_ids": []}, {"build_ids": ["a"], "include": ["logs"]}, {"ids": ["a"]}],
+)
+def test_build_batch_rejects_invalid_bodies(body):
+    assert _post(BuildBatchView, body).status_code == 400
@@ -0,0 +1,209 @@
+"""Parity tests between hardware_tests_rollup and the raw hardware details summary."""
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from kernelCI_app.helpers.filters import FilterParams
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_tests,
+)
+from kernelCI_app.management.commands.process_pending_aggregations import (
+    Command as ProcessPendingCommand,
+)
+from kernelCI_app.models import HardwareTestsRollup, StatusChoices, Tests
+from kernelCI_app.queries.hardware import (
+    get_hardware_details_summary,
+    get_hardware_details_summary_from_rollup,
+)
+from kernelCI_app.tests.factories import (
+    BuildFactory,
+    CheckoutFactory,
+    IncidentFactory,
+    TestFactory,
+)
+from kernelCI_app.views.hardwareDetailsSummaryView import HardwareDetailsSummary
+
+ORIGIN = "hardware-rollup-origin"
+PLATFORM = "hardware-rollup-board"
+COMPATIBLES = ["vendor,hardware-rollup-board", "vendor,hardware-rollup-soc"]
+
+
+def _hours_ago(hours: int):
+    return timezone.now() - timezone.timedelta(hours=hours)
+
+
+def _create_test(build, test_id, status, path="kselftest.cpu", **kwargs):
+    return TestFactory(
+        id=test_id,
+        build=build,
+        origin=ORIGIN,
+        status=status,
+        path=path,
+        start_time=build.start_time,
+        environment_misc={"platform": PLATFORM},
+        environment_compatible=COMPATIBLES,
+        misc={"runtime": "lab-a"},
+        **kwargs,
+    )
+
+
+def _create_data():
+    checkouts = [
+        CheckoutFactory(
+            id=f"hardware_rollup_checkout_{index}",
+            origin=ORIGIN,
+            git_commit_hash=f"hardware_rollup_hash_{index}",
+            start_time=_hours_ago(hours),
+        )
+        for index, hours in enumerate([3, 2])
+    ]
+    build_kwargs = {"origin": ORIGIN, "misc": {"lab": "lab-a"}}
+    passing_build = BuildFactory(
+        id="hardware_rollup_build_pass",
+        checkout=checkouts[0],
+        status=StatusChoices.PASS,
+        architecture="x86_64",
+        compiler="gcc-12",
+        **build_kwargs,
+    )
+    failing_build = BuildFactory(
+        id="hardware_rollup_build_fail",
+        checkout=checkouts[0],
+        status=StatusChoices.FAIL,
+        architecture="arm64",
+        compiler="clang-17",
+        **build_kwargs,
+    )
+    other_build = BuildFactory(
+        id="hardware_rollup_build_other",
+        checkout=checkouts[1],
+        status=StatusChoices.PASS,
+        config_name=None,
+        **build_kwargs,
+    )
+    dummy_build = BuildFactory(
+        id="maestro:dummy_hardware_rollup",
+        checkout=checkouts[1],
+        status=StatusChoices.PASS,
+        **build_kwargs,
+    )
+
+    _create_test(passing_build, "hardware_rollup_boot_pass", "PASS", path="boot")
+    _create_test(passing_build, "hardware_rollup_boot_fail", "FAIL", path="boot.nfs")
+    _create_test(passing_build, "hardware_rollup_test_pass", "PASS")
+    _create_test(passing_build, "hardware_rollup_test_skip", "SKIP")
+    _create_test(passing_build, "hardware_rollup_test_null", None)
+    known_fail = _create_test(failing_build, "hardware_rollup_test_known", "FAIL")
+    _create_test(failing_build, "hardware_rollup_test_unknown", "FAIL")
+    _create_test(other_build, "hardware_rollup_test_other", "ERROR")
+    _create_test(dummy_build, "hardware_rollup_test_dummy", "PASS")
+
+    IncidentFactory(build=failing_build, test=None, origin=ORIGIN)
+    IncidentFactory(build=None, test=known_fail, origin=ORIGIN)
+
+    return checkouts
+
+
+def _normalize(value):
+    """Sorts lists so that summaries built from rows in different orders compare equal"""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, set)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    return value
+
+
+def _aggregate(view: HardwareDetailsSummary, rows: list[dict], hardware_id: str):
+    builds, boots, tests = view.aggregate_summaries(rows, hardware_id)
+    trees, compatibles = view.aggregate_common(rows, hardware_id)
+    return _normalize(
+        {
+            "builds": builds.model_dump(),
+            "boots": boots.model_dump(),
+            "tests": tests.model_dump(),
+            "trees": [tree.model_dump() for tree in trees],
+            "compatibles": compatibles,
+        }
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("hardware_id", [PLATFORM, COMPATIBLES[0], COMPATIBLES[1]])
+def test_rollup_summary_matches_raw_summary(hardware_id):
+    checkouts = _create_data()
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    ProcessPendingCommand().process_pending_batch(batch_size=1000)
+
+    view = HardwareDetailsSummary()
+    view.filters = FilterParams({"filter": {}}, process_body=True)
+    summary_params = {
+        "hardware_id": hardware_id,
+        "origin": ORIGIN,
+        "commit_hashes": [checkout.git_commit_hash for checkout in checkouts],
+        "start_datetime": _hours_ago(24),
+        "end_datetime": timezone.now(),
+    }
+
+    raw_rows = get_hardware_details_summary(**summary_params)
+    rollup_rows = get_hardware_details_summary_from_rollup(**summary_params)
+
+    assert raw_rows
+    assert _aggregate(view, rollup_rows, hardware_id) == _aggregate(
+        view, raw_rows, hardware_id
+    )
+
+
+@pytest.mark.django_db
+def test_rollup_counts_each_item_once():
+    """Processing the same tests again doesn't count them twice."""
+    _create_data()
+    command = ProcessPendingCommand()
+
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    command.process_pending_batch(batch_size=1000)
+    rows_after_first_run = sorted(
+        HardwareTestsRollup.objects.filter(origin=ORIGIN).values_list(
+            "hardware_id", "is_build", "total_tests"
+        )
+    )
+
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    command.process_pending_batch(batch_size=1000)
+
+    assert rows_after_first_run
+    assert (
+        sorted(
+            HardwareTestsRollup.objects.filter(origin=ORIGIN).values_list(
+                "hardware_id", "is_build", "total_tests"
+            )
+        )
+        == rows_after_first_run
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("filters", [{}, {"filter_test.status": ["PASS"]}])
+def test_summary_view_falls_back_to_raw_summary(filters):
+    """Tests that weren't aggregated yet are still in the summary."""
+    _create_data()
+    body = {
+        "origin": ORIGIN,
+        "startTimestampInSeconds": int(_hours_ago(24).timestamp()),
+        "endTimestampInSeconds": int(timezone.now().timestamp()),
+        "selectedCommits": {},
+        "filter": filters,
+    }
+    request = APIRequestFactory().post(
+        f"/api/hardware/{PLATFORM}/summary", body, format="json"
+    )
+
+    response = HardwareDetailsSummary.as_view()(request, hardware_id=PLATFORM)
+
+    assert response.status_code == 200
+    assert "error" not in response.data
+    assert response.data["summary"]["tests"]["status"]["PASS"] == 1
+    # The trees are listed from the unfiltered summary
+    assert [
+        tree["head_git_commit_hash"] for tree in response.data["common"]["trees"]
+    ] == ["hardware_rollup_hash_1"]
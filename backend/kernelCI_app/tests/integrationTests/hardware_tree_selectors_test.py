@@ -0,0 +1,116 @@
+"""Integration tests for the hardware_tree_selectors table and the selectors query."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_checkouts_and_pendings,
+    update_hardware_tree_selectors,
+)
+from kernelCI_app.models import HardwareTreeSelector
+from kernelCI_app.queries.hardware import get_hardware_selectors
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory
+
+ORIGIN = "hardware-selectors-origin"
+# The selectors query is cached by origin, so each test reads a different one
+INGESTED_ORIGIN = "hardware-selectors-ingested-origin"
+POPULATED_ORIGIN = "hardware-selectors-populated-origin"
+
+
+def _days_ago(days: int):
+    return timezone.now() - timezone.timedelta(days=days)
+
+
+def _create_checkout(checkout_id: str, origin: str = ORIGIN, **kwargs):
+    return CheckoutFactory(
+        id=checkout_id,
+        origin=origin,
+        tree_name=kwargs.pop("tree_name", "selectors-tree"),
+        git_repository_url="https://git.example.org/selectors.git",
+        git_repository_branch="master",
+        git_commit_hash=kwargs.pop("git_commit_hash", checkout_id + "_hash"),
+        git_commit_name="v6.1",
+        **kwargs,
+    )
+
+
+def _selector_hashes(origin: str) -> list[str]:
+    return [row["git_commit_hash"] for row in get_hardware_selectors(origin=origin)]
+
+
+@pytest.mark.django_db
+def test_selectors_list_tree_heads_with_recent_builds():
+    recent = _create_checkout("selectors_recent", start_time=_days_ago(2))
+    retry = _create_checkout(
+        "selectors_recent_retry",
+        git_commit_hash="selectors_recent_hash",
+        start_time=_days_ago(1),
+    )
+    old = _create_checkout("selectors_old", start_time=_days_ago(60))
+    no_tree = _create_checkout("selectors_no_tree", tree_name=None)
+    _create_checkout("selectors_no_builds")
+
+    BuildFactory(checkout=recent, origin=ORIGIN, start_time=_days_ago(2))
+    BuildFactory(checkout=retry, origin=ORIGIN, start_time=_days_ago(1))
+    BuildFactory(checkout=old, origin=ORIGIN, start_time=_days_ago(60))
+    BuildFactory(checkout=no_tree, origin=ORIGIN, start_time=_days_ago(1))
+
+    update_hardware_tree_selectors(
+        checkout_ids=[
+            "selectors_recent",
+            "selectors_recent_retry",
+            "selectors_old",
+            "selectors_no_tree",
+            "selectors_no_builds",
+        ]
+    )
+
+    rows = get_hardware_selectors(origin=ORIGIN)
+    assert [row["git_commit_hash"] for row in rows] == ["selectors_recent_hash"]
+    assert rows[0]["start_time"] == retry.start_time
+
+
+@pytest.mark.django_db
+def test_ingested_builds_and_checkouts_update_selectors():
+    """Builds are merged whether they are ingested before or after their checkout."""
+    checkout = _create_checkout(
+        "selectors_ingested", origin=INGESTED_ORIGIN, start_time=_days_ago(1)
+    )
+    build = BuildFactory(
+        checkout=checkout, origin=INGESTED_ORIGIN, start_time=_days_ago(1)
+    )
+    aggregate_checkouts_and_pendings(
+        checkouts_instances=[], tests_instances=[], build_instances=[build]
+    )
+
+    late_checkout = _create_checkout(
+        "selectors_late", origin=INGESTED_ORIGIN, start_time=_days_ago(1)
+    )
+    BuildFactory(
+        checkout=late_checkout, origin=INGESTED_ORIGIN, start_time=_days_ago(1)
+    )
+    aggregate_checkouts_and_pendings(
+        checkouts_instances=[late_checkout], tests_instances=[], build_instances=[]
+    )
+
+    assert sorted(
+        HardwareTreeSelector.objects.filter(origin=INGESTED_ORIGIN).values_list(
+            "git_commit_hash", flat=True
+        )
+    ) == ["selectors_ingested_hash", "selectors_late_hash"]
+
+
+@pytest.mark.django_db
+def test_populate_command_recomputes_selectors():
+    checkout = _create_checkout(
+        "selectors_populate", origin=POPULATED_ORIGIN, start_time=_days_ago(1)
+    )
+    BuildFactory(checkout=checkout, origin=POPULATED_ORIGIN, start_time=_days_ago(1))
+
+    call_command("populate_hardware_tree_selectors", stdout=StringIO())
+    call_command("populate_hardware_tree_selectors", stdout=StringIO())
+
+    assert _selector_hashes(POPULATED_ORIGIN) == ["selectors_populate_hash"]
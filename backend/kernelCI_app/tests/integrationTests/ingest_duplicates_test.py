@@ -0,0 +1,69 @@
+"""Checks that merging duplicated records before a flush gives the same rows as
+upserting every duplicate."""
+
+from datetime import UTC, datetime
+
+import pytest
+from django.db import connection
+
+from kernelCI_app.management.commands.helpers.ingest_records import (
+    make_record,
+    merge_duplicate_records,
+)
+from kernelCI_app.management.commands.helpers.kcidbng_ingester import consume_buffer
+from kernelCI_app.models import Issues
+
+ISSUE_SUBMISSIONS = [
+    {"origin": "maestro", "version": 1, "comment": None},
+    {
+        "origin": "another",
+        "version": 1,
+        "comment": "First comment",
+        "culprit": {"code": True},
+    },
+    {
+        "origin": "maestro",
+        "version": 1,
+        "comment": "Second comment",
+        "culprit": {"code": False, "tool": True},
+        "misc": {"retry": 2},
+    },
+]
+
+
+def _issue_records(issue_id: str) -> list:
+    return [
+        make_record(
+            "issues",
+            {"id": issue_id, **issue},
+            timestamp=datetime(2026, 10, day, tzinfo=UTC),
+        )
+        for day, issue in zip([3, 1, 2], ISSUE_SUBMISSIONS, strict=True)
+    ]
+
+
+def _issue_row(issue_id: str) -> dict:
+    row = Issues.objects.values().get(id=issue_id)
+    row.pop("id")
+    return row
+
+
+@pytest.mark.django_db
+def test_merged_duplicates_upsert_the_same_row():
+    merged, duplicates = merge_duplicate_records(
+        "issues", _issue_records("merged_duplicates_issue")
+    )
+
+    consume_buffer(_issue_records("upserted_duplicates_issue"), "issues")
+    consume_buffer(merged, "issues")
+
+    assert duplicates == 2
+    assert _issue_row("merged_duplicates_issue") == _issue_row(
+        "upserted_duplicates_issue"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT _timestamp, comment FROM issues WHERE id = %s",
+            ["merged_duplicates_issue"],
+        )
+        assert cursor.fetchone() == (datetime(2026, 10, 3, tzinfo=UTC), "First comment")
@@ -0,0 +1,233 @@
+"""Integration tests for the issue_listing table and the issue listing endpoint."""
+
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_incidents,
+    aggregate_issue_listing,
+)
+from kernelCI_app.management.commands.helpers.ingest_records import make_record
+from kernelCI_app.management.commands.helpers.kcidbng_ingester import flush_buffers
+from kernelCI_app.models import IssueListingEntry
+from kernelCI_app.queries.issues import get_issue_listing_facets, get_issue_listing_page
+from kernelCI_app.tests.factories import (
+    BuildFactory,
+    CheckoutFactory,
+    IncidentFactory,
+    IssueFactory,
+)
+from kernelCI_app.views.issueView import IssueView
+
+
+def _window_start(year: int) -> datetime:
+    # The listing is cached by window, so each test uses a different one
+    return datetime(year, 1, 1, tzinfo=UTC)
+
+
+def _create_issues(start: datetime) -> dict:
+    build = BuildFactory(checkout=CheckoutFactory())
+    issues = {
+        "code": IssueFactory(
+            id=f"listing_code_{start.year}",
+            version=1,
+            origin="listing-origin-a",
+            culprit_code=True,
+            culprit_tool=False,
+            culprit_harness=False,
+            categories=["boot"],
+            field_timestamp=start + timedelta(hours=3),
+        ),
+        "tool": IssueFactory(
+            id=f"listing_tool_{start.year}",
+            version=1,
+            origin="listing-origin-b",
+            culprit_code=False,
+            culprit_tool=True,
+            culprit_harness=False,
+            categories=["test"],
+            field_timestamp=start + timedelta(hours=2),
+        ),
+        "no_tree": IssueFactory(
+            id=f"listing_no_tree_{start.year}",
+            version=1,
+            origin="listing-origin-a",
+            culprit_code=False,
+            culprit_tool=False,
+            culprit_harness=True,
+            categories=None,
+            field_timestamp=start + timedelta(hours=1),
+        ),
+        "outside": IssueFactory(
+            id=f"listing_outside_{start.year}",
+            version=1,
+            origin="listing-origin-c",
+            field_timestamp=start - timedelta(days=1),
+        ),
+    }
+    incidents = [
+        IncidentFactory(issue=issues["code"], build=build, test=None),
+        IncidentFactory(issue=issues["code"], build=build, test=None),
+        # Incidents that can't be linked to a tree hide their issue
+        IncidentFactory(issue=issues["no_tree"], build=None, test=None),
+    ]
+    aggregate_incidents(incidents)
+    aggregate_issue_listing(list(issues.values()), incidents)
+    return issues
+
+
+def _page_ids(start: datetime, **kwargs) -> tuple[list[str], int]:
+    params = {
+        "origins": [],
+        "culprits": [],
+        "categories": [],
+        "has_incident": False,
+        "limit": None,
+        "offset": 0,
+        **kwargs,
+    }
+    rows, total = get_issue_listing_page(
+        start_date=start, end_date=start + timedelta(days=1), **params
+    )
+    return [row["id"] for row in rows], total
+
+
+@pytest.mark.django_db
+def test_listing_rows_are_merged_from_issues_and_incidents():
+    start = _window_start(2001)
+    issues = _create_issues(start)
+
+    code_entry = IssueListingEntry.objects.get(issue_id=issues["code"].id)
+    assert code_entry.incident_count == 2
+    assert code_entry.has_trees
+    assert code_entry.first_seen is not None
+
+    no_tree_entry = IssueListingEntry.objects.get(issue_id=issues["no_tree"].id)
+    assert no_tree_entry.incident_count == 1
+    assert not no_tree_entry.has_trees
+
+    tool_entry = IssueListingEntry.objects.get(issue_id=issues["tool"].id)
+    assert tool_entry.incident_count == 0
+    assert tool_entry.first_seen is None
+
+
+def _flush_issue(issue_id: str, incident_ids: list[str], timestamp: datetime) -> None:
+    flush_buffers(
+        issues_buf=[
+            make_record(
+                "issues",
+                {"id": issue_id, "version": 1, "origin": "listing-origin-a"},
+                timestamp=timestamp,
+            )
+        ],
+        checkouts_buf=[],
+        builds_buf=[],
+        tests_buf=[],
+        incidents_buf=[
+            make_record(
+                "incidents",
+                {
+                    "id": incident_id,
+                    "origin": "listing-origin-a",
+                    "issue_id": issue_id,
+                    "issue_version": 1,
+                },
+                timestamp=timestamp,
+            )
+            for incident_id in incident_ids
+        ],
+        buffer_files=set(),
+        dirs={},
+        stat_ok=MagicMock(),
+        stat_fail=MagicMock(),
+        counter_lock=MagicMock(),
+    )
+
+
+@pytest.mark.django_db
+def test_flushes_only_count_new_incidents():
+    """Each flush adds its inserted incidents to the count of the existing rows,
+    so incidents submitted again aren't counted twice."""
+    start = _window_start(2006)
+    issue_id = "listing_flushed_issue"
+
+    _flush_issue(issue_id, ["listing_incident_a", "listing_incident_b"], start)
+    assert IssueListingEntry.objects.get(issue_id=issue_id).incident_count == 2
+
+    _flush_issue(issue_id, ["listing_incident_b", "listing_incident_c"], start)
+    assert IssueListingEntry.objects.get(issue_id=issue_id).incident_count == 3
+
+    _flush_issue(issue_id, [], start + timedelta(hours=1))
+    assert IssueListingEntry.objects.get(issue_id=issue_id).incident_count == 3
+
+
+@pytest.mark.django_db
+def test_listing_page_filters_and_paginates():
+    start = _window_start(2002)
+    issues = _create_issues(start)
+    code_id, tool_id = issues["code"].id, issues["tool"].id
+
+    assert _page_ids(start) == ([code_id, tool_id], 2)
+    assert _page_ids(start, limit=1) == ([code_id], 2)
+    assert _page_ids(start, limit=1, offset=1) == ([tool_id], 2)
+    assert _page_ids(start, origins=["listing-origin-b"]) == ([tool_id], 1)
+    assert _page_ids(start, culprits=["code", "harness"]) == ([code_id], 1)
+    assert _page_ids(start, categories=["test", "build"]) == ([tool_id], 1)
+    assert _page_ids(start, has_incident=True) == ([code_id], 1)
+
+    facets = get_issue_listing_facets(
+        start_date=start, end_date=start + timedelta(days=1)
+    )
+    assert facets["issue_count"] == 3
+    assert sorted(facets["origins"]) == ["listing-origin-a", "listing-origin-b"]
+    assert sorted(facets["categories"]) == ["boot", "test"]
+    assert facets["culprit_code"] and facets["culprit_harness"]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("from_listing_table", [True, False])
+def test_issue_view_pages_match_with_and_without_listing_table(from_listing_table):
+    start = _window_start(2003 if from_listing_table else 2004)
+    issues = _create_issues(start)
+    if not from_listing_table:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM issue_listing")
+
+    request = APIRequestFactory().get(
+        "/api/issue/",
+        {
+            "startTimestampInSeconds": int(start.timestamp()),
+            "endTimestampInSeconds": int((start + timedelta(days=1)).timestamp()),
+            "limit": 1,
+            "offset": 1,
+        },
+    )
+    response = IssueView().get(request)
+
+    assert response.status_code == 200
+    assert [issue["id"] for issue in response.data["issues"]] == [issues["tool"].id]
+    assert response.data["total_count"] == 2
+    assert response.data["filters"] == {
+        "origins": ["listing-origin-a", "listing-origin-b"],
+        "culprits": ["code", "harness", "tool"],
+        "categories": ["boot", "test"],
+    }
+
+
+@pytest.mark.django_db
+def test_populate_command_recomputes_listing():
+    start = _window_start(2005)
+    issues = _create_issues(start)
+    IssueListingEntry.objects.all().delete()
+
+    call_command("populate_issue_listing", stdout=StringIO())
+    call_command("populate_issue_listing", stdout=StringIO())
+
+    assert IssueListingEntry.objects.get(issue_id=issues["code"].id).incident_count == 2
+    assert _page_ids(start) == ([issues["code"].id, issues["tool"].id], 2)
@@ -0,0 +1,276 @@
+"""Integration tests for the issue_seen_summary tables and their issue extras."""
+
+from datetime import UTC, datetime, timedelta
+from io import StringIO
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from kernelCI_app.helpers.issueExtras import (
+    TagUrls,
+    assign_issue_incidents,
+    assign_issue_seen_summary,
+    assign_issue_trees,
+)
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_incidents,
+)
+from kernelCI_app.management.commands.helpers.ingest_records import make_record
+from kernelCI_app.management.commands.helpers.kcidbng_ingester import flush_buffers
+from kernelCI_app.models import IssueListingEntry, IssueSeenSummary, IssueSeenTree
+from kernelCI_app.tests.factories import (
+    BuildFactory,
+    CheckoutFactory,
+    IncidentFactory,
+    IssueFactory,
+    TestFactory,
+)
+
+
+def _create_issue_history():
+    now = timezone.now()
+    mainline = CheckoutFactory(
+        tree_name="mainline",
+        git_repository_url=TagUrls.MAINLINE_URL,
+        git_repository_branch="master",
+    )
+    stable = CheckoutFactory(
+        tree_name="stable",
+        git_repository_url=TagUrls.STABLE_URL,
+        git_repository_branch="linux-6.1.y",
+    )
+    mainline_build = BuildFactory(checkout=mainline)
+    stable_build = BuildFactory(checkout=stable)
+    stable_test = TestFactory(build=stable_build)
+
+    # Only the latest version is in the issues table, older versions
+    # are still referenced by their incidents
+    issue = IssueFactory(id="seen_summary_issue", version=2)
+
+    incidents = [
+        IncidentFactory(
+            issue=issue,
+            issue_version=1,
+            build=mainline_build,
+            test=None,
+            field_timestamp=now - timedelta(days=5),
+        ),
+        IncidentFactory(
+            issue=issue,
+            issue_version=1,
+            build=None,
+            test=stable_test,
+            field_timestamp=now - timedelta(days=4),
+        ),
+        IncidentFactory(
+            issue=issue,
+            build=None,
+            test=stable_test,
+            field_timestamp=now - timedelta(days=2),
+        ),
+        IncidentFactory(
+            issue=issue,
+            build=mainline_build,
+            test=None,
+            field_timestamp=now - timedelta(days=1),
+        ),
+    ]
+    return incidents
+
+
+def _issue_extras(assign_functions, issue_key_list):
+    processed_issues_table = {}
+    for assign in assign_functions:
+        assign(
+            issue_key_list=issue_key_list,
+            processed_issues_table=processed_issues_table,
+        )
+    return processed_issues_table
+
+
+@pytest.mark.django_db
+def test_summary_matches_incident_queries():
+    """The summary tables return the same extras as the queries on incidents."""
+    incidents = _create_issue_history()
+    # Merging in separate batches and out of order must give the same result
+    aggregate_incidents(incidents[2:])
+    aggregate_incidents(incidents[:2])
+
+    issue_key_list = [
+        ("seen_summary_issue", 1),
+        ("seen_summary_issue", 2),
+        ("seen_summary_issue", 3),
+    ]
+    expected = _issue_extras(
+        [assign_issue_incidents, assign_issue_trees], issue_key_list
+    )
+    actual = _issue_extras([assign_issue_seen_summary], issue_key_list)
+
+    assert actual.keys() == expected.keys()
+    actual_issue = actual["seen_summary_issue"]
+    expected_issue = expected["seen_summary_issue"]
+    assert actual_issue.first_incident == expected_issue.first_incident
+    assert actual_issue.last_incident == expected_issue.last_incident
+    assert actual_issue.versions.keys() == expected_issue.versions.keys()
+    assert actual_issue.versions[1] is None
+    assert actual_issue.versions[3] is None
+    actual_version = actual_issue.versions[2]
+    expected_version = expected_issue.versions[2]
+    assert sorted(actual_version.trees, key=str) == sorted(
+        expected_version.trees, key=str
+    )
+    assert actual_version.tags == expected_version.tags
+    assert actual_issue.versions[2].tags == {"mainline", "stable"}
+
+
+@pytest.mark.django_db
+def test_issue_without_incidents_is_left_out():
+    IssueFactory(id="seen_summary_lonely_issue", version=1)
+
+    processed_issues_table = _issue_extras(
+        [assign_issue_seen_summary], [("seen_summary_lonely_issue", 1)]
+    )
+
+    assert processed_issues_table == {}
+
+
+@pytest.mark.django_db
+def test_populate_issue_seen_summary():
+    """The populate command rebuilds the summary tables from the incidents."""
+    _create_issue_history()
+
+    call_command("populate_issue_seen_summary", stdout=StringIO())
+
+    summaries = IssueSeenSummary.objects.filter(issue_id="seen_summary_issue")
+    assert sorted(summary.issue_version for summary in summaries) == [1, 2]
+    assert (
+        IssueSeenTree.objects.filter(
+            issue_id="seen_summary_issue", issue_version=2
+        ).count()
+        == 2
+    )
+
+
+def _flush(**buffers):
+    flush_buffers(
+        **{
+            "issues_buf": [],
+            "checkouts_buf": [],
+            "builds_buf": [],
+            "tests_buf": [],
+            "incidents_buf": [],
+            **buffers,
+        },
+        buffer_files=set(),
+        dirs={},
+        stat_ok=MagicMock(),
+        stat_fail=MagicMock(),
+        counter_lock=MagicMock(),
+    )
+
+
+@pytest.mark.django_db
+def test_incidents_ingested_before_their_tests_and_builds():
+    """The summaries and trees of incidents are filled once their tests,
+    builds and checkout are ingested in later flushes."""
+    timestamp = datetime(2026, 10, 1, tzinfo=UTC)
+    issue_id = "seen_summary_early_issue"
+    _flush(
+        issues_buf=[
+            make_record(
+                "issues",
+                {"id": issue_id, "version": 1, "origin": "maestro"},
+                timestamp=timestamp,
+            )
+        ],
+        incidents_buf=[
+            make_record(
+                "incidents",
+                {
+                    "id": "seen_summary_early_test_incident",
+                    "origin": "maestro",
+                    "issue_id": issue_id,
+                    "issue_version": 1,
+                    "test_id": "seen_summary_early_test",
+                },
+                timestamp=timestamp,
+            ),
+            make_record(
+                "incidents",
+                {
+                    "id": "seen_summary_early_build_incident",
+                    "origin": "maestro",
+                    "issue_id": issue_id,
+                    "issue_version": 1,
+                    "build_id": "seen_summary_early_build",
+                },
+                timestamp=timestamp + timedelta(hours=1),
+            ),
+        ],
+    )
+
+    summary = IssueSeenSummary.objects.get(issue_id=issue_id, issue_version=1)
+    assert summary.first_checkout_id is None
+    assert summary.last_checkout_id is None
+    assert not IssueListingEntry.objects.get(issue_id=issue_id).has_trees
+
+    _flush(
+        tests_buf=[
+            make_record(
+                "tests",
+                {
+                    "id": "seen_summary_early_test",
+                    "origin": "maestro",
+                    "build_id": "seen_summary_early_build",
+                    "path": "boot",
+                    "status": "FAIL",
+                    "start_time": timestamp,
+                },
+                timestamp=timestamp,
+            )
+        ],
+    )
+    _flush(
+        checkouts_buf=[
+            make_record(
+                "checkouts",
+                {
+                    "id": "seen_summary_early_checkout",
+                    "origin": "maestro",
+                    "tree_name": "mainline",
+                    "git_repository_url": TagUrls.MAINLINE_URL,
+                    "git_repository_branch": "master",
+                    "git_commit_hash": "seen_summary_early_hash",
+                    "start_time": timestamp,
+                },
+                timestamp=timestamp,
+            )
+        ],
+        builds_buf=[
+            make_record(
+                "builds",
+                {
+                    "id": "seen_summary_early_build",
+                    "origin": "maestro",
+                    "checkout_id": "seen_summary_early_checkout",
+                    "status": "PASS",
+                    "start_time": timestamp,
+                },
+                timestamp=timestamp,
+            )
+        ],
+    )
+
+    summary.refresh_from_db()
+    assert summary.first_incident_id == "seen_summary_early_test_incident"
+    assert summary.first_checkout_id == "seen_summary_early_checkout"
+    assert summary.last_incident_id == "seen_summary_early_build_incident"
+    assert summary.last_checkout_id == "seen_summary_early_checkout"
+    assert list(
+        IssueSeenTree.objects.filter(issue_id=issue_id).values_list(
+            "tree_name", "git_repository_branch"
+        )
+    ) == [("mainline", "master")]
+    assert IssueListingEntry.objects.get(issue_id=issue_id).has_trees
@@ -0,0 +1,204 @@
+"""Uploads log excerpts to a local stub of the storage server, through the
+ingester's HTTP session and upload threads."""
+
+import gzip
+import threading
+from datetime import timedelta
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from django.utils import timezone
+from prometheus_client import REGISTRY
+
+from kernelCI_app.constants.ingester import INGESTER_GRAFANA_LABEL
+from kernelCI_app.management.commands.helpers import log_excerpt_utils
+from kernelCI_app.management.commands.helpers.log_excerpt_utils import (
+    cache_logs_maintenance,
+    extract_log_excerpt,
+    get_uploaded_urls,
+)
+from kernelCI_cache.models import LogExcerptUpload
+
+STORAGE_TOKEN = "stub-token"
+STORAGE_BASE_URL = "http://stub-storage"
+
+
+class StubStorageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        message = BytesParser(policy=policy.default).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        parts = {
+            part.get_param("name", header="content-disposition"): part.get_payload(
+                decode=True
+            )
+            for part in message.iter_parts()
+        }
+        self.server.uploads.append(
+            {
+                "authorization": self.headers["Authorization"],
+                "path": parts["path"].decode(),
+                "content": gzip.decompress(parts["file0"]).decode("utf-8"),
+            }
+        )
+        self.send_response(500 if self.server.fail_uploads else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_storage():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubStorageHandler)
+    server.uploads = []
+    server.fail_uploads = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    # A new session so that it connects to this server
+    log_excerpt_utils._upload_pid = None
+    with (
+        patch.object(
+            log_excerpt_utils, "UPLOAD_URL", f"http://127.0.0.1:{server.server_port}"
+        ),
+        patch.object(log_excerpt_utils, "STORAGE_TOKEN", STORAGE_TOKEN),
+        patch.object(log_excerpt_utils, "STORAGE_BASE_URL", STORAGE_BASE_URL),
+    ):
+        yield server
+
+    server.shutdown()
+    server.server_close()
+    log_excerpt_utils._upload_executor.shutdown()
+    log_excerpt_utils._upload_pid = None
+
+
+def _log_excerpts(result: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "kcidb_log_excerpts_total",
+            {"ingester": INGESTER_GRAFANA_LABEL, "result": result},
+        )
+        or 0
+    )
+
+
+@pytest.mark.django_db(databases=["cache"])
+def test_log_excerpts_are_uploaded_once(stub_storage):
+    log_excerpts = [f"log excerpt {i}\n" * 50 for i in range(6)]
+    first_submission = {
+        "builds": [
+            {"id": f"build{i}", "log_excerpt": log_excerpt}
+            for i, log_excerpt in enumerate(log_excerpts)
+        ],
+        "tests": [{"id": "test0", "log_excerpt": log_excerpts[0]}],
+    }
+    second_submission = {
+        "tests": [{"id": "test1", "log_excerpt": log_excerpts[5]}],
+    }
+    uploaded_before = _log_excerpts("uploaded")
+    deduplicated_before = _log_excerpts("deduplicated")
+
+    extract_log_excerpt(first_submission)
+    extract_log_excerpt(second_submission)
+
+    assert len(stub_storage.uploads) == len(log_excerpts)
+    assert sorted(upload["content"] for upload in stub_storage.uploads) == sorted(
+        log_excerpts
+    )
+    assert {upload["authorization"] for upload in stub_storage.uploads} == {
+        f"Bearer {STORAGE_TOKEN}"
+    }
+    for item in [
+        *first_submission["builds"],
+        *first_submission["tests"],
+        *second_submission["tests"],
+    ]:
+        assert item["log_excerpt"] == ""
+        [output_file] = item["output_files"]
+        assert output_file["url"].startswith(f"{STORAGE_BASE_URL}/logexcerpt/")
+    assert (
+        first_submission["tests"][0]["output_files"]
+        == first_submission["builds"][0]["output_files"]
+    )
+    assert LogExcerptUpload.objects.using("cache").count() == len(log_excerpts)
+    assert _log_excerpts("uploaded") == uploaded_before + len(log_excerpts)
+    assert _log_excerpts("deduplicated") == deduplicated_before + 1
+
+
+@pytest.mark.django_db(databases=["cache"])
+def test_failed_uploads_are_retried(stub_storage):
+    log_excerpt = "failing log excerpt\n" * 50
+    failed_before = _log_excerpts("failed")
+
+    stub_storage.fail_uploads = True
+    failed_submission = {"builds": [{"id": "build", "log_excerpt": log_excerpt}]}
+    extract_log_excerpt(failed_submission)
+
+    assert failed_submission["builds"][0] == {"id": "build", "log_excerpt": log_excerpt}
+    assert not LogExcerptUpload.objects.using("cache").exists()
+    assert _log_excerpts("failed") == failed_before + 1
+
+    stub_storage.fail_uploads = False
+    retried_submission = {"builds": [{"id": "build", "log_excerpt": log_excerpt}]}
+    extract_log_excerpt(retried_submission)
+
+    assert retried_submission["builds"][0]["log_excerpt"] == ""
+    assert len(stub_storage.uploads) == 2
+    assert LogExcerptUpload.objects.using("cache").count() == 1
+
+
+def _create_uploads(count: int) -> None:
+    now = timezone.now()
+    LogExcerptUpload.objects.using("cache").bulk_create(
+        [
+            LogExcerptUpload(
+                log_hash=f"hash{i}",
+                url=f"{STORAGE_BASE_URL}/{i}",
+                last_used=now - timedelta(minutes=i),
+            )
+            for i in range(count)
+        ]
+    )
+
+
+@pytest.mark.django_db(databases=["cache"])
+def test_indexed_log_excerpts_are_refreshed():
+    last_used = timezone.now() - timedelta(days=1)
+    LogExcerptUpload.objects.using("cache").create(
+        log_hash="hash0", url=f"{STORAGE_BASE_URL}/0", last_used=last_used
+    )
+
+    uploaded_urls = get_uploaded_urls(["hash0", "hash1"])
+
+    assert uploaded_urls == {"hash0": f"{STORAGE_BASE_URL}/0"}
+    assert LogExcerptUpload.objects.using("cache").get().last_used > last_used
+
+
+@pytest.mark.django_db(databases=["cache"])
+@patch.object(log_excerpt_utils, "CACHE_LOGS_SIZE_LIMIT", 3)
+def test_cache_logs_maintenance_prunes_when_over_limit():
+    _create_uploads(5)
+
+    cache_logs_maintenance()
+
+    assert set(
+        LogExcerptUpload.objects.using("cache").values_list("log_hash", flat=True)
+    ) == {"hash0", "hash1", "hash2"}
+
+
+@pytest.mark.django_db(databases=["cache"])
+@patch.object(log_excerpt_utils, "CACHE_LOGS_SIZE_LIMIT", 10)
+def test_cache_logs_maintenance_no_prune_when_under_limit():
+    _create_uploads(5)
+
+    cache_logs_maintenance()
+
+    assert LogExcerptUpload.objects.using("cache").count() == 5
@@ -0,0 +1,117 @@
+"""Runs the registered queries as server-side prepared statements on the database."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from django.db import connection
+from prometheus_client import REGISTRY
+
+from kernelCI_app.helpers.preparedQueries import registered_cursor
+from kernelCI_app.queries.hardware import get_hardware_listing_data_from_status_table
+from kernelCI_app.queries.issues import get_issue_listing_page
+from kernelCI_app.queries.tree import (
+    get_tree_details_data,
+    get_tree_listing_data_denormalized,
+)
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory
+
+
+def _observations(query: str, phase: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "kernelci_registered_query_duration_seconds_count",
+            {"query": query, "phase": phase},
+        )
+        or 0
+    )
+
+
+def _prepared_statements() -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT statement FROM pg_prepared_statements")
+        return [statement for (statement,) in cursor.fetchall()]
+
+
+@pytest.mark.django_db
+def test_registered_queries_are_prepared_once_per_connection(settings):
+    settings.PREPARED_QUERIES_ENABLED = True
+    checkout = CheckoutFactory(
+        id="prepared_checkout",
+        origin="prepared_origin",
+        git_commit_hash="prepared_hash",
+        git_repository_url="https://prepared.example.com",
+        git_repository_branch="master",
+    )
+    BuildFactory(id="prepared_build", checkout=checkout, origin="prepared_origin")
+
+    def get_rows(commit_hash: str):
+        return get_tree_details_data(
+            origin_param="prepared_origin",
+            git_url_param="https://prepared.example.com",
+            git_branch_param="master",
+            commit_hash=commit_hash,
+        )
+
+    assert get_rows("prepared_missing_hash") == []
+    prepared_before = _observations("tree_details", "prepared")
+    rows = get_rows("prepared_hash")
+
+    assert [row[13] for row in rows] == ["prepared_build"]
+    assert _observations("tree_details", "prepared") - prepared_before == 1
+    assert any("RELEVANT_HASH" in statement for statement in _prepared_statements())
+
+
+@pytest.mark.django_db
+def test_registered_queries_run_with_server_side_binding(settings):
+    settings.PREPARED_QUERIES_ENABLED = True
+    now = datetime.now(UTC)
+
+    assert (
+        get_tree_listing_data_denormalized(origin="prepared_none", interval_in_days=7)
+        == []
+    )
+    assert (
+        get_hardware_listing_data_from_status_table(
+            start_date=now - timedelta(days=7),
+            end_date=now,
+            origin="prepared_none",
+            commits_list=["prepared_hash"],
+        )
+        == []
+    )
+    assert get_issue_listing_page(
+        start_date=now - timedelta(days=3),
+        end_date=now - timedelta(days=2),
+        origins=["prepared_none"],
+        culprits=["code"],
+        categories=["prepared"],
+        has_incident=False,
+        limit=None,
+        offset=0,
+    ) == ([], 0)
+
+
+@pytest.mark.django_db
+def test_registered_query_plan_cache_mode_is_pinned_per_query(settings):
+    settings.PREPARED_QUERIES_ENABLED = True
+    settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {"tree_listing": "force_custom_plan"}
+
+    with registered_cursor("tree_listing") as cursor:
+        cursor.execute("SELECT current_setting('plan_cache_mode')")
+        assert cursor.fetchone() == ("force_custom_plan",)
+
+    with registered_cursor("tree_details") as cursor:
+        cursor.execute("SELECT current_setting('plan_cache_mode')")
+        assert cursor.fetchone() == ("auto",)
+
+
+@pytest.mark.django_db
+def test_registered_queries_can_be_unprepared(settings):
+    settings.PREPARED_QUERIES_ENABLED = False
+    unprepared_before = _observations("tree_listing", "unprepared")
+
+    assert (
+        get_tree_listing_data_denormalized(origin="unprepared", interval_in_days=7)
+        == []
+    )
+    assert _observations("tree_listing", "unprepared") - unprepared_before == 1
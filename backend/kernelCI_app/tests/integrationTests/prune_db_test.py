@@ -5,14 +5,38 @@ from io import StringIO
 import pytest
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
 from django.utils import timezone
 
-from kernelCI_app.models import Builds, Checkouts, Tests
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_incidents,
+    aggregate_issue_listing,
+    update_hardware_tree_selectors,
+    update_tree_commit_timeline,
+)
+from kernelCI_app.management.commands.prune_db import Command
+from kernelCI_app.models import (
+    Builds,
+    Checkouts,
+    HardwareStatus,
+    HardwareTreeSelector,
+    IssueListingEntry,
+    IssueSeenSummary,
+    IssueSeenTree,
+    LatestCheckout,
+    ProcessedListingItems,
+    Tests,
+    TreeCommitTimeline,
+    TreeListing,
+    TreeTestsRollup,
+)
 from kernelCI_app.tests.factories import (
     BuildFactory,
     CheckoutFactory,
     IncidentFactory,
+    IssueFactory,
     TestFactory,
+    TreeTestsRollupFactory,
 )
 
 
@@ -237,3 +261,281 @@ def test_skip_issue_protection_deletes_linked_rows():
     assert not Checkouts.objects.filter(id=checkout.id).exists()
     assert not Builds.objects.filter(id=build.id).exists()
     assert not Tests.objects.filter(id=test.id).exists()
+
+
+def _create_derived_rows(checkout):
+    """One row in every derived table for the given checkout."""
+    HardwareStatus.objects.create(
+        checkout_id=checkout.id,
+        test_origin=checkout.origin,
+        platform="prune-board",
+        start_time=checkout.start_time,
+    )
+    LatestCheckout.objects.create(
+        checkout_id=checkout.id,
+        origin=checkout.origin,
+        tree_name=checkout.tree_name,
+        git_repository_url=checkout.git_repository_url,
+        git_repository_branch=checkout.git_repository_branch,
+        start_time=checkout.start_time,
+    )
+    TreeListing.objects.create(
+        checkout_id=checkout.id,
+        origin=checkout.origin,
+        tree_name=checkout.tree_name,
+        git_repository_url=checkout.git_repository_url,
+        git_repository_branch=checkout.git_repository_branch,
+        git_commit_hash=checkout.git_commit_hash,
+        start_time=checkout.start_time,
+    )
+    ProcessedListingItems.objects.create(
+        listing_item_key=checkout.id.encode().ljust(32, b"\0")[:32],
+        checkout_id=checkout.id,
+    )
+    BuildFactory(checkout=checkout, field_timestamp=checkout.field_timestamp)
+    update_tree_commit_timeline(checkout_ids=[checkout.id])
+    update_hardware_tree_selectors(checkout_ids=[checkout.id])
+    return TreeTestsRollupFactory(
+        origin=checkout.origin,
+        tree_name=checkout.tree_name,
+        git_repository_branch=checkout.git_repository_branch,
+        git_repository_url=checkout.git_repository_url,
+        git_commit_hash=checkout.git_commit_hash,
+    )
+
+
+def _derived_exists(checkout, rollup) -> list[bool]:
+    commit = {
+        "tree_name": checkout.tree_name,
+        "git_repository_url": checkout.git_repository_url,
+        "git_repository_branch": checkout.git_repository_branch,
+        "git_commit_hash": checkout.git_commit_hash,
+    }
+    return [
+        TreeCommitTimeline.objects.filter(origin=checkout.origin, **commit).exists(),
+        HardwareTreeSelector.objects.filter(**commit).exists(),
+        HardwareStatus.objects.filter(checkout_id=checkout.id).exists(),
+        LatestCheckout.objects.filter(checkout_id=checkout.id).exists(),
+        TreeListing.objects.filter(checkout_id=checkout.id).exists(),
+        ProcessedListingItems.objects.filter(checkout_id=checkout.id).exists(),
+        TreeTestsRollup.objects.filter(id=rollup.id).exists(),
+    ]
+
+
+@pytest.mark.django_db
+def test_derived_rows_of_pruned_checkouts_removed():
+    old_checkout = CheckoutFactory(
+        id="prune_derived_old",
+        tree_name="prune-old-tree",
+        git_commit_hash="prune_old_commit",
+        field_timestamp=_days_ago(30),
+    )
+    recent_checkout = CheckoutFactory(
+        id="prune_derived_recent",
+        tree_name="prune-recent-tree",
+        git_commit_hash="prune_recent_commit",
+        field_timestamp=_days_ago(1),
+    )
+    old_rollup = _create_derived_rows(old_checkout)
+    recent_rollup = _create_derived_rows(recent_checkout)
+
+    _prune(yes=True, derived=True, batch_size=1)
+
+    assert _derived_exists(old_checkout, old_rollup) == [False] * 7
+    assert _derived_exists(recent_checkout, recent_rollup) == [True] * 7
+
+
+@pytest.mark.django_db
+def test_derived_rollup_kept_when_commit_has_surviving_checkout():
+    """The rollup sums all checkouts of a commit, so it stays while one survives."""
+    old_checkout = CheckoutFactory(id="prune_rollup_old", field_timestamp=_days_ago(30))
+    CheckoutFactory(
+        id="prune_rollup_recent",
+        field_timestamp=_days_ago(1),
+        origin=old_checkout.origin,
+        tree_name=old_checkout.tree_name,
+        git_repository_branch=old_checkout.git_repository_branch,
+        git_repository_url=old_checkout.git_repository_url,
+        git_commit_hash=old_checkout.git_commit_hash,
+    )
+    rollup = _create_derived_rows(old_checkout)
+
+    _prune(yes=True, derived=True)
+
+    assert TreeTestsRollup.objects.filter(id=rollup.id).exists()
+    assert TreeCommitTimeline.objects.filter(
+        git_commit_hash=old_checkout.git_commit_hash
+    ).exists()
+    assert not HardwareStatus.objects.filter(checkout_id=old_checkout.id).exists()
+
+
+@pytest.mark.django_db
+def test_derived_selector_kept_when_commit_has_surviving_build_origin():
+    """Selectors are per build origin, so they stay while a surviving checkout of
+    the commit has builds of that origin."""
+    old_checkout = CheckoutFactory(
+        id="prune_selector_old", field_timestamp=_days_ago(30)
+    )
+    recent_checkout = CheckoutFactory(
+        id="prune_selector_recent",
+        field_timestamp=_days_ago(1),
+        origin=old_checkout.origin,
+        tree_name=old_checkout.tree_name,
+        git_repository_branch=old_checkout.git_repository_branch,
+        git_repository_url=old_checkout.git_repository_url,
+        git_commit_hash=old_checkout.git_commit_hash,
+        git_commit_name=old_checkout.git_commit_name,
+    )
+    BuildFactory(checkout=recent_checkout, origin="prune-selector-kept")
+    BuildFactory(
+        checkout=old_checkout,
+        origin="prune-selector-pruned",
+        field_timestamp=_days_ago(30),
+    )
+    update_hardware_tree_selectors(checkout_ids=[old_checkout.id, recent_checkout.id])
+
+    _prune(yes=True, derived=True)
+
+    selectors = HardwareTreeSelector.objects.filter(
+        git_commit_hash=old_checkout.git_commit_hash
+    )
+    assert [selector.origin for selector in selectors] == ["prune-selector-kept"]
+
+
+@pytest.mark.django_db
+def test_derived_recomputes_issues_of_pruned_rows():
+    """Without issue protection, the summaries and listing rows of the issues
+    linked to pruned rows no longer point to the pruned checkouts and trees."""
+    checkout = CheckoutFactory(field_timestamp=_days_ago(30))
+    build = BuildFactory(checkout=checkout, field_timestamp=_days_ago(30))
+    test = TestFactory(build=build, field_timestamp=_days_ago(30))
+    issue = IssueFactory(id="prune_derived_issue", version=1)
+    incidents = [
+        IncidentFactory(issue=issue, build=build, test=None),
+        IncidentFactory(issue=issue, build=None, test=test),
+    ]
+    aggregate_incidents(incidents)
+    aggregate_issue_listing([issue], incidents)
+    assert IssueListingEntry.objects.get(issue_id=issue.id).has_trees
+
+    output = _prune(yes=True, derived=True, skip_issue_protection=True)
+
+    assert "Issues linked to pruned rows to recompute: 1" in output
+    summary = IssueSeenSummary.objects.get(issue_id=issue.id)
+    assert summary.first_checkout_id is None
+    assert summary.last_checkout_id is None
+    assert not IssueSeenTree.objects.filter(issue_id=issue.id).exists()
+    listing = IssueListingEntry.objects.get(issue_id=issue.id)
+    assert not listing.has_trees
+    assert listing.incident_count == 2
+
+
+@pytest.mark.django_db
+def test_derived_dry_run_reports_without_deleting():
+    checkout = CheckoutFactory(id="prune_derived_dry", field_timestamp=_days_ago(30))
+    rollup = _create_derived_rows(checkout)
+
+    output = _prune(dry_run=True, derived=True)
+
+    assert "Derived rows of pruned checkouts" in output
+    for table in (
+        "tree_tests_rollup",
+        "tree_commit_timeline",
+        "hardware_tree_selectors",
+        "hardware_status",
+        "latest_checkout",
+        "tree_listing",
+        "processed_listing_items",
+    ):
+        assert table in output
+    assert _derived_exists(checkout, rollup) == [True] * 7
+
+
+@pytest.mark.django_db
+def test_derived_requires_checkouts():
+    with pytest.raises(CommandError, match="--derived"):
+        _prune(yes=True, derived=True, tables=["builds", "tests"])
+
+
+@pytest.fixture
+def partitioned_table():
+    """A table range-partitioned by _timestamp, with one partition fully before the
+    10 days cutoff and one spanning it, plus a snapshot of the doomed ids."""
+    old_upper = _days_ago(20)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "CREATE TABLE prune_partitioned (id TEXT, _timestamp TIMESTAMPTZ) "
+            "PARTITION BY RANGE (_timestamp)"
+        )
+        cursor.execute(
+            "CREATE TABLE prune_partitioned_old PARTITION OF prune_partitioned "
+            "FOR VALUES FROM (MINVALUE) TO (%s)",
+            [old_upper],
+        )
+        cursor.execute(
+            "CREATE TABLE prune_partitioned_boundary PARTITION OF prune_partitioned "
+            "FOR VALUES FROM (%s) TO (MAXVALUE)",
+            [old_upper],
+        )
+        cursor.executemany(
+            "INSERT INTO prune_partitioned (id, _timestamp) VALUES (%s, %s)",
+            [
+                ("old_1", _days_ago(30)),
+                ("old_2", _days_ago(25)),
+                ("boundary_old", _days_ago(15)),
+                ("boundary_recent", _days_ago(1)),
+            ],
+        )
+        cursor.execute(
+            "CREATE TEMP TABLE prune_partitioned_ids AS "
+            "SELECT id FROM prune_partitioned WHERE _timestamp < %s",
+            [_days_ago(10)],
+        )
+    return "prune_partitioned"
+
+
+@pytest.mark.django_db
+def test_partition_before_cutoff_is_dropped(partitioned_table):
+    """Only the partition fully before the cutoff is dropped; its ids leave the
+    snapshot so the boundary partition is handled by the batched delete."""
+    command = Command(stdout=StringIO())
+
+    with connection.cursor() as cursor:
+        droppable = command._find_droppable_partitions(
+            cursor, partitioned_table, "prune_partitioned_ids", _days_ago(10)
+        )
+        assert droppable == ["prune_partitioned_old"]
+
+        dropped = command._drop_partition(
+            cursor, partitioned_table, "prune_partitioned_old", "prune_partitioned_ids"
+        )
+        assert dropped == 2
+
+        cursor.execute("SELECT id FROM prune_partitioned_ids")
+        assert [row[0] for row in cursor.fetchall()] == ["boundary_old"]
+        cursor.execute("SELECT to_regclass('prune_partitioned_old')")
+        assert cursor.fetchone()[0] is None
+
+
+@pytest.mark.django_db
+def test_partition_with_kept_rows_is_not_dropped(partitioned_table):
+    """A partition holding a row missing from the snapshot (e.g. one protected by an
+    incident) is left for the batched delete."""
+    command = Command(stdout=StringIO())
+
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM prune_partitioned_ids WHERE id = 'old_1'")
+
+        droppable = command._find_droppable_partitions(
+            cursor, partitioned_table, "prune_partitioned_ids", _days_ago(10)
+        )
+
+    assert droppable == []
+
+
+@pytest.mark.django_db
+def test_unpartitioned_table_has_no_partitions():
+    command = Command(stdout=StringIO())
+
+    with connection.cursor() as cursor:
+        assert command._find_partitions_before(cursor, "tests", _days_ago(10)) == []
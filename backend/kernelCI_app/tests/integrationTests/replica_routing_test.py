@@ -0,0 +1,62 @@
+"""Routes the reads of a view through the replica middleware, using the test
+database as its own replica."""
+
+import pytest
+from prometheus_client import REGISTRY
+from rest_framework.test import APIRequestFactory
+
+from kernelCI_app.middleware.replicaRoutingMiddleware import ReplicaRoutingMiddleware
+from kernelCI_app.routers import replicas
+from kernelCI_app.routers.replicas import (
+    _get_replica_lag,
+    get_read_database,
+    is_replica_healthy,
+)
+from kernelCI_app.tests.factories import CheckoutFactory
+from kernelCI_app.views.originsView import OriginsView
+
+request_factory = APIRequestFactory()
+
+
+def _routed_requests(database: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "kernelci_db_read_routing_total", {"database": database}
+        )
+        or 0
+    )
+
+
+@pytest.fixture
+def replica_settings(settings):
+    settings.DATABASE_REPLICAS = ["default"]
+    settings.REPLICA_VIEWS = ["originsView"]
+    replicas._replica_health.clear()
+    yield settings
+    replicas._replica_health.clear()
+
+
+@pytest.mark.django_db
+def test_primary_has_no_replication_lag(replica_settings):
+    assert _get_replica_lag("default") is None
+    assert is_replica_healthy("default") is True
+
+
+@pytest.mark.django_db
+def test_view_reads_are_routed(replica_settings):
+    CheckoutFactory(id="replica_routing_checkout", origin="replica_routing_origin")
+    read_databases = []
+
+    def get_response(request):
+        read_databases.append(get_read_database())
+        return OriginsView.as_view()(request)
+
+    routed_before = _routed_requests("default")
+    response = ReplicaRoutingMiddleware(get_response)(
+        request_factory.get("/api/origins/")
+    )
+
+    assert response.status_code == 200
+    assert "replica_routing_origin" in response.data["checkout_origins"]
+    assert read_databases == ["default"]
+    assert _routed_requests("default") == routed_before + 1
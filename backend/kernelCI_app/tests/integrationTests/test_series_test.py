@@ -0,0 +1,175 @@
+"""Parity tests between the test_series table and the raw test status history."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_tests,
+)
+from kernelCI_app.management.commands.process_pending_aggregations import (
+    Command as ProcessPendingCommand,
+)
+from kernelCI_app.models import Tests, TestSeries
+from kernelCI_app.queries.test import (
+    _get_test_status_history_from_tests,
+    get_test_status_history,
+)
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory, TestFactory
+
+ORIGIN = "test-series-origin"
+GIT_URL = "https://git.example.org/test-series.git"
+GIT_BRANCH = "master"
+
+
+def _hours_ago(hours: int):
+    return timezone.now() - timezone.timedelta(hours=hours)
+
+
+def _create_history() -> list[Tests]:
+    tests = []
+    for index, hours in enumerate([5, 4, 3, 2]):
+        checkout = CheckoutFactory(
+            id=f"test_series_checkout_{index}",
+            origin=ORIGIN,
+            git_repository_url=GIT_URL,
+            git_repository_branch=GIT_BRANCH,
+            git_commit_hash=f"test_series_hash_{index}",
+            start_time=_hours_ago(hours),
+        )
+        build = BuildFactory(
+            id=f"test_series_build_{index}",
+            checkout=checkout,
+            origin=ORIGIN,
+            config_name="defconfig",
+        )
+        # Runs with another platform or config are in other series
+        other_build = BuildFactory(
+            id=f"test_series_other_build_{index}",
+            checkout=checkout,
+            origin=ORIGIN,
+            config_name="tinyconfig",
+        )
+        test_kwargs = {
+            "origin": ORIGIN,
+            "path": "kselftest.cpu",
+            "start_time": _hours_ago(hours),
+            "field_timestamp": _hours_ago(hours),
+        }
+        tests.append(
+            TestFactory(
+                id=f"test_series_test_{index}",
+                build=build,
+                status=["PASS", "FAIL", None, "PASS"][index],
+                environment_misc={"platform": "board-a"},
+                **test_kwargs,
+            )
+        )
+        TestFactory(
+            id=f"test_series_other_platform_{index}",
+            build=build,
+            status="PASS",
+            environment_misc={"platform": "board-b"},
+            **test_kwargs,
+        )
+        TestFactory(
+            id=f"test_series_no_platform_{index}",
+            build=build,
+            status="FAIL",
+            environment_misc=None,
+            environment_compatible=None,
+            **test_kwargs,
+        )
+        TestFactory(
+            id=f"test_series_other_config_{index}",
+            build=other_build,
+            status="FAIL",
+            environment_misc={"platform": "board-a"},
+            **test_kwargs,
+        )
+    return tests
+
+
+def _history_params(test: Tests, platform, use_start_time: bool) -> dict:
+    return {
+        "path": test.path,
+        "origin": ORIGIN,
+        "git_repository_url": GIT_URL,
+        "git_repository_branch": GIT_BRANCH,
+        "platform": platform,
+        "test_start_time": test.start_time if use_start_time else None,
+        "config_name": "defconfig",
+        "field_timestamp": test.field_timestamp,
+        "group_size": 3,
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("platform", ["board-a", None])
+@pytest.mark.parametrize("use_start_time", [True, False])
+def test_series_history_matches_raw_history(platform, use_start_time):
+    tests = _create_history()
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    ProcessPendingCommand().process_pending_batch(batch_size=1000)
+
+    assert TestSeries.objects.filter(test_id=tests[2].id).exists()
+
+    params = _history_params(tests[2], platform, use_start_time)
+    series_rows = get_test_status_history(**params)
+    raw_rows = _get_test_status_history_from_tests(
+        params=params,
+        platform=platform,
+        test_start_time=params["test_start_time"],
+        field_timestamp=params["field_timestamp"],
+    )
+
+    assert len(series_rows) == 3
+    assert series_rows == raw_rows
+
+
+@pytest.mark.django_db
+def test_populate_command_copies_tests():
+    _create_history()
+
+    call_command("populate_test_series", stdout=StringIO())
+
+    series_ids = set(
+        TestSeries.objects.filter(
+            test_id__in=[f"test_series_test_{index}" for index in range(4)]
+        ).values_list("series_id", flat=True)
+    )
+    assert len(series_ids) == 1
+    assert (
+        TestSeries.objects.filter(checkout_id__startswith="test_series").count() == 16
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("use_start_time", [True, False])
+def test_series_history_includes_pending_tests(use_start_time):
+    tests = _create_history()
+    pending_ids = [tests[2].id, tests[3].id]
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN).exclude(id__in=pending_ids))
+    ProcessPendingCommand().process_pending_batch(batch_size=1000)
+    # The newest tests of the series, including the one of the history,
+    # weren't added to it yet
+    aggregate_tests(Tests.objects.filter(id__in=pending_ids))
+
+    assert not TestSeries.objects.filter(test_id__in=pending_ids).exists()
+
+    params = _history_params(tests[3], "board-a", use_start_time)
+    series_rows = get_test_status_history(**params)
+
+    assert [row["id"] for row in series_rows] == [
+        tests[3].id,
+        tests[2].id,
+        tests[1].id,
+    ]
+    assert series_rows == _get_test_status_history_from_tests(
+        params=params,
+        platform="board-a",
+        test_start_time=params["test_start_time"],
+        field_timestamp=params["field_timestamp"],
+    )
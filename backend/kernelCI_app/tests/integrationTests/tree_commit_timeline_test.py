@@ -0,0 +1,122 @@
+"""Integration tests for the tree_commit_timeline table and the hardware commit history."""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_checkouts_and_pendings,
+)
+from kernelCI_app.models import Checkouts, TreeCommitTimeline
+from kernelCI_app.queries.hardware import get_hardware_commit_history
+from kernelCI_app.tests.factories import CheckoutFactory
+from kernelCI_app.typeModels.hardwareDetails import CommitHead
+
+ORIGIN = "commit-timeline-origin"
+TREE_NAME = "commit-timeline-tree"
+GIT_URL = "https://git.example.org/commit-timeline.git"
+GIT_BRANCH = "master"
+
+
+def _hours_ago(hours: int):
+    return timezone.now() - timezone.timedelta(hours=hours)
+
+
+def _create_checkout(checkout_id: str, git_commit_hash: str, hours: int, **kwargs):
+    return CheckoutFactory(
+        id=checkout_id,
+        origin=ORIGIN,
+        tree_name=kwargs.pop("tree_name", TREE_NAME),
+        git_repository_url=GIT_URL,
+        git_repository_branch=GIT_BRANCH,
+        git_commit_hash=git_commit_hash,
+        git_commit_name=kwargs.pop("git_commit_name", git_commit_hash),
+        git_commit_tags=kwargs.pop("git_commit_tags", []),
+        start_time=_hours_ago(hours),
+    )
+
+
+def _create_timeline() -> None:
+    _create_checkout("timeline_too_old", "timeline_hash_too_old", 100)
+    _create_checkout(
+        "timeline_first", "timeline_hash_first", 10, git_commit_tags=["v1"]
+    )
+    # A later checkout of the same commit doesn't move it in the timeline
+    _create_checkout(
+        "timeline_first_retry",
+        "timeline_hash_first",
+        3,
+        git_commit_name="retried",
+        git_commit_tags=["v1", "v1-retry"],
+    )
+    _create_checkout("timeline_head", "timeline_hash_head", 5)
+    _create_checkout("timeline_after_head", "timeline_hash_after_head", 2)
+    _create_checkout(
+        "timeline_other_tree", "timeline_hash_other_tree", 6, tree_name="other"
+    )
+
+
+def _history_hashes(end_hours: int = 0) -> list[tuple]:
+    rows = get_hardware_commit_history(
+        origin=ORIGIN,
+        start_date=_hours_ago(24),
+        end_date=_hours_ago(end_hours),
+        commit_heads=[
+            CommitHead(
+                treeName=TREE_NAME,
+                repositoryUrl=GIT_URL,
+                branch=GIT_BRANCH,
+                commitHash="timeline_hash_head",
+            )
+        ],
+    )
+    return sorted((row[5], row[4], tuple(row[3] or [])) for row in rows)
+
+
+@pytest.mark.django_db
+def test_commit_history_lists_tree_commits_before_head():
+    _create_timeline()
+    # Checkouts are ingested in batches, in any order
+    checkouts = list(Checkouts.objects.filter(origin=ORIGIN).order_by("-start_time"))
+    aggregate_checkouts_and_pendings(
+        checkouts_instances=checkouts[:3], tests_instances=[], build_instances=[]
+    )
+    aggregate_checkouts_and_pendings(
+        checkouts_instances=checkouts[3:], tests_instances=[], build_instances=[]
+    )
+
+    assert _history_hashes() == [
+        ("timeline_hash_first", "timeline_hash_first", ("v1",)),
+        ("timeline_hash_head", "timeline_hash_head", ()),
+    ]
+    assert _history_hashes(end_hours=7) == [
+        ("timeline_hash_first", "timeline_hash_first", ("v1",)),
+    ]
+
+    first_commit = TreeCommitTimeline.objects.get(
+        origin=ORIGIN, git_commit_hash="timeline_hash_first"
+    )
+    assert (
+        first_commit.first_start_time
+        == Checkouts.objects.get(id="timeline_first").start_time
+    )
+    assert (
+        first_commit.last_start_time
+        == Checkouts.objects.get(id="timeline_first_retry").start_time
+    )
+
+
+@pytest.mark.django_db
+def test_populate_command_recomputes_timeline():
+    _create_timeline()
+
+    call_command("populate_tree_commit_timeline", stdout=StringIO())
+    call_command("populate_tree_commit_timeline", stdout=StringIO())
+
+    assert TreeCommitTimeline.objects.filter(origin=ORIGIN).count() == 5
+    assert [hash for hash, _, _ in _history_hashes()] == [
+        "timeline_hash_first",
+        "timeline_hash_head",
+    ]
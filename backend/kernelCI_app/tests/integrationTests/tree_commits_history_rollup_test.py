@@ -0,0 +1,153 @@
+"""Parity tests between the tree_tests_rollup and the raw tree commits history."""
+
+import pytest
+from django.utils import timezone
+
+from kernelCI_app.helpers.filters import FilterParams
+from kernelCI_app.management.commands.helpers.aggregation_helpers import (
+    aggregate_tests,
+)
+from kernelCI_app.management.commands.process_pending_aggregations import (
+    Command as ProcessPendingCommand,
+)
+from kernelCI_app.models import StatusChoices, Tests
+from kernelCI_app.queries.tree import (
+    get_tree_commit_history_from_rollup,
+    get_tree_commit_history_hashes_aggregated,
+)
+from kernelCI_app.tests.factories import (
+    BuildFactory,
+    CheckoutFactory,
+    TestFactory,
+)
+from kernelCI_app.views.treeCommitsHistory import TreeCommitsHistoryList
+
+ORIGIN = "commits-history-rollup-origin"
+TREE_NAME = "commits-history-rollup-tree"
+GIT_URL = "https://git.example.org/commits-history-rollup.git"
+GIT_BRANCH = "master"
+
+
+def _hours_ago(hours: int):
+    return timezone.now() - timezone.timedelta(hours=hours)
+
+
+def _create_test(build, test_id, status, path="kselftest.cpu"):
+    return TestFactory(
+        id=test_id,
+        build=build,
+        origin=ORIGIN,
+        status=status,
+        path=path,
+        start_time=build.start_time,
+        environment_misc={"platform": "commits-history-board"},
+        misc={"runtime": "lab-a"},
+    )
+
+
+def _create_data() -> list[str]:
+    checkout_kwargs = {
+        "origin": ORIGIN,
+        "tree_name": TREE_NAME,
+        "git_repository_url": GIT_URL,
+        "git_repository_branch": GIT_BRANCH,
+        "git_commit_name": "commits-history-rollup",
+    }
+    first_checkout = CheckoutFactory(
+        id="commits_history_rollup_checkout_0",
+        git_commit_hash="commits_history_rollup_hash_0",
+        git_commit_tags=["v1"],
+        start_time=_hours_ago(3),
+        **checkout_kwargs,
+    )
+    # A second checkout of the same commit is summed in the same rollup rows
+    retry_checkout = CheckoutFactory(
+        id="commits_history_rollup_checkout_0_retry",
+        git_commit_hash="commits_history_rollup_hash_0",
+        git_commit_tags=["v1"],
+        start_time=_hours_ago(2),
+        **checkout_kwargs,
+    )
+    other_checkout = CheckoutFactory(
+        id="commits_history_rollup_checkout_1",
+        git_commit_hash="commits_history_rollup_hash_1",
+        git_commit_tags=[],
+        start_time=_hours_ago(1),
+        **checkout_kwargs,
+    )
+
+    build_kwargs = {"origin": ORIGIN, "misc": {"lab": "lab-a"}}
+    passing_build = BuildFactory(
+        id="commits_history_rollup_build_pass",
+        checkout=first_checkout,
+        status=StatusChoices.PASS,
+        architecture="x86_64",
+        compiler="gcc-12",
+        **build_kwargs,
+    )
+    retry_build = BuildFactory(
+        id="commits_history_rollup_build_retry",
+        checkout=retry_checkout,
+        status=StatusChoices.FAIL,
+        architecture="arm64",
+        compiler="clang-17",
+        **build_kwargs,
+    )
+    other_build = BuildFactory(
+        id="commits_history_rollup_build_other",
+        checkout=other_checkout,
+        status=StatusChoices.PASS,
+        config_name=None,
+        **build_kwargs,
+    )
+
+    _create_test(passing_build, "commits_history_rollup_boot_pass", "PASS", "boot")
+    _create_test(passing_build, "commits_history_rollup_boot_fail", "FAIL", "boot.nfs")
+    _create_test(passing_build, "commits_history_rollup_test_pass", "PASS")
+    _create_test(passing_build, "commits_history_rollup_test_null", None)
+    _create_test(retry_build, "commits_history_rollup_test_fail", "FAIL")
+    _create_test(retry_build, "commits_history_rollup_test_skip", "SKIP")
+    _create_test(other_build, "commits_history_rollup_test_error", "ERROR")
+
+    return [first_checkout.git_commit_hash, other_checkout.git_commit_hash]
+
+
+def _aggregate(rows: list[dict], commit_hashes: list[str]):
+    view = TreeCommitsHistoryList()
+    view.filterParams = FilterParams({"filter": {}}, process_body=True)
+    results = view.aggregate_commits(commit_hashes, rows)
+    summary = {}
+    for commit_hash, data in results.items():
+        # Commits without rows default to the current time as their start time
+        if not data.git_commit_name:
+            summary[commit_hash] = None
+            continue
+        dumped = data.model_dump()
+        dumped["git_commit_tags"] = sorted(dumped["git_commit_tags"])
+        summary[commit_hash] = dumped
+    return summary
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "include_types", [None, ["builds"], ["boots"], ["tests"], ["boots", "tests"]]
+)
+def test_rollup_commit_history_matches_raw_commit_history(include_types):
+    commit_hashes = _create_data()
+    aggregate_tests(Tests.objects.filter(origin=ORIGIN))
+    ProcessPendingCommand().process_pending_batch(batch_size=1000)
+
+    query_params = {
+        "commit_hashes": commit_hashes,
+        "origin": ORIGIN,
+        "git_url": GIT_URL,
+        "git_branch": GIT_BRANCH,
+        "tree_name": TREE_NAME,
+        "include_types": include_types,
+    }
+
+    raw_rows = get_tree_commit_history_hashes_aggregated(**query_params)
+    rollup_rows = get_tree_commit_history_from_rollup(**query_params)
+
+    assert raw_rows
+    assert _aggregate(rollup_rows, commit_hashes) == _aggregate(raw_rows, commit_hashes)
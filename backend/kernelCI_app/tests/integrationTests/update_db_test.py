@@ -0,0 +1,140 @@
+"""Integration tests for the update_db management command."""
+
+import tarfile
+from io import StringIO
+
+import pytest
+import zstandard
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from kernelCI_app.models import Builds, Checkouts, Tests
+from kernelCI_app.tests.factories import BuildFactory, CheckoutFactory, TestFactory
+
+ORIGIN = "update-db-origin"
+
+
+def _snapshot(filepath, **kwargs) -> None:
+    call_command(
+        "update_db",
+        "snapshot",
+        "--start-interval=2 days",
+        f"--filepath={filepath}",
+        f"--origins={ORIGIN}",
+        "--workers=1",
+        stdout=StringIO(),
+        **kwargs,
+    )
+
+
+def _restore(filepath) -> None:
+    call_command(
+        "update_db",
+        "restore",
+        f"--filepath={filepath}",
+        "--workers=1",
+        stdout=StringIO(),
+    )
+
+
+def _archive_members(filepath) -> list[str]:
+    with (
+        open(filepath, "rb") as raw_file,
+        zstandard.ZstdDecompressor().stream_reader(raw_file) as stream,
+        tarfile.open(fileobj=stream, mode="r|") as archive,
+    ):
+        return [member.name for member in archive]
+
+
+def _create_tree():
+    now = timezone.now()
+    checkout = CheckoutFactory(
+        id="update_db_checkout",
+        origin=ORIGIN,
+        field_timestamp=now,
+        git_commit_tags=["v6.1", "tag,with,commas"],
+        misc={"key": "value", "nested": {"list": [1, 2]}},
+        comment="",
+    )
+    build = BuildFactory(
+        id="update_db_build", checkout=checkout, origin=ORIGIN, field_timestamp=now
+    )
+    test = TestFactory(
+        id="update_db_test",
+        build=build,
+        origin=ORIGIN,
+        field_timestamp=now,
+        environment_compatible=["board-a", "board-b"],
+        environment_misc=None,
+        log_excerpt='line "one"\nline two',
+    )
+    return checkout, build, test
+
+
+@pytest.mark.django_db
+def test_snapshot_restore_roundtrip(tmp_path):
+    """Rows survive a COPY snapshot and restore with JSON, arrays, NULLs and
+    empty strings intact."""
+    checkout, build, test = _create_tree()
+    filepath = tmp_path / "snapshot.tar.zst"
+
+    _snapshot(filepath)
+
+    Tests.objects.filter(id=test.id).delete()
+    Builds.objects.filter(id=build.id).delete()
+    Checkouts.objects.filter(id=checkout.id).delete()
+
+    _restore(filepath)
+
+    restored_checkout = Checkouts.objects.get(id=checkout.id)
+    assert restored_checkout.git_commit_tags == ["v6.1", "tag,with,commas"]
+    assert restored_checkout.misc == {"key": "value", "nested": {"list": [1, 2]}}
+    assert restored_checkout.comment == ""
+    assert restored_checkout.field_timestamp == checkout.field_timestamp
+    assert Builds.objects.get(id=build.id).checkout_id == checkout.id
+
+    restored_test = Tests.objects.get(id=test.id)
+    assert restored_test.environment_compatible == ["board-a", "board-b"]
+    assert restored_test.environment_misc is None
+    assert restored_test.log_excerpt == 'line "one"\nline two'
+    assert restored_test.start_time == test.start_time
+
+
+@pytest.mark.django_db
+def test_restore_keeps_existing_rows(tmp_path):
+    """Rows already in the database are left untouched and restoring twice is harmless."""
+    checkout, _, _ = _create_tree()
+    filepath = tmp_path / "snapshot.tar.zst"
+
+    _snapshot(filepath)
+    Checkouts.objects.filter(id=checkout.id).update(comment="changed")
+
+    _restore(filepath)
+    _restore(filepath)
+
+    assert Checkouts.objects.get(id=checkout.id).comment == "changed"
+    assert Checkouts.objects.filter(origin=ORIGIN).count() == 1
+    assert Tests.objects.filter(origin=ORIGIN).count() == 1
+
+
+@pytest.mark.django_db
+def test_snapshot_single_table(tmp_path):
+    """--table limits the archive to that table."""
+    _create_tree()
+    filepath = tmp_path / "snapshot"
+
+    _snapshot(filepath, table="builds")
+
+    assert _archive_members(tmp_path / "snapshot.tar.zst") == ["builds.csv"]
+
+
+def test_rejects_invalid_workers(tmp_path):
+    with pytest.raises(CommandError, match="--workers"):
+        call_command(
+            "update_db",
+            "restore",
+            f"--filepath={tmp_path / 'snapshot.tar.zst'}",
+            "--workers=0",
+            stdout=StringIO(),
+        )
@@ -0,0 +1,89 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.test import RequestFactory
+from django.views.decorators.cache import cache_page
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.middleware.precompressedCacheMiddleware import (
+    precompressed_cache_page,
+)
+
+ROWS_COUNT = 10000
+START_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# About 4 MB of JSON, as large tree details responses
+ROWS = [
+    {
+        "id": f"maestro:test{i}",
+        "origin": "maestro",
+        "status": "FAIL" if i % 3 else "PASS",
+        "duration": i % 700,
+        "path": "kselftest.cpufreq",
+        "start_time": START_TIME + timedelta(seconds=i),
+        "environment_compatible": ["rockchip,rk3399-gru-kevin", "google,kevin"],
+        "log_url": f"https://storage.kernelci.org/maestro/test{i}/log.txt.gz",
+        "environment_misc": {"platform": "rk3399-gru-kevin"},
+        "lab": "lab-collabora",
+    }
+    for i in range(ROWS_COUNT)
+]
+
+
+class RowsView(APIView):
+    def get(self, request):
+        return Response({"tests": ROWS})
+
+
+CACHE_DECORATORS = {
+    "cache_page": cache_page,
+    "precompressed_cache_page": precompressed_cache_page,
+}
+
+
+def _server_view(cache_decorator):
+    """The cached view behind GZipMiddleware, rendering the responses as the
+    request handler does"""
+    cached_view = cache_decorator(60)(RowsView.as_view())
+
+    def get_response(request):
+        response = cached_view(request)
+        if hasattr(response, "render"):
+            response = response.render()
+        return response
+
+    return GZipMiddleware(get_response)
+
+
+@pytest.mark.benchmark(group="cache-hits")
+@pytest.mark.parametrize("cache_decorator", CACHE_DECORATORS)
+def test_cache_hit_perf(benchmark, cache_decorator):
+    """Benchmark serving a large cached response to a client accepting gzip."""
+    cache.clear()
+    server_view = _server_view(CACHE_DECORATORS[cache_decorator])
+    request_factory = RequestFactory()
+
+    def request_rows():
+        return server_view(
+            request_factory.get(
+                "/api/tree/rows",
+                HTTP_ACCEPT="application/json",
+                HTTP_ACCEPT_ENCODING="gzip, deflate, br, zstd",
+            )
+        )
+
+    # Fills the cache, the benchmark only measures the cache hits
+    request_rows()
+
+    cpu_start = time.process_time()
+    response = benchmark.pedantic(request_rows, rounds=20, iterations=1)
+    cpu_time = time.process_time() - cpu_start
+
+    benchmark.extra_info["content_encoding"] = response["Content-Encoding"]
+    benchmark.extra_info["bytes"] = len(response.content)
+    benchmark.extra_info["cpu_ms_per_request"] = f"{cpu_time / 20 * 1000:.2f}"
+    cache.clear()
@@ -0,0 +1,124 @@
+import pytest
+from django.http import QueryDict
+from django.test import RequestFactory
+
+from kernelCI_app.helpers.filters import FilterParams
+
+ROWS_COUNT = 20000
+
+# Query strings of the filters that are compared, from none to most of them
+FILTER_QUERIES = {
+    "unfiltered": "",
+    "status": "filter_test.status=FAIL&filter_build.status=FAIL",
+    "all": (
+        "filter_test.status=FAIL&filter_test.status=PASS"
+        "&filter_test.duration_[gte]=1&filter_test.duration_[lte]=500"
+        "&filter_test.path=kselftest&filter_test.platform=rk3399"
+        "&filter_test.issue=maestro:issue,1&filter_test.origin=maestro"
+        "&filter_build.status=FAIL&filter_duration_[lte]=900"
+        "&filter_build.issue=maestro:issue,1&filter_build.origin=maestro"
+        "&filter_architecture=arm64&filter_compiler=gcc-12"
+        "&filter_config_name=defconfig&filter_test.hardware=rk3399"
+    ),
+}
+
+TEST_ROWS = [
+    {
+        "path": "kselftest.cpufreq" if i % 2 else "boot",
+        "status": "FAIL" if i % 3 else "PASS",
+        "duration": i % 700,
+        "issue_id": "maestro:issue" if i % 5 else None,
+        "issue_version": 1,
+        "incident_test_id": f"maestro:test{i}",
+        "platform": "rk3399" if i % 4 else "juno",
+        "origin": "maestro",
+    }
+    for i in range(ROWS_COUNT)
+]
+
+BUILD_ROWS = [
+    {
+        "duration": i % 1200,
+        "build_status": "FAIL" if i % 3 else "PASS",
+        "issue_id": "maestro:issue" if i % 5 else None,
+        "issue_version": 1,
+        "incident_test_id": None,
+        "build_origin": "maestro",
+    }
+    for i in range(ROWS_COUNT)
+]
+
+RECORD_ROWS = [
+    {
+        "hardwares": ["rk3399" if i % 4 else "juno"],
+        "architecture": "arm64" if i % 2 else "x86_64",
+        "compiler": "gcc-12",
+        "config_name": "defconfig",
+        "lab": "lab-collabora",
+    }
+    for i in range(ROWS_COUNT)
+]
+
+
+def _filter_params(filters: str) -> FilterParams:
+    request = RequestFactory().get("/")
+    request.GET = QueryDict(filters)
+    return FilterParams(request)
+
+
+def _count_filtered_out(predicate, rows: list[dict]) -> int:
+    return sum(1 for row in rows if predicate(**row))
+
+
+@pytest.mark.benchmark(group="filter-predicates-tests")
+@pytest.mark.parametrize("filters", FILTER_QUERIES)
+def test_test_predicate_perf(benchmark, filters):
+    """Benchmark filtering test rows, compiling the filters once per request."""
+
+    def filter_rows():
+        return _count_filtered_out(
+            _filter_params(FILTER_QUERIES[filters]).test_predicate, TEST_ROWS
+        )
+
+    benchmark.pedantic(filter_rows, rounds=10, iterations=1)
+
+    benchmark.extra_info["rows"] = ROWS_COUNT
+    benchmark.extra_info["rows_per_second"] = (
+        f"{ROWS_COUNT / benchmark.stats.stats.mean:.0f}"
+    )
+
+
+@pytest.mark.benchmark(group="filter-predicates-builds")
+@pytest.mark.parametrize("filters", FILTER_QUERIES)
+def test_build_predicate_perf(benchmark, filters):
+    """Benchmark filtering build rows, compiling the filters once per request."""
+
+    def filter_rows():
+        return _count_filtered_out(
+            _filter_params(FILTER_QUERIES[filters]).build_predicate, BUILD_ROWS
+        )
+
+    benchmark.pedantic(filter_rows, rounds=10, iterations=1)
+
+    benchmark.extra_info["rows"] = ROWS_COUNT
+    benchmark.extra_info["rows_per_second"] = (
+        f"{ROWS_COUNT / benchmark.stats.stats.mean:.0f}"
+    )
+
+
+@pytest.mark.benchmark(group="filter-predicates-records")
+@pytest.mark.parametrize("filters", FILTER_QUERIES)
+def test_record_predicate_perf(benchmark, filters):
+    """Benchmark filtering rows by their build and environment."""
+
+    def filter_rows():
+        return _count_filtered_out(
+            _filter_params(FILTER_QUERIES[filters]).record_predicate, RECORD_ROWS
+        )
+
+    benchmark.pedantic(filter_rows, rounds=10, iterations=1)
+
+    benchmark.extra_info["rows"] = ROWS_COUNT
+    benchmark.extra_info["rows_per_second"] = (
+        f"{ROWS_COUNT / benchmark.stats.stats.mean:.0f}"
+    )
@@ -8,7 +8,14 @@ from unittest.mock import patch
 
 import kcidb_io
 import pytest
+from django.utils import timezone
 
+from kernelCI_app.management.commands.helpers.ingest_records import (
+    COLUMN_PLANS,
+    flatten_dict_specific,
+    make_record,
+    record_to_params,
+)
 from kernelCI_app.management.commands.helpers.kcidbng_ingester import (
     MAP_TABLENAMES_TO_COUNTER,
     SubmissionFileMetadata,
@@ -17,8 +24,9 @@ from kernelCI_app.management.commands.helpers.kcidbng_ingester import (
     prepare_file_data,
 )
 from kernelCI_app.management.commands.helpers.process_submissions import (
-    build_instances_from_submission,
+    build_records_from_submission,
 )
+from kernelCI_app.typeModels.modelTypes import MODEL_MAP
 
 trees_names = {
     "mainline": "https://git.kernel.org/pub/scm/linux/kernel/git/torvalds/linux.git",
@@ -264,7 +272,7 @@ def _prepare_buffers(
         if not data:
             continue
 
-        instances = build_instances_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
+        instances = build_records_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
 
         objects_buffers["issues"].extend(instances["issues"])
         objects_buffers["checkouts"].extend(instances["checkouts"])
@@ -369,13 +377,13 @@ def test_build_instances_perf(benchmark, cleanup_submission_files, file_subset):
     # Calculate total items to be processed
     total_items = 0
     for data in data_list:
-        instances = build_instances_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
+        instances = build_records_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
         for key in instances:
             total_items += len(instances[key])
 
     def run_build_instances(data_list):
         for data in data_list:
-            build_instances_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
+            build_records_from_submission(data, MAP_TABLENAMES_TO_COUNTER)
 
     benchmark.pedantic(
         run_build_instances,
@@ -389,3 +397,82 @@ def test_build_instances_perf(benchmark, cleanup_submission_files, file_subset):
     benchmark.extra_info["items_processed"] = total_items
     benchmark.extra_info["file_subset"] = file_subset
     benchmark.extra_info["items_per_second"] = f"{items_per_second:.2f}"
+
+
+def _model_instance_rows(data: dict[str, Any]) -> list[tuple]:
+    """Insert parameters built from Django model instances, as the ingester did
+    before the ingest records. Kept as the baseline of the records benchmark."""
+    rows = []
+    for table_name, model in MODEL_MAP.items():
+        plan = COLUMN_PLANS[table_name]
+        attnames = {field.attname for field in model._meta.concrete_fields}
+        for item in data.get(table_name) or []:
+            flattened = flatten_dict_specific(item, plan.flattened_fields)
+            instance = model(**{k: v for k, v in flattened.items() if k in attnames})
+            instance.field_timestamp = timezone.now()
+
+            values = []
+            for field in plan.columns:
+                value = getattr(instance, field)
+                model_field = instance._meta.get_field(field)
+                if model_field.get_internal_type() == "JSONField" and value is not None:
+                    value = json.dumps(value)
+                values.append(value)
+            rows.append(tuple(values))
+    return rows
+
+
+def _record_rows(data: dict[str, Any]) -> list[tuple]:
+    rows = []
+    timestamp = timezone.now()
+    for table_name in MODEL_MAP:
+        plan = COLUMN_PLANS[table_name]
+        for item in data.get(table_name) or []:
+            record = make_record(table_name, item, timestamp=timestamp)
+            rows.append(record_to_params(plan, record))
+    return rows
+
+
+@pytest.mark.benchmark(group="ingest-rows")
+@pytest.mark.parametrize("file_subset", FILE_SUBSETS)
+@pytest.mark.parametrize(
+    "build_rows", [_record_rows, _model_instance_rows], ids=["records", "models"]
+)
+def test_ingest_rows_perf(benchmark, cleanup_submission_files, file_subset, build_rows):  # noqa: ARG001
+    """Benchmark turning submissions into insert parameters, with the ingest
+    records against the model instances they replaced."""
+    all_files = _load_submission_files(SUBMISSIONS_DIR)
+    files = _get_file_subset(all_files, file_subset)
+
+    assert len(files) > 0, "No submissions found"
+
+    data_list = []
+    for file_path in files:
+        file_metadata: SubmissionFileMetadata = {
+            "path": file_path,
+            "name": os.path.basename(file_path),
+            "size": os.path.getsize(file_path),
+        }
+
+        data, _ = prepare_file_data(file_metadata, trees_names)
+        if data:
+            data_list.append(data)
+
+    total_rows = sum(len(build_rows(data)) for data in data_list)
+
+    def run_build_rows(data_list):
+        for data in data_list:
+            build_rows(data)
+
+    benchmark.pedantic(
+        run_build_rows,
+        args=(data_list,),
+        rounds=5,
+        iterations=1,
+    )
+
+    rows_per_second = total_rows / benchmark.stats.stats.mean
+
+    benchmark.extra_info["rows_processed"] = total_rows
+    benchmark.extra_info["file_subset"] = file_subset
+    benchmark.extra_info["rows_per_second"] = f"{rows_per_second:.2f}"
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from kernelCI_app.helpers.hardwareDetails import generate_test_summary_typed
+from kernelCI_app.renderers.jsonRenderer import FastJSONRenderer
+from kernelCI_app.typeModels.commonDetails import (
+    BuildSummary,
+    DetailsFilters,
+    GlobalFilters,
+    LocalFilters,
+    Summary,
+)
+from kernelCI_app.typeModels.treeDetails import TreeCommon, TreeDetailsFullResponse
+
+BUILDS_COUNT = 2000
+BOOTS_COUNT = 5000
+TESTS_COUNT = 20000
+
+START_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _history_item(i: int, path: str) -> dict:
+    return {
+        "id": f"maestro:test{i}",
+        "origin": "maestro",
+        "status": "FAIL" if i % 3 else "PASS",
+        "duration": i % 700,
+        "path": path,
+        "start_time": START_TIME + timedelta(seconds=i),
+        "environment_compatible": ["rockchip,rk3399-gru-kevin", "google,kevin"],
+        "config": "defconfig",
+        "log_url": f"https://storage.kernelci.org/maestro/test{i}/log.txt.gz",
+        "architecture": "arm64",
+        "compiler": "gcc-12",
+        "environment_misc": {"platform": "rk3399-gru-kevin"},
+        "lab": "lab-collabora",
+    }
+
+
+def _build_item(i: int) -> dict:
+    return {
+        "id": f"maestro:build{i}",
+        "origin": "maestro",
+        "architecture": "arm64",
+        "config_name": "defconfig",
+        "misc": {"platform": "rk3399-gru-kevin"},
+        "config_url": f"https://storage.kernelci.org/maestro/build{i}/.config",
+        "compiler": "gcc-12",
+        "status": "FAIL" if i % 3 else "PASS",
+        "duration": i % 1200,
+        "log_url": f"https://storage.kernelci.org/maestro/build{i}/build.log",
+        "start_time": START_TIME + timedelta(seconds=i),
+        "git_repository_url": "https://git.kernel.org/linux.git",
+        "git_repository_branch": "master",
+    }
+
+
+def _local_filters() -> LocalFilters:
+    return LocalFilters(
+        issues=[("maestro:issue", 1)],
+        origins=["maestro"],
+        has_unknown_issue=True,
+        labs=["lab-collabora"],
+    )
+
+
+# The largest response of the API, a tree details response without filters
+TREE_DETAILS_RESPONSE = TreeDetailsFullResponse(
+    builds=[_build_item(i) for i in range(BUILDS_COUNT)],
+    boots=[_history_item(i, "boot") for i in range(BOOTS_COUNT)],
+    tests=[_history_item(i, "kselftest.cpufreq") for i in range(TESTS_COUNT)],
+    summary=Summary(
+        builds=BuildSummary(issues=[], unknown_issues=0),
+        boots=generate_test_summary_typed(),
+        tests=generate_test_summary_typed(),
+    ),
+    common=TreeCommon(
+        hardware=["rk3399-gru-kevin"],
+        tree_url="https://git.kernel.org/linux.git",
+        git_commit_tags=[],
+    ),
+    filters=DetailsFilters(
+        all=GlobalFilters(
+            configs=["defconfig"], architectures=["arm64"], compilers=["gcc-12"]
+        ),
+        builds=_local_filters(),
+        boots=_local_filters(),
+        tests=_local_filters(),
+    ),
+)
+
+# How a view renders its validated response: with the stdlib encoder of
+# JSONRenderer, with FastJSONRenderer, and with FastJSONRenderer given the
+# model itself instead of its dump
+RENDERINGS = {
+    "json_renderer": lambda response: JSONRenderer().render(response.model_dump()),
+    "fast_json_renderer": lambda response: FastJSONRenderer().render(
+        response.model_dump()
+    ),
+    "fast_json_renderer_model": lambda response: FastJSONRenderer().render(response),
+}
+
+
+@pytest.mark.benchmark(group="json-renderer-tree-details")
+@pytest.mark.parametrize("rendering", RENDERINGS)
+def test_tree_details_rendering_perf(benchmark, rendering):
+    """Benchmark rendering a full tree details response to JSON."""
+    render = RENDERINGS[rendering]
+
+    content = benchmark.pedantic(
+        render, args=(TREE_DETAILS_RESPONSE,), rounds=10, iterations=1
+    )
+
+    benchmark.extra_info["bytes"] = len(content)
+    benchmark.extra_info["rows"] = BUILDS_COUNT + BOOTS_COUNT + TESTS_COUNT
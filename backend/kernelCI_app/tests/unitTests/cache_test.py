@@ -7,8 +7,10 @@ from kernelCI_app.cache import (
     _create_cache_params_hash,
     get_notification_cache,
     get_query_cache,
+    get_query_cache_many,
     set_notification_cache,
     set_query_cache,
+    set_query_cache_many,
 )
 
 
@@ -123,6 +125,32 @@ class TestGetQueryCache:
         assert result is None
 
 
+class TestQueryCacheMany:
+    @patch("kernelCI_app.cache.cache")
+    def test_get_query_cache_many_keeps_entry_order(self, mock_cache):
+        """Test that all entries are read at once and misses are None."""
+        entries = [("key_a", {"id": "1"}), ("key_b", None), ("key_a", {"id": "2"})]
+        first_key = "key_a-%s" % _create_cache_params_hash({"id": "1"})
+        mock_cache.get_many.return_value = {first_key: ["row1"], "key_b": ["row2"]}
+
+        result = get_query_cache_many(entries)
+
+        mock_cache.get_many.assert_called_once()
+        assert result == [["row1"], ["row2"], None]
+
+    @patch("kernelCI_app.cache.cache")
+    def test_set_query_cache_many_uses_same_keys_as_get(self, mock_cache):
+        """Test that entries written at once can be read with get_query_cache."""
+        set_query_cache_many([("key_a", {"id": "1"}, ["row1"]), ("key_b", None, [])])
+
+        mock_cache.set_many.assert_called_once()
+        written = mock_cache.set_many.call_args[0][0]
+        assert written == {
+            "key_a-%s" % _create_cache_params_hash({"id": "1"}): ["row1"],
+            "key_b": [],
+        }
+
+
 class TestSetNotificationCache:
     @patch("kernelCI_app.cache.cache")
     def test_set_notification_cache(self, mock_cache):
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from kernelCI_app.management.commands.backfill_hardware_aggregations import (
+    date_range_chunks,
+)
+
+
+class TestDateRangeChunks(TestCase):
+    def setUp(self):
+        self.start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    def test_splits_window_in_steps(self):
+        chunks = list(
+            date_range_chunks(
+                self.start, self.start + timedelta(hours=72), timedelta(hours=24)
+            )
+        )
+
+        self.assertEqual(
+            chunks,
+            [
+                (self.start, self.start + timedelta(hours=24)),
+                (self.start + timedelta(hours=24), self.start + timedelta(hours=48)),
+                (self.start + timedelta(hours=48), None),
+            ],
+        )
+
+    def test_last_chunk_is_open_ended(self):
+        chunks = list(
+            date_range_chunks(
+                self.start, self.start + timedelta(hours=30), timedelta(hours=24)
+            )
+        )
+
+        self.assertEqual(chunks[-1], (self.start + timedelta(hours=24), None))
+
+    def test_window_smaller_than_step(self):
+        chunks = list(
+            date_range_chunks(
+                self.start, self.start + timedelta(hours=1), timedelta(hours=24)
+            )
+        )
+
+        self.assertEqual(chunks, [(self.start, None)])
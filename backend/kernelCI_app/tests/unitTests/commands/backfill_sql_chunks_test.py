@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import patch
+
+from django.core.management.base import CommandError
+
+from kernelCI_app.management.commands.backfill_hardware_aggregations import Command
+
+
+class TestProcessSqlChunks(TestCase):
+    def setUp(self):
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        self.chunks = [
+            (start, start + timedelta(hours=24)),
+            (start + timedelta(hours=24), start + timedelta(hours=48)),
+            (start + timedelta(hours=48), None),
+        ]
+        self.command = Command()
+
+    def _process(self, workers: int):
+        def run_sql_chunk(*, start, **kwargs):
+            if start == self.chunks[1][0]:
+                raise RuntimeError("canceling statement due to statement timeout")
+            return 10
+
+        with (
+            patch.object(self.command, "estimate_rows", return_value=30),
+            patch.object(self.command, "run_sql_chunk", side_effect=run_sql_chunk),
+            patch(
+                "kernelCI_app.management.commands.backfill_hardware_aggregations.out"
+            ),
+        ):
+            return self.command.process_sql_chunks(
+                chunks=self.chunks,
+                select_query="SELECT {end_condition}",
+                insert_query="INSERT {select}",
+                end_column="start_time",
+                workers=workers,
+                label="Checkouts",
+            )
+
+    def test_returns_the_failed_chunks(self):
+        self.assertEqual(self._process(workers=1), [self.chunks[1]])
+
+    def test_returns_the_failed_chunks_of_the_workers(self):
+        self.assertEqual(self._process(workers=2), [self.chunks[1]])
+
+    @patch("kernelCI_app.management.commands.backfill_hardware_aggregations.out")
+    def test_raises_for_failed_chunks(self, mock_out):
+        with self.assertRaises(CommandError):
+            self.command.raise_for_failed_chunks(
+                [self.chunks[2], self.chunks[1]], label="Tests"
+            )
+
+        first_start, first_end = self.chunks[1]
+        printed = [call.args[0] for call in mock_out.call_args_list]
+        self.assertEqual(
+            printed[1:],
+            [
+                f"  from {first_start.isoformat()} to {first_end.isoformat()}",
+                f"  from {self.chunks[2][0].isoformat()} to now",
+            ],
+        )
+
+    def test_no_failed_chunks(self):
+        self.command.raise_for_failed_chunks([], label="Tests")
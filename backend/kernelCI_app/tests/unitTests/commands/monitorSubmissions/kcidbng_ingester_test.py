@@ -1,11 +1,14 @@
 from unittest.mock import MagicMock, call, mock_open, patch
 
 import pytest
+from prometheus_client import REGISTRY
 
 from kernelCI_app.constants.ingester import (
     AUTOMATIC_LAB_FIELD,
     INGESTER_GRAFANA_LABEL,
 )
+from kernelCI_app.management.commands.generated.insert_queries import INSERT_QUERIES
+from kernelCI_app.management.commands.helpers.ingest_records import make_record
 from kernelCI_app.management.commands.helpers.kcidbng_ingester import (
     SubmissionFileMetadata,
     _extract_origins_info,
@@ -13,6 +16,8 @@ from kernelCI_app.management.commands.helpers.kcidbng_ingester import (
     consume_buffer,
     flush_buffers,
     ingest_submissions_parallel,
+    merge_buffered_duplicates,
+    observe_ingest_latency,
     prepare_file_data,
     standardize_labs,
     standardize_tree_names,
@@ -527,19 +532,33 @@ class TestConsumeBuffer:
     def test_consume_buffer_with_items(self, mock_time, mock_connections, mock_out):
         """Test consume_buffer with items in buffer."""
         table_name = "issues"
-        # TODO: test with a real example
-        mock_buffer = [MagicMock(), MagicMock()]
+        buffer = [
+            make_record(
+                table_name,
+                {"id": "issue_1", "version": 1, "misc": {"key": "value"}},
+                timestamp=None,
+            ),
+            make_record(table_name, {"id": "issue_2", "version": 1}, timestamp=None),
+        ]
         mock_cursor = MagicMock()
         mock_connections[
             "default"
         ].cursor.return_value.__enter__.return_value = mock_cursor
 
-        consume_buffer(mock_buffer, table_name)
+        consume_buffer(buffer, table_name)
 
         assert mock_time.call_count == 2
         mock_cursor.executemany.assert_called_once()
         mock_out.assert_called_once()
 
+        query, params = mock_cursor.executemany.call_args.args
+        assert query == INSERT_QUERIES[table_name]["query"]
+        columns = INSERT_QUERIES[table_name]["updateable_model_fields"]
+        first_row = dict(zip(columns, params[0], strict=True))
+        assert first_row["id"] == "issue_1"
+        assert first_row["misc"] == '{"key": "value"}'
+        assert dict(zip(columns, params[1], strict=True))["misc"] is None
+
     @patch("kernelCI_app.management.commands.helpers.kcidbng_ingester.out")
     @patch("time.time")
     def test_consume_buffer_empty_buffer(self, mock_time, mock_out):
@@ -559,6 +578,107 @@ class TestConsumeBuffer:
             consume_buffer([mock_model], "another")
 
 
+class TestMergeBufferedDuplicates:
+    """Test cases for merge_buffered_duplicates function."""
+
+    def test_merge_buffered_duplicates(self):
+        records_dict = {
+            "issues": [],
+            "checkouts": [],
+            "builds": [],
+            "tests": [
+                make_record("tests", {"id": "test_1"}, timestamp=None),
+                make_record("tests", {"id": "test_2"}, timestamp=None),
+                make_record(
+                    "tests", {"id": "test_1", "status": "PASS"}, timestamp=None
+                ),
+            ],
+            "incidents": [],
+        }
+        labels = {"ingester": INGESTER_GRAFANA_LABEL, "table": "tests"}
+        merged_before = (
+            REGISTRY.get_sample_value("kcidb_ingester_merged_duplicates_total", labels)
+            or 0
+        )
+
+        merge_buffered_duplicates(records_dict)
+
+        assert [test.id for test in records_dict["tests"]] == ["test_1", "test_2"]
+        assert records_dict["tests"][0].status == "PASS"
+        assert (
+            REGISTRY.get_sample_value("kcidb_ingester_merged_duplicates_total", labels)
+            == merged_before + 1
+        )
+
+
+class TestIngestMetrics:
+    """Test cases for the stage and latency metrics of the ingester."""
+
+    @staticmethod
+    def get_sample(name: str, **labels) -> float:
+        return (
+            REGISTRY.get_sample_value(
+                name, {"ingester": INGESTER_GRAFANA_LABEL, **labels}
+            )
+            or 0
+        )
+
+    @patch("time.time", return_value=1030)
+    @patch("os.path.getmtime", return_value=1000)
+    def test_observe_ingest_latency(self, mock_getmtime, mock_time):
+        count_before = self.get_sample("kcidb_ingester_latency_seconds_count")
+        sum_before = self.get_sample("kcidb_ingester_latency_seconds_sum")
+
+        observe_ingest_latency(SUBMISSION_PATH_MOCK)
+
+        mock_getmtime.assert_called_once_with(SUBMISSION_PATH_MOCK)
+        assert (
+            self.get_sample("kcidb_ingester_latency_seconds_count") == count_before + 1
+        )
+        assert self.get_sample("kcidb_ingester_latency_seconds_sum") == sum_before + 30
+
+    @patch("os.path.getmtime", side_effect=FileNotFoundError())
+    def test_observe_ingest_latency_missing_file(self, mock_getmtime):
+        count_before = self.get_sample("kcidb_ingester_latency_seconds_count")
+
+        observe_ingest_latency(SUBMISSION_PATH_MOCK)
+
+        assert self.get_sample("kcidb_ingester_latency_seconds_count") == count_before
+
+    @patch(
+        "kernelCI_app.management.commands.helpers.kcidbng_ingester.CONVERT_LOG_EXCERPT",
+        False,
+    )
+    @patch("kcidb_io.schema.V5_3.validate")
+    @patch("kcidb_io.schema.V5_3.upgrade")
+    def test_prepare_file_data_stages(self, mock_upgrade, mock_validate):
+        stages = ["read", "decode", "validation", "log_excerpts"]
+        counts_before = {
+            stage: self.get_sample(
+                "kcidb_ingester_stage_duration_seconds_count", stage=stage
+            )
+            for stage in stages
+        }
+
+        # The registry reads /proc, so open is only mocked for the ingestion
+        with patch("builtins.open", mock_open(read_data=SUBMISSION_FILE_MOCK)):
+            prepare_file_data(
+                SubmissionFileMetadata(
+                    name=SUBMISSION_FILENAME_MOCK, path=SUBMISSION_PATH_MOCK, size=100
+                ),
+                {},
+            )
+
+        counts = {
+            stage: self.get_sample(
+                "kcidb_ingester_stage_duration_seconds_count", stage=stage
+            )
+            - counts_before[stage]
+            for stage in stages
+        }
+        assert counts == {"read": 1, "decode": 1, "validation": 1, "log_excerpts": 0}
+
+
 class TestFlushBuffers:
     """Test cases for flush_buffers function."""
 
@@ -587,6 +707,15 @@ class TestFlushBuffers:
         mock_consume.assert_not_called()
         mock_rename.assert_not_called()
 
+    @patch(
+        "kernelCI_app.management.commands.helpers.kcidbng_ingester.observe_ingest_latency"
+    )
+    @patch(
+        "kernelCI_app.management.commands.helpers.kcidbng_ingester.aggregate_issue_listing"
+    )
+    @patch(
+        "kernelCI_app.management.commands.helpers.kcidbng_ingester.aggregate_incidents"
+    )
     @patch(
         "kernelCI_app.management.commands.helpers.kcidbng_ingester.aggregate_checkouts_and_pendings"
     )
@@ -603,6 +732,9 @@ class TestFlushBuffers:
         mock_consume,
         mock_out,
         mock_aggregate,
+        mock_aggregate_incidents,
+        mock_aggregate_issue_listing,
+        mock_observe_latency,
     ):
         """Test flush_buffers with items in buffers."""
         # Arbitrary amount of items in each buffer
@@ -644,9 +776,21 @@ class TestFlushBuffers:
             call(checkouts_buf, "checkouts"),
             call(builds_buf, "builds"),
             call(tests_buf, "tests"),
-            call(incidents_buf, "incidents"),
+            call(incidents_buf, "incidents", return_inserted_ids=True),
         ]
         mock_consume.assert_has_calls(expected_calls)
+        mock_aggregate_incidents.assert_called_once_with(
+            incidents_buf,
+            checkouts_instances=checkouts_buf,
+            builds_instances=builds_buf,
+            tests_instances=tests_buf,
+        )
+        mock_aggregate_issue_listing.assert_called_once_with(
+            issues_buf,
+            incidents_buf,
+            mock_aggregate_incidents.return_value,
+            new_incident_ids=mock_consume.return_value,
+        )
 
         # Verify stat_ok update
         # counter_lock enter/exit called
@@ -679,6 +823,7 @@ class TestFlushBuffers:
             SUBMISSION_FILEPATH_MOCK,
             "/".join([ARCHIVE_SUBMISSIONS_DIR, SUBMISSION_FILENAME_MOCK]),
         )
+        mock_observe_latency.assert_called_once_with(SUBMISSION_FILEPATH_MOCK)
 
         assert mock_time.call_count == 2
         mock_atomic.assert_called_once()
@@ -8,8 +8,12 @@ from kernelCI_app.management.commands.helpers.process_pending_helpers import (
     RollupEntryData,
     RollupKey,
     accumulate_rollup_entry,
+    aggregate_hardware_tests_rollup,
     aggregate_tests_rollup,
     extract_path_group,
+    get_hardware_ids,
+    get_hardware_rollup_key,
+    get_rollup_key,
 )
 from kernelCI_app.models import StatusChoices
 
@@ -709,3 +713,96 @@ class TestAggregateTestsRollupWithReprocess(SimpleTestCase):
         self.assertEqual(record["fail_tests"], 1)
         self.assertEqual(record["total_tests"], 1)
         self.assertEqual(record["null_tests"], 0)
+
+
+class TestGetHardwareIds(SimpleTestCase):
+    def test_compatibles_and_platform_are_returned(self):
+        self.assertEqual(
+            get_hardware_ids("board", ["vendor,board", "vendor,soc"]),
+            ["vendor,board", "vendor,soc", "board"],
+        )
+
+    def test_platform_in_compatibles_is_not_repeated(self):
+        self.assertEqual(get_hardware_ids("board", ["board", "board"]), ["board"])
+
+    def test_no_platform_and_no_compatibles_returns_empty_list(self):
+        self.assertEqual(get_hardware_ids(None, None), [])
+
+
+class TestGetHardwareRollupKey(SimpleTestCase):
+    def test_build_keys_differ_per_hardware(self):
+        self.assertNotEqual(
+            get_hardware_rollup_key("build-1", hardware_id="board-a"),
+            get_hardware_rollup_key("build-1", hardware_id="board-b"),
+        )
+
+    def test_keys_are_namespaced_from_tree_rollup(self):
+        self.assertEqual(len(get_hardware_rollup_key("test-1")), 32)
+        self.assertNotEqual(get_hardware_rollup_key("test-1"), get_rollup_key("test-1"))
+
+
+class TestAggregateHardwareTestsRollup(SimpleTestCase):
+    def _make_hardware_build(self, status=StatusChoices.PASS):
+        build = _make_build()
+        build.id = "build-1"
+        build.origin = "build-origin"
+        build.status = status
+        build.misc = {"lab": "build-lab"}
+        build.checkout.id = "checkout-1"
+        build.checkout.start_time = "2025-01-01T00:00:00Z"
+        return build
+
+    def test_test_is_counted_for_each_hardware(self):
+        build = self._make_hardware_build()
+        test = _make_pending_test(platform="board", compatible=["vendor,board"])
+
+        result = aggregate_hardware_tests_rollup([test], [], {"build-1": build}, {}, {})
+
+        self.assertEqual(
+            sorted(key.hardware_id for key in result), ["board", "vendor,board"]
+        )
+        for key, data in result.items():
+            self.assertFalse(key.is_build)
+            self.assertEqual(key.checkout_id, "checkout-1")
+            self.assertEqual(key.compatibles, ("vendor,board",))
+            self.assertEqual(data["pass_tests"], 1)
+            self.assertEqual(data["start_time"], "2025-01-01T00:00:00Z")
+
+    def test_build_row_uses_build_data(self):
+        build = self._make_hardware_build(status=StatusChoices.FAIL)
+        test = _make_pending_test(platform="board")
+
+        result = aggregate_hardware_tests_rollup(
+            [],
+            [("board", test)],
+            {"build-1": build},
+            {},
+            {"build-1": {"issue_id": "issue-1", "issue_version": 2}},
+        )
+
+        key, data = next(iter(result.items()))
+        self.assertTrue(key.is_build)
+        self.assertEqual(key.origin, "build-origin")
+        self.assertEqual(key.lab, "build-lab")
+        self.assertEqual(key.path_group, EMPTY_PATH_GROUP)
+        self.assertEqual((key.issue_id, key.issue_version), ("issue-1", 2))
+        self.assertFalse(key.issue_uncategorized)
+        self.assertEqual(data["fail_tests"], 1)
+
+    def test_build_correction_moves_null_count(self):
+        build = self._make_hardware_build()
+        test = _make_pending_test(platform="board")
+
+        result = aggregate_hardware_tests_rollup(
+            [],
+            [("board", test)],
+            {"build-1": build},
+            {},
+            {},
+            reprocess_build_keys={("board", "build-1")},
+        )
+
+        data = next(iter(result.values()))
+        self.assertEqual(data["null_tests"], -1)
+        self.assertEqual(data["pass_tests"], 1)
+        self.assertEqual(data["total_tests"], 0)
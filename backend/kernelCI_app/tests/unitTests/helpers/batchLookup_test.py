@@ -0,0 +1,58 @@
+from unittest.mock import MagicMock, patch
+
+from kernelCI_app.helpers.batchLookup import BatchQuery, lookup_batch
+
+
+class TestLookupBatch:
+    @patch("kernelCI_app.helpers.batchLookup.set_query_cache_many")
+    @patch("kernelCI_app.helpers.batchLookup.get_query_cache_many")
+    def test_lookup_batch_only_queries_missing_ids(self, mock_get_many, mock_set_many):
+        """Test that cached ids are not queried and the new rows are cached."""
+        # Entries are read query by query, in the order of the ids
+        mock_get_many.return_value = [
+            [{"id": "a", "status": "PASS"}],
+            None,
+            None,
+            [],
+        ]
+        details_query = MagicMock(return_value=[{"id": "b", "status": "FAIL"}])
+        tests_query = MagicMock(return_value=[])
+
+        result = lookup_batch(
+            ids=["a", "b"],
+            queries={
+                "details": BatchQuery(query=details_query, id_field="id"),
+                "tests": BatchQuery(query=tests_query, id_field="build_id"),
+            },
+        )
+
+        mock_get_many.assert_called_once()
+        details_query.assert_called_once_with(["b"])
+        tests_query.assert_called_once_with(["a"])
+        assert result == {
+            "details": {
+                "a": [{"id": "a", "status": "PASS"}],
+                "b": [{"id": "b", "status": "FAIL"}],
+            },
+            "tests": {"a": [], "b": []},
+        }
+        written = mock_set_many.call_args[0][0]
+        assert [(key, params["id"]) for key, params, _ in written] == [
+            ("batchLookup-details", "b"),
+            ("batchLookup-tests", "a"),
+        ]
+
+    @patch("kernelCI_app.helpers.batchLookup.set_query_cache_many")
+    @patch("kernelCI_app.helpers.batchLookup.get_query_cache_many")
+    def test_lookup_batch_all_cached(self, mock_get_many, mock_set_many):
+        """Test that nothing is queried nor cached when all ids are cached."""
+        mock_get_many.return_value = [[{"id": "a"}]]
+        query = MagicMock()
+
+        result = lookup_batch(
+            ids=["a"], queries={"details": BatchQuery(query=query, id_field="id")}
+        )
+
+        assert result == {"details": {"a": [{"id": "a"}]}}
+        query.assert_not_called()
+        mock_set_many.assert_not_called()
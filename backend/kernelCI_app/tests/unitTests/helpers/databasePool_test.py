@@ -0,0 +1,84 @@
+from unittest.mock import MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from kernelCI.settings import set_database_pools
+from kernelCI_app.helpers.databasePool import record_pool_stats
+
+
+def _sample(name: str, labels: dict) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class TestRecordPoolStats:
+    def test_records_pool_stats(self):
+        connection = MagicMock()
+        connection.alias = "unit_pool"
+        connection.pool.pop_stats.return_value = {
+            "requests_num": 3,
+            "requests_wait_ms": 1500,
+            "requests_errors": 1,
+            "requests_waiting": 2,
+            "pool_size": 4,
+            "pool_available": 1,
+            "pool_max": 8,
+        }
+        requests_before = _sample(
+            "kernelci_db_pool_requests_total", {"alias": "unit_pool"}
+        )
+        wait_before = _sample(
+            "kernelci_db_pool_wait_seconds_total", {"alias": "unit_pool"}
+        )
+
+        record_pool_stats(sender=None, connection=connection)
+
+        labels = {"alias": "unit_pool"}
+        assert _sample("kernelci_db_pool_requests_total", labels) - requests_before == 3
+        assert (
+            _sample("kernelci_db_pool_wait_seconds_total", labels) - wait_before == 1.5
+        )
+        assert _sample("kernelci_db_pool_requests_waiting", labels) == 2
+        assert (
+            _sample("kernelci_db_pool_connections", {**labels, "state": "in_use"}) == 3
+        )
+        assert _sample("kernelci_db_pool_connections", {**labels, "state": "max"}) == 8
+
+    def test_ignores_connections_without_pool(self):
+        connection = MagicMock()
+        connection.alias = "unit_no_pool"
+        connection.pool = None
+
+        record_pool_stats(sender=None, connection=connection)
+
+        assert (
+            REGISTRY.get_sample_value(
+                "kernelci_db_pool_requests_total", {"alias": "unit_no_pool"}
+            )
+            is None
+        )
+
+
+class TestSetDatabasePools:
+    def test_sets_pool_options(self):
+        databases = {
+            "default": {
+                "ENGINE": "django.db.backends.postgresql",
+                "CONN_MAX_AGE": 60,
+                "OPTIONS": {"connect_timeout": 16},
+            }
+        }
+
+        set_database_pools(databases, {"default": {"max_size": 8}})
+
+        assert databases["default"]["OPTIONS"] == {
+            "connect_timeout": 16,
+            "pool": {"max_size": 8},
+        }
+        assert databases["default"]["CONN_MAX_AGE"] == 0
+
+    def test_rejects_sqlite_databases(self):
+        databases = {"cache": {"ENGINE": "django.db.backends.sqlite3"}}
+
+        with pytest.raises(ValueError):
+            set_database_pools(databases, {"cache": True})
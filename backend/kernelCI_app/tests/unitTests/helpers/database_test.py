@@ -1,6 +1,6 @@
 from unittest.mock import MagicMock
 
-from kernelCI_app.helpers.database import dict_fetchall
+from kernelCI_app.helpers.database import debug_query, dict_fetchall
 
 
 class TestDictFetchall:
@@ -43,3 +43,29 @@ class TestDictFetchall:
 
         expected = [{"id": 1}, {"id": 2}, {"id": 3}]
         assert result == expected
+
+
+class TestDebugQuery:
+    def test_debug_query_analyzes_by_default(self):
+        """Test debug_query executes the query to get the actual timings."""
+        mock_cursor = MagicMock()
+        mock_cursor.mogrify.return_value = "SELECT 1"
+        mock_cursor.execute.return_value = [("Result",), ("Execution Time: 1 ms",)]
+
+        result = debug_query(mock_cursor, "SELECT %s", [1])
+
+        assert result == ("SELECT 1", "Result\nExecution Time: 1 ms")
+        mock_cursor.execute.assert_called_once_with(
+            "EXPLAIN (ANALYZE, BUFFERS) SELECT %s", [1]
+        )
+
+    def test_debug_query_without_analyze(self):
+        """Test debug_query only plans the query without analyze."""
+        mock_cursor = MagicMock()
+        mock_cursor.execute.return_value = [("Delete on pending_test",)]
+
+        debug_query(mock_cursor, "DELETE FROM pending_test", None, analyze=False)
+
+        mock_cursor.execute.assert_called_once_with(
+            "EXPLAIN DELETE FROM pending_test", None
+        )
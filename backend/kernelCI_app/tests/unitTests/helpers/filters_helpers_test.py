@@ -2,7 +2,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from kernelCI_app.constants.general import UNCATEGORIZED_STRING
+from kernelCI_app.constants.general import UNCATEGORIZED_STRING, UNKNOWN_STRING
 from kernelCI_app.helpers.filters import (
     FilterParams,
     InvalidComparisonOPError,
@@ -1005,6 +1005,101 @@ class TestTestFilters:
         assert result is False
 
 
+class TestCompiledPredicates:
+    def test_predicates_without_filters_never_filter_out(self):
+        """Test that without filters every predicate is the same no-op."""
+        filter_params = FilterParams(mock_request(), process_body=False)
+
+        predicates = {
+            filter_params.build_predicate,
+            filter_params.record_predicate,
+            filter_params.boot_predicate,
+            filter_params.test_predicate,
+        }
+
+        assert len(predicates) == 1
+        assert filter_params.build_predicate(build_status="FAIL") is False
+
+    def test_predicates_are_compiled_once(self):
+        """Test that the predicates are compiled on first use and kept."""
+        filter_params = FilterParams(mock_request_with_filters(), process_body=False)
+
+        predicate = filter_params.test_predicate
+        filter_params.filterTestStatus = set()
+
+        assert filter_params.test_predicate is predicate
+        assert filter_params.compile_test_predicate() is not predicate
+
+    def test_compiled_predicates_match_the_request_filters(self):
+        """Test the predicates compiled from request filters."""
+        filter_params = FilterParams(mock_request_with_filters(), process_body=False)
+
+        test_data = {
+            "path": "boot",
+            "status": "PASS",
+            "duration": 10,
+            "issue_id": None,
+            "issue_version": None,
+        }
+        assert filter_params.test_predicate(**test_data) is False
+        assert filter_params.test_predicate(**{**test_data, "status": "FAIL"}) is True
+        assert filter_params.boot_predicate(**test_data) is False
+        assert filter_params.boot_predicate(**{**test_data, "duration": 150}) is True
+        assert filter_params.boot_predicate(**{**test_data, "duration": None}) is True
+
+    def test_build_predicate_with_issue_filter(self):
+        """Test the build predicate only keeps failed builds with the issue."""
+        filter_params = FilterParams(mock_request(), process_body=False)
+        filter_params.filterIssues["build"] = {("issue123", 1)}
+
+        build_data = {
+            "duration": None,
+            "build_status": "FAIL",
+            "issue_id": "issue123",
+            "issue_version": 1,
+            "incident_test_id": None,
+        }
+        predicate = filter_params.compile_build_predicate()
+
+        assert predicate(**build_data) is False
+        assert predicate(**{**build_data, "build_status": "PASS"}) is True
+        assert predicate(**{**build_data, "issue_version": 2}) is True
+
+    def test_record_predicate_with_unknown_values(self):
+        """Test the record predicate matches missing values as unknown."""
+        filter_params = FilterParams(mock_request(), process_body=False)
+        filter_params.filterArchitecture = {UNKNOWN_STRING}
+        filter_params.filter_labs = {UNKNOWN_STRING}
+
+        predicate = filter_params.compile_record_predicate()
+
+        assert (
+            predicate(architecture=None, compiler=None, config_name=None, lab=None)
+            is False
+        )
+        assert predicate(architecture="arm64", compiler=None, config_name=None) is True
+
+    def test_test_predicate_with_platform_and_origin_filters(self):
+        """Test the test predicate with platform and origin filters."""
+        filter_params = FilterParams(mock_request(), process_body=False)
+        filter_params.filterPlatforms["test"] = {"rk3399"}
+        filter_params.filter_test_origin = {"maestro"}
+
+        test_data = {
+            "path": "kselftest",
+            "status": "PASS",
+            "duration": None,
+            "platform": "rk3399",
+            "origin": "maestro",
+        }
+        predicate = filter_params.compile_test_predicate()
+
+        assert predicate(**test_data) is False
+        assert predicate(**{**test_data, "platform": "juno"}) is True
+        assert predicate(**{**test_data, "origin": "redhat"}) is True
+        assert filter_params.compile_boot_predicate()(**test_data) is False
+
+
 class TestFilterHandlers:
     @patch("kernelCI_app.helpers.filters.log_message")
     def test_handle_issue_culprits_with_invalid_culprit(self, mock_log_message):
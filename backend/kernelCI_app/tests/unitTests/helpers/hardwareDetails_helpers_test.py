@@ -1068,7 +1068,7 @@ class TestDecideIfIsFullRecordFilteredOut:
         mock_is_selected.return_value = True
 
         instance = MagicMock()
-        instance.filters.is_record_filtered_out.return_value = True
+        instance.filters.record_predicate.return_value = True
 
         record = {
             "environment_compatible": ["hardware1"],
@@ -1086,14 +1086,14 @@ class TestDecideIfIsFullRecordFilteredOut:
         )
 
         assert result is True
-        instance.filters.is_record_filtered_out.assert_called_once()
+        instance.filters.record_predicate.assert_called_once()
 
 
 class TestDecideIfIsBuildInFilter:
     def test_decide_if_is_build_in_filter(self):
         """Test decide_if_is_build_in_filter function."""
         instance = MagicMock()
-        instance.filters.is_build_filtered_out.return_value = False
+        instance.filters.build_predicate.return_value = False
 
         build = MagicMock()
         build.id = "build123"
@@ -1113,12 +1113,12 @@ class TestDecideIfIsBuildInFilter:
         )
 
         assert result is True
-        instance.filters.is_build_filtered_out.assert_called_once()
+        instance.filters.build_predicate.assert_called_once()
 
     def test_decide_if_is_build_in_filter_with_dummy_build(self):
         """Test decide_if_is_build_in_filter with dummy build."""
         instance = MagicMock()
-        instance.filters.is_build_filtered_out.return_value = False
+        instance.filters.build_predicate.return_value = False
 
         build = MagicMock()
         build.id = "maestro:dummy_123"
@@ -1138,7 +1138,7 @@ class TestDecideIfIsBuildInFilter:
         )
 
         assert result is False
-        instance.filters.is_build_filtered_out.assert_called_once()
+        instance.filters.build_predicate.assert_called_once()
 
     @patch("kernelCI_app.helpers.hardwareDetails.is_status_failure")
     def test_decide_if_is_build_in_filter_with_processed_build(
@@ -1148,7 +1148,7 @@ class TestDecideIfIsBuildInFilter:
         mock_is_status_failure.return_value = False
 
         instance = MagicMock()
-        instance.filters.is_build_filtered_out.return_value = False
+        instance.filters.build_predicate.return_value = False
 
         build = MagicMock()
         build.id = "build123"
@@ -1168,7 +1168,7 @@ class TestDecideIfIsBuildInFilter:
         )
 
         assert result is False
-        instance.filters.is_build_filtered_out.assert_called_once()
+        instance.filters.build_predicate.assert_called_once()
 
 
 class TestGetProcessedIssueKey:
@@ -1243,7 +1243,7 @@ class TestDecideIfIsTestInFilter:
         mock_env_misc_value.return_value = {"platform": "x86_64"}
 
         instance = MagicMock()
-        instance.filters.is_boot_filtered_out.return_value = False
+        instance.filters.boot_predicate.return_value = False
 
         record = {
             "status": "PASS",
@@ -1261,7 +1261,7 @@ class TestDecideIfIsTestInFilter:
         )
 
         assert result is True
-        instance.filters.is_boot_filtered_out.assert_called_once()
+        instance.filters.boot_predicate.assert_called_once()
 
     @patch("kernelCI_app.helpers.hardwareDetails.misc_value_or_default")
     @patch("kernelCI_app.helpers.hardwareDetails.handle_misc")
@@ -1273,7 +1273,7 @@ class TestDecideIfIsTestInFilter:
         mock_env_misc_value.return_value = {"platform": "x86_64"}
 
         instance = MagicMock()
-        instance.filters.is_test_filtered_out.return_value = False
+        instance.filters.test_predicate.return_value = False
 
         record = {
             "status": "PASS",
@@ -1291,7 +1291,7 @@ class TestDecideIfIsTestInFilter:
         )
 
         assert result is True
-        instance.filters.is_test_filtered_out.assert_called_once()
+        instance.filters.test_predicate.assert_called_once()
 
 
 class TestIsRecordTreeSelected:
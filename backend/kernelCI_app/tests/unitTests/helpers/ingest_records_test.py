@@ -0,0 +1,203 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from kernelCI_app.management.commands.generated.insert_queries import INSERT_QUERIES
+from kernelCI_app.management.commands.helpers.ingest_records import (
+    COLUMN_PLANS,
+    flatten_dict_specific,
+    make_record,
+    merge_duplicate_records,
+    merge_records,
+    record_to_params,
+)
+from kernelCI_app.typeModels.modelTypes import MODEL_MAP
+
+TIMESTAMP = datetime(2026, 10, 1, 12, 0, tzinfo=UTC)
+
+SUBMISSION_ITEMS = {
+    "issues": {
+        "id": "maestro:issue",
+        "version": 2,
+        "origin": "maestro",
+        "comment": "Boot failure",
+        "culprit": {"code": True, "tool": False},
+        "misc": {"author": "bot"},
+        "extra_field": "ignored",
+    },
+    "checkouts": {
+        "id": "maestro:checkout",
+        "origin": "maestro",
+        "tree_name": "mainline",
+        "patchset_files": [{"name": "fix.patch", "url": "https://patch"}],
+        "git_commit_tags": ["v6.18"],
+        "start_time": "2026-10-01T10:00:00+00:00",
+    },
+    "builds": {
+        "id": "maestro:build",
+        "origin": "maestro",
+        "checkout_id": "maestro:checkout",
+        "status": "PASS",
+        "output_files": [{"name": "kernel", "url": "https://kernel"}],
+        "misc": {"lab": "lab-a"},
+    },
+    "tests": {
+        "id": "maestro:test",
+        "origin": "maestro",
+        "build_id": "maestro:build",
+        "path": "boot",
+        "environment": {"comment": "board", "misc": {"platform": "rk3399"}},
+        "number": {"value": 1.5, "unit": "s"},
+        "misc": {"runtime": "lab-a"},
+    },
+    "incidents": {
+        "id": "maestro:incident",
+        "origin": "maestro",
+        "issue_id": "maestro:issue",
+        "issue_version": 2,
+        "test_id": "maestro:test",
+        "present": True,
+    },
+}
+
+
+def _model_instance_params(table_name, item) -> tuple:
+    """Insert parameters built the way the ingester did with model instances"""
+    model = MODEL_MAP[table_name]
+    attnames = {field.attname for field in model._meta.concrete_fields}
+    flattened = flatten_dict_specific(item, COLUMN_PLANS[table_name].flattened_fields)
+    instance = model(**{k: v for k, v in flattened.items() if k in attnames})
+    instance.field_timestamp = TIMESTAMP
+
+    values = []
+    for field in INSERT_QUERIES[table_name]["updateable_model_fields"]:
+        value = getattr(instance, field)
+        model_field = instance._meta.get_field(field)
+        if model_field.get_internal_type() == "JSONField" and value is not None:
+            value = json.dumps(value)
+        values.append(value)
+    return tuple(values)
+
+
+class TestColumnPlans:
+    @pytest.mark.parametrize("table_name", list(MODEL_MAP))
+    def test_plan_follows_the_insert_query(self, table_name):
+        plan = COLUMN_PLANS[table_name]
+
+        assert plan.record_class._fields == tuple(
+            INSERT_QUERIES[table_name]["updateable_model_fields"]
+        )
+        assert plan.columns[plan.timestamp_index] == "field_timestamp"
+
+    def test_json_columns(self):
+        plan = COLUMN_PLANS["tests"]
+
+        json_columns = {plan.columns[index] for index in plan.json_indexes}
+        assert json_columns == {
+            "environment_misc",
+            "input_files",
+            "output_files",
+            "misc",
+        }
+
+
+class TestMakeRecord:
+    @pytest.mark.parametrize("table_name", list(MODEL_MAP))
+    def test_params_match_the_model_instance_path(self, table_name):
+        item = SUBMISSION_ITEMS[table_name]
+
+        record = make_record(table_name, item, timestamp=TIMESTAMP)
+
+        assert record_to_params(COLUMN_PLANS[table_name], record) == (
+            _model_instance_params(table_name, item)
+        )
+
+    def test_missing_columns_use_the_model_defaults(self):
+        record = make_record("issues", {"version": 1}, timestamp=TIMESTAMP)
+
+        assert record.id == ""
+        assert record.origin == ""
+        assert record.comment is None
+        assert record.field_timestamp == TIMESTAMP
+
+    def test_flattened_fields(self):
+        record = make_record("tests", SUBMISSION_ITEMS["tests"], timestamp=TIMESTAMP)
+
+        assert record.environment_comment == "board"
+        assert record.environment_misc == {"platform": "rk3399"}
+        assert record.number_value == 1.5
+        assert not hasattr(record, "environment")
+
+    def test_records_have_no_instance_dict(self):
+        record = make_record("builds", SUBMISSION_ITEMS["builds"], timestamp=TIMESTAMP)
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.extra_field = "value"
+
+    def test_unknown_table(self):
+        with pytest.raises(KeyError):
+            make_record("another", {}, timestamp=TIMESTAMP)
+
+
+class TestMergeDuplicateRecords:
+    def test_merge_follows_the_upsert_precedence(self):
+        later = datetime(2026, 10, 2, tzinfo=UTC)
+        first = make_record(
+            "tests",
+            {"id": "test", "origin": "maestro", "status": "FAIL"},
+            timestamp=TIMESTAMP,
+        )
+        retry = make_record(
+            "tests",
+            {
+                "id": "test",
+                "origin": "another",
+                "build_id": "build",
+                "status": "PASS",
+                "path": "boot",
+            },
+            timestamp=later,
+        )
+
+        merged = merge_records(COLUMN_PLANS["tests"], first, retry)
+
+        # Columns without a conflict clause keep the first value
+        assert merged.origin == "maestro"
+        assert merged.build_id is None
+        # COALESCE keeps the first non-NULL value
+        assert merged.status == "FAIL"
+        assert merged.path == "boot"
+        # GREATEST keeps the latest timestamp
+        assert merged.field_timestamp == later
+
+    def test_merge_duplicate_records(self):
+        records = [
+            make_record("builds", {"id": "build_a"}, timestamp=TIMESTAMP),
+            make_record("builds", {"id": "build_b"}, timestamp=TIMESTAMP),
+            make_record(
+                "builds", {"id": "build_a", "status": "PASS"}, timestamp=TIMESTAMP
+            ),
+            make_record(
+                "builds", {"id": "build_a", "status": "FAIL"}, timestamp=TIMESTAMP
+            ),
+        ]
+
+        merged, duplicates = merge_duplicate_records("builds", records)
+
+        assert duplicates == 2
+        assert [record.id for record in merged] == ["build_a", "build_b"]
+        assert merged[0].status == "PASS"
+        assert merged[1] is records[1]
+
+    def test_without_duplicates(self):
+        records = [
+            make_record("issues", {"id": f"issue_{i}"}, timestamp=TIMESTAMP)
+            for i in range(3)
+        ]
+
+        merged, duplicates = merge_duplicate_records("issues", records)
+
+        assert duplicates == 0
+        assert merged == records
@@ -4,6 +4,7 @@ from unittest.mock import patch
 from kernelCI_app.helpers.issueExtras import (
     TagUrls,
     assign_issue_incidents,
+    assign_issue_seen_summary,
     assign_issue_trees,
     process_issues_extra_details,
 )
@@ -15,12 +16,16 @@ from kernelCI_app.typeModels.issues import (
 
 
 class TestProcessIssuesExtraDetails:
-    @patch("kernelCI_app.helpers.issueExtras.assign_issue_incidents")
-    @patch("kernelCI_app.helpers.issueExtras.assign_issue_trees")
+    @patch("kernelCI_app.helpers.issueExtras.set_query_cache_many")
+    @patch(
+        "kernelCI_app.helpers.issueExtras.get_query_cache_many",
+        return_value=[None, None],
+    )
+    @patch("kernelCI_app.helpers.issueExtras.assign_issue_seen_summary")
     def test_process_issues_extra_details_with_issues(
-        self, mock_assign_trees, mock_assign_incidents
+        self, mock_assign_summary, mock_get_cache, mock_set_cache
     ):
-        """Test process_issues_extra_details with issues."""
+        """Test process_issues_extra_details queries and caches uncached issues."""
         issue_key_list = [("issue1", 1), ("issue2", 2)]
         processed_issues_table = {}
 
@@ -28,17 +33,68 @@ class TestProcessIssuesExtraDetails:
             issue_key_list=issue_key_list, processed_issues_table=processed_issues_table
         )
 
-        mock_assign_incidents.assert_called_once_with(
-            issue_key_list=issue_key_list, processed_issues_table=processed_issues_table
+        mock_assign_summary.assert_called_once()
+        assert mock_assign_summary.call_args.kwargs["issue_key_list"] == issue_key_list
+        mock_get_cache.assert_called_once_with(
+            [
+                ("issueExtras", {"issue_id": "issue1", "issue_version": 1}),
+                ("issueExtras", {"issue_id": "issue2", "issue_version": 2}),
+            ]
         )
-        mock_assign_trees.assert_called_once_with(
-            issue_key_list=issue_key_list, processed_issues_table=processed_issues_table
+        # Issues without incidents are cached as empty and left out of the table
+        mock_set_cache.assert_called_once_with(
+            [
+                ("issueExtras", {"issue_id": "issue1", "issue_version": 1}, {}),
+                ("issueExtras", {"issue_id": "issue2", "issue_version": 2}, {}),
+            ]
         )
+        assert processed_issues_table == {}
 
-    @patch("kernelCI_app.helpers.issueExtras.assign_issue_incidents")
-    @patch("kernelCI_app.helpers.issueExtras.assign_issue_trees")
+    @patch("kernelCI_app.helpers.issueExtras.set_query_cache_many")
+    @patch("kernelCI_app.helpers.issueExtras.get_query_cache_many")
+    @patch("kernelCI_app.helpers.issueExtras.assign_issue_seen_summary")
+    def test_process_issues_extra_details_cached(
+        self, mock_assign_summary, mock_get_cache, mock_set_cache
+    ):
+        """Test process_issues_extra_details only queries the uncached issues."""
+        incident = Incident(
+            first_seen=datetime(2024, 1, 15, 10, 0, 0),
+            git_commit_hash="abc123",
+            git_repository_url=TagUrls.MAINLINE_URL,
+            git_repository_branch="master",
+            git_commit_name="commit1",
+            tree_name="mainline",
+            issue_version=1,
+            checkout_id="checkout1",
+        )
+        cached_version = IssueWithExtraInfo(id="issue1", version=1)
+        mock_get_cache.return_value = [
+            {
+                "first_incident": incident,
+                "last_incident": incident,
+                "version": cached_version,
+            },
+            None,
+        ]
+        processed_issues_table = {}
+
+        process_issues_extra_details(
+            issue_key_list=[("issue1", 1), ("issue2", 2)],
+            processed_issues_table=processed_issues_table,
+        )
+
+        mock_assign_summary.assert_called_once()
+        assert mock_assign_summary.call_args.kwargs["issue_key_list"] == [("issue2", 2)]
+        mock_get_cache.assert_called_once()
+        [cache_entry] = mock_set_cache.call_args.args[0]
+        assert cache_entry[1] == {"issue_id": "issue2", "issue_version": 2}
+        assert processed_issues_table["issue1"].first_incident == incident
+        assert processed_issues_table["issue1"].versions == {1: cached_version}
+
+    @patch("kernelCI_app.helpers.issueExtras.get_query_cache_many")
+    @patch("kernelCI_app.helpers.issueExtras.assign_issue_seen_summary")
     def test_process_issues_extra_details_empty_list(
-        self, mock_assign_trees, mock_assign_incidents
+        self, mock_assign_summary, mock_get_cache
     ):
         """Test process_issues_extra_details with empty issue list."""
         issue_key_list = []
@@ -48,8 +104,77 @@ class TestProcessIssuesExtraDetails:
             issue_key_list=issue_key_list, processed_issues_table=processed_issues_table
         )
 
-        mock_assign_incidents.assert_not_called()
-        mock_assign_trees.assert_not_called()
+        mock_assign_summary.assert_not_called()
+        mock_get_cache.assert_not_called()
+
+
+class TestAssignIssueSeenSummary:
+    @patch("kernelCI_app.helpers.issueExtras.get_issue_seen_summary_data")
+    def test_assign_issue_seen_summary(self, mock_get_data):
+        """Test first/last incidents come from the lowest/highest versions with
+        incidents and that trees are only set for the requested versions."""
+
+        def record(version, first_seen, last_seen, tree_name, exists=True):
+            return {
+                "issue_id": "issue1",
+                "issue_version": version,
+                "issue_exists": exists,
+                "first_incident_id": f"first{version}" if first_seen else None,
+                "first_seen": first_seen,
+                "first_checkout_id": f"checkout{version}",
+                "first_git_commit_hash": f"hash{version}",
+                "first_git_repository_url": TagUrls.MAINLINE_URL,
+                "first_git_repository_branch": "master",
+                "first_git_commit_name": f"commit{version}",
+                "first_tree_name": "mainline",
+                "last_incident_id": f"last{version}" if last_seen else None,
+                "last_seen": last_seen,
+                "last_checkout_id": f"checkout{version}",
+                "last_git_commit_hash": f"hash{version}",
+                "last_git_repository_url": TagUrls.MAINLINE_URL,
+                "last_git_repository_branch": "master",
+                "last_git_commit_name": f"commit{version}",
+                "last_tree_name": "mainline",
+                "tree_name": tree_name,
+                "git_repository_url": TagUrls.MAINLINE_URL if tree_name else None,
+                "git_repository_branch": "master" if tree_name else None,
+            }
+
+        mock_get_data.return_value = [
+            record(1, datetime(2024, 1, 1), datetime(2024, 2, 1), "mainline"),
+            record(2, None, None, None),
+            record(3, datetime(2024, 3, 1), datetime(2024, 4, 1), "mainline"),
+        ]
+        processed_issues_table = {}
+
+        assign_issue_seen_summary(
+            issue_key_list=[("issue1", 2), ("issue1", 4)],
+            processed_issues_table=processed_issues_table,
+        )
+
+        mock_get_data.assert_called_once_with(issue_id_list=["issue1"])
+        issue = processed_issues_table["issue1"]
+        assert issue.first_incident.first_seen == datetime(2024, 1, 1)
+        assert issue.first_incident.issue_version == 1
+        assert issue.last_incident.first_seen == datetime(2024, 4, 1)
+        assert issue.last_incident.issue_version == 3
+        assert issue.versions[4] is None
+        assert issue.versions[2].trees == []
+        assert issue.versions[2].tags == set()
+        assert set(issue.versions) == {2, 4}
+
+    @patch("kernelCI_app.helpers.issueExtras.get_issue_seen_summary_data")
+    def test_assign_issue_seen_summary_no_incidents(self, mock_get_data):
+        """Test issues without incidents are left out of the table."""
+        mock_get_data.return_value = []
+        processed_issues_table = {}
+
+        assign_issue_seen_summary(
+            issue_key_list=[("issue1", 1)],
+            processed_issues_table=processed_issues_table,
+        )
+
+        assert processed_issues_table == {}
 
 
 class TestAssignIssueFirstSeen:
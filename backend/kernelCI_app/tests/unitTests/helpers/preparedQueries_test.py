@@ -0,0 +1,126 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from kernelCI_app.helpers.preparedQueries import (
+    REGISTERED_QUERIES,
+    RegisteredQueryCursor,
+    get_plan_cache_mode,
+    register_query,
+    registered_cursor,
+)
+
+
+class TestRegisterQuery:
+    def test_register_query_returns_name(self):
+        assert register_query("unit_test_query", "A query of the unit tests") == (
+            "unit_test_query"
+        )
+        assert REGISTERED_QUERIES["unit_test_query"] == "A query of the unit tests"
+
+    def test_register_query_rejects_duplicates(self):
+        register_query("unit_test_duplicate", "First")
+
+        with pytest.raises(ValueError):
+            register_query("unit_test_duplicate", "Second")
+
+    def test_registered_cursor_rejects_unknown_queries(self):
+        with pytest.raises(ValueError):
+            with registered_cursor("unit_test_unknown"):
+                pass
+
+
+class TestGetPlanCacheMode:
+    def test_defaults_to_auto(self, settings):
+        settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {}
+
+        assert get_plan_cache_mode("tree_details") == "auto"
+
+    def test_returns_pinned_mode(self, settings):
+        settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {
+            "tree_details": "force_generic_plan"
+        }
+
+        assert get_plan_cache_mode("tree_details") == "force_generic_plan"
+
+    def test_rejects_invalid_mode(self, settings):
+        settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {"tree_details": "generic"}
+
+        with pytest.raises(ImproperlyConfigured):
+            get_plan_cache_mode("tree_details")
+
+
+class TestRegisteredQueryCursor:
+    @patch("kernelCI_app.helpers.preparedQueries.REGISTERED_QUERY_DURATION")
+    def test_unprepared_execute(self, mock_histogram):
+        mock_cursor = MagicMock(rowcount=1)
+        cursor = RegisteredQueryCursor(
+            name="tree_details", cursor=mock_cursor, using="default", prepare=False
+        )
+
+        cursor.execute("SELECT 1", {"a": 1})
+
+        mock_cursor.execute.assert_called_once_with("SELECT 1", {"a": 1})
+        mock_histogram.labels.assert_called_once_with(
+            query="tree_details", phase="unprepared"
+        )
+
+    @patch("kernelCI_app.helpers.preparedQueries.connections")
+    @patch("kernelCI_app.helpers.preparedQueries.REGISTERED_QUERY_DURATION")
+    def test_prepared_execute_phases(self, mock_histogram, mock_connections, settings):
+        settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {}
+        mock_cursor = MagicMock(rowcount=1)
+        mock_cursor.connection.prepared_max = 100
+        cursor = RegisteredQueryCursor(
+            name="tree_details", cursor=mock_cursor, using="default", prepare=True
+        )
+
+        cursor.execute("SELECT 1", None)
+        cursor.execute("SELECT 1", None)
+
+        mock_cursor.execute.assert_called_with("SELECT 1", None, prepare=True)
+        phases = [call.kwargs["phase"] for call in mock_histogram.labels.call_args_list]
+        assert phases == ["prepare", "prepared"]
+
+    @patch("kernelCI_app.helpers.preparedQueries.connections")
+    @patch("kernelCI_app.helpers.preparedQueries.REGISTERED_QUERY_DURATION")
+    def test_prepared_texts_follow_prepared_max(
+        self, mock_histogram, mock_connections, settings
+    ):
+        """Statements deallocated by psycopg beyond prepared_max are prepared again"""
+        settings.PREPARED_QUERIES_PLAN_CACHE_MODES = {}
+        mock_cursor = MagicMock(rowcount=1)
+        mock_cursor.connection.prepared_max = 2
+        cursor = RegisteredQueryCursor(
+            name="tree_details", cursor=mock_cursor, using="default", prepare=True
+        )
+
+        for query in ["SELECT 1", "SELECT 2", "SELECT 1", "SELECT 3", "SELECT 2"]:
+            cursor.execute(query, None)
+
+        phases = [call.kwargs["phase"] for call in mock_histogram.labels.call_args_list]
+        assert phases == ["prepare", "prepare", "prepared", "prepare", "prepare"]
+
+    @patch("kernelCI_app.helpers.preparedQueries.REGISTERED_QUERY_ROWS")
+    def test_observes_rows(self, mock_histogram):
+        mock_cursor = MagicMock(rowcount=3)
+        cursor = RegisteredQueryCursor(
+            name="tree_details", cursor=mock_cursor, using="default", prepare=False
+        )
+
+        cursor.execute("SELECT 1", None)
+        mock_cursor.rowcount = -1
+        cursor.execute("SELECT 1", None)
+
+        mock_histogram.labels.assert_called_once_with(query="tree_details")
+        mock_histogram.labels.return_value.observe.assert_called_once_with(3)
+
+    def test_delegates_to_cursor(self):
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [(1,)]
+        cursor = RegisteredQueryCursor(
+            name="tree_details", cursor=mock_cursor, using="default", prepare=False
+        )
+
+        assert cursor.fetchall() == [(1,)]
@@ -5,13 +5,14 @@ from django.test import SimpleTestCase
 from django.utils import timezone
 from pydantic import ValidationError
 
+from kernelCI_app.management.commands.helpers.ingest_records import (
+    flatten_dict_specific,
+)
 from kernelCI_app.management.commands.helpers.kcidbng_ingester import (
     MAP_TABLENAMES_TO_COUNTER,
 )
 from kernelCI_app.management.commands.helpers.process_submissions import (
-    build_instances_from_submission,
-    flatten_dict_specific,
-    get_model_fields,
+    build_records_from_submission,
     insert_items,
     insert_submission_data,
     make_build_instance,
@@ -25,28 +26,6 @@ from kernelCI_app.models import Builds, Checkouts, Incidents, Issues, Tests
 MOCK_TIME = timezone.datetime(2025, 10, 11, 12, 0, 0)
 
 
-class TestGetModelFields(SimpleTestCase):
-    def test_get_model_fields_regular_field(self):
-        mock_field = MagicMock()
-        mock_field.__class__.__name__ = "TextField"
-        mock_field.name = "description"
-
-        result = get_model_fields([mock_field])
-
-        self.assertIn("description", result)
-        self.assertEqual(len(result), 1)
-
-    def test_get_model_fields_foreign_key_field(self):
-        mock_field = MagicMock()
-        mock_field.__class__.__name__ = "ForeignKey"
-        mock_field.name = "description"
-
-        result = get_model_fields([mock_field])
-
-        self.assertIn("description_id", result)
-        self.assertNotIn("description", result)
-
-
 class TestFlattenDictSpecific(SimpleTestCase):
     def test_flatten_dict_specific_with_dict_value(self):
         target = {
@@ -287,41 +266,23 @@ class TestMakeIncidentInstance(SimpleTestCase):
         self.assertEqual(actual_fields, expected_fields)
 
 
-class TestBuildInstancesFromSubmission(SimpleTestCase):
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_issue_instance"
-    )
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_checkout_instance"
-    )
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_build_instance"
-    )
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_test_instance"
-    )
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_incident_instance"
-    )
-    def test_build_instances_from_submission_with_all_types(
-        self,
-        mock_make_incident,
-        mock_make_test,
-        mock_make_build,
-        mock_make_checkout,
-        mock_make_issue,
-    ):
-        mock_make_issue.return_value = MagicMock()
-        mock_make_checkout.return_value = MagicMock()
-        mock_make_build.return_value = MagicMock()
-        mock_make_test.return_value = MagicMock()
-        mock_make_incident.return_value = MagicMock()
-
+@patch("kernelCI_app.management.commands.helpers.process_submissions.timezone.now")
+class TestBuildRecordsFromSubmission(SimpleTestCase):
+    def test_build_records_from_submission_with_all_types(self, mock_now):
+        mock_now.return_value = MOCK_TIME
         submission_data = {
             "issues": [{"id": "issue", "version": 1, "origin": "test"}],
             "checkouts": [{"id": "checkout", "origin": "test"}],
             "builds": [{"id": "build", "origin": "test", "checkout_id": "checkout"}],
-            "tests": [{"id": "test", "origin": "test", "build_id": "build"}],
+            "tests": [
+                {
+                    "id": "test",
+                    "origin": "test",
+                    "build_id": "build",
+                    "environment": {"misc": {"platform": "x86_64"}},
+                    "extra_field": "should_be_filtered",
+                }
+            ],
             "incidents": [
                 {
                     "id": "incident",
@@ -332,27 +293,33 @@ class TestBuildInstancesFromSubmission(SimpleTestCase):
             ],
         }
 
-        result = build_instances_from_submission(
+        result = build_records_from_submission(
             submission_data, MAP_TABLENAMES_TO_COUNTER
         )
 
-        expected = {
-            "issues": [mock_make_issue.return_value],
-            "checkouts": [mock_make_checkout.return_value],
-            "builds": [mock_make_build.return_value],
-            "tests": [mock_make_test.return_value],
-            "incidents": [mock_make_incident.return_value],
-        }
-        self.assertEqual(result, expected)
-
-        mock_make_issue.assert_called_once()
-        mock_make_checkout.assert_called_once()
-        mock_make_build.assert_called_once()
-        mock_make_test.assert_called_once()
-        mock_make_incident.assert_called_once()
+        self.assertEqual(
+            {
+                table: [record.id for record in records]
+                for table, records in result.items()
+            },
+            {
+                "issues": ["issue"],
+                "checkouts": ["checkout"],
+                "builds": ["build"],
+                "tests": ["test"],
+                "incidents": ["incident"],
+            },
+        )
+        test_record = result["tests"][0]
+        self.assertEqual(test_record.build_id, "build")
+        self.assertEqual(test_record.environment_misc, {"platform": "x86_64"})
+        self.assertEqual(test_record.field_timestamp, MOCK_TIME)
+        self.assertFalse(hasattr(test_record, "extra_field"))
+        self.assertEqual(result["builds"][0].checkout_id, "checkout")
+        self.assertEqual(result["incidents"][0].issue_version, 1)
 
-    def test_build_instances_from_submission_with_empty_data(self):
-        result = build_instances_from_submission({}, MAP_TABLENAMES_TO_COUNTER)
+    def test_build_records_from_submission_with_empty_data(self, mock_now):
+        result = build_records_from_submission({}, MAP_TABLENAMES_TO_COUNTER)
 
         expected = {
             "issues": [],
@@ -364,30 +331,8 @@ class TestBuildInstancesFromSubmission(SimpleTestCase):
         self.assertEqual(result, expected)
 
     @patch("kernelCI_app.management.commands.helpers.process_submissions.logger")
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_issue_instance"
-    )
-    def test_build_instances_from_submission_with_validation_error(
-        self, mock_make_issue, mock_logger
-    ):
-        submission_data = {"issues": [{"id": "issue", "version": 1, "origin": "test"}]}
-        mock_make_issue.side_effect = ValidationError.from_exception_data(
-            "TestModel", []
-        )
-
-        result = build_instances_from_submission(
-            submission_data, MAP_TABLENAMES_TO_COUNTER
-        )
-
-        self.assertEqual(len(result["issues"]), 0)
-        mock_logger.error.assert_called_once()
-
-    @patch("kernelCI_app.management.commands.helpers.process_submissions.logger")
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_issue_instance"
-    )
-    def test_build_instances_from_submission_with_non_dict_items(
-        self, mock_make_issue, mock_logger
+    def test_build_records_from_submission_with_non_dict_items(
+        self, mock_logger, mock_now
     ):
         submission_data = {
             "issues": [
@@ -397,18 +342,18 @@ class TestBuildInstancesFromSubmission(SimpleTestCase):
             ]
         }
 
-        result = build_instances_from_submission(
+        result = build_records_from_submission(
             submission_data, MAP_TABLENAMES_TO_COUNTER
         )
 
         self.assertEqual(len(result["issues"]), 2)
-        self.assertEqual(mock_make_issue.call_count, 2)
         mock_logger.warning.assert_called_once()
 
-    @patch(
-        "kernelCI_app.management.commands.helpers.process_submissions.make_issue_instance"
-    )
-    def test_build_instances_from_submission_continues_on_error(self, mock_make_issue):
+    @patch("kernelCI_app.management.commands.helpers.process_submissions.logger")
+    @patch("kernelCI_app.management.commands.helpers.process_submissions.make_record")
+    def test_build_records_from_submission_continues_on_error(
+        self, mock_make_record, mock_logger, mock_now
+    ):
         submission_data = {
             "issues": [
                 {"id": "issue_1", "version": 1, "origin": "test"},
@@ -418,20 +363,19 @@ class TestBuildInstancesFromSubmission(SimpleTestCase):
         }
         mock_issue_1 = MagicMock()
         mock_issue_3 = MagicMock()
-        mock_make_issue.side_effect = [
+        mock_make_record.side_effect = [
             mock_issue_1,
-            ValidationError.from_exception_data("TestModel", []),
+            ValueError("invalid issue"),
             mock_issue_3,
         ]
 
-        result = build_instances_from_submission(
+        result = build_records_from_submission(
             submission_data, MAP_TABLENAMES_TO_COUNTER
         )
 
-        self.assertEqual(len(result["issues"]), 2)
-        self.assertEqual(result["issues"][0], mock_issue_1)
-        self.assertEqual(result["issues"][1], mock_issue_3)
-        self.assertEqual(mock_make_issue.call_count, 3)
+        self.assertEqual(result["issues"], [mock_issue_1, mock_issue_3])
+        self.assertEqual(mock_make_record.call_count, 3)
+        mock_logger.error.assert_called_once()
 
 
 class TestInsertItems(SimpleTestCase):
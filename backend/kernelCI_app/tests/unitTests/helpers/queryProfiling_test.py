@@ -0,0 +1,229 @@
+from unittest.mock import MagicMock, patch
+
+import psycopg
+import pytest
+
+from kernelCI_app.helpers import queryProfiling
+from kernelCI_app.helpers.queryProfiling import (
+    RequestProfile,
+    capture_query_plan,
+    get_query_plans,
+    get_request_profile,
+    is_read_only_query,
+    observe_request_profile,
+    profile_request,
+    profiled_query,
+    record_query,
+)
+
+
+@pytest.fixture(autouse=True)
+def query_plans_settings(settings):
+    settings.QUERY_PLANS_SAMPLE_RATE = 1.0
+    settings.QUERY_PLANS_SLOW_QUERY_SECONDS = 0.5
+    queryProfiling.QUERY_PLANS.clear()
+    yield settings
+    queryProfiling.QUERY_PLANS.clear()
+
+
+def make_postgres_connection() -> MagicMock:
+    return MagicMock(vendor="postgresql", in_atomic_block=False)
+
+
+class TestRecordQuery:
+    @patch("kernelCI_app.helpers.queryProfiling.capture_query_plan")
+    def test_accumulates_into_the_request_profile(self, mock_capture):
+        with profile_request() as profile:
+            record_query(
+                sql="SELECT 1", params=None, using="default", duration=0.1, rows=3
+            )
+            record_query(
+                sql="SELECT 2", params=None, using="default", duration=0.2, rows=-1
+            )
+
+        assert profile.database_seconds == pytest.approx(0.3)
+        assert profile.rows == 3
+        assert get_request_profile() is None
+        mock_capture.assert_not_called()
+
+    @patch("kernelCI_app.helpers.queryProfiling.capture_query_plan")
+    def test_captures_slow_queries(self, mock_capture):
+        with profiled_query("tree_details"):
+            record_query(
+                sql="SELECT 1", params=[1], using="default", duration=1, rows=1
+            )
+
+        mock_capture.assert_called_once_with(
+            sql="SELECT 1", params=[1], using="default", duration=1, name="tree_details"
+        )
+
+    @patch("kernelCI_app.helpers.queryProfiling.capture_query_plan")
+    def test_samples_the_captures(self, mock_capture, settings):
+        settings.QUERY_PLANS_SAMPLE_RATE = 0.5
+
+        with patch(
+            "kernelCI_app.helpers.queryProfiling.random.random", return_value=0.7
+        ):
+            record_query(
+                sql="SELECT 1", params=None, using="default", duration=1, rows=1
+            )
+        mock_capture.assert_not_called()
+
+        with patch(
+            "kernelCI_app.helpers.queryProfiling.random.random", return_value=0.2
+        ):
+            record_query(
+                sql="SELECT 1", params=None, using="default", duration=1, rows=1
+            )
+        mock_capture.assert_called_once()
+
+    @patch("kernelCI_app.helpers.queryProfiling.capture_query_plan")
+    def test_capture_disabled_by_default(self, mock_capture, settings):
+        settings.QUERY_PLANS_SAMPLE_RATE = 0
+
+        record_query(sql="SELECT 1", params=None, using="default", duration=10, rows=1)
+
+        mock_capture.assert_not_called()
+
+
+class TestIsReadOnlyQuery:
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "SELECT 1",
+            "  select id FROM tests",
+            "WITH last AS (SELECT 1) SELECT * FROM last",
+            "-- tree details\n/* listing */ SELECT 1",
+        ],
+    )
+    def test_read_only_queries(self, sql):
+        assert is_read_only_query(sql)
+
+    @pytest.mark.parametrize(
+        "sql",
+        [
+            "INSERT INTO tests (id) VALUES (%s)",
+            "UPDATE tests SET status = 'PASS'",
+            "DELETE FROM pending_test",
+            "WITH claimed AS (DELETE FROM pending_test RETURNING *) SELECT * FROM claimed",
+            "SELECT * INTO tests_copy FROM tests",
+            "SELECT * FROM tests FOR UPDATE",
+            "VACUUM tests",
+        ],
+    )
+    def test_other_queries(self, sql):
+        assert not is_read_only_query(sql)
+
+
+class TestCaptureQueryPlan:
+    @patch("kernelCI_app.helpers.queryProfiling.debug_query")
+    @patch("kernelCI_app.helpers.queryProfiling.connections")
+    def test_keeps_the_newest_plans_first(self, mock_connections, mock_debug_query):
+        mock_connections.__getitem__.return_value = make_postgres_connection()
+        mock_debug_query.side_effect = [
+            ("SELECT 1", "Result (actual rows=1)"),
+            ("SELECT 2", "Result (actual rows=2)"),
+        ]
+
+        capture_query_plan(
+            sql="SELECT %s", params=[1], using="default", duration=1, name=None
+        )
+        capture_query_plan(
+            sql="SELECT %s", params=[2], using="replica", duration=2, name="tree"
+        )
+
+        plans = get_query_plans()
+        assert [plan.sql for plan in plans] == ["SELECT 2", "SELECT 1"]
+        assert plans[0].query == "tree"
+        assert plans[0].database == "replica"
+        assert plans[0].plan == "Result (actual rows=2)"
+
+    @patch("kernelCI_app.helpers.queryProfiling.debug_query")
+    @patch("kernelCI_app.helpers.queryProfiling.connections")
+    def test_only_analyzes_read_only_queries(self, mock_connections, mock_debug_query):
+        mock_connections.__getitem__.return_value = make_postgres_connection()
+        mock_debug_query.return_value = ("SQL", "Plan")
+
+        capture_query_plan(
+            sql="SELECT 1", params=None, using="default", duration=1, name=None
+        )
+        capture_query_plan(
+            sql="DELETE FROM pending_test",
+            params=None,
+            using="default",
+            duration=1,
+            name=None,
+        )
+
+        analyzed = [call.kwargs["analyze"] for call in mock_debug_query.call_args_list]
+        assert analyzed == [True, False]
+        assert len(get_query_plans()) == 2
+
+    @patch("kernelCI_app.helpers.queryProfiling.debug_query")
+    @patch("kernelCI_app.helpers.queryProfiling.connections")
+    def test_skips_transactions(self, mock_connections, mock_debug_query):
+        db_connection = make_postgres_connection()
+        db_connection.in_atomic_block = True
+        mock_connections.__getitem__.return_value = db_connection
+
+        capture_query_plan(
+            sql="SELECT 1", params=None, using="default", duration=1, name=None
+        )
+
+        mock_debug_query.assert_not_called()
+        assert get_query_plans() == []
+
+    @patch("kernelCI_app.helpers.queryProfiling.debug_query")
+    def test_skips_other_databases(self, mock_debug_query):
+        capture_query_plan(
+            sql="SELECT 1", params=None, using="cache", duration=1, name=None
+        )
+
+        mock_debug_query.assert_not_called()
+        assert get_query_plans() == []
+
+    @patch("kernelCI_app.helpers.queryProfiling.debug_query")
+    @patch("kernelCI_app.helpers.queryProfiling.connections")
+    def test_ignores_errors(self, mock_connections, mock_debug_query):
+        mock_connections.__getitem__.return_value = make_postgres_connection()
+        mock_debug_query.side_effect = psycopg.errors.QueryCanceled()
+
+        capture_query_plan(
+            sql="SELECT 1", params=None, using="default", duration=1, name=None
+        )
+
+        assert get_query_plans() == []
+
+
+class TestObserveRequestProfile:
+    @patch("kernelCI_app.helpers.queryProfiling.VIEW_ROWS")
+    @patch("kernelCI_app.helpers.queryProfiling.VIEW_DURATION")
+    def test_observes_the_phases(self, mock_duration, mock_rows):
+        profile = RequestProfile(
+            view_start=10.0,
+            view_end=11.0,
+            render_end=11.5,
+            database_seconds=0.25,
+            rows=42,
+        )
+
+        observe_request_profile(view="treeDetailsView", profile=profile, end=12.0)
+
+        phases = [call.kwargs["phase"] for call in mock_duration.labels.call_args_list]
+        durations = [
+            call.args[0]
+            for call in mock_duration.labels.return_value.observe.call_args_list
+        ]
+        observed = dict(zip(phases, durations, strict=True))
+        assert observed == {
+            "database": 0.25,
+            "processing": 0.75,
+            "rendering": 0.5,
+        }
+        mock_rows.labels.return_value.observe.assert_called_once_with(42)
+
+    @patch("kernelCI_app.helpers.queryProfiling.VIEW_DURATION")
+    def test_skips_requests_without_view(self, mock_duration):
+        observe_request_profile(view="treeDetailsView", profile=RequestProfile(), end=1)
+
+        mock_duration.labels.assert_not_called()
@@ -0,0 +1,132 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from kernelCI_app.helpers.responseValidation import (
+    build_response,
+    build_response_data,
+    should_validate_response,
+)
+from kernelCI_app.typeModels.commonDetails import (
+    BuildHistoryItem,
+    CommonDetailsTestsResponse,
+)
+from kernelCI_app.typeModels.treeDetails import TreeDetailsBuildsResponse
+
+HISTORY_ITEM = {
+    "id": "maestro:test1",
+    "origin": "maestro",
+    "status": "FAIL",
+    "duration": 12.5,
+    "path": "kselftest.cpufreq",
+    "start_time": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    "environment_compatible": ["rockchip,rk3399"],
+    "config": "defconfig",
+    "log_url": "https://example.com/log.txt",
+    "architecture": "arm64",
+    "compiler": "gcc-12",
+    "environment_misc": {"platform": "rk3399", "job_id": "42"},
+    "lab": "lab-collabora",
+}
+
+BUILD_ITEM = BuildHistoryItem(
+    id="maestro:build1",
+    origin="maestro",
+    architecture="arm64",
+    config_name="defconfig",
+    misc=None,
+    config_url=None,
+    compiler="gcc-12",
+    status="PASS",
+    duration=120,
+    log_url=None,
+    start_time=datetime(2025, 1, 1, tzinfo=timezone.utc),
+    git_repository_url=None,
+    git_repository_branch=None,
+)
+
+
+class TestShouldValidateResponse:
+    def test_full_policy_always_validates(self, settings):
+        settings.RESPONSE_VALIDATION = "full"
+
+        assert should_validate_response()
+
+    def test_off_policy_never_validates(self, settings):
+        settings.RESPONSE_VALIDATION = "off"
+
+        assert not should_validate_response()
+
+    @pytest.mark.parametrize("sample, expected", [(0.001, True), (0.5, False)])
+    def test_sampled_policy_validates_a_share_of_responses(
+        self, settings, sample, expected
+    ):
+        settings.RESPONSE_VALIDATION = "sampled"
+        settings.RESPONSE_VALIDATION_SAMPLE_RATE = 0.01
+
+        with patch(
+            "kernelCI_app.helpers.responseValidation.random.random",
+            return_value=sample,
+        ):
+            assert should_validate_response() is expected
+
+
+class TestBuildResponseData:
+    @pytest.mark.parametrize("policy", ["full", "off"])
+    def test_history_items_have_the_same_data(self, settings, policy):
+        settings.RESPONSE_VALIDATION = policy
+
+        response_data = build_response_data(
+            CommonDetailsTestsResponse, tests=[HISTORY_ITEM]
+        )
+
+        assert (
+            response_data
+            == CommonDetailsTestsResponse(tests=[HISTORY_ITEM]).model_dump()
+        )
+
+    @pytest.mark.parametrize("policy", ["full", "off"])
+    def test_models_are_dumped(self, settings, policy):
+        settings.RESPONSE_VALIDATION = policy
+
+        response_data = build_response_data(
+            TreeDetailsBuildsResponse, builds=[BUILD_ITEM]
+        )
+
+        assert response_data == {"builds": [BUILD_ITEM.model_dump()]}
+
+    def test_invalid_fields_raise_when_validated(self, settings):
+        settings.RESPONSE_VALIDATION = "full"
+
+        with pytest.raises(ValidationError):
+            build_response_data(
+                CommonDetailsTestsResponse, tests=[{**HISTORY_ITEM, "id": None}]
+            )
+
+    def test_fields_are_not_validated_when_off(self, settings):
+        settings.RESPONSE_VALIDATION = "off"
+        invalid_item = {**HISTORY_ITEM, "id": None}
+
+        response_data = build_response_data(
+            CommonDetailsTestsResponse, tests=[invalid_item]
+        )
+
+        assert response_data == {"tests": [invalid_item]}
+
+
+class TestBuildResponse:
+    def test_returns_the_model_when_validated(self, settings):
+        settings.RESPONSE_VALIDATION = "full"
+
+        response = build_response(CommonDetailsTestsResponse, tests=[HISTORY_ITEM])
+
+        assert response == CommonDetailsTestsResponse(tests=[HISTORY_ITEM])
+
+    def test_returns_the_data_when_not_validated(self, settings):
+        settings.RESPONSE_VALIDATION = "off"
+
+        response = build_response(CommonDetailsTestsResponse, tests=[HISTORY_ITEM])
+
+        assert response == {"tests": [HISTORY_ITEM]}
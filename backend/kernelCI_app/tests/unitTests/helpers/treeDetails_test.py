@@ -544,7 +544,7 @@ class TestDecideIfIsBuildFilteredOut:
     def test_decide_if_is_build_filtered_out(self):
         """Test decide_if_is_build_filtered_out function."""
         instance = MagicMock()
-        instance.filters.is_build_filtered_out.return_value = True
+        instance.filters.build_predicate.return_value = True
 
         row_data = {
             "issue_id": "issue123",
@@ -558,7 +558,7 @@ class TestDecideIfIsBuildFilteredOut:
         result = decide_if_is_build_filtered_out(instance, row_data)
 
         assert result is True
-        instance.filters.is_build_filtered_out.assert_called_once_with(
+        instance.filters.build_predicate.assert_called_once_with(
             build_status="FAIL",
             duration=100,
             issue_id="issue123",
@@ -572,7 +572,7 @@ class TestDecideIfIsBootFilteredOut:
     def test_decide_if_is_boot_filtered_out(self):
         """Test decide_if_is_boot_filtered_out function."""
         instance = MagicMock()
-        instance.filters.is_boot_filtered_out.return_value = True
+        instance.filters.boot_predicate.return_value = True
 
         row_data = {
             "test_status": "FAIL",
@@ -587,7 +587,7 @@ class TestDecideIfIsBootFilteredOut:
         result = decide_if_is_boot_filtered_out(instance, row_data)
 
         assert result is True
-        instance.filters.is_boot_filtered_out.assert_called_once_with(
+        instance.filters.boot_predicate.assert_called_once_with(
             duration=100,
             issue_id="issue123",
             issue_version=1,
@@ -605,7 +605,7 @@ class TestDecideIfIsFullRowFilteredOut:
         mock_get_hardware_filter.return_value = "hardware1"
 
         instance = MagicMock()
-        instance.filters.is_record_filtered_out.return_value = True
+        instance.filters.record_predicate.return_value = True
 
         row_data = {
             "build_architecture": "x86_64",
@@ -619,7 +619,7 @@ class TestDecideIfIsFullRowFilteredOut:
         result = decide_if_is_full_row_filtered_out(instance, row_data)
 
         assert result is True
-        instance.filters.is_record_filtered_out.assert_called_once_with(
+        instance.filters.record_predicate.assert_called_once_with(
             hardwares=["hardware1"],
             architecture="x86_64",
             compiler="gcc",
@@ -632,7 +632,7 @@ class TestDecideIfIsTestFilteredOut:
     def test_decide_if_is_test_filtered_out(self):
         """Test decide_if_is_test_filtered_out function."""
         instance = MagicMock()
-        instance.filters.is_test_filtered_out.return_value = True
+        instance.filters.test_predicate.return_value = True
 
         row_data = {
             "test_status": "FAIL",
@@ -647,7 +647,7 @@ class TestDecideIfIsTestFilteredOut:
         result = decide_if_is_test_filtered_out(instance, row_data)
 
         assert result is True
-        instance.filters.is_test_filtered_out.assert_called_once_with(
+        instance.filters.test_predicate.assert_called_once_with(
             duration=100,
             issue_id="issue123",
             issue_version=1,
@@ -0,0 +1,71 @@
+import json
+import math
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from kernelCI_app.renderers.jsonRenderer import FastJSONRenderer
+from kernelCI_app.typeModels.treeListing import TestStatusCount
+
+RESPONSE_DATA = {
+    "id": "maestro:test1",
+    "start_time": datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+    "local_time": datetime(2025, 1, 1, 12, 30, 15),
+    "day": date(2025, 1, 1),
+    "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "duration": 12.5,
+    "count": 3,
+    "passed": True,
+    "log_url": None,
+    "path": "kselftest.ünïcode",
+    "environment_misc": {"platform": "rk3399", "compatibles": ("a", "b")},
+    "issues": [{"id": "maestro:issue", "version": 1}],
+}
+
+
+class TestFastJSONRenderer:
+    @pytest.mark.parametrize(
+        "data",
+        [RESPONSE_DATA, [RESPONSE_DATA, RESPONSE_DATA], {}, [], "text", 1.5],
+    )
+    def test_renders_as_json_renderer(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_renders_models_as_their_dump(self):
+        model = TestStatusCount(**{"pass": 2, "fail": 1})
+
+        rendered = FastJSONRenderer().render({"summary": model})
+
+        assert rendered == JSONRenderer().render({"summary": model.model_dump()})
+        assert FastJSONRenderer().render(model) == JSONRenderer().render(
+            model.model_dump()
+        )
+
+    def test_renders_nothing_for_none(self):
+        assert FastJSONRenderer().render(None) == b""
+
+    def test_indents_when_requested(self):
+        rendered = FastJSONRenderer().render(
+            RESPONSE_DATA, "application/json; indent=2"
+        )
+
+        assert rendered.startswith(b'{\n  "id"')
+        assert json.loads(rendered) == json.loads(JSONRenderer().render(RESPONSE_DATA))
+
+    def test_falls_back_to_the_json_renderer_encoder(self):
+        data = {"message": gettext_lazy("No results")}
+
+        assert FastJSONRenderer().render(data) == b'{"message":"No results"}'
+
+    def test_escapes_line_separators(self):
+        data = {"comment": "line\u2028paragraph\u2029"}
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_renders_nan_as_null(self):
+        assert FastJSONRenderer().render({"duration": math.nan}) == (
+            b'{"duration":null}'
+        )
@@ -0,0 +1,122 @@
+import gzip
+import json
+from unittest.mock import patch
+
+import pytest
+import zstandard
+from django.core.cache import cache
+from django.middleware.gzip import GZipMiddleware
+from django.test import RequestFactory
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.middleware.precompressedCacheMiddleware import (
+    precompressed_cache_page,
+)
+
+ROWS = [{"id": f"maestro:test{i}", "status": "PASS"} for i in range(100)]
+
+
+class RowsView(APIView):
+    calls = 0
+
+    def get(self, request):
+        RowsView.calls += 1
+        return Response({"rows": ROWS})
+
+
+class ShortView(APIView):
+    def get(self, request):
+        return Response({"rows": []})
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    # The default cache is Redis, which the unit tests can't reach
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+    cache.clear()
+    RowsView.calls = 0
+    yield
+    cache.clear()
+
+
+def _get(view, accept_encoding: str = "", path: str = "/api/rows"):
+    """Requests the view through GZipMiddleware, rendering the response of the
+    view before the middleware processes it, as the request handler does"""
+    request = RequestFactory().get(
+        path, HTTP_ACCEPT="application/json", HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    cached_view = precompressed_cache_page(60)(view.as_view())
+
+    def get_response(request):
+        response = cached_view(request)
+        if hasattr(response, "render"):
+            response = response.render()
+        return response
+
+    return GZipMiddleware(get_response)(request)
+
+
+def _decode(response) -> dict:
+    encoding = response.get("Content-Encoding")
+    if encoding == "zstd":
+        return json.loads(zstandard.ZstdDecompressor().decompress(response.content))
+    if encoding == "gzip":
+        return json.loads(gzip.decompress(response.content))
+    return json.loads(response.content)
+
+
+class TestPrecompressedCachePage:
+    @pytest.mark.parametrize(
+        "accept_encoding, expected_encoding",
+        [
+            ("gzip, deflate, br, zstd", "zstd"),
+            ("gzip, deflate", "gzip"),
+            ("", None),
+        ],
+    )
+    def test_serves_cache_hits_in_the_accepted_encoding(
+        self, accept_encoding, expected_encoding
+    ):
+        _get(RowsView, "gzip")
+
+        with patch("django.middleware.gzip.compress_string") as mock_compress:
+            response = _get(RowsView, accept_encoding)
+
+        mock_compress.assert_not_called()
+        assert RowsView.calls == 1
+        assert response.get("Content-Encoding") == expected_encoding
+        if expected_encoding is not None:
+            assert response["Content-Length"] == str(len(response.content))
+        assert "Accept-Encoding" in response["Vary"]
+        assert _decode(response) == {"rows": ROWS}
+
+    def test_serves_the_response_filling_the_cache_compressed(self):
+        with patch("django.middleware.gzip.compress_string") as mock_compress:
+            response = _get(RowsView, "gzip")
+
+        mock_compress.assert_not_called()
+        assert response["Content-Encoding"] == "gzip"
+        assert _decode(response) == {"rows": ROWS}
+
+    def test_keeps_a_single_entry_for_every_encoding(self):
+        for accept_encoding in ["zstd", "gzip", "", "br"]:
+            assert _decode(_get(RowsView, accept_encoding)) == {"rows": ROWS}
+
+        assert RowsView.calls == 1
+
+    def test_does_not_compress_short_responses(self):
+        _get(ShortView, "gzip", path="/api/short")
+        response = _get(ShortView, "gzip", path="/api/short")
+
+        assert not response.has_header("Content-Encoding")
+        assert _decode(response) == {"rows": []}
+
+    def test_caches_only_the_rendered_content(self):
+        _get(RowsView, "gzip")
+        response = _get(RowsView, "gzip")
+
+        assert not hasattr(response, "data")
+        assert response["Content-Type"] == "application/json"
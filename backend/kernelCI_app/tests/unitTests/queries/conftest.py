@@ -9,6 +9,12 @@ def setup_mock_cursor(mock_connection):
     return mock_cursor
 
 
+def setup_mock_registered_cursor(mock_registered_cursor):
+    mock_cursor = MagicMock()
+    mock_registered_cursor.return_value.__enter__.return_value = mock_cursor
+    return mock_cursor
+
+
 def setup_mock_queryset(mock_model, return_value):
     mock_queryset = Mock()
     mock_queryset.values.return_value = mock_queryset
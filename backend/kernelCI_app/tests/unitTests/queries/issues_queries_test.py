@@ -1,5 +1,5 @@
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 from kernelCI_app.queries.issues import (
     get_build_issues,
@@ -8,6 +8,7 @@ from kernelCI_app.queries.issues import (
     get_issue_first_seen_data,
     get_issue_last_seen_data,
     get_issue_listing_data,
+    get_issue_listing_page,
     get_issue_tests,
     get_issue_trees_data,
     get_latest_issue_version,
@@ -16,6 +17,7 @@ from kernelCI_app.queries.issues import (
 from kernelCI_app.tests.unitTests.queries.conftest import (
     setup_mock_cursor,
     setup_mock_queryset,
+    setup_mock_registered_cursor,
 )
 
 
@@ -124,6 +126,69 @@ class TestGetIssueListingData:
         mock_get_cache.assert_called_once()
 
 
+class TestGetIssueListingPage:
+    @patch("kernelCI_app.queries.issues.get_query_cache")
+    @patch("kernelCI_app.queries.issues.set_query_cache")
+    @patch("kernelCI_app.queries.issues.dict_fetchall")
+    @patch("kernelCI_app.queries.issues.registered_cursor")
+    def test_get_issue_listing_page_with_filters(
+        self, mock_registered_cursor, mock_dict_fetchall, mock_set_cache, mock_get_cache
+    ):
+        mock_get_cache.return_value = None
+        expected_rows = [{"id": "issue", "version": 1}]
+        mock_dict_fetchall.return_value = expected_rows
+        mock_cursor = setup_mock_registered_cursor(mock_registered_cursor)
+        mock_cursor.fetchone.return_value = (5,)
+
+        rows, total = get_issue_listing_page(
+            start_date=datetime(2025, 11, 4),
+            end_date=datetime(2025, 11, 11),
+            origins=["maestro"],
+            culprits=["tool", "code", "invalid"],
+            categories=[],
+            has_incident=True,
+            limit=10,
+            offset=20,
+        )
+
+        assert rows == expected_rows
+        assert total == 5
+        page_query, page_params = mock_cursor.execute.call_args_list[0][0]
+        assert "origin = ANY(%(origins)s)" in page_query
+        assert "(culprit_code IS TRUE OR culprit_tool IS TRUE)" in page_query
+        assert "invalid" not in page_query
+        assert "categories &&" not in page_query
+        assert "incident_count > 0" in page_query
+        assert page_params["limit"] == 10
+        assert page_params["offset"] == 20
+        assert [call.args for call in mock_registered_cursor.call_args_list] == [
+            ("issue_listing_page",),
+            ("issue_listing_count",),
+        ]
+        mock_set_cache.assert_called_once()
+
+    @patch("kernelCI_app.queries.issues.get_query_cache")
+    @patch("kernelCI_app.queries.issues.registered_cursor")
+    def test_get_issue_listing_page_cache_hit(
+        self, mock_registered_cursor, mock_get_cache
+    ):
+        mock_get_cache.return_value = {"rows": [{"id": "issue"}], "total": 1}
+
+        result = get_issue_listing_page(
+            start_date=datetime(2025, 11, 4),
+            end_date=datetime(2025, 11, 11),
+            origins=[],
+            culprits=[],
+            categories=[],
+            has_incident=False,
+            limit=None,
+            offset=0,
+        )
+
+        assert result == ([{"id": "issue"}], 1)
+        mock_registered_cursor.assert_not_called()
+
+
 class TestGetLatestIssueVersion:
     @patch("kernelCI_app.queries.issues.Issues")
     def test_get_latest_issue_version_success(self, mock_issues_model):
@@ -323,12 +388,11 @@ class TestGetIssueLastSeenData:
 
 class TestGetIssueTreesData:
     @patch("kernelCI_app.queries.issues.dict_fetchall")
-    @patch("kernelCI_app.queries.issues.connections")
-    def test_get_issue_trees_data_success(self, mock_connections, mock_dict_fetchall):
+    @patch("kernelCI_app.queries.issues.connection")
+    def test_get_issue_trees_data_success(self, mock_connection, mock_dict_fetchall):
         expected_result = [{"issue_id": "issue_1", "issue_version": 1}]
         mock_dict_fetchall.return_value = expected_result
-        mock_cursor = MagicMock()
-        mock_connections.__getitem__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        setup_mock_cursor(mock_connection)
 
         result = get_issue_trees_data(issue_key_list=[("issue_1", 1), ("issue_2", 2)])
 
@@ -340,9 +404,9 @@ class TestGetIssueTreesData:
         assert result == []
 
     @patch("kernelCI_app.queries.issues.dict_fetchall")
-    @patch("kernelCI_app.queries.issues.connections")
+    @patch("kernelCI_app.queries.issues.connection")
     def test_get_issue_trees_data_multiple_issues(
-        self, mock_connections, mock_dict_fetchall
+        self, mock_connection, mock_dict_fetchall
     ):
         expected_result = [
             {
@@ -367,8 +431,7 @@ class TestGetIssueTreesData:
             },
         ]
         mock_dict_fetchall.return_value = expected_result
-        mock_cursor = MagicMock()
-        mock_connections.__getitem__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_cursor = setup_mock_cursor(mock_connection)
 
         result = get_issue_trees_data(
             issue_key_list=[("issue_1", 1), ("issue_2", 2), ("issue_3", 3)]
@@ -384,9 +447,9 @@ class TestGetIssueTreesData:
         assert result[1]["incident_issue_version"] is None
 
     @patch("kernelCI_app.queries.issues.dict_fetchall")
-    @patch("kernelCI_app.queries.issues.connections")
+    @patch("kernelCI_app.queries.issues.connection")
     def test_get_issue_trees_data_issue_with_no_incidents(
-        self, mock_connections, mock_dict_fetchall
+        self, mock_connection, mock_dict_fetchall
     ):
         expected_result = [
             {
@@ -401,8 +464,7 @@ class TestGetIssueTreesData:
             }
         ]
         mock_dict_fetchall.return_value = expected_result
-        mock_cursor = MagicMock()
-        mock_connections.__getitem__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
+        setup_mock_cursor(mock_connection)
 
         result = get_issue_trees_data(issue_key_list=[("issue_1", 1)])
 
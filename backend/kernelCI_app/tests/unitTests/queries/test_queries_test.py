@@ -66,13 +66,14 @@ class TestGetTestStatusHistory:
         )
 
         assert result == expected_result
-        assert mock_cursor.execute.call_count > 1
-        query_call = mock_cursor.execute.call_args_list[1]
-        assert "platform" in query_call[0][1]
+        mock_cursor.execute.assert_called_once()
+        query_call = mock_cursor.execute.call_args_list[0]
+        assert "TEST_SERIES" in query_call[0][0]
+        assert "enable_nestloop" not in query_call[0][0]
         assert query_call[0][1]["platform"] == "x86_64"
         mock_get_cache.assert_called_once()
         mock_set_cache.assert_called_once()
-        mock_transaction.assert_called_once()
+        mock_transaction.assert_not_called()
 
     @patch("kernelCI_app.queries.test.transaction.atomic")
     @patch("kernelCI_app.queries.test.set_query_cache")
@@ -107,7 +108,7 @@ class TestGetTestStatusHistory:
         )
 
         assert result == expected_result
-        query_call = mock_cursor.execute.call_args_list[1]
+        query_call = mock_cursor.execute.call_args_list[0]
         assert "field_timestamp" in query_call[0][1]
         assert query_call[0][1]["field_timestamp"] == "2025-11-11T10:00:00Z"
         mock_get_cache.assert_called_once()
@@ -145,7 +146,7 @@ class TestGetTestStatusHistory:
             group_size=10,
         )
 
-        query_call = mock_cursor.execute.call_args_list[1]
+        query_call = mock_cursor.execute.call_args_list[0]
         assert "test_start_time" in query_call[0][1]
         assert query_call[0][1]["test_start_time"] == "2025-11-10T10:00:00Z"
         mock_get_cache.assert_called_once()
@@ -185,10 +186,9 @@ class TestGetTestStatusHistory:
         )
 
         assert result == expected_result
-        query_call = mock_cursor.execute.call_args_list[1]
-        sql = query_call[0][0]
-        assert "T.START_TIME IS NULL" in sql
-        assert "T._TIMESTAMP IS NULL" in sql
+        sql = mock_cursor.execute.call_args_list[0][0][0]
+        assert "TS.START_TIME IS NULL" in sql
+        assert "TS._TIMESTAMP IS NULL" in sql
         mock_get_cache.assert_called_once()
         mock_set_cache.assert_called_once()
         mock_transaction.assert_called_once()
@@ -221,3 +221,43 @@ class TestGetTestStatusHistory:
         mock_dict_fetchall.assert_not_called()
         mock_set_cache.assert_not_called()
         mock_get_cache.assert_called_once()
+
+    @patch("kernelCI_app.queries.test.transaction.atomic")
+    @patch("kernelCI_app.queries.test.set_query_cache")
+    @patch("kernelCI_app.queries.test.get_query_cache")
+    @patch("kernelCI_app.queries.test.dict_fetchall")
+    @patch("kernelCI_app.queries.test.connection")
+    def test_get_test_status_history_falls_back_to_tests_table(
+        self,
+        mock_connection,
+        mock_dict_fetchall,
+        mock_get_cache,
+        mock_set_cache,
+        mock_transaction,
+    ):
+        """A test that wasn't aggregated into its series yet is read from the tests table"""
+        mock_transaction.return_value.__enter__ = Mock(return_value=None)
+        mock_transaction.return_value.__exit__ = Mock(return_value=None)
+        expected_result = [{"id": "test", "status": "PASS"}]
+        mock_dict_fetchall.side_effect = [[], expected_result]
+        mock_get_cache.return_value = None
+        mock_cursor = setup_mock_cursor(mock_connection)
+
+        result = get_test_status_history(
+            path="boot",
+            origin="maestro",
+            git_repository_url="https://my_url.com",
+            git_repository_branch="master",
+            platform="x86_64",
+            test_start_time="2025-11-11T10:00:00Z",
+            config_name="defconfig",
+            field_timestamp=None,
+            group_size=10,
+        )
+
+        assert result == expected_result
+        queries = [call[0][0] for call in mock_cursor.execute.call_args_list]
+        assert "TEST_SERIES" in queries[0]
+        assert queries[1] == "SET LOCAL enable_nestloop = off"
+        assert "T.START_TIME <= %(test_start_time)s" in queries[2]
+        assert mock_set_cache.call_args.kwargs["rows"] == expected_result
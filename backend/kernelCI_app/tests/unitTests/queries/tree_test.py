@@ -5,8 +5,8 @@ from kernelCI_app.queries.tree import (
     get_tree_details_data,
 )
 from kernelCI_app.tests.unitTests.queries.conftest import (
-    setup_mock_cursor,
     setup_mock_queryset,
+    setup_mock_registered_cursor,
 )
 
 
@@ -28,10 +28,10 @@ class TestGetTreeDetailsData:
     @patch("kernelCI_app.queries.tree.get_query_cache")
     @patch("kernelCI_app.queries.tree.set_query_cache")
     @patch("kernelCI_app.queries.tree.create_checkouts_where_clauses")
-    @patch("kernelCI_app.queries.tree.connection")
+    @patch("kernelCI_app.queries.tree.registered_cursor")
     def test_get_tree_details_data_from_database(
         self,
-        mock_connection,
+        mock_registered_cursor,
         mock_create_clauses,
         mock_set_cache,
         mock_get_cache,
@@ -43,7 +43,7 @@ class TestGetTreeDetailsData:
             "tree_name_clause": "",
             "git_url_clause": "git_repository_url = %(git_url_param)s",
         }
-        mock_cursor = setup_mock_cursor(mock_connection)
+        mock_cursor = setup_mock_registered_cursor(mock_registered_cursor)
         mock_cursor.fetchall.return_value = expected_data
 
         result = get_tree_details_data(
@@ -54,6 +54,7 @@ class TestGetTreeDetailsData:
         )
 
         assert result == expected_data
+        mock_registered_cursor.assert_called_once_with("tree_details")
         mock_set_cache.assert_called_once()
 
 
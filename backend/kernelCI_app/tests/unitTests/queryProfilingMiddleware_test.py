@@ -0,0 +1,68 @@
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+from prometheus_client import REGISTRY
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.helpers.queryProfiling import record_query
+from kernelCI_app.middleware.queryProfilingMiddleware import QueryProfilingMiddleware
+
+VIEW_NAME = "queryProfilingTestView"
+
+
+class RowsView(APIView):
+    def get(self, request):
+        # Records the query like the execute wrapper of the connections does
+        record_query(
+            sql="SELECT 1 UNION ALL SELECT 2",
+            params=None,
+            using="default",
+            duration=0.01,
+            rows=2,
+        )
+        return Response({"rows": [(1,), (2,)]})
+
+
+def get_sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, {"view": VIEW_NAME, **labels}) or 0.0
+
+
+def run_view(request):
+    """Runs the view through the middleware hooks like Django's handler does"""
+    middleware = QueryProfilingMiddleware(lambda request: None)
+
+    def get_response(request):
+        request.resolver_match = ResolverMatch(RowsView.as_view(), (), {}, VIEW_NAME)
+        middleware.process_view(request, RowsView.as_view(), (), {})
+        response = RowsView.as_view()(request)
+        response = middleware.process_template_response(request, response)
+        return response.render()
+
+    middleware.get_response = get_response
+    return middleware(request)
+
+
+def test_observes_the_phases_of_the_view():
+    count_before = {
+        phase: get_sample("kernelci_view_duration_seconds_count", phase=phase)
+        for phase in ["database", "processing", "rendering"]
+    }
+    rows_before = get_sample("kernelci_view_rows_count")
+
+    response = run_view(RequestFactory().get("/"))
+
+    assert response.status_code == 200
+    for phase, count in count_before.items():
+        assert (
+            get_sample("kernelci_view_duration_seconds_count", phase=phase) == count + 1
+        )
+    assert get_sample("kernelci_view_rows_count") == rows_before + 1
+
+
+def test_skips_unresolved_requests():
+    middleware = QueryProfilingMiddleware(lambda request: Response(status=404))
+    count_before = get_sample("kernelci_view_rows_count")
+
+    middleware(RequestFactory().get("/"))
+
+    assert get_sample("kernelci_view_rows_count") == count_before
@@ -0,0 +1,147 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import DatabaseError
+from django.test import RequestFactory
+
+from kernelCI_app.middleware.replicaRoutingMiddleware import ReplicaRoutingMiddleware
+from kernelCI_app.models import Checkouts
+from kernelCI_app.routers import replicas
+from kernelCI_app.routers.databaseRouter import DatabaseRouter
+from kernelCI_app.routers.replicas import (
+    choose_read_database,
+    get_read_database,
+    is_replica_healthy,
+    is_replica_view,
+    use_primary_database,
+    use_read_database,
+)
+from kernelCI_cache.models import NotificationsIssue
+
+
+@pytest.fixture(autouse=True)
+def replica_settings(settings):
+    settings.DATABASE_REPLICAS = ["replica", "replica_2"]
+    settings.REPLICA_VIEWS = ["treeDetailsView"]
+    settings.REPLICA_MAX_LAG_SECONDS = 30
+    settings.REPLICA_LAG_CHECK_INTERVAL = 5
+    replicas._replica_health.clear()
+    yield settings
+    replicas._replica_health.clear()
+
+
+class TestReadDatabase:
+    def test_defaults_to_primary(self):
+        assert get_read_database() == "default"
+
+    def test_use_read_database(self):
+        with use_read_database("replica"):
+            assert get_read_database() == "replica"
+            with use_primary_database():
+                assert get_read_database() == "default"
+            assert get_read_database() == "replica"
+        assert get_read_database() == "default"
+
+
+class TestReplicaHealth:
+    @patch("kernelCI_app.routers.replicas._get_replica_lag")
+    def test_replica_within_max_lag(self, mock_get_lag):
+        mock_get_lag.return_value = 2.5
+
+        assert is_replica_healthy("replica") is True
+
+    @patch("kernelCI_app.routers.replicas._get_replica_lag")
+    def test_replica_behind_max_lag(self, mock_get_lag):
+        mock_get_lag.return_value = 120
+
+        assert is_replica_healthy("replica") is False
+
+    @patch("kernelCI_app.routers.replicas._get_replica_lag")
+    def test_unavailable_replica(self, mock_get_lag):
+        mock_get_lag.side_effect = DatabaseError("connection refused")
+
+        assert is_replica_healthy("replica") is False
+
+    @patch("kernelCI_app.routers.replicas._get_replica_lag")
+    def test_lag_is_checked_once_per_interval(self, mock_get_lag):
+        mock_get_lag.return_value = 0
+
+        is_replica_healthy("replica")
+        is_replica_healthy("replica")
+
+        mock_get_lag.assert_called_once_with("replica")
+
+    @patch("kernelCI_app.routers.replicas.is_replica_healthy")
+    def test_choose_read_database_skips_lagging_replicas(self, mock_is_healthy):
+        mock_is_healthy.side_effect = lambda alias: alias == "replica_2"
+
+        assert choose_read_database() == "replica_2"
+
+    @patch("kernelCI_app.routers.replicas.is_replica_healthy")
+    def test_choose_read_database_falls_back_to_primary(self, mock_is_healthy):
+        mock_is_healthy.return_value = False
+
+        assert choose_read_database() == "default"
+
+
+class TestIsReplicaView:
+    def test_listed_view(self):
+        assert is_replica_view("treeDetailsView") is True
+        assert is_replica_view("hardware") is False
+
+    def test_all_views(self, replica_settings):
+        replica_settings.REPLICA_VIEWS = ["*"]
+
+        assert is_replica_view("hardware") is True
+
+    def test_without_replicas(self, replica_settings):
+        replica_settings.DATABASE_REPLICAS = []
+
+        assert is_replica_view("treeDetailsView") is False
+
+
+class TestDatabaseRouter:
+    def test_db_for_read(self):
+        router = DatabaseRouter()
+
+        with use_read_database("replica"):
+            assert router.db_for_read(Checkouts) == "replica"
+            assert router.db_for_read(NotificationsIssue) is None
+            assert router.db_for_write(Checkouts) is None
+
+    def test_replicas_are_not_migrated(self):
+        router = DatabaseRouter()
+
+        assert router.allow_migrate("replica", "kernelCI_app") is False
+        assert (
+            router.allow_migrate("replica_2", "kernelCI_cache", run_always=True)
+            is False
+        )
+
+
+class TestReplicaRoutingMiddleware:
+    def _call(self, method: str, path: str) -> list[str]:
+        databases = []
+
+        def get_response(request):
+            databases.append(get_read_database())
+            return MagicMock()
+
+        request = getattr(RequestFactory(), method)(path)
+        ReplicaRoutingMiddleware(get_response)(request)
+        return databases
+
+    @patch(
+        "kernelCI_app.middleware.replicaRoutingMiddleware.choose_read_database",
+        return_value="replica",
+    )
+    def test_routes_listed_views(self, mock_choose):
+        assert self._call("get", "/api/tree/abc123/full") == ["replica"]
+        assert get_read_database() == "default"
+
+    @patch("kernelCI_app.middleware.replicaRoutingMiddleware.choose_read_database")
+    def test_keeps_other_requests_on_primary(self, mock_choose):
+        assert self._call("get", "/api/hardware/") == ["default"]
+        assert self._call("post", "/api/tree/abc123/full") == ["default"]
+        assert self._call("get", "/not-a-route/") == ["default"]
+        mock_choose.assert_not_called()
@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from kernelCI_app.helpers import queryProfiling
+from kernelCI_app.typeModels.queryPlans import QueryPlan
+from kernelCI_app.views.queryPlansView import QueryPlansView
+
+PLAN = QueryPlan(
+    captured_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    query="tree_details",
+    database="default",
+    duration=1.5,
+    sql="SELECT 1",
+    plan="Result (actual rows=1)",
+)
+
+
+@pytest.fixture(autouse=True)
+def query_plans():
+    queryProfiling.QUERY_PLANS.clear()
+    queryProfiling.QUERY_PLANS.append(PLAN)
+    yield
+    queryProfiling.QUERY_PLANS.clear()
+
+
+def test_rejects_anonymous_users():
+    request = APIRequestFactory().get("/api/admin/query-plans/")
+
+    response = QueryPlansView.as_view()(request)
+
+    assert response.status_code == 403
+
+
+def test_lists_the_plans_to_staff_users():
+    request = APIRequestFactory().get("/api/admin/query-plans/")
+    force_authenticate(request, user=User(username="admin", is_staff=True))
+
+    response = QueryPlansView.as_view()(request)
+
+    assert response.status_code == 200
+    assert response.data == {"plans": [PLAN.model_dump()]}
@@ -288,11 +288,9 @@ class TestTreeCommitsHistoryList(SimpleTestCase):
         self.view = TreeCommitsHistoryList()
         self.url = "/api/tree/commits"
 
-    @patch(
-        "kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_hashes_aggregated"
-    )
-    def test_tree_commits_history_list_success(self, mock_get_aggregated):
-        mock_get_aggregated.return_value = [
+    @patch("kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_from_rollup")
+    def test_tree_commits_history_list_success(self, mock_get_rollup):
+        mock_get_rollup.return_value = [
             {
                 "count": 5,
                 "git_commit_hash": "abc123",
@@ -324,13 +322,11 @@ class TestTreeCommitsHistoryList(SimpleTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data[0]["git_commit_hash"], "abc123")
         self.assertEqual(response.data[0]["builds"]["PASS"], 5)
-        mock_get_aggregated.assert_called_once()
+        mock_get_rollup.assert_called_once()
 
-    @patch(
-        "kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_hashes_aggregated"
-    )
-    def test_tree_commits_history_list_with_types_filter(self, mock_aggregated):
-        mock_aggregated.return_value = [
+    @patch("kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_from_rollup")
+    def test_tree_commits_history_list_with_types_filter(self, mock_rollup):
+        mock_rollup.return_value = [
             {
                 "count": 10,
                 "git_commit_hash": "abc123",
@@ -361,13 +357,11 @@ class TestTreeCommitsHistoryList(SimpleTestCase):
         response = self.view.get(request)
 
         self.assertEqual(response.status_code, 200)
-        mock_aggregated.assert_called_once()
+        mock_rollup.assert_called_once()
 
-    @patch(
-        "kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_hashes_aggregated"
-    )
+    @patch("kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_from_rollup")
     def test_tree_commits_history_list_with_no_commit_hashes_returns_error(
-        self, mock_aggregated
+        self, mock_rollup
     ):
         request = self.factory.get(
             self.url,
@@ -379,13 +373,11 @@ class TestTreeCommitsHistoryList(SimpleTestCase):
         response = self.view.get(request)
 
         self.assertEqual(response.status_code, 400)
-        mock_aggregated.assert_not_called()
+        mock_rollup.assert_not_called()
 
-    @patch(
-        "kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_hashes_aggregated"
-    )
-    def test_tree_commits_history_list_empty_results(self, mock_aggregated):
-        mock_aggregated.return_value = []
+    @patch("kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_from_rollup")
+    def test_tree_commits_history_list_empty_results(self, mock_rollup):
+        mock_rollup.return_value = []
 
         request = self.factory.get(
             self.url,
@@ -402,4 +394,27 @@ class TestTreeCommitsHistoryList(SimpleTestCase):
             response.data,
             {"error": ClientStrings.TREE_COMMITS_HISTORY_NOT_FOUND},
         )
+        mock_rollup.assert_called_once()
+
+    @patch(
+        "kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_hashes_aggregated"
+    )
+    @patch("kernelCI_app.views.treeCommitsHistory.get_tree_commit_history_from_rollup")
+    def test_tree_commits_history_list_duration_filter_uses_raw_data(
+        self, mock_rollup, mock_aggregated
+    ):
+        mock_aggregated.return_value = []
+
+        request = self.factory.get(
+            self.url,
+            {
+                "origin": "maestro",
+                "commit_hashes": "abc123",
+                "filter_test.duration_[gte]": "10",
+            },
+        )
+
+        self.view.get(request)
+
         mock_aggregated.assert_called_once()
+        mock_rollup.assert_not_called()
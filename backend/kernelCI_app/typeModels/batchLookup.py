@@ -0,0 +1,50 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+from kernelCI_app.constants.general import BATCH_LOOKUP_MAX_IDS
+from kernelCI_app.constants.localization import DocStrings
+from kernelCI_app.typeModels.buildDetails import (
+    BuildDetailsResponse,
+    BuildTestsResponse,
+)
+from kernelCI_app.typeModels.detailsIssuesView import DetailsIssuesResponse
+from kernelCI_app.typeModels.testDetails import TestDetailsResponse
+
+type BuildBatchPayload = Literal["details", "tests", "issues"]
+type TestBatchPayload = Literal["details", "issues"]
+
+
+class BuildBatchRequest(BaseModel):
+    build_ids: list[str] = Field(
+        min_length=1,
+        max_length=BATCH_LOOKUP_MAX_IDS,
+        description=DocStrings.BATCH_BUILD_IDS_DESCRIPTION,
+    )
+    include: list[BuildBatchPayload] = Field(
+        default=["details", "tests", "issues"],
+        description=DocStrings.BATCH_INCLUDE_DESCRIPTION,
+    )
+
+
+class BuildBatchResponse(BaseModel):
+    details: dict[str, BuildDetailsResponse]
+    tests: dict[str, BuildTestsResponse]
+    issues: dict[str, DetailsIssuesResponse]
+
+
+class TestBatchRequest(BaseModel):
+    test_ids: list[str] = Field(
+        min_length=1,
+        max_length=BATCH_LOOKUP_MAX_IDS,
+        description=DocStrings.BATCH_TEST_IDS_DESCRIPTION,
+    )
+    include: list[TestBatchPayload] = Field(
+        default=["details", "issues"],
+        description=DocStrings.BATCH_INCLUDE_DESCRIPTION,
+    )
+
+
+class TestBatchResponse(BaseModel):
+    details: dict[str, TestDetailsResponse]
+    issues: dict[str, DetailsIssuesResponse]
@@ -31,6 +31,16 @@ class IssueListingQueryParameters(ListingInterval):
         default=None,
         description=DocStrings.DEFAULT_END_TS_DESCRIPTION,
     )
+    limit: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description=DocStrings.ISSUE_LISTING_LIMIT_DESCRIPTION,
+    )
+    offset: int = Field(
+        default=0,
+        ge=0,
+        description=DocStrings.ISSUE_LISTING_OFFSET_DESCRIPTION,
+    )
 
 
 class IssueListingItem(BaseModel):
@@ -55,3 +65,4 @@ class IssueListingResponse(BaseModel):
     issues: list[IssueListingItem]
     extras: dict[str, Incident]
     filters: IssueListingFilters
+    total_count: int
@@ -1,9 +1,11 @@
-from typing import Literal, Type
+from typing import Any, Literal, Type
 
 from kernelCI_app.models import Builds, Checkouts, Incidents, Issues, Tests
 
 type TableNames = Literal["issues", "checkouts", "builds", "tests", "incidents"]
 type TableModels = Issues | Checkouts | Builds | Tests | Incidents
+# Ingest records are namedtuples with the columns of a table, see ingest_records.py
+type TableRecord = tuple[Any, ...]
 type TableModelsClass = (
     Type[Issues] | Type[Checkouts] | Type[Builds] | Type[Tests] | Type[Incidents]
 )
@@ -0,0 +1,19 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class QueryPlan(BaseModel):
+    captured_at: datetime
+    query: Optional[str] = Field(
+        description="Name of the registered query, if the query is registered"
+    )
+    database: str
+    duration: float = Field(description="Duration of the query, in seconds")
+    sql: str
+    plan: str = Field(description="Output of EXPLAIN (ANALYZE, BUFFERS)")
+
+
+class QueryPlansResponse(BaseModel):
+    plans: list[QueryPlan]
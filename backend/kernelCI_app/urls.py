@@ -1,6 +1,5 @@
 from django.conf import settings
 from django.urls import path
-from django.views.decorators.cache import cache_page
 from drf_spectacular.views import (
     SpectacularAPIView,
     SpectacularRedocView,
@@ -8,10 +7,13 @@ from drf_spectacular.views import (
 )
 
 from kernelCI_app import views
+from kernelCI_app.middleware.precompressedCacheMiddleware import (
+    precompressed_cache_page,
+)
 
 
 def view_cache(view, timeout: int = settings.CACHE_TIMEOUT):
-    return cache_page(timeout)(view.as_view())
+    return precompressed_cache_page(timeout)(view.as_view())
 
 
 urlpatterns = [
@@ -20,6 +22,7 @@ urlpatterns = [
         view_cache(views.TestStatusHistory),
         name="testStatusHistory",
     ),
+    path("test/batch/", views.TestBatchView.as_view(), name="testBatch"),
     path("test/<str:test_id>", view_cache(views.TestDetails), name="testDetails"),
     path("tree/", view_cache(views.TreeView), name="tree"),
     path(
@@ -97,6 +100,7 @@ urlpatterns = [
         view_cache(views.TreeLatest),
         name="treeLatest",
     ),
+    path("build/batch/", views.BuildBatchView.as_view(), name="buildBatch"),
     path("build/<str:build_id>", view_cache(views.BuildDetails), name="buildDetails"),
     path("build/<str:build_id>/tests", view_cache(views.BuildTests), name="buildTests"),
     path(
@@ -180,4 +184,5 @@ urlpatterns = [
     path("origins/", views.OriginsView.as_view(), name="originsView"),
     path("tree-report/", views.TreeReport.as_view(), name="treeReportView"),
     path("metrics/", views.MetricsView.as_view(), name="metricsView"),
+    path("admin/query-plans/", views.QueryPlansView.as_view(), name="queryPlansView"),
 ]
@@ -0,0 +1,84 @@
+import json
+from http import HTTPStatus
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from drf_spectacular.utils import extend_schema
+from pydantic import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.constants.localization import ClientStrings
+from kernelCI_app.helpers.batchLookup import BatchQuery, lookup_batch
+from kernelCI_app.helpers.detailsIssues import sanitize_details_issues_rows
+from kernelCI_app.helpers.errorHandling import create_api_error_response
+from kernelCI_app.queries.build import get_builds_details, get_builds_tests
+from kernelCI_app.queries.issues import get_builds_issues
+from kernelCI_app.typeModels.batchLookup import (
+    BuildBatchRequest,
+    BuildBatchResponse,
+)
+
+BUILD_BATCH_QUERIES = {
+    "details": BatchQuery(query=get_builds_details, id_field="id"),
+    "tests": BatchQuery(query=get_builds_tests, id_field="build_id"),
+    "issues": BatchQuery(
+        query=lambda build_ids: get_builds_issues(build_ids=build_ids),
+        id_field="build_id",
+    ),
+}
+
+
+# POST is only used to send the list of ids in the body, see IssueExtraDetails
+@method_decorator(csrf_exempt, name="dispatch")
+class BuildBatchView(APIView):
+    @extend_schema(
+        request=BuildBatchRequest,
+        responses=BuildBatchResponse,
+        methods=["POST"],
+    )
+    def post(self, request) -> Response:
+        """
+        Returns the details, tests and issues of a list of builds, keyed by build id.
+        Each payload is the same as the one of the single build endpoints.
+
+        Builds that weren't found, or have no tests or issues,
+        are left out of the corresponding payload.
+        """
+        try:
+            body = json.loads(request.body)
+            valid_body = BuildBatchRequest(**body)
+        except json.JSONDecodeError:
+            return create_api_error_response(
+                error_message=ClientStrings.INVALID_JSON_BODY,
+            )
+        except ValidationError as e:
+            return Response(e.json(), status=HTTPStatus.BAD_REQUEST)
+
+        rows = lookup_batch(
+            ids=list(dict.fromkeys(valid_body.build_ids)),
+            queries={name: BUILD_BATCH_QUERIES[name] for name in valid_body.include},
+        )
+
+        try:
+            valid_response = BuildBatchResponse(
+                details={
+                    build_id: build_rows[0]
+                    for build_id, build_rows in rows.get("details", {}).items()
+                    if build_rows
+                },
+                tests={
+                    build_id: build_rows
+                    for build_id, build_rows in rows.get("tests", {}).items()
+                    if build_rows
+                },
+                issues={
+                    build_id: sanitize_details_issues_rows(rows=build_rows)
+                    for build_id, build_rows in rows.get("issues", {}).items()
+                    if build_rows
+                },
+            )
+        except ValidationError as e:
+            return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        return Response(valid_response.model_dump())
@@ -22,6 +22,7 @@ from kernelCI_app.helpers.hardwareDetails import (
     is_test_processed,
     unstable_parse_post_body,
 )
+from kernelCI_app.helpers.responseValidation import build_response_data
 from kernelCI_app.queries.hardware import (
     get_hardware_details_data,
     get_hardware_trees_data,
@@ -176,10 +177,11 @@ class HardwareDetailsBoots(APIView):
         self._sanitize_records(records, trees_with_selected_commits, is_all_selected)
 
         try:
-            valid_response = HardwareDetailsBootsResponse(
+            response_data = build_response_data(
+                HardwareDetailsBootsResponse,
                 boots=self.boots,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response_data)
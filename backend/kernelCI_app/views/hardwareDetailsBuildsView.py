@@ -23,6 +23,7 @@ from kernelCI_app.helpers.hardwareDetails import (
     handle_build_history,
     unstable_parse_post_body,
 )
+from kernelCI_app.helpers.responseValidation import build_response_data
 from kernelCI_app.queries.hardware import (
     get_hardware_details_data,
     get_hardware_trees_data,
@@ -160,10 +161,11 @@ class HardwareDetailsBuilds(APIView):
                 records, trees_with_selected_commits, is_all_selected
             )
 
-            valid_response = HardwareDetailsBuildsResponse(
+            response_data = build_response_data(
+                HardwareDetailsBuildsResponse,
                 builds=self.builds,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response_data)
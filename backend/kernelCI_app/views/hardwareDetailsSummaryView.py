@@ -28,6 +28,7 @@ from kernelCI_app.helpers.hardwareDetails import (
 from kernelCI_app.helpers.issueExtras import parse_issue
 from kernelCI_app.queries.hardware import (
     get_hardware_details_summary,
+    get_hardware_details_summary_from_rollup,
     get_hardware_trees_head_commits,
 )
 from kernelCI_app.typeModels.common import StatusCount
@@ -460,6 +461,20 @@ class HardwareDetailsSummary(APIView):
             ),
         )
 
+    def has_duration_filters(self) -> bool:
+        filters: FilterParams = self.filters
+        return any(
+            duration is not None
+            for duration in (
+                filters.filterBuildDurationMin,
+                filters.filterBuildDurationMax,
+                filters.filterBootDurationMin,
+                filters.filterBootDurationMax,
+                filters.filterTestDurationMin,
+                filters.filterTestDurationMax,
+            )
+        )
+
     def valid_filter_status(self) -> bool:
         filters: FilterParams = self.filters
         return all(
@@ -550,25 +565,40 @@ class HardwareDetailsSummary(APIView):
                 tree_heads, self.selected_commits
             )
 
-            summary: list[dict] = get_hardware_details_summary(
-                hardware_id=hardware_id,
-                origin=self.origin,
-                commit_hashes=selected_commit_hashes,
-                start_datetime=self.start_datetime,
-                end_datetime=self.end_datetime,
-                builds_duration=(
-                    filters.filterBuildDurationMin,
-                    filters.filterBuildDurationMax,
-                ),
-                boots_duration=(
-                    filters.filterBootDurationMin,
-                    filters.filterBootDurationMax,
-                ),
-                tests_duration=(
-                    filters.filterTestDurationMin,
-                    filters.filterTestDurationMax,
-                ),
-            )
+            # The rollup doesn't keep durations, so duration filters need the raw data
+            use_rollup = not self.has_duration_filters()
+            summary: list[dict] = []
+            if use_rollup:
+                summary = get_hardware_details_summary_from_rollup(
+                    hardware_id=hardware_id,
+                    origin=self.origin,
+                    commit_hashes=selected_commit_hashes,
+                    start_datetime=self.start_datetime,
+                    end_datetime=self.end_datetime,
+                )
+
+            # Tests that weren't aggregated yet are only in the raw data
+            if not summary:
+                use_rollup = False
+                summary = get_hardware_details_summary(
+                    hardware_id=hardware_id,
+                    origin=self.origin,
+                    commit_hashes=selected_commit_hashes,
+                    start_datetime=self.start_datetime,
+                    end_datetime=self.end_datetime,
+                    builds_duration=(
+                        filters.filterBuildDurationMin,
+                        filters.filterBuildDurationMax,
+                    ),
+                    boots_duration=(
+                        filters.filterBootDurationMin,
+                        filters.filterBootDurationMax,
+                    ),
+                    tests_duration=(
+                        filters.filterTestDurationMin,
+                        filters.filterTestDurationMax,
+                    ),
+                )
 
             if not summary:
                 return self._get_error_response(ClientStrings.HARDWARE_NOT_FOUND)
@@ -577,7 +607,12 @@ class HardwareDetailsSummary(APIView):
             # a dedicated endpoint for filters is important
             if filters.filters or self.selected_commits:
                 head_commit_hashes = self.select_commits_hashes(tree_heads)
-                unfiltered_summary = get_hardware_details_summary(
+                get_unfiltered_summary = (
+                    get_hardware_details_summary_from_rollup
+                    if use_rollup
+                    else get_hardware_details_summary
+                )
+                unfiltered_summary = get_unfiltered_summary(
                     hardware_id=hardware_id,
                     origin=self.origin,
                     commit_hashes=head_commit_hashes,
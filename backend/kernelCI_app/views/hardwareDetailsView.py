@@ -40,6 +40,7 @@ from kernelCI_app.helpers.hardwareDetails import (
     set_trees_status_summary,
     unstable_parse_post_body,
 )
+from kernelCI_app.helpers.responseValidation import build_response
 from kernelCI_app.queries.hardware import (
     get_hardware_details_data,
     get_hardware_trees_data,
@@ -352,7 +353,8 @@ class HardwareDetails(APIView):
         )
 
         try:
-            valid_response = HardwareDetailsFullResponse(
+            response = build_response(
+                HardwareDetailsFullResponse,
                 builds=self.builds["items"],
                 boots=self.boot_history,
                 tests=self.test_history,
@@ -410,4 +412,4 @@ class HardwareDetails(APIView):
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response)
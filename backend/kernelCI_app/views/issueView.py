@@ -16,7 +16,11 @@ from kernelCI_app.helpers.errorHandling import (
 from kernelCI_app.helpers.filters import FilterParams
 from kernelCI_app.helpers.issueExtras import process_issues_extra_details
 from kernelCI_app.helpers.issueListing import should_discard_issue_record
-from kernelCI_app.queries.issues import get_issue_listing_data
+from kernelCI_app.queries.issues import (
+    get_issue_listing_data,
+    get_issue_listing_facets,
+    get_issue_listing_page,
+)
 from kernelCI_app.typeModels.issueListing import (
     IssueListingFilters,
     IssueListingQueryParameters,
@@ -26,6 +30,8 @@ from kernelCI_app.typeModels.issues import (
     CULPRIT_CODE,
     CULPRIT_HARNESS,
     CULPRIT_TOOL,
+    HAS_INCIDENT_OPTION,
+    POSSIBLE_CULPRITS,
     Incident,
     PossibleIssueCulprits,
     ProcessedExtraDetailedIssues,
@@ -122,6 +128,78 @@ class IssueView(APIView):
         ) in self.processed_extra_issue_details.items():
             self.first_incidents[issue_extras_id] = issue_extras_data.first_incident
 
+    def _get_listing_page(
+        self,
+        *,
+        request_params: IssueListingQueryParameters,
+        start_date: datetime,
+        end_date: datetime,
+        facets: dict,
+    ) -> tuple[list[dict], int]:
+        """Filters and paginates the issues on the issue_listing table.
+
+        Only the extras of the issues in the page are queried."""
+        self.unprocessed_origins.update(facets["origins"])
+        self.unprocessed_categories.update(facets["categories"])
+        for culprit in POSSIBLE_CULPRITS:
+            if facets[f"culprit_{culprit}"]:
+                self.unprocessed_culprits.add(culprit)
+
+        issue_records, total_count = get_issue_listing_page(
+            start_date=start_date,
+            end_date=end_date,
+            origins=list(self.filters.filter_origins),
+            culprits=list(self.filters.filter_issue_culprits),
+            categories=list(self.filters.filter_issue_categories),
+            has_incident=HAS_INCIDENT_OPTION in self.filters.filter_issue_options,
+            limit=request_params.limit,
+            offset=request_params.offset,
+        )
+
+        process_issues_extra_details(
+            issue_key_list=[(issue["id"], issue["version"]) for issue in issue_records],
+            processed_issues_table=self.processed_extra_issue_details,
+        )
+
+        return issue_records, total_count
+
+    def _get_listing_from_issues(
+        self,
+        *,
+        request_params: IssueListingQueryParameters,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> tuple[list[dict], int]:
+        """Filters and paginates the issues of the issues table in memory."""
+        issue_records: list[dict] = get_issue_listing_data(
+            start_date=start_date,
+            end_date=end_date,
+        )
+
+        filtered_records = self._filter_records(issue_records=issue_records)
+
+        issue_key_list = [(issue["id"], issue["version"]) for issue in filtered_records]
+        # The endpoint only returns the first_seen data, but getting the trees data is useful
+        # to filter out issues with incidents that are related to unexistent builds/checkouts
+        process_issues_extra_details(
+            issue_key_list=issue_key_list,
+            processed_issues_table=self.processed_extra_issue_details,
+        )
+
+        (self.processed_extra_issue_details, refiltered_records) = (
+            self._filter_records_by_extras(records=filtered_records)
+        )
+
+        # Same order as the issue_listing page: newest first, then by id and version
+        refiltered_records.sort(key=lambda issue: (issue["id"], issue["version"]))
+        refiltered_records.sort(
+            key=lambda issue: issue["field_timestamp"], reverse=True
+        )
+        offset = request_params.offset
+        limit = request_params.limit
+        page_end = None if limit is None else offset + limit
+        return refiltered_records[offset:page_end], len(refiltered_records)
+
     @extend_schema(
         parameters=[IssueListingQueryParameters],
         responses=IssueListingResponse,
@@ -141,42 +219,41 @@ class IssueView(APIView):
                 status_code=HTTPStatus.BAD_REQUEST,
             )
 
-        issue_records: list[dict] = get_issue_listing_data(
-            start_date=start_date,
-            end_date=end_date,
-        )
+        self.filters = FilterParams(_request)
 
-        if len(issue_records) == 0:
+        facets = get_issue_listing_facets(start_date=start_date, end_date=end_date)
+        if facets["issue_count"] > 0:
+            issue_records, total_count = self._get_listing_page(
+                request_params=request_params,
+                start_date=start_date,
+                end_date=end_date,
+                facets=facets,
+            )
+        else:
+            # Issues ingested before the issue_listing table existed
+            issue_records, total_count = self._get_listing_from_issues(
+                request_params=request_params,
+                start_date=start_date,
+                end_date=end_date,
+            )
+
+        if total_count == 0 and not self.unprocessed_origins:
             return create_api_error_response(
                 error_message=ClientStrings.NO_ISSUE_FOUND, status_code=HTTPStatus.OK
             )
 
-        self.filters = FilterParams(_request)
-        filtered_records = self._filter_records(issue_records=issue_records)
-
-        issue_key_list = [(issue["id"], issue["version"]) for issue in filtered_records]
-        # The endpoint only returns the first_seen data, but getting the trees data is useful
-        # to filter out issues with incidents that are related to unexistent builds/checkouts
-        process_issues_extra_details(
-            issue_key_list=issue_key_list,
-            processed_issues_table=self.processed_extra_issue_details,
-        )
-
-        (self.processed_extra_issue_details, refiltered_records) = (
-            self._filter_records_by_extras(records=filtered_records)
-        )
-
         self._format_processing_for_response()
 
         try:
             valid_data = IssueListingResponse(
-                issues=refiltered_records,
+                issues=issue_records,
                 extras=self.first_incidents,
                 filters=IssueListingFilters(
                     origins=sorted(self.unprocessed_origins),
                     culprits=sorted(self.unprocessed_culprits),
                     categories=sorted(self.unprocessed_categories),
                 ),
+                total_count=total_count,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
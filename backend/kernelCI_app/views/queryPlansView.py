@@ -0,0 +1,29 @@
+from http import HTTPStatus
+
+from drf_spectacular.utils import extend_schema
+from pydantic import ValidationError
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.helpers.queryProfiling import get_query_plans
+from kernelCI_app.typeModels.queryPlans import QueryPlansResponse
+
+
+class QueryPlansView(APIView):
+    """Lists the plans of the slow queries captured by this process, only to
+    staff users"""
+
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses=QueryPlansResponse,
+        methods=["GET"],
+    )
+    def get(self, request) -> Response:
+        try:
+            valid_response = QueryPlansResponse(plans=get_query_plans())
+        except ValidationError as e:
+            return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        return Response(valid_response.model_dump())
@@ -0,0 +1,81 @@
+import json
+from http import HTTPStatus
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from drf_spectacular.utils import extend_schema
+from pydantic import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from kernelCI_app.constants.localization import ClientStrings
+from kernelCI_app.helpers.batchLookup import BatchQuery, lookup_batch
+from kernelCI_app.helpers.detailsIssues import sanitize_details_issues_rows
+from kernelCI_app.helpers.errorHandling import create_api_error_response
+from kernelCI_app.queries.issues import get_tests_issues
+from kernelCI_app.queries.test import get_tests_details_data
+from kernelCI_app.typeModels.batchLookup import (
+    TestBatchRequest,
+    TestBatchResponse,
+)
+
+TEST_BATCH_QUERIES = {
+    "details": BatchQuery(
+        query=lambda test_ids: get_tests_details_data(test_ids=test_ids),
+        id_field="id",
+    ),
+    "issues": BatchQuery(
+        query=lambda test_ids: get_tests_issues(test_ids=test_ids),
+        id_field="test_id",
+    ),
+}
+
+
+# POST is only used to send the list of ids in the body, see IssueExtraDetails
+@method_decorator(csrf_exempt, name="dispatch")
+class TestBatchView(APIView):
+    @extend_schema(
+        request=TestBatchRequest,
+        responses=TestBatchResponse,
+        methods=["POST"],
+    )
+    def post(self, request) -> Response:
+        """
+        Returns the details and issues of a list of tests, keyed by test id.
+        Each payload is the same as the one of the single test endpoints.
+
+        Tests that weren't found, or have no issues,
+        are left out of the corresponding payload.
+        """
+        try:
+            body = json.loads(request.body)
+            valid_body = TestBatchRequest(**body)
+        except json.JSONDecodeError:
+            return create_api_error_response(
+                error_message=ClientStrings.INVALID_JSON_BODY,
+            )
+        except ValidationError as e:
+            return Response(e.json(), status=HTTPStatus.BAD_REQUEST)
+
+        rows = lookup_batch(
+            ids=list(dict.fromkeys(valid_body.test_ids)),
+            queries={name: TEST_BATCH_QUERIES[name] for name in valid_body.include},
+        )
+
+        try:
+            valid_response = TestBatchResponse(
+                details={
+                    test_id: test_rows[0]
+                    for test_id, test_rows in rows.get("details", {}).items()
+                    if test_rows
+                },
+                issues={
+                    test_id: sanitize_details_issues_rows(rows=test_rows)
+                    for test_id, test_rows in rows.get("issues", {}).items()
+                    if test_rows
+                },
+            )
+        except ValidationError as e:
+            return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+        return Response(valid_response.model_dump())
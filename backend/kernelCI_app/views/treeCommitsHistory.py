@@ -28,6 +28,7 @@ from kernelCI_app.helpers.misc import (
 )
 from kernelCI_app.queries.tree import (
     get_tree_commit_history,
+    get_tree_commit_history_from_rollup,
     get_tree_commit_history_hashes_aggregated,
 )
 from kernelCI_app.typeModels.common import StatusCount
@@ -153,7 +154,7 @@ class BaseTreeCommitsHistory(APIView):
         key: str,
         build_origin: str,
     ) -> None:
-        is_filtered_out = self.filterParams.is_build_filtered_out(
+        is_filtered_out = self.filterParams.build_predicate(
             duration=duration,
             build_status=build_status,
             issue_id=issue_id,
@@ -310,7 +311,7 @@ class BaseTreeCommitsHistory(APIView):
             issue_id = UNCATEGORIZED_STRING
 
         if is_boot(test_path):
-            return self.filterParams.is_boot_filtered_out(
+            return self.filterParams.boot_predicate(
                 duration=test_duration,
                 issue_id=issue_id,
                 issue_version=issue_version,
@@ -320,7 +321,7 @@ class BaseTreeCommitsHistory(APIView):
                 origin=test_origin,
             )
 
-        return self.filterParams.is_test_filtered_out(
+        return self.filterParams.test_predicate(
             duration=test_duration,
             issue_id=issue_id,
             issue_version=issue_version,
@@ -354,7 +355,7 @@ class BaseTreeCommitsHistory(APIView):
 
             record_filter_out = (
                 not record_in_period
-                or self.filterParams.is_record_filtered_out(
+                or self.filterParams.record_predicate(
                     hardwares=hardware_filter,
                     architecture=row["architecture"],
                     compiler=row["compiler"],
@@ -597,6 +598,28 @@ class TreeCommitsHistoryList(BaseTreeCommitsHistory):
 
         return False
 
+    def can_use_rollup(self) -> bool:
+        """
+        The tree_tests_rollup has no durations and keeps only the first hardware
+        and issue of each test, so those filters need the raw data
+        """
+        filters: FilterParams = self.filterParams
+        has_duration_filters = any(
+            duration is not None
+            for duration in (
+                filters.filterBuildDurationMin,
+                filters.filterBuildDurationMax,
+                filters.filterBootDurationMin,
+                filters.filterBootDurationMax,
+                filters.filterTestDurationMin,
+                filters.filterTestDurationMax,
+            )
+        )
+        has_issue_filters = any(filters.filterIssues.values())
+        return not (
+            has_duration_filters or has_issue_filters or len(self.filterHardware) > 0
+        )
+
     def aggregate_commits(self, commit_hashes: list[str], instances: list[dict]):
         results = {
             commit_hash: TreeCommitsData(
@@ -714,27 +737,37 @@ class TreeCommitsHistoryList(BaseTreeCommitsHistory):
         ):
             include_types = ["builds", "boots", "tests"]
 
-        commit_history_list = get_tree_commit_history_hashes_aggregated(
-            commit_hashes=commit_hashes,
-            origin=params.origin,
-            git_url=params.git_url,
-            git_branch=params.git_branch,
-            tree_name=params.tree_name,
-            include_types=include_types,
-            platform_filter=list(self.filterParams.filterHardware),
-            builds_duration=(
-                self.filterParams.filterBuildDurationMin,
-                self.filterParams.filterBuildDurationMax,
-            ),
-            boots_duration=(
-                self.filterParams.filterBootDurationMin,
-                self.filterParams.filterBootDurationMax,
-            ),
-            tests_duration=(
-                self.filterParams.filterTestDurationMin,
-                self.filterParams.filterTestDurationMax,
-            ),
-        )
+        if self.can_use_rollup():
+            commit_history_list = get_tree_commit_history_from_rollup(
+                commit_hashes=commit_hashes,
+                origin=params.origin,
+                git_url=params.git_url,
+                git_branch=params.git_branch,
+                tree_name=params.tree_name,
+                include_types=include_types,
+            )
+        else:
+            commit_history_list = get_tree_commit_history_hashes_aggregated(
+                commit_hashes=commit_hashes,
+                origin=params.origin,
+                git_url=params.git_url,
+                git_branch=params.git_branch,
+                tree_name=params.tree_name,
+                include_types=include_types,
+                platform_filter=list(self.filterParams.filterHardware),
+                builds_duration=(
+                    self.filterParams.filterBuildDurationMin,
+                    self.filterParams.filterBuildDurationMax,
+                ),
+                boots_duration=(
+                    self.filterParams.filterBootDurationMin,
+                    self.filterParams.filterBootDurationMax,
+                ),
+                tests_duration=(
+                    self.filterParams.filterTestDurationMin,
+                    self.filterParams.filterTestDurationMax,
+                ),
+            )
 
         if not commit_history_list:
             return create_api_error_response(
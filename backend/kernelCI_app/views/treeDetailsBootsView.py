@@ -12,16 +12,14 @@ from kernelCI_app.helpers.errorHandling import create_api_error_response
 from kernelCI_app.helpers.filters import (
     FilterParams,
 )
+from kernelCI_app.helpers.responseValidation import build_response_data
 from kernelCI_app.helpers.treeDetails import (
     decide_if_is_boot_filtered_out,
     decide_if_is_full_row_filtered_out,
     get_current_row_data,
 )
 from kernelCI_app.queries.tree import get_tree_data
-from kernelCI_app.typeModels.commonDetails import (
-    CommonDetailsBootsResponse,
-    TestHistoryItem,
-)
+from kernelCI_app.typeModels.commonDetails import CommonDetailsBootsResponse
 from kernelCI_app.typeModels.commonOpenApiParameters import (
     COMMIT_HASH_PATH_PARAM,
     GIT_BRANCH_PATH_PARAM,
@@ -51,7 +49,6 @@ class BaseTreeDetailsBoots(APIView):
         if test_id in self.processedTests:
             return
         self.processedTests.add(test_id)
-        TestHistoryItem(**history_item)
         self.bootHistory.append(history_item)
 
     def _sanitize_rows(self, rows):
@@ -103,13 +100,14 @@ class BaseTreeDetailsBoots(APIView):
         try:
             self._sanitize_rows(rows)
 
-            valid_response = CommonDetailsBootsResponse(
+            response_data = build_response_data(
+                CommonDetailsBootsResponse,
                 boots=self.bootHistory,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response_data)
 
 
 class TreeDetailsBootsDirect(BaseTreeDetailsBoots):
@@ -15,6 +15,7 @@ from kernelCI_app.helpers.filters import (
     FilterParams,
 )
 from kernelCI_app.helpers.logger import create_endpoint_notification
+from kernelCI_app.helpers.responseValidation import build_response_data
 from kernelCI_app.helpers.treeDetails import (
     decide_if_is_build_filtered_out,
     decide_if_is_full_row_filtered_out,
@@ -113,13 +114,14 @@ class BaseTreeDetailsBuilds(APIView):
         self._sanitize_rows(rows)
 
         try:
-            valid_response = TreeDetailsBuildsResponse(
+            response_data = build_response_data(
+                TreeDetailsBuildsResponse,
                 builds=self.builds,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response_data)
 
 
 class TreeDetailsBuildsDirect(BaseTreeDetailsBuilds):
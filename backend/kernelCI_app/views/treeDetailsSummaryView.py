@@ -165,7 +165,7 @@ class BaseTreeDetailsSummary(APIView):
             process_tree_url(self, row_data)
             process_build_filters(self, row_data)
 
-            if self.filters.is_record_filtered_out(
+            if self.filters.record_predicate(
                 architecture=row_data["build_architecture"],
                 compiler=row_data["build_compiler"],
                 config_name=row_data["build_config_name"],
@@ -189,7 +189,7 @@ class BaseTreeDetailsSummary(APIView):
 
             process_rollup_filters(self, row_dict)
 
-            if self.filters.is_record_filtered_out(
+            if self.filters.record_predicate(
                 hardwares=[row_dict["hardware_key"]],
                 architecture=row_dict["build_architecture"],
                 compiler=row_dict["build_compiler"],
@@ -12,16 +12,14 @@ from kernelCI_app.helpers.errorHandling import create_api_error_response
 from kernelCI_app.helpers.filters import (
     FilterParams,
 )
+from kernelCI_app.helpers.responseValidation import build_response_data
 from kernelCI_app.helpers.treeDetails import (
     decide_if_is_full_row_filtered_out,
     decide_if_is_test_filtered_out,
     get_current_row_data,
 )
 from kernelCI_app.queries.tree import get_tree_data
-from kernelCI_app.typeModels.commonDetails import (
-    CommonDetailsTestsResponse,
-    TestHistoryItem,
-)
+from kernelCI_app.typeModels.commonDetails import CommonDetailsTestsResponse
 from kernelCI_app.typeModels.commonOpenApiParameters import (
     COMMIT_HASH_PATH_PARAM,
     GIT_BRANCH_PATH_PARAM,
@@ -53,9 +51,6 @@ class BaseTreeDetailsTests(APIView):
             return
 
         self.processedTests.add(test_id)
-
-        TestHistoryItem(**history_item)
-
         self.testHistory.append(history_item)
 
     def _sanitize_rows(self, rows):
@@ -109,13 +104,14 @@ class BaseTreeDetailsTests(APIView):
         try:
             self._sanitize_rows(rows)
 
-            valid_response = CommonDetailsTestsResponse(
+            response_data = build_response_data(
+                CommonDetailsTestsResponse,
                 tests=self.testHistory,
             )
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response_data)
 
 
 class TreeDetailsTestsDirect(BaseTreeDetailsTests):
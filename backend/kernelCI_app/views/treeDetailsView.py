@@ -16,6 +16,7 @@ from kernelCI_app.helpers.errorHandling import create_api_error_response
 from kernelCI_app.helpers.filters import FilterParams
 from kernelCI_app.helpers.hardwareDetails import generate_test_summary_typed
 from kernelCI_app.helpers.logger import create_endpoint_notification
+from kernelCI_app.helpers.responseValidation import build_response
 from kernelCI_app.helpers.treeDetails import (
     call_based_on_compatible_and_misc_platform,
     decide_if_is_boot_filtered_out,
@@ -265,7 +266,8 @@ class BaseTreeDetails(APIView):
         self._sanitize_rows(rows)
 
         try:
-            valid_response = TreeDetailsFullResponse(
+            response = build_response(
+                TreeDetailsFullResponse,
                 builds=self.builds,
                 boots=self.bootHistory,
                 tests=self.testHistory,
@@ -342,7 +344,7 @@ class BaseTreeDetails(APIView):
         except ValidationError as e:
             return Response(data=e.json(), status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-        return Response(valid_response.model_dump())
+        return Response(response)
 
 
 class TreeDetailsDirect(BaseTreeDetails):
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("kernelCI_cache", "0013_delete_checkoutscache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LogExcerptUpload",
+            fields=[
+                ("log_hash", models.TextField(primary_key=True, serialize=False)),
+                ("url", models.TextField()),
+                ("last_used", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "db_table": "log_excerpt_upload",
+            },
+        ),
+    ]
@@ -33,3 +33,15 @@ class NotificationsIssue(models.Model):
     class Meta:
         db_table = "notifications_issue"
         unique_together = (("issue_id", "issue_version"),)
+
+
+class LogExcerptUpload(models.Model):
+    """Log excerpts already uploaded to the storage by the ingester, keyed by the
+    SHA-256 of their content. Entries unused for the longest time are pruned first."""
+
+    log_hash = models.TextField(primary_key=True)
+    url = models.TextField()
+    last_used = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "log_excerpt_upload"
@@ -21,6 +21,7 @@ export type IssueListingResponse = {
   issues: IssueListingItem[];
   extras: Record<string, Incident>;
   filters: IssueListingFilters;
+  total_count: number;
 };
 
 export type IssueListingTableItem = IssueListingItem & Incident;
@@ -0,0 +1,27 @@
+import http from "k6/http";
+import { check } from "k6";
+
+// Concurrent requests to light endpoints, where opening a database connection
+// is a large share of the response time. Run it with and without DB_POOLS set
+// on the test backend to compare the latencies.
+export const options = {
+    scenarios: {
+        concurrent_requests: {
+            executor: "constant-vus",
+            vus: Number(__ENV.VUS || 10),
+            duration: __ENV.DURATION || "30s",
+        },
+    },
+};
+
+export default function () {
+    const originsRes = http.get('http://test-backend:8000/api/origins/');
+    check(originsRes, {
+        'origins status is 200': (r) => r.status === 200,
+    });
+
+    const treeRes = http.get('http://test-backend:8000/api/tree/?origin=maestro');
+    check(treeRes, {
+        'tree listing status is 200': (r) => r.status === 200,
+    });
+}